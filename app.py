@@ -19,16 +19,19 @@
 # - ADDED: Proper shutdown handler
 # - ADDED: Named constants for background task intervals
 # - ADDED: Google Workspace background tasks (token refresh, auto-sync)
+#
+# CHANGELOG 2026-10-16:
+# - CHANGED: Background while-loops replaced by jobs on the shared scheduler
+#   (modules/core/scheduler.py) - leases, skip-if-running, jitter, metrics
+# - ADDED: GET /api/scheduler/jobs
 #===============================================================================
 
 #-- Section 1: Core Imports - 9/23/25
 import os
 import sys
 import logging
-import asyncio
 import time
 from datetime import datetime
-from zoneinfo import ZoneInfo
 
 from fastapi import FastAPI, HTTPException, Cookie, Response, Depends
 from fastapi.staticfiles import StaticFiles
@@ -37,6 +40,9 @@ from pydantic import BaseModel
 
 from modules.core.health import get_health_status
 from modules.core.database import db_manager
+from modules.core.cache import init_cache_backend
+from modules.core.scheduler import get_scheduler
+from modules.core.document_extractor import get_document_extractor
 
 #-- Section 2: Integration Module Imports - 9/23/25
 from modules.integrations.slack_clickup import router as slack_clickup_router
@@ -49,6 +55,7 @@ from modules.integrations.weather import get_integration_info as weather_integra
 #-- Section 2b: Bluesky Multi-Account Integration - added 9/24/25
 from modules.integrations.bluesky import router as bluesky_router
 from modules.integrations.bluesky import get_integration_info as bluesky_integration_info, check_module_health as bluesky_module_health
+from modules.integrations.bluesky import get_bluesky_multi_client
 
 #-- Section 2c: RSS Learning Integration - added 9/25/25
 from modules.integrations.rss_learning import router as rss_learning_router
@@ -82,6 +89,7 @@ from modules.integrations.google_workspace.background_tasks import start_backgro
 #-- Section 2j: Telegram Notification System - added 10/12/25
 from modules.integrations.telegram.router import router as telegram_router
 from modules.integrations.telegram.notification_manager import NotificationManager
+from modules.integrations.telegram.notification_pipeline import get_notification_pipeline
 from modules.integrations.telegram.bot_client import TelegramBotClient
 from modules.integrations.telegram.kill_switch import KillSwitch
 from modules.integrations.telegram.notification_types.prayer_notifications import PrayerNotificationHandler
@@ -98,6 +106,7 @@ from modules.integrations.telegram.notification_types.content_approval_notificat
 #-- Section 2k: Fathom Meeting Integration - added 10/16/25
 from modules.integrations.fathom import router as fathom_router
 from modules.integrations.fathom import get_integration_info as fathom_integration_info, check_module_health as fathom_module_health
+from modules.integrations.fathom.database_manager import FathomDatabaseManager
 
 #-- Section 2l: Intelligence Hub Integration - added 10/22/25
 from modules.intelligence.intelligence_orchestrator import get_intelligence_orchestrator
@@ -145,7 +154,7 @@ logger.info("🔒 Thread-safe logging initialized for chat diagnostics")
 TASK_INTERVALS = {
     'session_cleanup': 3600,           # 1 hour
     'prayer_check': 300,               # 5 minutes
-    'reminder_check': 60,              # 1 minute (internal to monitor_reminders)
+    'reminder_check': 60,              # 1 minute
     'calendar_check': 1800,            # 30 minutes
     'weather_collection': 7200,        # 2 hours
     'weather_notification': 1800,      # 30 minutes
@@ -159,7 +168,6 @@ TASK_INTERVALS = {
     'analytics_check': 3600,           # 1 hour
     'content_approval': 30,            # 30 seconds
     'intelligence_cycle': 14400,       # 4 hours
-    'daily_digest_check': 300,         # 5 minutes
     'startup_delay_trends': 600,       # 10 minutes
     'startup_delay_bluesky': 900,      # 15 minutes
     'startup_delay_clickup': 1200,     # 20 minutes
@@ -169,6 +177,10 @@ TASK_INTERVALS = {
     'startup_delay_job_radar': 1500,   # 25 minutes
 }
 
+# Daily intelligence digest - 8 AM Eastern
+DAILY_DIGEST_CRON = '0 8 * * *'
+DAILY_DIGEST_TIMEZONE = 'America/New_York'
+
 # Single user ID (intentionally hardcoded for single-user system)
 DEFAULT_USER_ID = "b7c60682-4815-4d9d-8ebe-66c6cd24eff9"
 
@@ -331,352 +343,269 @@ async def get_current_user_id(session_token: str = Cookie(None)) -> str:
     
     return user['id']
 
-#-- Section 12: Background Task Definitions - 10/12/25
-# These are defined before startup so they can be referenced
+#-- Section 12: Background Job Definitions - 10/12/25 (scheduler jobs 2026-10-16)
+# One run per call - the scheduler (modules/core/scheduler.py) owns intervals,
+# retries, leases and jitter. Registered in startup_event().
 
-async def session_cleanup_task():
+async def session_cleanup_job():
     """Periodic cleanup of expired sessions"""
-    logger.info("🔐 Session cleanup task started")
-    while True:
-        await asyncio.sleep(TASK_INTERVALS['session_cleanup'])
-        await AuthManager.cleanup_expired_sessions()
-        logger.debug("Session cleanup completed")
-
-async def prayer_notification_task():
-    """Check for prayer notifications every 5 minutes"""
-    logger.info("🕌 Prayer notification task started")
-    while True:
-        try:
-            if await app.state.telegram_kill_switch.is_enabled(DEFAULT_USER_ID):
-                await app.state.telegram_prayer_handler.check_and_notify()
-            await asyncio.sleep(TASK_INTERVALS['prayer_check'])
-        except Exception as e:
-            logger.error(f"Prayer notification error: {e}")
-            await asyncio.sleep(TASK_INTERVALS['error_retry'])
-
-async def reminder_notification_task():
-    """Monitor reminders continuously"""
-    logger.info("⏰ Reminder notification task started")
-    try:
-        await app.state.telegram_reminder_handler.monitor_reminders()
-    except Exception as e:
-        logger.error(f"Reminder monitor error: {e}")
-
-async def calendar_notification_task():
-    """Check for calendar notifications every 30 minutes"""
-    logger.info("📅 Calendar notification task started")
-    while True:
-        try:
-            if await app.state.telegram_kill_switch.is_enabled(DEFAULT_USER_ID):
-                await app.state.telegram_calendar_handler.check_and_notify()
-            await asyncio.sleep(TASK_INTERVALS['calendar_check'])
-        except Exception as e:
-            logger.error(f"Calendar notification error: {e}")
-            await asyncio.sleep(TASK_INTERVALS['error_retry'])
-
-async def weather_collection_task():
-    """Collect weather data from Tomorrow.io every 2 hours"""
-    logger.info("🌡️ Weather collection task started")
-    while True:
-        try:
-            from modules.integrations.weather.tomorrow_client import TomorrowClient
-            from modules.integrations.weather.weather_processor import WeatherProcessor
-            
-            client = TomorrowClient()
-            processor = WeatherProcessor()
-            
-            weather_data = await client.get_current_weather()
-            reading_id = await processor.store_weather_reading(
-                user_id=DEFAULT_USER_ID,
-                weather_data=weather_data,
-                location=None
-            )
-            
-            logger.info(f"✅ Weather data collected and stored (reading_id: {reading_id})")
-            await asyncio.sleep(TASK_INTERVALS['weather_collection'])
-            
-        except Exception as e:
-            logger.error(f"Weather collection error: {e}")
-            await asyncio.sleep(TASK_INTERVALS['error_retry_short'])
-
-async def weather_notification_task():
-    """Check for weather notifications every 30 minutes"""
-    logger.info("🌤️ Weather notification task started")
-    while True:
-        try:
-            if await app.state.telegram_kill_switch.is_enabled(DEFAULT_USER_ID):
-                await app.state.telegram_weather_handler.check_and_notify()
-            await asyncio.sleep(TASK_INTERVALS['weather_notification'])
-        except Exception as e:
-            logger.error(f"Weather notification error: {e}")
-            await asyncio.sleep(TASK_INTERVALS['error_retry'])
-
-async def email_notification_task():
-    """Check for email notifications every hour"""
-    logger.info("📧 Email notification task started")
-    while True:
-        try:
-            if await app.state.telegram_kill_switch.is_enabled(DEFAULT_USER_ID):
-                await app.state.telegram_email_handler.check_and_notify()
-            await asyncio.sleep(TASK_INTERVALS['email_check'])
-        except Exception as e:
-            logger.error(f"Email notification error: {e}")
-            await asyncio.sleep(TASK_INTERVALS['error_retry'])
-
-async def clickup_notification_task():
-    """Check for ClickUp notifications every 4 hours"""
-    logger.info("📋 ClickUp notification task started")
-    while True:
-        try:
-            if await app.state.telegram_kill_switch.is_enabled(DEFAULT_USER_ID):
-                await app.state.telegram_clickup_handler.check_and_notify()
-            await asyncio.sleep(TASK_INTERVALS['clickup_check'])
-        except Exception as e:
-            logger.error(f"ClickUp notification error: {e}")
-            await asyncio.sleep(TASK_INTERVALS['error_retry'])
-
-async def bluesky_notification_task():
-    """Check for Bluesky notifications every 4 hours"""
-    logger.info("🦋 Bluesky notification task started")
-    while True:
-        try:
-            if await app.state.telegram_kill_switch.is_enabled(DEFAULT_USER_ID):
-                await app.state.telegram_bluesky_handler.check_and_notify()
-            await asyncio.sleep(TASK_INTERVALS['bluesky_notification'])
-        except Exception as e:
-            logger.error(f"Bluesky notification error: {e}")
-            await asyncio.sleep(TASK_INTERVALS['error_retry'])
-
-async def trends_notification_task():
-    """Check for trending topics every 4 hours"""
-    logger.info("📈 Trends notification task started")
-    while True:
-        try:
-            if await app.state.telegram_kill_switch.is_enabled(DEFAULT_USER_ID):
-                await app.state.telegram_trends_handler.check_and_notify()
-            await asyncio.sleep(TASK_INTERVALS['trends_notification'])
-        except Exception as e:
-            logger.error(f"Trends notification error: {e}")
-            await asyncio.sleep(TASK_INTERVALS['error_retry'])
-
-async def analytics_notification_task():
+    await AuthManager.cleanup_expired_sessions()
+    logger.debug("Session cleanup completed")
+
+async def prayer_notification_job():
+    """Check for prayer notifications"""
+    if await app.state.telegram_kill_switch.is_enabled(DEFAULT_USER_ID):
+        await app.state.telegram_prayer_handler.check_and_notify()
+
+async def reminder_notification_job():
+    """Send reminders that are due"""
+    await app.state.telegram_reminder_handler.check_and_notify()
+
+async def calendar_notification_job():
+    """Check for calendar notifications"""
+    if await app.state.telegram_kill_switch.is_enabled(DEFAULT_USER_ID):
+        await app.state.telegram_calendar_handler.check_and_notify()
+
+async def weather_collection_job():
+    """Collect weather data from Tomorrow.io"""
+    from modules.integrations.weather.tomorrow_client import TomorrowClient
+    from modules.integrations.weather.weather_processor import WeatherProcessor
+    
+    client = TomorrowClient()
+    processor = WeatherProcessor()
+    
+    weather_data = await client.get_current_weather()
+    reading_id = await processor.store_weather_reading(
+        user_id=DEFAULT_USER_ID,
+        weather_data=weather_data,
+        location=None
+    )
+    
+    logger.info(f"✅ Weather data collected and stored (reading_id: {reading_id})")
+
+async def weather_notification_job():
+    """Check for weather notifications"""
+    if await app.state.telegram_kill_switch.is_enabled(DEFAULT_USER_ID):
+        await app.state.telegram_weather_handler.check_and_notify()
+
+async def email_notification_job():
+    """Check for email notifications"""
+    if await app.state.telegram_kill_switch.is_enabled(DEFAULT_USER_ID):
+        await app.state.telegram_email_handler.check_and_notify()
+
+async def clickup_notification_job():
+    """Check for ClickUp notifications"""
+    if await app.state.telegram_kill_switch.is_enabled(DEFAULT_USER_ID):
+        await app.state.telegram_clickup_handler.check_and_notify()
+
+async def bluesky_notification_job():
+    """Check for Bluesky notifications"""
+    if await app.state.telegram_kill_switch.is_enabled(DEFAULT_USER_ID):
+        await app.state.telegram_bluesky_handler.check_and_notify()
+
+async def trends_notification_job():
+    """Check for trending topics"""
+    if await app.state.telegram_kill_switch.is_enabled(DEFAULT_USER_ID):
+        await app.state.telegram_trends_handler.check_and_notify()
+
+async def analytics_notification_job():
     """Check for analytics notifications (morning/evening summaries)"""
-    logger.info("📊 Analytics notification task started")
-    while True:
-        try:
-            if await app.state.telegram_kill_switch.is_enabled(DEFAULT_USER_ID):
-                await app.state.telegram_analytics_handler.check_and_notify()
-            await asyncio.sleep(TASK_INTERVALS['analytics_check'])
-        except Exception as e:
-            logger.error(f"Analytics notification error: {e}")
-            await asyncio.sleep(TASK_INTERVALS['error_retry'])
-
-async def content_approval_notification_task():
-    """Check content recommendation queue every 30 seconds"""
-    logger.info("📝 Content approval notification task started")
-    await asyncio.sleep(TASK_INTERVALS['content_approval'])  # Initial delay
-    
-    while True:
-        try:
-            if await app.state.telegram_kill_switch.is_enabled(DEFAULT_USER_ID):
-                await app.state.telegram_content_approval_handler.check_and_notify()
-            await asyncio.sleep(TASK_INTERVALS['content_approval'])
-        except Exception as e:
-            logger.error(f"Content approval notification error: {e}")
-            await asyncio.sleep(TASK_INTERVALS['content_approval'])
-
-async def trends_monitoring_cycle_task():
-    """Scan Google Trends and populate trend_opportunities every 4 hours"""
-    logger.info("📈 Trends monitoring cycle task started")
-    await asyncio.sleep(TASK_INTERVALS['startup_delay_trends'])  # Startup delay
-    
-    while True:
-        try:
-            if await app.state.telegram_kill_switch.is_enabled(DEFAULT_USER_ID):
-                logger.info("🔍 Running Google Trends monitoring cycle...")
-                
-                from modules.integrations.google_trends.keyword_monitor import KeywordMonitor
-                
-                monitor = KeywordMonitor(mode='normal')
-                result = await monitor.run_monitoring_cycle()
-                
-                if result.get('success'):
-                    logger.info(f"✅ Trends cycle complete: {result.get('keywords_monitored', 0)} keywords, "
-                              f"{result.get('trends_fetched', 0)} trends, {result.get('alerts_created', 0)} opportunities created")
-                else:
-                    logger.error(f"❌ Trends cycle failed: {result.get('error', 'Unknown error')}")
-            else:
-                logger.info("📈 Trends monitoring cycle skipped (kill switch disabled)")
-            
-            await asyncio.sleep(TASK_INTERVALS['trends_monitoring'])
-            
-        except Exception as e:
-            logger.error(f"Trends monitoring cycle error: {e}")
-            await asyncio.sleep(TASK_INTERVALS['startup_delay_trends'])
-
-async def bluesky_scanning_cycle_task():
-    """Scan all 5 Bluesky accounts for engagement opportunities every 90 minutes"""
-    logger.info("🦋 Bluesky scanning cycle task started")
-    await asyncio.sleep(TASK_INTERVALS['startup_delay_bluesky'])  # Startup delay
-    
-    while True:
-        try:
-            if await app.state.telegram_kill_switch.is_enabled(DEFAULT_USER_ID):
-                logger.info("🔍 Scanning Bluesky accounts for engagement opportunities...")
-                
-                try:
-                    import importlib
-                    engagement_detector_module = importlib.import_module('modules.integrations.bluesky.engagement_detector')
-                    EngagementDetector = getattr(engagement_detector_module, 'BlueskyEngagementDetector')
-                    
-                    detector = EngagementDetector()
-                    results = await detector.scan_all_accounts()
-                    
-                except AttributeError:
-                    logger.error("⚠️ EngagementDetector class not found in engagement_detector.py")
-                    results = {}
-                except Exception as scan_error:
-                    logger.error(f"⚠️ Bluesky scanning failed: {scan_error}")
-                    results = {}
-                
-                total_opportunities = sum(results.values())
-                logger.info(f"✅ Bluesky scan complete: {total_opportunities} opportunities found across {len(results)} accounts")
-                
-                for account_id, count in results.items():
-                    if count > 0:
-                        logger.info(f"   🦋 {account_id}: {count} opportunities")
-            else:
-                logger.info("🦋 Bluesky scanning cycle skipped (kill switch disabled)")
-            
-            await asyncio.sleep(TASK_INTERVALS['bluesky_scan'])
-            
-        except Exception as e:
-            logger.error(f"Bluesky scanning cycle error: {e}")
-            await asyncio.sleep(TASK_INTERVALS['startup_delay_trends'])
-
-async def clickup_sync_cycle_task():
-    """Sync ClickUp tasks from API to database every 4 hours"""
-    logger.info("📋 ClickUp sync cycle task started")
-    await asyncio.sleep(TASK_INTERVALS['startup_delay_clickup'])  # Startup delay
-    
-    while True:
-        try:
-            if await app.state.telegram_kill_switch.is_enabled(DEFAULT_USER_ID):
-                logger.info("🔄 Syncing ClickUp tasks from API...")
-                
-                from modules.integrations.slack_clickup.clickup_sync_manager import ClickUpSyncManager
-                
-                sync_manager = ClickUpSyncManager()
-                result = await sync_manager.sync_all_tasks()
-                
-                logger.info(f"✅ ClickUp sync complete: {result['tasks_synced']} tasks total "
-                          f"({result['amcf_tasks']} AMCF, {result['personal_tasks']} Personal)")
-                
-                if result['errors']:
-                    logger.error(f"⚠️ ClickUp sync had errors: {result['errors']}")
-            else:
-                logger.info("📋 ClickUp sync cycle skipped (kill switch disabled)")
-            
-            await asyncio.sleep(TASK_INTERVALS['clickup_sync'])
-            
-        except Exception as e:
-            logger.error(f"ClickUp sync cycle error: {e}")
-            await asyncio.sleep(TASK_INTERVALS['startup_delay_trends'])
-
-async def intelligence_cycle_task():
-    """Run complete intelligence cycle every 4 hours"""
-    logger.info("🧠 Intelligence cycle task started")
-    
-    while True:
-        try:
-            if await app.state.telegram_kill_switch.is_enabled(DEFAULT_USER_ID):
-                logger.info("🧠 Running intelligence cycle...")
-                
-                orchestrator = get_intelligence_orchestrator(
-                    db_manager=db_manager,
-                    telegram_service=app.state.telegram_notification_manager,
-                    user_id=DEFAULT_USER_ID
-                )
-                
-                result = await orchestrator.run_intelligence_cycle()
-                
-                logger.info(f"✅ Intelligence cycle complete: {result['signals_collected']} signals, "
-                          f"{result['situations_detected']} situations, "
-                          f"{result['notifications_sent']} notifications sent")
-            else:
-                logger.info("🧠 Intelligence cycle skipped (kill switch disabled)")
-            
-            await asyncio.sleep(TASK_INTERVALS['intelligence_cycle'])
-            
-        except Exception as e:
-            logger.error(f"Intelligence cycle error: {e}")
-            await asyncio.sleep(TASK_INTERVALS['error_retry_short'])
-
-async def job_radar_scan_task():
-    """Run job radar scan every 4 hours"""
-    await asyncio.sleep(TASK_INTERVALS['startup_delay_job_radar'])
-    logger.info("🔍 Job Radar scan task started")
-    
-    while True:
-        try:
-            if await app.state.telegram_kill_switch.is_enabled(DEFAULT_USER_ID):
-                logger.info("🔍 Running Job Radar scan...")
-                
-                # Get Gmail client for email notifications
-                from modules.integrations.google_workspace.gmail_client import get_gmail_client
-                gmail = get_gmail_client(DEFAULT_USER_ID)
-                await gmail.initialize(DEFAULT_USER_ID)
-                
-                result = await run_job_scan(
-                    telegram_service=app.state.telegram_notification_manager,
-                )
-                logger.info(
-                    f"✅ Job Radar scan complete: "
-                    f"{result.get('total_results', 0)} found, "
-                    f"{result.get('ai_scored', 0)} scored, "
-                    f"{result.get('high_matches', 0)} high matches"
-                )
-            else:
-                logger.info("🔍 Job Radar scan skipped (kill switch disabled)")
-            
-            await asyncio.sleep(TASK_INTERVALS['job_radar_scan'])
-        except Exception as e:
-            logger.error(f"Job Radar scan error: {e}")
-            await asyncio.sleep(TASK_INTERVALS['error_retry_short'])
-
-async def daily_intelligence_digest_task():
-    """Send daily intelligence digest at 8 AM Eastern Time"""
-    logger.info("📊 Daily intelligence digest task started")
-    
-    while True:
-        try:
-            eastern = ZoneInfo('America/New_York')
-            now = datetime.now(eastern)
-            
-            # Check if it's 8 AM (with 5-minute window)
-            if now.hour == 8 and now.minute < 5:
-                if await app.state.telegram_kill_switch.is_enabled(DEFAULT_USER_ID):
-                    logger.info("📊 Sending daily intelligence digest...")
-                    
-                    orchestrator = get_intelligence_orchestrator(
-                        db_manager=db_manager,
-                        user_id=DEFAULT_USER_ID
-                    )
-                    
-                    await orchestrator.run_daily_digest()
-                    logger.info("✅ Daily digest sent successfully")
-                    
-                    # Sleep until next day (23 hours)
-                    await asyncio.sleep(82800)
-                else:
-                    logger.info("📊 Daily digest skipped (kill switch disabled)")
-                    await asyncio.sleep(82800)
-            else:
-                await asyncio.sleep(TASK_INTERVALS['daily_digest_check'])
-            
-        except Exception as e:
-            logger.error(f"Daily digest error: {e}")
-            await asyncio.sleep(TASK_INTERVALS['daily_digest_check'])
+    if await app.state.telegram_kill_switch.is_enabled(DEFAULT_USER_ID):
+        await app.state.telegram_analytics_handler.check_and_notify()
+
+async def content_approval_notification_job():
+    """Check content recommendation queue"""
+    if await app.state.telegram_kill_switch.is_enabled(DEFAULT_USER_ID):
+        await app.state.telegram_content_approval_handler.check_and_notify()
+
+async def trends_monitoring_cycle_job():
+    """Scan Google Trends and populate trend_opportunities"""
+    if not await app.state.telegram_kill_switch.is_enabled(DEFAULT_USER_ID):
+        logger.info("📈 Trends monitoring cycle skipped (kill switch disabled)")
+        return
+    
+    logger.info("🔍 Running Google Trends monitoring cycle...")
+    
+    from modules.integrations.google_trends.keyword_monitor import KeywordMonitor
+    
+    monitor = KeywordMonitor(mode='normal')
+    result = await monitor.run_monitoring_cycle()
+    
+    if result.get('success'):
+        logger.info(f"✅ Trends cycle complete: {result.get('keywords_monitored', 0)} keywords, "
+                  f"{result.get('trends_fetched', 0)} trends, {result.get('alerts_created', 0)} opportunities created")
+    else:
+        logger.error(f"❌ Trends cycle failed: {result.get('error', 'Unknown error')}")
+
+async def bluesky_scanning_cycle_job():
+    """Scan all 5 Bluesky accounts for engagement opportunities"""
+    if not await app.state.telegram_kill_switch.is_enabled(DEFAULT_USER_ID):
+        logger.info("🦋 Bluesky scanning cycle skipped (kill switch disabled)")
+        return
+    
+    logger.info("🔍 Scanning Bluesky accounts for engagement opportunities...")
+    
+    try:
+        import importlib
+        engagement_detector_module = importlib.import_module('modules.integrations.bluesky.engagement_detector')
+        EngagementDetector = getattr(engagement_detector_module, 'BlueskyEngagementDetector')
+        
+        detector = EngagementDetector()
+        results = await detector.scan_all_accounts()
+        
+    except AttributeError:
+        logger.error("⚠️ EngagementDetector class not found in engagement_detector.py")
+        results = {}
+    except Exception as scan_error:
+        logger.error(f"⚠️ Bluesky scanning failed: {scan_error}")
+        results = {}
+    
+    total_opportunities = sum(results.values())
+    logger.info(f"✅ Bluesky scan complete: {total_opportunities} opportunities found across {len(results)} accounts")
+    
+    for account_id, count in results.items():
+        if count > 0:
+            logger.info(f"   🦋 {account_id}: {count} opportunities")
+
+async def clickup_sync_cycle_job():
+    """Sync ClickUp tasks from API to database"""
+    if not await app.state.telegram_kill_switch.is_enabled(DEFAULT_USER_ID):
+        logger.info("📋 ClickUp sync cycle skipped (kill switch disabled)")
+        return
+    
+    logger.info("🔄 Syncing ClickUp tasks from API...")
+    
+    from modules.integrations.slack_clickup.clickup_sync_manager import ClickUpSyncManager
+    
+    sync_manager = ClickUpSyncManager()
+    result = await sync_manager.sync_all_tasks()
+    
+    logger.info(f"✅ ClickUp sync complete: {result['tasks_synced']} tasks total "
+              f"({result['amcf_tasks']} AMCF, {result['personal_tasks']} Personal)")
+    
+    if result['errors']:
+        logger.error(f"⚠️ ClickUp sync had errors: {result['errors']}")
+
+async def intelligence_cycle_job():
+    """Run complete intelligence cycle"""
+    if not await app.state.telegram_kill_switch.is_enabled(DEFAULT_USER_ID):
+        logger.info("🧠 Intelligence cycle skipped (kill switch disabled)")
+        return
+    
+    logger.info("🧠 Running intelligence cycle...")
+    
+    orchestrator = get_intelligence_orchestrator(
+        db_manager=db_manager,
+        telegram_service=app.state.telegram_notification_manager,
+        user_id=DEFAULT_USER_ID
+    )
+    
+    result = await orchestrator.run_intelligence_cycle()
+    
+    logger.info(f"✅ Intelligence cycle complete: {result['signals_collected']} signals, "
+              f"{result['situations_detected']} situations, "
+              f"{result['notifications_sent']} notifications sent")
+
+async def job_radar_scan_job():
+    """Run job radar scan"""
+    if not await app.state.telegram_kill_switch.is_enabled(DEFAULT_USER_ID):
+        logger.info("🔍 Job Radar scan skipped (kill switch disabled)")
+        return
+    
+    logger.info("🔍 Running Job Radar scan...")
+    
+    # Get Gmail client for email notifications
+    from modules.integrations.google_workspace.gmail_client import get_gmail_client
+    gmail = get_gmail_client(DEFAULT_USER_ID)
+    await gmail.initialize(DEFAULT_USER_ID)
+    
+    result = await run_job_scan(
+        telegram_service=app.state.telegram_notification_manager,
+    )
+    logger.info(
+        f"✅ Job Radar scan complete: "
+        f"{result.get('total_results', 0)} found, "
+        f"{result.get('ai_scored', 0)} scored, "
+        f"{result.get('high_matches', 0)} high matches"
+    )
+
+async def daily_intelligence_digest_job():
+    """Send daily intelligence digest (scheduled for 8 AM Eastern)"""
+    if not await app.state.telegram_kill_switch.is_enabled(DEFAULT_USER_ID):
+        logger.info("📊 Daily digest skipped (kill switch disabled)")
+        return
+    
+    logger.info("📊 Sending daily intelligence digest...")
+    
+    orchestrator = get_intelligence_orchestrator(
+        db_manager=db_manager,
+        user_id=DEFAULT_USER_ID
+    )
+    
+    await orchestrator.run_daily_digest()
+    logger.info("✅ Daily digest sent successfully")
+
+def register_background_jobs(scheduler):
+    """
+    Register the Telegram-dependent jobs (previously one while-loop task each).
+    Intervals, startup delays and error retries are unchanged from TASK_INTERVALS.
+    """
+    scheduler.add_job('session_cleanup', session_cleanup_job,
+                      interval=TASK_INTERVALS['session_cleanup'],
+                      start_delay=TASK_INTERVALS['session_cleanup'])
+    scheduler.add_job('weather_collection', weather_collection_job,
+                      interval=TASK_INTERVALS['weather_collection'],
+                      retry_after=TASK_INTERVALS['error_retry_short'])
+    scheduler.add_job('prayer_notification', prayer_notification_job,
+                      interval=TASK_INTERVALS['prayer_check'],
+                      retry_after=TASK_INTERVALS['error_retry'])
+    scheduler.add_job('reminder_notification', reminder_notification_job,
+                      interval=TASK_INTERVALS['reminder_check'], jitter=0)
+    scheduler.add_job('calendar_notification', calendar_notification_job,
+                      interval=TASK_INTERVALS['calendar_check'],
+                      retry_after=TASK_INTERVALS['error_retry'])
+    scheduler.add_job('weather_notification', weather_notification_job,
+                      interval=TASK_INTERVALS['weather_notification'],
+                      retry_after=TASK_INTERVALS['error_retry'])
+    scheduler.add_job('email_notification', email_notification_job,
+                      interval=TASK_INTERVALS['email_check'],
+                      retry_after=TASK_INTERVALS['error_retry'])
+    scheduler.add_job('clickup_notification', clickup_notification_job,
+                      interval=TASK_INTERVALS['clickup_check'],
+                      retry_after=TASK_INTERVALS['error_retry'])
+    scheduler.add_job('bluesky_notification', bluesky_notification_job,
+                      interval=TASK_INTERVALS['bluesky_notification'],
+                      retry_after=TASK_INTERVALS['error_retry'])
+    scheduler.add_job('trends_notification', trends_notification_job,
+                      interval=TASK_INTERVALS['trends_notification'],
+                      retry_after=TASK_INTERVALS['error_retry'])
+    scheduler.add_job('analytics_notification', analytics_notification_job,
+                      interval=TASK_INTERVALS['analytics_check'],
+                      retry_after=TASK_INTERVALS['error_retry'])
+    scheduler.add_job('content_approval_notification', content_approval_notification_job,
+                      interval=TASK_INTERVALS['content_approval'],
+                      start_delay=TASK_INTERVALS['content_approval'])
+    scheduler.add_job('trends_monitoring_cycle', trends_monitoring_cycle_job,
+                      interval=TASK_INTERVALS['trends_monitoring'],
+                      start_delay=TASK_INTERVALS['startup_delay_trends'],
+                      retry_after=TASK_INTERVALS['startup_delay_trends'])
+    scheduler.add_job('bluesky_scanning_cycle', bluesky_scanning_cycle_job,
+                      interval=TASK_INTERVALS['bluesky_scan'],
+                      start_delay=TASK_INTERVALS['startup_delay_bluesky'],
+                      retry_after=TASK_INTERVALS['startup_delay_trends'])
+    scheduler.add_job('clickup_sync_cycle', clickup_sync_cycle_job,
+                      interval=TASK_INTERVALS['clickup_sync'],
+                      start_delay=TASK_INTERVALS['startup_delay_clickup'],
+                      retry_after=TASK_INTERVALS['startup_delay_trends'])
+    scheduler.add_job('intelligence_cycle', intelligence_cycle_job,
+                      interval=TASK_INTERVALS['intelligence_cycle'],
+                      retry_after=TASK_INTERVALS['error_retry_short'])
+    scheduler.add_job('daily_intelligence_digest', daily_intelligence_digest_job,
+                      cron=DAILY_DIGEST_CRON, tz=DAILY_DIGEST_TIMEZONE)
+    scheduler.add_job('job_radar_scan', job_radar_scan_job,
+                      interval=TASK_INTERVALS['job_radar_scan'],
+                      start_delay=TASK_INTERVALS['startup_delay_job_radar'],
+                      retry_after=TASK_INTERVALS['error_retry_short'])
 
 #-- Section 13: Application Lifecycle Events - MERGED 12/09/25
 @app.on_event("startup")
@@ -697,6 +626,19 @@ async def startup_event():
     await db_manager.connect()
     print("✅ Database connected")
     
+    # Shared cache second tier (CACHE_L2_BACKEND) - needs the pool for postgres
+    await init_cache_backend()
+    
+    # Background job scheduler - jobs can be registered before or after start
+    await get_scheduler().start()
+    
+    # Session table + write-behind last_activity flush job (once, before any request)
+    await AuthManager.initialize()
+    
+    # Fathom search columns + transcript chunks: migrated and backfilled in the
+    # background (rewrites fathom_meetings once); search uses the old query meanwhile
+    await FathomDatabaseManager().ensure_search_schema()
+    
     # =========================================================================
     # PHASE 2: Telegram Notification System
     # =========================================================================
@@ -706,6 +648,9 @@ async def startup_event():
         telegram_kill_switch = KillSwitch()
         telegram_notification_manager = NotificationManager(telegram_bot, telegram_kill_switch)
         
+        # Rate counters seeded from the last 24h, batched log/iOS writes scheduled
+        await get_notification_pipeline().start()
+        
         # Initialize all notification handlers
         prayer_handler = PrayerNotificationHandler(telegram_notification_manager)
         reminder_handler = ReminderNotificationHandler(telegram_notification_manager)
@@ -738,27 +683,9 @@ async def startup_event():
         logger.info("✅ Telegram notification system initialized")
         
         # =====================================================================
-        # PHASE 3: Start Background Tasks
+        # PHASE 3: Register Background Jobs
         # =====================================================================
-        asyncio.create_task(session_cleanup_task())
-        asyncio.create_task(weather_collection_task())
-        asyncio.create_task(prayer_notification_task())
-        asyncio.create_task(reminder_notification_task())
-        asyncio.create_task(calendar_notification_task())
-        asyncio.create_task(weather_notification_task())
-        asyncio.create_task(email_notification_task())
-        asyncio.create_task(clickup_notification_task())
-        asyncio.create_task(bluesky_notification_task())
-        asyncio.create_task(trends_notification_task())
-        asyncio.create_task(analytics_notification_task())
-        asyncio.create_task(content_approval_notification_task())
-        asyncio.create_task(trends_monitoring_cycle_task())
-        asyncio.create_task(bluesky_scanning_cycle_task())
-        asyncio.create_task(clickup_sync_cycle_task())
-        asyncio.create_task(intelligence_cycle_task())
-        asyncio.create_task(daily_intelligence_digest_task())
-        asyncio.create_task(job_radar_scan_task())
-        logger.info("🔍 Job Radar background scan task scheduled")
+        register_background_jobs(get_scheduler())
         
         # Google Workspace background tasks (token refresh, email/analytics/calendar sync)
         await start_google_background_tasks()
@@ -983,6 +910,38 @@ async def shutdown_event():
     except Exception as e:
         logger.error(f"❌ Error stopping Google background tasks: {e}")
     
+    # Flush buffered notification logs / iOS rows and stop the Telegram send queue
+    try:
+        await get_notification_pipeline().stop()
+        logger.info("✅ Notification pipeline flushed")
+    except Exception as e:
+        logger.error(f"❌ Error stopping notification pipeline: {e}")
+    
+    # Stop the job scheduler (cancels runs in progress, releases their leases)
+    try:
+        await get_scheduler().stop()
+        logger.info("✅ Job scheduler stopped")
+    except Exception as e:
+        logger.error(f"❌ Error stopping job scheduler: {e}")
+    
+    # Stop the document extraction worker processes
+    try:
+        get_document_extractor().shutdown()
+    except Exception as e:
+        logger.error(f"❌ Error stopping document extraction pool: {e}")
+    
+    # Close the Bluesky client's shared HTTP session
+    try:
+        await get_bluesky_multi_client().close()
+    except Exception as e:
+        logger.error(f"❌ Error closing Bluesky client: {e}")
+    
+    # Write back pending session activity while the pool is still open
+    try:
+        await AuthManager.shutdown()
+    except Exception as e:
+        logger.error(f"❌ Error flushing session activity: {e}")
+    
     # Close database connection
     try:
         await db_manager.disconnect()
@@ -1001,6 +960,24 @@ async def health_check():
     """System health check endpoint"""
     return await get_health_status()
 
+@app.get("/api/scheduler/jobs")
+async def scheduler_jobs(session_token: str = Cookie(None)):
+    """Background job schedule, counters and duration/lag histograms (admin endpoint)"""
+    if not session_token:
+        raise HTTPException(status_code=401, detail="Not authenticated")
+    
+    user = await AuthManager.validate_session(session_token)
+    if not user:
+        raise HTTPException(status_code=401, detail="Invalid session")
+    
+    scheduler = get_scheduler()
+    status = scheduler.get_status()
+    try:
+        status['shared_state'] = await scheduler.get_shared_state()
+    except Exception as e:
+        status['shared_state_error'] = str(e)
+    return status
+
 @app.get("/api/health/voice")
 async def voice_health():
     """Voice Synthesis integration health check"""
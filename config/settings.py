@@ -16,6 +16,10 @@ class Settings:
         self.debug: bool = self._get_optional("DEBUG", "false").lower() == "true"
         self.log_level: str = self._get_optional("LOG_LEVEL", "INFO")
         
+        # Shared cache second tier: none | postgres | file (see modules/core/cache.py)
+        self.cache_l2_backend: str = self._get_optional("CACHE_L2_BACKEND", "none").lower()
+        self.cache_l2_path: str = self._get_optional("CACHE_L2_PATH", "/tmp/syntaxprime_cache")
+        
     def _get_required(self, key: str) -> str:
         """Get required environment variable or raise error."""
         value = os.getenv(key)
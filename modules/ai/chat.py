@@ -5,6 +5,10 @@
 # Date: 9/26/25 - Converted to helper module only
 # Date: 9/27/25 - Added Google Trends integration and Prayer Notifications
 # Date: 9/28/25 - Added Voice Synthesis and Image Generation detection
+# Date: 10/16/26 - Upload parsing moved to modules/core/document_extractor.py (process pool,
+#                  per-job timeouts, content-hash cache); analyze_*_file helpers moved with it
+# Date: 10/16/26 - search_meetings uses the Fathom full-text indexes and shows the matching
+#                  transcript segments (with timestamps) instead of whole transcripts
 
 #-- Section 1: Core Imports - 9/26/25
 import os
@@ -16,30 +20,16 @@ import pytz
 from typing import Dict, List, Any, Optional
 from pathlib import Path
 import logging
-import warnings
 import httpx
 
 # File processing imports
-from PIL import Image, ImageOps
-import pdfplumber
-import pandas as pd
+# PDF / Word / Excel / CSV / Python parsing lives in the document extraction pool - 2026-10-16
 import magic
 import cv2
 import numpy as np
 from io import BytesIO
 import base64
-
-# Word document processing
-from docx import Document
-
-# Excel file processing
-import openpyxl
-from openpyxl.utils import get_column_letter
-
-# Python file processing
-import ast
-import tokenize
-from io import StringIO
+from ..core.document_extractor import get_document_extractor
 
 # Add to the existing imports section:
 from .pattern_fatigue import get_pattern_fatigue_tracker, handle_duplicate_complaint, handle_time_joke_complaint
@@ -50,9 +40,6 @@ from ..integrations.google_trends.opportunity_training import OpportunityTrainin
 from ..integrations.google_trends.integration_info import check_module_health
 
 logger = logging.getLogger(__name__)
-# Suppress PDF font parsing warnings (Issue 5E fix)
-warnings.filterwarnings('ignore', message='.*FontBBox.*')
-warnings.filterwarnings('ignore', category=UserWarning, module='pdfminer')
 
 # File upload configuration
 UPLOAD_DIR = Path("/home/app/uploads/chat_files")
@@ -125,6 +112,14 @@ def convert_utc_to_user_timezone(dt: datetime) -> datetime:
     return dt.astimezone(user_tz)
 
 #-- Section 3: Weather Integration Functions - 9/26/25
+WEATHER_KEYWORDS = [
+    "weather", "temperature", "forecast", "rain", "snow", "sunny",
+    "cloudy", "storm", "wind", "humidity", "barometric pressure",
+    "headache weather", "pressure change", "uv index"
+]
+
+WEATHER_FORECAST_KEYWORDS = ["forecast", "tomorrow", "next", "upcoming", "week", "days"]
+
 def detect_weather_request(message: str) -> tuple[bool, str]:
     """Detect weather-related requests
     
@@ -133,22 +128,16 @@ def detect_weather_request(message: str) -> tuple[bool, str]:
         request_type: 'current' or 'forecast'
     
     """
-    weather_keywords = [
-        "weather", "temperature", "forecast", "rain", "snow", "sunny",
-        "cloudy", "storm", "wind", "humidity", "barometric pressure",
-        "headache weather", "pressure change", "uv index"
-    ]
     message_lower = message.lower()
     
     # Check if it's a weather request
-    is_weather = any(keyword in message_lower for keyword in weather_keywords)
+    is_weather = any(keyword in message_lower for keyword in WEATHER_KEYWORDS)
     
     if not is_weather:
         return (False, None)
     
     # Determine if it's a forecast request
-    forecast_keywords = ["forecast", "tomorrow", "next", "upcoming", "week", "days"]
-    is_forecast = any(keyword in message_lower for keyword in forecast_keywords)
+    is_forecast = any(keyword in message_lower for keyword in WEATHER_FORECAST_KEYWORDS)
     
     request_type = 'forecast' if is_forecast else 'current'
     
@@ -419,6 +408,11 @@ def detect_bluesky_post_command(message: str) -> Tuple[bool, str, Optional[str],
     
     return False, '', None, None
 
+BLUESKY_KEYWORDS = [
+    "bluesky scan", "bluesky opportunities", "bluesky accounts",
+    "bluesky health", "bluesky status", "bluesky", "social media opportunities"
+]
+
 def detect_bluesky_command(message: str) -> bool:
     """Detect ALL Bluesky commands including V1-style posting"""
     
@@ -428,22 +422,19 @@ def detect_bluesky_command(message: str) -> bool:
         return True
     
     # Original detection for management commands
-    bluesky_keywords = [
-        "bluesky scan", "bluesky opportunities", "bluesky accounts",
-        "bluesky health", "bluesky status", "bluesky", "social media opportunities"
-    ]
     message_lower = message.lower()
-    return any(keyword in message_lower for keyword in bluesky_keywords)
+    return any(keyword in message_lower for keyword in BLUESKY_KEYWORDS)
+
+BLUESKY_APPROVAL_KEYWORDS = [
+    "post it", "send it", "post that", "send that",
+    "yes post", "approve", "looks good",
+    "post the reply", "send the reply"
+]
 
 def detect_bluesky_reply_approval(message: str) -> bool:
     """Detect when user approves a Bluesky reply draft"""
-    approval_keywords = [
-        "post it", "send it", "post that", "send that",
-        "yes post", "approve", "looks good",
-        "post the reply", "send the reply"
-    ]
     message_lower = message.lower().strip()
-    return any(keyword in message_lower for keyword in approval_keywords)
+    return any(keyword in message_lower for keyword in BLUESKY_APPROVAL_KEYWORDS)
 
 async def post_bluesky_reply_from_thread(
     reply_text: str,
@@ -805,7 +796,9 @@ async def trigger_background_scan(user_id: str):
         approval_system = get_approval_system()
         
         await multi_client.authenticate_all_accounts()
-        timelines = await multi_client.get_all_timelines()
+        # Latest page, not new_only: this on-demand scan only looks at the first
+        # 20 posts and must not move the scheduled scan's timeline watermark
+        timelines = await multi_client.get_all_timelines(new_only=False)
         
         all_opportunities = []
         for account_id, timeline in timelines.items():
@@ -831,16 +824,17 @@ async def trigger_background_scan(user_id: str):
         logger.error(f"Background scan failed: {e}")
 
 #-- Section 5: RSS Learning Functions - 9/26/25
+RSS_KEYWORDS = [
+    "marketing trends", "content ideas", "writing inspiration", "blog ideas",
+    "social media trends", "seo trends", "marketing insights", "campaign ideas",
+    "content strategy", "latest marketing", "marketing news",
+    "industry trends", "rss insights", "marketing research", "content research", "writing help"
+]
+
 def detect_rss_command(message: str) -> bool:
     """Detect if user is asking for RSS/marketing insights"""
-    rss_keywords = [
-        "marketing trends", "content ideas", "writing inspiration", "blog ideas",
-        "social media trends", "seo trends", "marketing insights", "campaign ideas",
-        "content strategy", "latest marketing", "marketing news",
-        "industry trends", "rss insights", "marketing research", "content research", "writing help"
-    ]
     message_lower = message.lower()
-    return any(keyword in message_lower for keyword in rss_keywords)
+    return any(keyword in message_lower for keyword in RSS_KEYWORDS)
 
 def detect_writing_assistance_request(message: str) -> tuple[bool, str]:
     """Detect writing assistance requests and determine content type"""
@@ -958,15 +952,16 @@ async def get_rss_marketing_context(message: str, content_type: str = None) -> s
         return "RSS_CONTEXT_ERROR: Unable to retrieve current marketing insights. Proceed with general knowledge."
 
 #-- Section 6: Marketing Scraper Functions - 9/26/25
+SCRAPER_KEYWORDS = [
+    "scrape", "scraper", "analyze website", "competitor analysis", "scrape url",
+    "scrape site", "website analysis", "marketing analysis", "content analysis",
+    "scrape history", "scrape insights", "scrape data"
+]
+
 def detect_scraper_command(message: str) -> bool:
     """Detect marketing scraper commands"""
-    scraper_keywords = [
-        "scrape", "scraper", "analyze website", "competitor analysis", "scrape url",
-        "scrape site", "website analysis", "marketing analysis", "content analysis",
-        "scrape history", "scrape insights", "scrape data"
-    ]
     message_lower = message.lower()
-    return any(keyword in message_lower for keyword in scraper_keywords)
+    return any(keyword in message_lower for keyword in SCRAPER_KEYWORDS)
 
 def extract_url_from_message(message: str) -> str:
     """Extract URL from scrape command message"""
@@ -1179,15 +1174,16 @@ Please try again or contact support if the issue persists."""
         return f"❌ **Scraper Command Error:** {str(e)}\n\nTry `scrape https://example.com` to analyze a website."
 
 #-- Section 7: Prayer Times Functions - 9/26/25 (Updated 9/27/25)
+PRAYER_KEYWORDS = [
+    "prayer", "prayers", "salah", "namaz", "fajr", "dhuhr", "asr", "maghrib", "isha",
+    "prayer time", "prayer times", "next prayer", "when is prayer", "how long until",
+    "how long till", "time until prayer", "prayer schedule", "islamic time", "islamic date"
+]
+
 def detect_prayer_command(message: str) -> bool:
     """Detect prayer-related requests"""
-    prayer_keywords = [
-        "prayer", "prayers", "salah", "namaz", "fajr", "dhuhr", "asr", "maghrib", "isha",
-        "prayer time", "prayer times", "next prayer", "when is prayer", "how long until",
-        "how long till", "time until prayer", "prayer schedule", "islamic time", "islamic date"
-    ]
     message_lower = message.lower()
-    return any(keyword in message_lower for keyword in prayer_keywords)
+    return any(keyword in message_lower for keyword in PRAYER_KEYWORDS)
 
 def detect_prayer_question_type(message: str) -> str:
     """Determine what type of prayer question the user is asking"""
@@ -1357,6 +1353,7 @@ async def process_uploaded_files(files) -> List[Dict]:
     from fastapi import UploadFile
     
     processed_files = []
+    contents = []
     
     # Ensure upload directory exists
     ensure_upload_dir()
@@ -1376,25 +1373,30 @@ async def process_uploaded_files(files) -> List[Dict]:
         file_id = str(uuid.uuid4())
         file_path = UPLOAD_DIR / f"{file_id}_{file.filename}"
         
-        with open(file_path, "wb") as f:
-            f.write(content)
+        await asyncio.to_thread(file_path.write_bytes, content)
         
-        file_info = {
+        processed_files.append({
             'file_id': file_id,
             'filename': file.filename,
             'file_type': file_ext,
             'file_size': len(content),
-            'file_path': str(file_path),
-            'analysis': await analyze_file_content(file_path, file_ext)
-        }
-        
-        processed_files.append(file_info)
+            'file_path': str(file_path)
+        })
+        contents.append(content)
         await file.seek(0)
     
+    # Files are parsed in parallel, bounded by the extraction pool
+    analyses = await asyncio.gather(*[
+        analyze_file_content(Path(file_info['file_path']), file_info['file_type'], content)
+        for file_info, content in zip(processed_files, contents)
+    ])
+    for file_info, analysis in zip(processed_files, analyses):
+        file_info['analysis'] = analysis
+    
     return processed_files
 
-async def analyze_file_content(file_path: Path, file_type: str) -> Dict:
-    """Analyze file content and extract information"""
+async def analyze_file_content(file_path: Path, file_type: str, content: Optional[bytes] = None) -> Dict:
+    """Analyze file content and extract information (parsed in the document extraction pool)"""
     analysis = {
         'type': 'unknown',
         'description': '',
@@ -1404,23 +1406,9 @@ async def analyze_file_content(file_path: Path, file_type: str) -> Dict:
     }
     
     try:
-        if file_type in ['.png', '.jpg', '.jpeg', '.gif']:
-            analysis.update(await analyze_image_file(file_path))
-        elif file_type == '.pdf':
-            analysis.update(await analyze_pdf_file(file_path))
-        elif file_type in ['.txt', '.md']:
-            analysis.update(await analyze_text_file(file_path))
-        elif file_type == '.csv':
-            analysis.update(await analyze_csv_file(file_path))
-        elif file_type in ['.doc', '.docx']:
-            analysis.update(await analyze_docx_file(file_path))
-        elif file_type in ['.xls', '.xlsx']:
-            analysis.update(await analyze_excel_file(file_path))
-        elif file_type == '.py':
-            analysis.update(await analyze_python_file(file_path))
-        else:
-            analysis['description'] = f"Unsupported file type: {file_type}"
-            
+        if content is None:
+            content = await asyncio.to_thread(file_path.read_bytes)
+        analysis.update(await get_document_extractor().analyze(content, file_type, path=str(file_path)))
     except Exception as e:
         logger.error(f"File analysis failed for {file_path}: {e}")
         analysis['description'] = f"Analysis failed: {str(e)}"
@@ -1428,266 +1416,17 @@ async def analyze_file_content(file_path: Path, file_type: str) -> Dict:
     
     return analysis
 
-async def analyze_image_file(file_path: Path) -> Dict:
-    """Analyze image file"""
-    try:
-        with Image.open(file_path) as img:
-            width, height = img.size
-            format_name = img.format
-            mode = img.mode
-            
-        return {
-            'type': 'image',
-            'description': f'{format_name} image ({width}x{height}, {mode})',
-            'metadata': {
-                'width': width,
-                'height': height,
-                'format': format_name,
-                'mode': mode
-            },
-            'extracted_text': f"Image file: {width}x{height} {format_name}"
-        }
-    except Exception as e:
-        return {
-            'type': 'image',
-            'description': f'Image analysis failed: {e}',
-            'extracted_text': ''
-        }
-
-async def analyze_pdf_file(file_path: Path) -> Dict:
-    """Analyze PDF file"""
-    try:
-        text_content = ""
-        page_count = 0
-        
-        with pdfplumber.open(file_path) as pdf:
-            page_count = len(pdf.pages)
-            for page in pdf.pages[:5]:  # First 5 pages
-                if page.extract_text():
-                    text_content += page.extract_text() + "\n"
-        
-        return {
-            'type': 'pdf',
-            'description': f'PDF document with {page_count} pages',
-            'extracted_text': text_content[:2000],  # First 2000 chars
-            'metadata': {'page_count': page_count}
-        }
-    except Exception as e:
-        return {
-            'type': 'pdf',
-            'description': f'PDF analysis failed: {e}',
-            'extracted_text': ''
-        }
-
-async def analyze_text_file(file_path: Path) -> Dict:
-    """Analyze text file"""
-    try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-        
-        line_count = len(content.splitlines())
-        word_count = len(content.split())
-        
-        return {
-            'type': 'text',
-            'description': f'Text file ({line_count} lines, {word_count} words)',
-            'extracted_text': content[:2000],  # First 2000 chars
-            'metadata': {'line_count': line_count, 'word_count': word_count}
-        }
-    except Exception as e:
-        return {
-            'type': 'text',
-            'description': f'Text analysis failed: {e}',
-            'extracted_text': ''
-        }
-
-async def analyze_csv_file(file_path: Path) -> Dict:
-    """Analyze CSV file"""
-    try:
-        df = pd.read_csv(file_path)
-        rows, cols = df.shape
-        columns = df.columns.tolist()
-        
-        preview = df.head().to_string()
-        
-        return {
-            'type': 'csv',
-            'description': f'CSV file ({rows} rows, {cols} columns)',
-            'extracted_text': f"CSV Preview:\n{preview}",
-            'metadata': {'rows': rows, 'columns': cols, 'column_names': columns}
-        }
-    except Exception as e:
-        return {
-            'type': 'csv',
-            'description': f'CSV analysis failed: {e}',
-            'extracted_text': ''
-        }
-        
-async def analyze_docx_file(file_path: Path) -> Dict:
-    """Analyze Word document file (.docx)"""
-    try:
-        doc = Document(file_path)
-        
-        # Extract text content
-        text_content = ""
-        for paragraph in doc.paragraphs:
-            text_content += paragraph.text + "\n"
-        
-        # Count paragraphs, tables, images
-        paragraph_count = len(doc.paragraphs)
-        table_count = len(doc.tables)
-        
-        # Extract table data
-        table_text = ""
-        for table in doc.tables[:3]:  # First 3 tables
-            for row in table.rows:
-                for cell in row.cells:
-                    table_text += cell.text + " | "
-                table_text += "\n"
-        
-        word_count = len(text_content.split())
-        
-        return {
-            'type': 'document',
-            'description': f'Word document with {paragraph_count} paragraphs, {table_count} tables, {word_count} words',
-            'extracted_text': (text_content + "\n\n" + table_text)[:3000],  # First 3000 chars
-            'metadata': {
-                'paragraph_count': paragraph_count,
-                'table_count': table_count,
-                'word_count': word_count
-            }
-        }
-    except Exception as e:
-        logger.error(f"Word document analysis failed: {e}")
-        return {
-            'type': 'document',
-            'description': f'Word document analysis failed: {e}',
-            'extracted_text': ''
-        }
-        
-async def analyze_excel_file(file_path: Path) -> Dict:
-    """Analyze Excel file (.xlsx, .xls)"""
-    try:
-        # Load workbook
-        workbook = openpyxl.load_workbook(file_path, data_only=True)
-        
-        sheet_names = workbook.sheetnames
-        sheet_count = len(sheet_names)
-        
-        # Analyze first sheet
-        first_sheet = workbook.active
-        row_count = first_sheet.max_row
-        col_count = first_sheet.max_column
-        
-        # Extract sample data (first 10 rows)
-        extracted_text = f"Sheet: {first_sheet.title}\n\n"
-        for row_idx, row in enumerate(first_sheet.iter_rows(max_row=10, values_only=True), 1):
-            row_data = [str(cell) if cell is not None else '' for cell in row]
-            extracted_text += " | ".join(row_data) + "\n"
-            if row_idx >= 10:
-                break
-        
-        # Get all sheet summaries
-        sheet_summaries = []
-        for sheet_name in sheet_names[:5]:  # First 5 sheets
-            sheet = workbook[sheet_name]
-            sheet_summaries.append(f"{sheet_name}: {sheet.max_row} rows × {sheet.max_column} cols")
-        
-        return {
-            'type': 'spreadsheet',
-            'description': f'Excel file with {sheet_count} sheets, {row_count} rows × {col_count} columns in active sheet',
-            'extracted_text': extracted_text[:3000],
-            'metadata': {
-                'sheet_count': sheet_count,
-                'sheet_names': sheet_names[:10],  # First 10 sheet names
-                'active_sheet': first_sheet.title,
-                'row_count': row_count,
-                'column_count': col_count,
-                'sheet_summaries': sheet_summaries
-            }
-        }
-    except Exception as e:
-        logger.error(f"Excel file analysis failed: {e}")
-        return {
-            'type': 'spreadsheet',
-            'description': f'Excel analysis failed: {e}',
-            'extracted_text': ''
-        }
-        
-async def analyze_python_file(file_path: Path) -> Dict:
-    """Analyze Python source code file"""
-    try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            source_code = f.read()
-        
-        # Parse AST for code analysis
-        try:
-            tree = ast.parse(source_code)
-            
-            # Count different code elements
-            functions = [node.name for node in ast.walk(tree) if isinstance(node, ast.FunctionDef)]
-            classes = [node.name for node in ast.walk(tree) if isinstance(node, ast.ClassDef)]
-            imports = []
-            
-            for node in ast.walk(tree):
-                if isinstance(node, ast.Import):
-                    imports.extend([alias.name for alias in node.names])
-                elif isinstance(node, ast.ImportFrom):
-                    if node.module:
-                        imports.append(node.module)
-            
-            function_count = len(functions)
-            class_count = len(classes)
-            import_count = len(set(imports))
-            
-        except SyntaxError:
-            function_count = class_count = import_count = 0
-            functions = classes = imports = []
-        
-        # Count lines
-        lines = source_code.splitlines()
-        line_count = len(lines)
-        code_lines = [line for line in lines if line.strip() and not line.strip().startswith('#')]
-        comment_lines = [line for line in lines if line.strip().startswith('#')]
-        
-        # Extract docstrings and top comments
-        extracted_text = source_code[:2000]  # First 2000 chars
-        
-        return {
-            'type': 'code',
-            'description': f'Python file with {function_count} functions, {class_count} classes, {line_count} lines',
-            'extracted_text': extracted_text,
-            'metadata': {
-                'language': 'python',
-                'line_count': line_count,
-                'code_lines': len(code_lines),
-                'comment_lines': len(comment_lines),
-                'function_count': function_count,
-                'class_count': class_count,
-                'import_count': import_count,
-                'functions': functions[:10],  # First 10 function names
-                'classes': classes[:10],  # First 10 class names
-                'imports': list(set(imports))[:15]  # First 15 unique imports
-            }
-        }
-    except Exception as e:
-        logger.error(f"Python file analysis failed: {e}")
-        return {
-            'type': 'code',
-            'description': f'Python file analysis failed: {e}',
-            'extracted_text': ''
-        }
-
 #-- Section 9: Voice Synthesis Functions - 9/28/25
+VOICE_KEYWORDS = [
+    "voice synthesize", "voice generate", "say this", "speak this",
+    "voice this", "read this", "voice history", "voice personalities",
+    "text to speech", "tts", "synthesize voice", "generate audio"
+]
+
 def detect_voice_command(message: str) -> bool:
     """Detect voice synthesis commands"""
-    voice_keywords = [
-        "voice synthesize", "voice generate", "say this", "speak this",
-        "voice this", "read this", "voice history", "voice personalities",
-        "text to speech", "tts", "synthesize voice", "generate audio"
-    ]
     message_lower = message.lower()
-    return any(keyword in message_lower for keyword in voice_keywords)
+    return any(keyword in message_lower for keyword in VOICE_KEYWORDS)
 
 def extract_text_for_voice(message: str) -> str:
     """Extract text to synthesize from voice command"""
@@ -1854,16 +1593,17 @@ The audio has been generated and cached for playback. Use the audio URL in your
         return f"❌ **Voice Synthesis Error:** {str(e)}\n\nTry `voice synthesize hello world` to test the system."
 
 #-- Section 10: Image Generation Functions - 9/28/25
+IMAGE_KEYWORDS = [
+    "image create", "image generate", "generate image", "create image",
+    "image blog", "image social", "image marketing", "image history",
+    "image download", "make image", "draw image", "picture of",
+    "visualize this", "show me", "image style", "mockup"
+]
+
 def detect_image_command(message: str) -> bool:
     """Detect image generation commands"""
-    image_keywords = [
-        "image create", "image generate", "generate image", "create image",
-        "image blog", "image social", "image marketing", "image history",
-        "image download", "make image", "draw image", "picture of",
-        "visualize this", "show me", "image style", "mockup"
-    ]
     message_lower = message.lower()
-    return any(keyword in message_lower for keyword in image_keywords)
+    return any(keyword in message_lower for keyword in IMAGE_KEYWORDS)
 
 def extract_image_prompt(message: str) -> tuple[str, str]:
     """Extract image prompt and content type from command"""
@@ -2024,18 +1764,18 @@ Your visual idea has been brought to life! 🌟"""
         return f"❌ **Image Generation Error:** {str(e)}\n\nTry `image create blue circle` to test the system."
 
 #-- Section 11: Google Trends Integration Functions - 9/27/25
+TRENDS_KEYWORDS = [
+    'trends', 'trending', 'google trends', 'opportunities',
+    'good match', 'bad match', 'train trends', 'trends status',
+    'trends health', 'trend opportunities', 'trends scan'
+]
+
 def detect_trends_command(message: str) -> tuple[bool, str]:
     """Detect Google Trends commands and determine command type"""
-    trends_keywords = [
-        'trends', 'trending', 'google trends', 'opportunities',
-        'good match', 'bad match', 'train trends', 'trends status',
-        'trends health', 'trend opportunities', 'trends scan'
-    ]
-    
     message_lower = message.lower()
     
     # Check if it's a trends-related command
-    is_trends_command = any(keyword in message_lower for keyword in trends_keywords)
+    is_trends_command = any(keyword in message_lower for keyword in TRENDS_KEYWORDS)
     
     if not is_trends_command:
         return False, ''
@@ -2259,15 +1999,16 @@ Ready to discover your next trending opportunity?"""
         return f"❌ **Trends System Error:** {str(e)}\n\nTry `trends status` to check system health."
 
 #-- Section 12: Prayer Notification Functions - 9/27/25
+PRAYER_NOTIFICATION_KEYWORDS = [
+    "prayer notifications", "prayer alerts", "prayer reminder",
+    "notification status", "notification test", "prayer service",
+    "disable prayer", "enable prayer", "prayer settings"
+]
+
 def detect_prayer_notification_command(message: str) -> bool:
     """Detect prayer notification management commands"""
-    notification_keywords = [
-        "prayer notifications", "prayer alerts", "prayer reminder",
-        "notification status", "notification test", "prayer service",
-        "disable prayer", "enable prayer", "prayer settings"
-    ]
     message_lower = message.lower()
-    return any(keyword in message_lower for keyword in notification_keywords)
+    return any(keyword in message_lower for keyword in PRAYER_NOTIFICATION_KEYWORDS)
 
 async def process_prayer_notification_command(message: str, user_id: str, ip_address: str = None, gps_latitude: float = None, gps_longitude: float = None) -> str:
     """Process prayer notification management commands
@@ -2340,15 +2081,16 @@ The service runs automatically in the background."""
         logger.error(f"Prayer notification command processing failed: {e}")
         return f"❌ **Prayer Notification Error:** {str(e)}\n\nTry `prayer notifications status` to check the system."
 
+LOCATION_KEYWORDS = [
+    "my location", "where am i", "current location", "detect location",
+    "prayer location", "location for prayers", "change location",
+    "location settings", "ip location", "auto location"
+]
+
 def detect_location_command(message: str) -> bool:
     """Detect location-related commands"""
-    location_keywords = [
-        "my location", "where am i", "current location", "detect location",
-        "prayer location", "location for prayers", "change location",
-        "location settings", "ip location", "auto location"
-    ]
     message_lower = message.lower()
-    return any(keyword in message_lower for keyword in location_keywords)
+    return any(keyword in message_lower for keyword in LOCATION_KEYWORDS)
 
 async def process_location_command(message: str, user_id: str, ip_address: str = None, gps_latitude: float = None, gps_longitude: float = None) -> str:
     """Process location detection and management commands
@@ -2478,6 +2220,16 @@ async def get_or_create_system_thread(memory_manager) -> str:
         raise
 
 #-- Section 12.5: Intelligence System Commands - 10/22/25
+INTELLIGENCE_KEYWORDS = [
+    "intelligence status", "intelligence system",
+    "active situations", "situations",
+    "what did you notice", "what have you noticed",
+    "context check", "check context",
+    "run intelligence", "intelligence cycle",
+    "daily digest", "intelligence digest",
+    "intelligence report"
+]
+
 def detect_intelligence_command(message: str) -> bool:
     """
     Detect if user is asking about the intelligence system
@@ -2489,18 +2241,8 @@ def detect_intelligence_command(message: str) -> bool:
     - "daily digest"
     - "situations"
     """
-    intelligence_keywords = [
-        "intelligence status", "intelligence system",
-        "active situations", "situations",
-        "what did you notice", "what have you noticed",
-        "context check", "check context",
-        "run intelligence", "intelligence cycle",
-        "daily digest", "intelligence digest",
-        "intelligence report"
-    ]
-    
     message_lower = message.lower()
-    return any(keyword in message_lower for keyword in intelligence_keywords)
+    return any(keyword in message_lower for keyword in INTELLIGENCE_KEYWORDS)
 
 
 async def handle_intelligence_command(message: str, user_id: str) -> str:
@@ -2810,18 +2552,19 @@ def check_module_health() -> Dict[str, Any]:
         "note": "This is a helper module - endpoints are handled by router.py"
     }
 #-- Section 13: Pattern Fatigue Detection Functions 9/29/25
+PATTERN_DUPLICATE_TRIGGERS = ["stop mentioning duplicate", "ignore duplicate", "stop pointing out double", "enough with the double", "stop saying twice", "stop being annoying", "quit that", "enough", "stop that"]
+
+PATTERN_TIME_JOKE_TRIGGERS = ["stop with the 2am", "enough 2am jokes", "quit asking about 2am", "stop time jokes", "no more 2am"]
+
 def detect_pattern_complaint(message: str) -> tuple[bool, str, str]:
     """Detect if user is complaining about repetitive patterns"""
     message_lower = message.lower()
     
-    duplicate_triggers = ["stop mentioning duplicate", "ignore duplicate", "stop pointing out double", "enough with the double", "stop saying twice", "stop being annoying", "quit that", "enough", "stop that"]
-    time_joke_triggers = ["stop with the 2am", "enough 2am jokes", "quit asking about 2am", "stop time jokes", "no more 2am"]
-    
-    for trigger in duplicate_triggers:
+    for trigger in PATTERN_DUPLICATE_TRIGGERS:
         if trigger in message_lower:
             return True, "duplicate_callouts", message
     
-    for trigger in time_joke_triggers:
+    for trigger in PATTERN_TIME_JOKE_TRIGGERS:
         if trigger in message_lower:
             return True, "2am_jokes", message
     
@@ -2849,21 +2592,21 @@ def detect_pattern_fatigue_command(message: str) -> bool:
 #-- Section 14: Google Workspace Integration Functions - 9/30/25
 #-- Section 14: Google Workspace Integration Functions updated for web autho - 10/1/25
 #-- Section 14: Google Workspace Integration Functions - OAuth web flow + Keywords/Analytics handlers
+GOOGLE_KEYWORDS = [
+    'google auth', 'google status', 'google sites', 'google accounts',
+    'google keywords', 'google analytics', 'google drive', 'google email',
+    'google gmail', 'google calendar', 'google suggest', 'google patterns',
+    'google predict', 'google intelligence', 'google optimal',
+    'copy to drive', 'save to google doc', 'move to drive',  # ← Already added
+    'copy that to drive', 'save that to drive',  # ← ADD THESE
+]
+
 def detect_google_command(message: str) -> tuple[bool, str]:
     """Detect Google Workspace commands and determine command type"""
-    google_keywords = [
-            'google auth', 'google status', 'google sites', 'google accounts',
-            'google keywords', 'google analytics', 'google drive', 'google email',
-            'google gmail', 'google calendar', 'google suggest', 'google patterns',
-            'google predict', 'google intelligence', 'google optimal',
-            'copy to drive', 'save to google doc', 'move to drive',  # ← Already added
-            'copy that to drive', 'save that to drive',  # ← ADD THESE
-    ]
-    
     message_lower = message.lower()
     
     # Check if it's a Google command
-    is_google_command = any(keyword in message_lower for keyword in google_keywords)
+    is_google_command = any(keyword in message_lower for keyword in GOOGLE_KEYWORDS)
     
     if not is_google_command:
         return False, ''
@@ -4023,6 +3766,29 @@ You can copy this and create the draft manually in Gmail."""
         return f"Error creating draft: {str(e)}"
 
 #-- Section 15: Reminder Functions - 10/16/25
+REMINDER_KILL_PHRASES = [
+    "cancel all reminders",
+    "delete all reminders",
+    "kill all reminders",
+    "stop all reminders",
+    "remove all reminders",
+    "clear all reminders",
+    "kill reminders"
+]
+
+REMINDER_CANCEL_KEYWORDS = ["cancel reminder", "delete reminder", "remove reminder"]
+
+REMINDER_LIST_KEYWORDS = [
+    "list reminders", "show reminders", "my reminders",
+    "list my reminders", "show my reminders",
+    "what reminders", "view reminders"
+]
+
+REMINDER_CREATE_KEYWORDS = [
+    "remind", "reminder", "remind me", "set reminder",
+    "create reminder", "make reminder"
+]
+
 def detect_reminder_command(message: str) -> Optional[str]:
     """
     Detect reminder-related commands
@@ -4037,38 +3803,19 @@ def detect_reminder_command(message: str) -> Optional[str]:
     message_lower = message.lower()
     
     # KILL SWITCH - Check this FIRST (most important!)
-    kill_phrases = [
-        "cancel all reminders",
-        "delete all reminders",
-        "kill all reminders",
-        "stop all reminders",
-        "remove all reminders",
-        "clear all reminders",
-        "kill reminders"
-    ]
-    if any(phrase in message_lower for phrase in kill_phrases):
+    if any(phrase in message_lower for phrase in REMINDER_KILL_PHRASES):
         return 'cancel_all'
     
     # Cancel specific reminder
-    cancel_keywords = ["cancel reminder", "delete reminder", "remove reminder"]
-    if any(keyword in message_lower for keyword in cancel_keywords):
+    if any(keyword in message_lower for keyword in REMINDER_CANCEL_KEYWORDS):
         return 'cancel_one'
     
     # List reminders
-    list_keywords = [
-        "list reminders", "show reminders", "my reminders",
-        "list my reminders", "show my reminders",
-        "what reminders", "view reminders"
-    ]
-    if any(keyword in message_lower for keyword in list_keywords):
+    if any(keyword in message_lower for keyword in REMINDER_LIST_KEYWORDS):
         return 'list'
     
     # Create reminder (default if contains remind keywords)
-    create_keywords = [
-        "remind", "reminder", "remind me", "set reminder",
-        "create reminder", "make reminder"
-    ]
-    if any(keyword in message_lower for keyword in create_keywords):
+    if any(keyword in message_lower for keyword in REMINDER_CREATE_KEYWORDS):
         return 'create'
     
     return None
@@ -4332,18 +4079,19 @@ Use `list reminders` to see your pending reminders.
         return f"❌ **Error:** {str(e)}"
 
 #-- Section 15.5: Meeting Display Functions - 10/31/25
+SHOW_MEETINGS_PATTERNS = [
+    'show recent meetings',
+    'show meetings',
+    'list recent meetings',
+    'list meetings',
+    'recent meetings',
+    'my recent meetings'
+]
+
 def detect_show_meetings_command(message: str) -> bool:
     """Detect explicit 'show recent meetings' command"""
     message_lower = message.lower().strip()
-    show_patterns = [
-        'show recent meetings',
-        'show meetings',
-        'list recent meetings',
-        'list meetings',
-        'recent meetings',
-        'my recent meetings'
-    ]
-    return any(pattern in message_lower for pattern in show_patterns)
+    return any(pattern in message_lower for pattern in SHOW_MEETINGS_PATTERNS)
 
 async def format_recent_meetings_response(user_id: str, days: int = 14, limit: int = 10) -> str:
     """
@@ -4435,6 +4183,25 @@ No meetings found in the last {days} days."""
         return f"❌ Error retrieving meetings: {str(e)}"
 
 #-- Section 16: Fathom Meeting Integration Functions - 10/19/25
+# Expanded keywords for better detection
+MEETING_KEYWORDS = [
+    "meeting", "meetings", "discussed", "talked about",
+    "action item", "action items", "follow up", "follow-up",
+    "what did we decide", "what was decided", "meeting notes",
+    "decompress", "debrief", "recap", "call", "calls",
+    "conversation", "session", "discussion", "chat with",
+    "spoke with", "talked with", "mentioned", "said in",
+    "brought up", "covered", "went over", "reviewed"
+]
+
+# Temporal indicators that suggest meeting context
+MEETING_TEMPORAL_KEYWORDS = [
+    "yesterday", "today", "last week", "this week",
+    "last month", "monday", "tuesday", "wednesday",
+    "thursday", "friday", "saturday", "sunday",
+    "morning", "afternoon", "ago", "recent"
+]
+
 def detect_meeting_query(message: str) -> tuple[bool, str]:
     """
     Detect meeting-related queries with improved sensitivity
@@ -4443,25 +4210,6 @@ def detect_meeting_query(message: str) -> tuple[bool, str]:
         tuple: (is_meeting_query, query_type)
         query_type: 'specific', 'recent', 'search', 'action_items'
     """
-    # Expanded keywords for better detection
-    meeting_keywords = [
-        "meeting", "meetings", "discussed", "talked about",
-        "action item", "action items", "follow up", "follow-up",
-        "what did we decide", "what was decided", "meeting notes",
-        "decompress", "debrief", "recap", "call", "calls",
-        "conversation", "session", "discussion", "chat with",
-        "spoke with", "talked with", "mentioned", "said in",
-        "brought up", "covered", "went over", "reviewed"
-    ]
-    
-    # Temporal indicators that suggest meeting context
-    temporal_keywords = [
-        "yesterday", "today", "last week", "this week",
-        "last month", "monday", "tuesday", "wednesday",
-        "thursday", "friday", "saturday", "sunday",
-        "morning", "afternoon", "ago", "recent"
-    ]
-    
     # Date patterns (October 15, Oct 15, 10/15, etc)
     import re
     date_patterns = [
@@ -4477,10 +4225,10 @@ def detect_meeting_query(message: str) -> tuple[bool, str]:
     has_date = any(re.search(pattern, message_lower, re.IGNORECASE) for pattern in date_patterns)
     
     # Check for temporal keywords
-    has_temporal = any(word in message_lower for word in temporal_keywords)
+    has_temporal = any(word in message_lower for word in MEETING_TEMPORAL_KEYWORDS)
     
     # Check for meeting keywords
-    has_meeting_keyword = any(keyword in message_lower for keyword in meeting_keywords)
+    has_meeting_keyword = any(keyword in message_lower for keyword in MEETING_KEYWORDS)
     
     # NEW LOGIC: If there's a date OR temporal reference, assume it might be about a meeting
     is_meeting = has_meeting_keyword or has_date or has_temporal
@@ -4514,10 +4262,12 @@ async def search_meetings(
         limit: Max number of meetings to return
     
     Returns:
-        Formatted meeting context string
+        Formatted meeting context string (transcripts appear as the segments
+        matching the query, not in full)
     """
     try:
         from modules.core.database import db_manager
+        from modules.integrations.fathom.database_manager import FathomDatabaseManager
         import re
         from datetime import datetime, timedelta
         
@@ -4534,8 +4284,7 @@ async def search_meetings(
                     duration_minutes,
                     participants,
                     ai_summary,
-                    key_points,
-                    transcript_text
+                    key_points
                 FROM fathom_meetings
                 ORDER BY meeting_date DESC
                 LIMIT $1
@@ -4564,8 +4313,7 @@ async def search_meetings(
                     m.title,
                     m.meeting_date,
                     m.ai_summary,
-                    m.key_points,
-                    m.transcript_text
+                    m.key_points
                 FROM fathom_meetings m
                 WHERE m.ai_summary IS NOT NULL
                 ORDER BY m.meeting_date DESC
@@ -4626,8 +4374,7 @@ async def search_meetings(
                         duration_minutes,
                         participants,
                         ai_summary,
-                        key_points,
-                        transcript_text
+                        key_points
                     FROM fathom_meetings
                     WHERE meeting_date BETWEEN $1 AND $2
                     ORDER BY ABS(EXTRACT(EPOCH FROM (meeting_date - $3)))
@@ -4651,42 +4398,17 @@ async def search_meetings(
                             meeting['key_points'] = []
                 
             else:
-                # Fallback: Simple text search in title and summary
-                search_term = f"%{query.lower()}%"
-                sql = """
-                    SELECT 
-                        id,
-                        title,
-                        meeting_date,
-                        duration_minutes,
-                        participants,
-                        ai_summary,
-                        key_points,
-                        transcript_text
-                    FROM fathom_meetings
-                    WHERE 
-                        LOWER(title) LIKE $1
-                        OR LOWER(ai_summary) LIKE $1
-                    ORDER BY meeting_date DESC
-                    LIMIT $2
-                """
-                results = await db_manager.fetch_all(sql, search_term, limit)
-                # Convert asyncpg Records to dicts for proper .get() access
-                meetings = [dict(row) for row in results]
-                
-                # 🔧 FIX (Nov 6, 2025): Parse JSON strings back to lists
-                for meeting in meetings:
-                    if meeting.get('participants') and isinstance(meeting['participants'], str):
-                        try:
-                            meeting['participants'] = json.loads(meeting['participants'])
-                        except Exception:
-                            meeting['participants'] = []
-                    if meeting.get('key_points') and isinstance(meeting['key_points'], str):
-                        try:
-                            meeting['key_points'] = json.loads(meeting['key_points'])
-                        except Exception:
-                            meeting['key_points'] = []
-                
+                # Full-text search over the stored meeting and transcript chunk indexes
+                # (any query word counts; more matching words rank higher)
+                meetings = await FathomDatabaseManager().search_meetings(query, limit, match='any')
+        
+        # Transcript segments matching the query (search results already carry theirs)
+        if meetings and any('matching_segments' not in m for m in meetings):
+            segments = await FathomDatabaseManager().search_transcript_segments(
+                query, [str(m['id']) for m in meetings], match='any'
+            )
+            for meeting in meetings:
+                meeting.setdefault('matching_segments', segments.get(str(meeting['id']), []))
         
         if not meetings or len(meetings) == 0:
             return "\n\n📅 **Meeting Context:** No meetings found matching your query."
@@ -4717,14 +4439,6 @@ async def search_meetings(
                 summary = meeting['ai_summary']
                 meeting_text.append(f"\n📝 Summary: {summary}")
                 
-            # 🔧 FIX (Nov 6, 2025): Add transcript for specific queries
-            if meeting.get('transcript_text') and meeting['transcript_text'].strip():
-                transcript = meeting['transcript_text']
-                # Truncate if extremely long (over 30k chars)
-                if len(transcript) > 30000:
-                    transcript = transcript[:30000] + "\n\n[Transcript truncated for length - showing first 30,000 characters]"
-                meeting_text.append(f"\n📝 Full Transcript:\n{transcript}")
-            
             if meeting.get('key_points'):
                 key_points = meeting['key_points']
                 if isinstance(key_points, list) and len(key_points) > 0:
@@ -4732,10 +4446,13 @@ async def search_meetings(
                     for point in key_points[:5]:  # Show more key points
                         meeting_text.append(f"  • {point}")
             
-            # Add full transcript if available
-            if meeting.get('transcript_text'):
-                transcript = meeting['transcript_text']
-                meeting_text.append(f"\n\n**Full Transcript:**\n{transcript}")
+            # Transcript segments matching the query, with where they occur in the recording
+            if meeting.get('matching_segments'):
+                meeting_text.append("\n🎙️ Matching Transcript Segments:")
+                for segment in meeting['matching_segments']:
+                    timestamp = f"[{segment['timestamp']}] " if segment.get('timestamp') else ""
+                    snippet = " ".join(segment['snippet'].split())
+                    meeting_text.append(f"  • {timestamp}{snippet}")
             
             meeting_context.append("\n".join(meeting_text))
             meeting_context.append("---")
@@ -0,0 +1,297 @@
+# modules/ai/command_router.py
+"""
+Compiled Command Router for Syntax Prime V2
+Classifies a chat message against every integration command in ONE pass.
+
+Date: 10/16/26 - Replaces the per-message detect_* if/elif walk in router.py
+
+HOW IT WORKS:
+1. Each route declares its trigger phrases - the same keyword lists the
+   detect_* helpers in chat.py use (imported, not copied)
+2. All trigger phrases are compiled into a single trie-factored regex and
+   scanned once per message. A lookahead finds the longest phrase at every
+   position; a precomputed substring closure maps it to every route whose
+   phrase it contains, so results match the old `kw in message_lower` checks
+3. Routes that fired are resolved in priority order. Routes that carry
+   arguments (weather type, email number, trends type...) call their
+   detect_* helper ONCE, and only when their triggers actually fired
+
+USAGE:
+    from .command_router import get_command_router
+
+    command = get_command_router().classify(message)
+    if command.winner:                      # first integration in the chain
+        name, args = command.winner.name, command.winner.args
+    is_weather, weather_type = command.args('weather', (False, None))
+"""
+
+import re
+import time
+import logging
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, FrozenSet, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+__all__ = [
+    'CommandRoute',
+    'CommandMatch',
+    'MessageClassification',
+    'CommandRouter',
+    'get_command_router',
+    'HEALTH_CHECK_KEYWORDS',
+    'WRITING_CONTEXT_KEYWORDS',
+]
+
+# Terms that make /chat answer with the system health summary
+HEALTH_CHECK_KEYWORDS = ['health check', 'system status', 'system health', 'how are you feeling']
+
+# Terms that pull RSS marketing context into a regular AI answer
+WRITING_CONTEXT_KEYWORDS = ['write', 'content', 'marketing', 'blog', 'email']
+
+# Necessary substrings for detect_meeting_query's date regexes
+# (full month names contain their abbreviations; numeric dates need / or -)
+MEETING_DATE_TRIGGERS = ['jan', 'feb', 'mar', 'apr', 'may', 'jun', 'jul', 'aug',
+                         'sep', 'oct', 'nov', 'dec', '/', '-']
+
+
+# =============================================================================
+# Route and Result Types
+# =============================================================================
+
+@dataclass
+class CommandRoute:
+    """
+    One integration command.
+
+    triggers:   phrases; the route fires if ANY appears in the lowercased message
+    resolve:    optional confirm/extract step, run only if the route fired.
+                Returns the route's args, or a falsy value to reject the match.
+                Without a resolver the args are simply True.
+    exclusive:  part of /chat's if/elif integration chain (first one wins)
+    answers:    /chat answers from the integration instead of the model
+    """
+    name: str
+    triggers: List[str]
+    resolve: Optional[Callable[[str], Any]] = None
+    exclusive: bool = True
+    answers: bool = True
+
+
+@dataclass
+class CommandMatch:
+    name: str
+    args: Any
+
+
+class MessageClassification:
+    """Every route that matched one message, in priority order."""
+
+    def __init__(self, matches: Dict[str, CommandMatch], routes: List[CommandRoute]):
+        self.matches = matches
+        self._routes = routes
+        self._routes_by_name = {route.name: route for route in routes}
+
+    @property
+    def winner(self) -> Optional[CommandMatch]:
+        """First exclusive route that matched - the /chat if/elif winner."""
+        for route in self._routes:
+            if route.exclusive and route.name in self.matches:
+                return self.matches[route.name]
+        return None
+
+    def has(self, name: str) -> bool:
+        return name in self.matches
+
+    def args(self, name: str, default: Any = None) -> Any:
+        match = self.matches.get(name)
+        return match.args if match else default
+
+    @property
+    def answered_by_integration(self) -> bool:
+        """True if /chat would reply from an integration rather than the model."""
+        winner = self.winner
+        if winner and self._routes_by_name[winner.name].answers:
+            return True
+        if self.has('health_check') and not self.has('meeting_query'):
+            # The health check is the meeting query's elif in /chat
+            return True
+        return any(self.has(name) for name in ('weather', 'bluesky_reply_approval', 'show_meetings'))
+
+    def __repr__(self) -> str:
+        return f"MessageClassification({list(self.matches)})"
+
+
+# =============================================================================
+# Trie Regex Compilation
+# =============================================================================
+
+def _compile_trie_pattern(phrases: Iterable[str]) -> str:
+    """
+    Build a prefix-factored alternation from phrases, e.g.
+    ['bluesky', 'bluesky scan', 'blog'] -> bl(?:og|uesky(?:\\ scan)?)
+    The regex engine walks it like a trie: one character test per branch point.
+    Greedy optional groups make it prefer the longest phrase at a position.
+    """
+    trie: Dict[str, Any] = {}
+    for phrase in phrases:
+        node = trie
+        for char in phrase:
+            node = node.setdefault(char, {})
+        node[''] = True
+
+    def build(node: Dict[str, Any]) -> str:
+        terminal = '' in node
+        branches = [re.escape(char) + build(child)
+                    for char, child in sorted(node.items()) if char != '']
+        if not branches:
+            return ''
+        if len(branches) == 1 and not terminal:
+            return branches[0]
+        group = '(?:' + '|'.join(branches) + ')'
+        return group + '?' if terminal else group
+
+    return build(trie)
+
+
+# =============================================================================
+# Command Router
+# =============================================================================
+
+class CommandRouter:
+    """Single-pass message classifier over a priority-ordered list of routes."""
+
+    def __init__(self, routes: List[CommandRoute]):
+        self.routes = routes
+
+        vocabulary = sorted({phrase.lower() for route in routes for phrase in route.triggers})
+        routes_by_phrase: Dict[str, set] = {}
+        for route in routes:
+            for phrase in route.triggers:
+                routes_by_phrase.setdefault(phrase.lower(), set()).add(route.name)
+
+        # Substring closure: finding phrase P means every phrase inside P is present too
+        self._phrase_routes: Dict[str, FrozenSet[str]] = {}
+        for phrase in vocabulary:
+            fired = set()
+            for inner in vocabulary:
+                if inner in phrase:
+                    fired |= routes_by_phrase[inner]
+            self._phrase_routes[phrase] = frozenset(fired)
+
+        # Zero-width lookahead: reports the longest phrase starting at EVERY position,
+        # so overlapping phrases ("google trends" / "trends status") are all seen
+        self._scanner = re.compile(f"(?=({_compile_trie_pattern(vocabulary)}))")
+
+        self.stats = {'classified': 0, 'matched': 0, 'total_ms': 0.0}
+        logger.info(f"🧭 Command router compiled: {len(routes)} routes, {len(vocabulary)} trigger phrases")
+
+    def fired_routes(self, message: str) -> FrozenSet[str]:
+        """Names of routes whose triggers appear in the message (one scan, no resolving)."""
+        fired = set()
+        for match in self._scanner.finditer(message.lower()):
+            fired.update(self._phrase_routes[match.group(1)])
+        return frozenset(fired)
+
+    def classify(self, message: str) -> MessageClassification:
+        """Classify a message: one scan, then resolve only the routes that fired."""
+        start = time.perf_counter()
+        fired = self.fired_routes(message)
+
+        matches: Dict[str, CommandMatch] = {}
+        for route in self.routes:
+            if route.name not in fired:
+                continue
+            args = route.resolve(message) if route.resolve else True
+            if args:
+                matches[route.name] = CommandMatch(name=route.name, args=args)
+
+        self.stats['classified'] += 1
+        self.stats['matched'] += 1 if matches else 0
+        self.stats['total_ms'] += (time.perf_counter() - start) * 1000
+        return MessageClassification(matches, self.routes)
+
+    def get_stats(self) -> Dict[str, Any]:
+        classified = self.stats['classified']
+        return {
+            'routes': len(self.routes),
+            'classified': classified,
+            'matched': self.stats['matched'],
+            'avg_classify_ms': round(self.stats['total_ms'] / classified, 4) if classified else 0.0,
+        }
+
+
+def _flag_tuple(detector: Callable[[str], tuple]) -> Callable[[str], Optional[tuple]]:
+    """Adapt a detect_* helper returning (is_match, ...) into a resolver."""
+    def resolve(message: str) -> Optional[tuple]:
+        result = detector(message)
+        return result if result[0] else None
+    return resolve
+
+
+def build_default_routes() -> List[CommandRoute]:
+    """
+    Routes in /chat's dispatch priority order.
+    Imported lazily: chat.py pulls in the file-processing stack.
+    """
+    from . import chat
+
+    return [
+        # Runs alongside the chain (its own `if` in /chat)
+        CommandRoute('weather', chat.WEATHER_KEYWORDS,
+                     resolve=_flag_tuple(chat.detect_weather_request), exclusive=False),
+        # Heads the chain, but only when there's a thread to reply from
+        CommandRoute('bluesky_reply_approval', chat.BLUESKY_APPROVAL_KEYWORDS, exclusive=False),
+
+        # The integration if/elif chain - first match wins
+        # (every V1 bluesky post pattern contains "bluesky")
+        CommandRoute('bluesky', chat.BLUESKY_KEYWORDS),
+        CommandRoute('rss', chat.RSS_KEYWORDS, answers=False),
+        CommandRoute('scraper', chat.SCRAPER_KEYWORDS),
+        CommandRoute('prayer', chat.PRAYER_KEYWORDS),
+        CommandRoute('prayer_notification', chat.PRAYER_NOTIFICATION_KEYWORDS),
+        CommandRoute('intelligence', chat.INTELLIGENCE_KEYWORDS),
+        CommandRoute('location', chat.LOCATION_KEYWORDS),
+        CommandRoute('pattern_complaint',
+                     chat.PATTERN_DUPLICATE_TRIGGERS + chat.PATTERN_TIME_JOKE_TRIGGERS,
+                     resolve=_flag_tuple(chat.detect_pattern_complaint)),
+        CommandRoute('trends', chat.TRENDS_KEYWORDS,
+                     resolve=_flag_tuple(chat.detect_trends_command)),
+        CommandRoute('voice', chat.VOICE_KEYWORDS),
+        CommandRoute('image', chat.IMAGE_KEYWORDS),
+        CommandRoute('reminder',
+                     chat.REMINDER_KILL_PHRASES + chat.REMINDER_CANCEL_KEYWORDS
+                     + chat.REMINDER_LIST_KEYWORDS + chat.REMINDER_CREATE_KEYWORDS,
+                     resolve=chat.detect_reminder_command),
+        CommandRoute('google', chat.GOOGLE_KEYWORDS,
+                     resolve=_flag_tuple(chat.detect_google_command)),
+        # Regex-based: every email pattern contains "email" or "reply",
+        # every draft pattern contains "draft"
+        CommandRoute('email_detail', ['email', 'reply'],
+                     resolve=_flag_tuple(chat.detect_email_detail_command)),
+        CommandRoute('draft_creation', ['draft'],
+                     resolve=_flag_tuple(chat.detect_draft_creation_command)),
+
+        # Independent checks after the chain
+        CommandRoute('show_meetings', chat.SHOW_MEETINGS_PATTERNS, exclusive=False),
+        CommandRoute('meeting_query',
+                     chat.MEETING_KEYWORDS + chat.MEETING_TEMPORAL_KEYWORDS + MEETING_DATE_TRIGGERS,
+                     resolve=_flag_tuple(chat.detect_meeting_query), exclusive=False, answers=False),
+        CommandRoute('health_check', HEALTH_CHECK_KEYWORDS, exclusive=False),
+        CommandRoute('writing_context', WRITING_CONTEXT_KEYWORDS, exclusive=False, answers=False),
+    ]
+
+
+# =============================================================================
+# Global Instance
+# =============================================================================
+
+_command_router: Optional[CommandRouter] = None
+
+
+def get_command_router() -> CommandRouter:
+    """Get the global command router (compiled on first use)"""
+    global _command_router
+    if _command_router is None:
+        _command_router = CommandRouter(build_default_routes())
+    return _command_router
@@ -4,115 +4,108 @@ Digital Elephant Conversation Manager for Syntax Prime V2
 Never forgets. Maintains 250K context + last 500 conversations.
 
 Updated: 2025 - Added bounded TTL cache, fixed cleanup methods, removed dead code
+Updated: 2026-10-16 - Rolling per-thread context windows (cached token counts, incremental updates)
+Updated: 2026-10-16 - History cache moved to the shared modules.core.cache
 """
 
 import asyncio
+import time
 import uuid
 import json
 import logging
-from collections import OrderedDict
+from collections import OrderedDict, deque
 from datetime import datetime, timezone
+from itertools import count
 from threading import Lock
 from typing import Dict, List, Optional, Any, Tuple
 
 from ..core.database import db_manager
+from ..core.cache import get_cache, stable_key, invalidate, CONVERSATION_HISTORY
 
 logger = logging.getLogger(__name__)
 
 
 # =============================================================================
-# TTL Cache (same implementation as knowledge_query.py for consistency)
+# Rolling Context Window
 # =============================================================================
 
-class TTLCache:
+MAX_CONTEXT_WINDOWS = 20             # Threads per user kept warm in memory
+CONTEXT_WINDOW_TTL_SECONDS = 1800    # Reload after this long (catches out-of-band writes)
+
+# Newest messages whose running token total fits the budget, returned oldest-first.
+# Same estimate as estimate_tokens() (char_length / 4), computed in Postgres so
+# only the rows that fit come back.
+CONTEXT_WINDOW_QUERY = """
+SELECT id, role, content, tokens, thread_messages
+FROM (
+    SELECT id, role, content, created_at,
+           char_length(content) / 4 AS tokens,
+           SUM(char_length(content) / 4) OVER (
+               ORDER BY created_at DESC, id DESC
+               ROWS BETWEEN UNBOUNDED PRECEDING AND CURRENT ROW
+           ) AS running_tokens,
+           COUNT(*) OVER () AS thread_messages
+    FROM conversation_messages
+    WHERE thread_id = $1
+) AS newest
+WHERE running_tokens <= $2
+ORDER BY created_at ASC, id ASC
+"""
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token estimate: 4 chars = 1 token"""
+    return len(text) // 4
+
+
+class ThreadContextWindow:
     """
-    Thread-safe LRU cache with TTL (time-to-live) expiration.
+    The newest slice of one thread that fits a token budget.
     
-    Features:
-    - Maximum size limit with LRU eviction
-    - TTL-based expiration
-    - Thread-safe operations
+    Each message carries its token count, computed once. New messages are
+    appended and the oldest dropped until the window fits again, so a chat
+    turn never re-reads or re-counts the thread.
     """
     
-    def __init__(self, max_size: int = 100, ttl_seconds: int = 300):
-        self._cache: OrderedDict = OrderedDict()
-        self._max_size = max_size
-        self._ttl_seconds = ttl_seconds
-        self._lock = Lock()
-    
-    def get(self, key: str) -> Optional[Any]:
-        """Get value from cache if exists and not expired."""
-        with self._lock:
-            if key not in self._cache:
-                return None
-            
-            cached_time, value = self._cache[key]
-            elapsed = (datetime.now() - cached_time).total_seconds()
-            
-            if elapsed >= self._ttl_seconds:
-                del self._cache[key]
-                return None
-            
-            self._cache.move_to_end(key)
-            return value
+    def __init__(self, budget: int, messages: List[Dict], complete: bool):
+        self.budget = budget
+        self.messages: deque = deque(messages)  # oldest -> newest: {'role', 'content', 'tokens'}
+        self.total_tokens = sum(m['tokens'] for m in messages)
+        self.complete = complete  # Holds the entire thread (nothing older was cut)
+        self.loaded_at = time.monotonic()
     
-    def set(self, key: str, value: Any) -> None:
-        """Set value in cache with current timestamp."""
-        with self._lock:
-            if key in self._cache:
-                del self._cache[key]
-            
-            while len(self._cache) >= self._max_size:
-                self._cache.popitem(last=False)
-            
-            self._cache[key] = (datetime.now(), value)
+    def append(self, role: str, content: str) -> None:
+        tokens = estimate_tokens(content)
+        self.messages.append({'role': role, 'content': content, 'tokens': tokens})
+        self.total_tokens += tokens
+        
+        while self.messages and self.total_tokens > self.budget:
+            self.total_tokens -= self.messages.popleft()['tokens']
+            self.complete = False
     
-    def invalidate(self, key_pattern: str = None) -> int:
-        """
-        Invalidate cache entries matching pattern.
-        If pattern is None, clears entire cache.
-        Returns count of removed entries.
-        """
-        with self._lock:
-            if key_pattern is None:
-                count = len(self._cache)
-                self._cache.clear()
-                return count
-            
-            keys_to_remove = [k for k in self._cache.keys() if key_pattern in k]
-            for key in keys_to_remove:
-                del self._cache[key]
-            return len(keys_to_remove)
+    def covers(self, max_tokens: int) -> bool:
+        """Can this window answer a request for max_tokens without reloading?"""
+        return max_tokens <= self.budget or self.complete
     
-    def clear(self) -> None:
-        """Clear all cache entries."""
-        with self._lock:
-            self._cache.clear()
+    def is_stale(self) -> bool:
+        return time.monotonic() - self.loaded_at >= CONTEXT_WINDOW_TTL_SECONDS
     
-    def cleanup_expired(self) -> int:
-        """Remove all expired entries. Returns count of removed entries."""
-        removed = 0
-        with self._lock:
-            now = datetime.now()
-            expired_keys = [
-                key for key, (cached_time, _) in self._cache.items()
-                if (now - cached_time).total_seconds() >= self._ttl_seconds
-            ]
-            
-            for key in expired_keys:
-                del self._cache[key]
-                removed += 1
+    def newest_within(self, max_tokens: int) -> Tuple[List[Dict], int]:
+        """Newest messages fitting max_tokens, oldest-first, plus their token total"""
+        total_tokens = 0
+        count = 0
+        for message in reversed(self.messages):
+            if total_tokens + message['tokens'] > max_tokens:
+                break
+            total_tokens += message['tokens']
+            count += 1
         
-        return removed
-    
-    def stats(self) -> Dict[str, Any]:
-        """Return cache statistics."""
-        with self._lock:
-            return {
-                "size": len(self._cache),
-                "max_size": self._max_size,
-                "ttl_seconds": self._ttl_seconds
-            }
+        start = len(self.messages) - count
+        selected = [
+            {'role': self.messages[i]['role'], 'content': self.messages[i]['content']}
+            for i in range(start, len(self.messages))
+        ]
+        return selected, total_tokens
 
 
 # =============================================================================
@@ -131,9 +124,18 @@ class DigitalElephantMemory:
         self.max_stored_conversations = 500  # Last 500 conversations always accessible
         self.current_thread_id: Optional[str] = None
         
-        # Bounded cache for conversation history
-        # 5-minute TTL, max 50 cached conversations per user
-        self._conversation_cache = TTLCache(max_size=50, ttl_seconds=300)
+        # Shared conversation history cache (5-minute TTL), entries tagged
+        # by thread and user. In-process only: history changes every turn
+        self._conversation_cache = get_cache(CONVERSATION_HISTORY, max_size=500, ttl_seconds=300)
+        self._user_tag = f"user:{user_id}"
+        
+        # Rolling token-budgeted context per thread (LRU), updated by add_message
+        self._context_windows: OrderedDict = OrderedDict()
+        # Stamped with a fresh sequence number on every add_message; a load that
+        # raced a write is not cached. LRU-bounded like the windows - stamps are
+        # never reused, so a dropped entry can only skip caching, never mask a write
+        self._context_generations: OrderedDict = OrderedDict()
+        self._write_sequence = count(1)
     
     async def create_conversation_thread(
         self,
@@ -245,8 +247,18 @@ class DigitalElephantMemory:
             # Update thread metadata
             await self._update_thread_after_message(thread_id, content if role == 'user' else None)
             
-            # Invalidate cache for this thread
-            self._conversation_cache.invalidate(thread_id)
+            # Invalidate cached history for this thread
+            await invalidate(CONVERSATION_HISTORY, str(thread_id))
+            
+            # Extend the rolling context window instead of rebuilding it
+            thread_key = str(thread_id)
+            self._context_generations[thread_key] = next(self._write_sequence)
+            self._context_generations.move_to_end(thread_key)
+            while len(self._context_generations) > MAX_CONTEXT_WINDOWS:
+                self._context_generations.popitem(last=False)
+            window = self._context_windows.get(thread_key)
+            if window is not None:
+                window.append(role, content)
             
             logger.info(f"Added {role} message to thread {thread_id}: {message_id}")
             return message_id
@@ -314,8 +326,8 @@ class DigitalElephantMemory:
             List of message dicts
         """
         # Check cache first
-        cache_key = f"{thread_id}_{limit}_{include_metadata}"
-        cached = self._conversation_cache.get(cache_key)
+        cache_key = stable_key('history', str(thread_id), limit, include_metadata)
+        cached = await self._conversation_cache.get(cache_key)
         if cached is not None:
             return cached
         
@@ -365,7 +377,7 @@ class DigitalElephantMemory:
                 result.append(message_dict)
             
             # Cache the result
-            self._conversation_cache.set(cache_key, result)
+            await self._conversation_cache.set(cache_key, result, tags=[str(thread_id), self._user_tag])
             
             return result
             
@@ -390,28 +402,8 @@ class DigitalElephantMemory:
         """
         max_tokens = max_tokens or self.max_context_tokens
         
-        # Get conversation history
-        messages = await self.get_conversation_history(thread_id, include_metadata=True)
-        
-        # Estimate token count (rough approximation: 4 chars = 1 token)
-        def estimate_tokens(text: str) -> int:
-            return len(text) // 4
-        
-        # Build context from newest to oldest, staying within token limit
-        context_messages = []
-        total_tokens = 0
-        
-        for message in reversed(messages):
-            message_tokens = estimate_tokens(message['content'])
-            
-            if total_tokens + message_tokens > max_tokens:
-                break
-                
-            context_messages.insert(0, {
-                'role': message['role'],
-                'content': message['content']
-            })
-            total_tokens += message_tokens
+        window = await self._get_context_window(str(thread_id), max_tokens)
+        context_messages, total_tokens = window.newest_within(max_tokens)
         
         context_info = {
             'thread_id': thread_id,
@@ -424,6 +416,36 @@ class DigitalElephantMemory:
         
         return context_messages, context_info
     
+    async def _get_context_window(self, thread_id: str, max_tokens: int) -> ThreadContextWindow:
+        """Cached rolling window for a thread, loading only the rows that fit max_tokens"""
+        window = self._context_windows.get(thread_id)
+        if window is not None and window.covers(max_tokens) and not window.is_stale():
+            self._context_windows.move_to_end(thread_id)
+            return window
+        
+        generation = self._context_generations.get(thread_id)
+        rows = await db_manager.fetch_all(CONTEXT_WINDOW_QUERY, thread_id, max_tokens)
+        
+        messages = [
+            {'role': row['role'], 'content': row['content'], 'tokens': row['tokens']}
+            for row in rows
+        ]
+        thread_messages = rows[0]['thread_messages'] if rows else 0
+        window = ThreadContextWindow(
+            budget=max_tokens,
+            messages=messages,
+            complete=len(messages) == thread_messages
+        )
+        
+        # Only cache if no message landed while we were reading
+        if self._context_generations.get(thread_id) == generation:
+            self._context_windows[thread_id] = window
+            self._context_windows.move_to_end(thread_id)
+            while len(self._context_windows) > MAX_CONTEXT_WINDOWS:
+                self._context_windows.popitem(last=False)
+        
+        return window
+    
     async def get_thread_info(self, thread_id: str) -> Optional[Dict]:
         """Get metadata about a conversation thread"""
         query = """
@@ -485,20 +507,26 @@ class DigitalElephantMemory:
             return []
     
     def clear_cache(self) -> None:
-        """Clear the conversation cache"""
-        self._conversation_cache.clear()
+        """Clear this user's cached conversation history"""
+        self._conversation_cache.local.invalidate(self._user_tag)
+        self._context_windows.clear()
+        self._context_generations.clear()
         logger.debug(f"Cleared conversation cache for user {self.user_id}")
     
     def cache_stats(self) -> Dict[str, Any]:
         """Get cache statistics"""
-        return self._conversation_cache.stats()
+        stats = self._conversation_cache.stats()
+        stats['context_windows'] = len(self._context_windows)
+        return stats
     
     async def cleanup(self) -> None:
         """Cleanup resources (call on shutdown)"""
-        expired = self._conversation_cache.cleanup_expired()
+        expired = self._conversation_cache.local.cleanup_expired()
         if expired > 0:
             logger.debug(f"Cleaned up {expired} expired cache entries for user {self.user_id}")
-        self._conversation_cache.clear()
+        self._conversation_cache.local.invalidate(self._user_tag)
+        self._context_windows.clear()
+        self._context_generations.clear()
 
 
 # =============================================================================
@@ -5,112 +5,135 @@ Intelligently queries 21K+ knowledge entries with context awareness
 
 Updated: 2025 - Fixed cache TTL bug (.seconds → .total_seconds()), 
                 added bounded LRU cache with automatic cleanup
+Updated: 2026-10-16 - Hybrid full-text + trigram retrieval in one query,
+                      headlines only for the final top-k, per-phase timings
+Updated: 2026-10-16 - Moved to the shared modules.core.cache (stable keys, optional L2)
 """
 
 import asyncio
 import re
 import json
+import time
 import logging
-from collections import Counter, OrderedDict
-from datetime import datetime, timezone
+from collections import Counter
 from typing import Dict, List, Optional, Any
-from threading import Lock
 
 from ..core.database import db_manager
+from ..core.cache import get_cache, stable_key, KNOWLEDGE_SEARCH
 
 logger = logging.getLogger(__name__)
 
 
 # =============================================================================
-# LRU Cache with TTL Support
+# Hybrid Search Configuration
 # =============================================================================
 
-class TTLCache:
-    """
-    Thread-safe LRU cache with TTL (time-to-live) expiration.
-    
-    Features:
-    - Maximum size limit with LRU eviction
-    - TTL-based expiration (correctly using total_seconds)
-    - Automatic cleanup of stale entries
-    - Thread-safe operations
-    """
-    
-    def __init__(self, max_size: int = 100, ttl_seconds: int = 3600):
-        self._cache: OrderedDict = OrderedDict()
-        self._max_size = max_size
-        self._ttl_seconds = ttl_seconds
-        self._lock = Lock()
-    
-    def get(self, key: str) -> Optional[Any]:
-        """Get value from cache if exists and not expired."""
-        with self._lock:
-            if key not in self._cache:
-                return None
-            
-            cached_time, value = self._cache[key]
-            elapsed = (datetime.now() - cached_time).total_seconds()
-            
-            if elapsed >= self._ttl_seconds:
-                # Expired - remove and return None
-                del self._cache[key]
-                return None
-            
-            # Move to end (most recently used)
-            self._cache.move_to_end(key)
-            return value
-    
-    def set(self, key: str, value: Any) -> None:
-        """Set value in cache with current timestamp."""
-        with self._lock:
-            # If key exists, remove it first (will be re-added at end)
-            if key in self._cache:
-                del self._cache[key]
-            
-            # Evict oldest entries if at capacity
-            while len(self._cache) >= self._max_size:
-                self._cache.popitem(last=False)
-            
-            # Add new entry
-            self._cache[key] = (datetime.now(), value)
-    
-    def clear(self) -> None:
-        """Clear all cache entries."""
-        with self._lock:
-            self._cache.clear()
-    
-    def cleanup_expired(self) -> int:
-        """Remove all expired entries. Returns count of removed entries."""
-        removed = 0
-        with self._lock:
-            now = datetime.now()
-            expired_keys = []
-            
-            for key, (cached_time, _) in self._cache.items():
-                if (now - cached_time).total_seconds() >= self._ttl_seconds:
-                    expired_keys.append(key)
-            
-            for key in expired_keys:
-                del self._cache[key]
-                removed += 1
-        
-        return removed
-    
-    def stats(self) -> Dict[str, Any]:
-        """Return cache statistics."""
-        with self._lock:
-            now = datetime.now()
-            expired_count = sum(
-                1 for cached_time, _ in self._cache.values()
-                if (now - cached_time).total_seconds() >= self._ttl_seconds
+HYBRID_SEARCH_CONFIG = {
+    'fts_candidates_factor': 3,       # Full-text candidates per requested result
+    'pattern_candidates_factor': 2,   # Trigram (ILIKE) candidates per requested result
+    'pattern_scan_factor': 10,        # ILIKE matches examined (match position computed) per result
+    'pattern_weight': 0.5,            # Weight of the literal-match rank vs ts_rank
+    'pattern_min_length': 3,          # Trigram index needs at least one full trigram
+}
+
+# One round-trip: full-text hits (GIN on search_vector) and literal matches
+# (GIN trigram on title/content) are collected independently, merged, and
+# ranked together. No headlines here - only the final top-k get one.
+HYBRID_SEARCH_QUERY = """
+WITH fts AS (
+    SELECT ke.id, ts_rank(ke.search_vector, plainto_tsquery('english', $1)) AS fts_rank
+    FROM knowledge_entries ke
+    WHERE ke.search_vector @@ plainto_tsquery('english', $1)
+    AND ke.processed = true
+    ORDER BY fts_rank DESC, ke.relevance_score DESC, ke.access_count DESC
+    LIMIT $4
+),
+pattern_matches AS MATERIALIZED (
+    -- Bounded before the match position is computed: title hits and the most
+    -- used entries first, at most $7 rows
+    SELECT ke.id, ke.access_count, ke.relevance_score, ke.content,
+        ke.title ILIKE $3 AS title_match
+    FROM knowledge_entries ke
+    WHERE (ke.content ILIKE $3 OR ke.title ILIKE $3)
+    AND ke.processed = true
+    ORDER BY title_match DESC, ke.access_count DESC, ke.relevance_score DESC
+    LIMIT $7
+),
+pattern_positions AS (
+    SELECT id, access_count, relevance_score, title_match,
+        POSITION(LOWER($2) IN LOWER(content)) AS char_index
+    FROM pattern_matches
+),
+pattern AS (
+    SELECT id,
+        CASE 
+            WHEN title_match THEN 1.0
+            WHEN char_index < 500 THEN 0.8
+            WHEN char_index < 2000 THEN 0.6
+            WHEN char_index < 5000 THEN 0.4
+            ELSE 0.3
+        END AS pattern_rank
+    FROM pattern_positions
+    ORDER BY pattern_rank DESC, access_count DESC, relevance_score DESC
+    LIMIT $5
+),
+hits AS (
+    SELECT 
+        COALESCE(fts.id, pattern.id) AS id,
+        COALESCE(fts.fts_rank, 0) AS fts_rank,
+        COALESCE(pattern.pattern_rank, 0)::float8 AS pattern_rank
+    FROM fts
+    FULL OUTER JOIN pattern ON fts.id = pattern.id
+)
+SELECT 
+    ke.id,
+    ke.title,
+    ke.content,
+    ke.content_type,
+    ke.word_count,
+    ke.access_count,
+    ke.relevance_score,
+    ke.key_topics,
+    ke.project_id,
+    ke.summary,
+    ke.created_at,
+    kp.name as project_name,
+    kp.category as project_category,
+    ks.name as source_name,
+    ks.source_type,
+    hits.fts_rank,
+    hits.pattern_rank,
+    hits.fts_rank + $6::float8 * hits.pattern_rank as search_rank
+FROM hits
+JOIN knowledge_entries ke ON ke.id = hits.id
+LEFT JOIN knowledge_projects kp ON ke.project_id = kp.id
+LEFT JOIN knowledge_sources ks ON ke.source_id = ks.id
+ORDER BY search_rank DESC, ke.relevance_score DESC, ke.access_count DESC;
+"""
+
+# Snippets for the final results only: highlighted full-text fragments,
+# or the text around the literal match for trigram-only hits
+HEADLINE_QUERY = """
+SELECT 
+    ke.id,
+    CASE 
+        WHEN ke.search_vector @@ plainto_tsquery('english', $1) THEN
+            ts_headline('english', ke.content, plainto_tsquery('english', $1), 
+                       'MaxWords=50, MinWords=20, MaxFragments=2')
+        ELSE
+            SUBSTRING(
+                ke.content,
+                GREATEST(1, POSITION(LOWER($2) IN LOWER(ke.content)) - 100),
+                300
             )
-            
-            return {
-                "size": len(self._cache),
-                "max_size": self._max_size,
-                "ttl_seconds": self._ttl_seconds,
-                "expired_pending_cleanup": expired_count
-            }
+    END as snippet
+FROM knowledge_entries ke
+WHERE ke.id = ANY($3::uuid[]);
+"""
+
+
+def _elapsed_ms(start: float) -> float:
+    return round((time.perf_counter() - start) * 1000, 2)
 
 
 # =============================================================================
@@ -124,8 +147,12 @@ class KnowledgeQueryEngine:
     """
     
     def __init__(self):
-        # Bounded cache with 1-hour TTL and max 200 entries
-        self.cache = TTLCache(max_size=200, ttl_seconds=3600)
+        # Shared cache: 1-hour TTL, max 200 entries per worker, L2 shared across workers.
+        # Invalidated by knowledge_entries writers (RSS, Fathom, Job Radar)
+        self.cache = get_cache(KNOWLEDGE_SEARCH, max_size=200, ttl_seconds=3600, shared=True)
+        
+        # Per-phase timings of the last uncached search (exposed on /ai/stats)
+        self.last_search_timings: Dict[str, Any] = {}
         
         # Knowledge source priorities
         self.source_priorities = {
@@ -161,47 +188,32 @@ class KnowledgeQueryEngine:
             List of relevant knowledge entries with scores
         """
         # Cache key
-        cache_key = f"search_{hash(query)}_{personality_id}_{limit}"
+        cache_key = stable_key('search', query, personality_id, limit, min_relevance)
         
-        # Check cache (TTLCache handles expiration correctly)
-        cached_result = self.cache.get(cache_key)
+        # Check cache (L1, then shared L2)
+        cached_result = await self.cache.get(cache_key)
         if cached_result is not None:
             logger.debug(f"Cache hit for query: {query[:50]}")
             return cached_result
         
+        timings: Dict[str, Any] = {}
+        
         # Extract context keywords from conversation
         context_keywords = self._extract_context_keywords(conversation_context)
         
         # Build enhanced search query
         enhanced_query = self._build_enhanced_query(query, context_keywords)
         
-        # Perform the search
-        # PHASE 1: Try full-text search
-        logger.info(f"📊 Phase 1: Full-text search for '{query}'")
-        search_results = await self._execute_knowledge_search(enhanced_query, limit * 3)
-        logger.info(f"📊 Full-text search returned {len(search_results)} results")
-
-        # PHASE 2: If full-text returns nothing or low-quality results, use pattern matching
-        needs_fallback = False
-        if not search_results:
-            needs_fallback = True
-            logger.info("⚠️  Full-text search returned 0 results - using pattern matching fallback")
-        elif len(search_results) < 3:
-            needs_fallback = True
-            logger.info(f"⚠️  Full-text search returned only {len(search_results)} results - augmenting with pattern matching")
-
-        if needs_fallback:
-            logger.info(f"🔄 Phase 2: Pattern matching search for '{query}'")
-            pattern_results = await self._pattern_match_search(query, limit * 2)
-            logger.info(f"📊 Pattern matching found {len(pattern_results)} additional results")
-            
-            # Merge results, avoiding duplicates
-            existing_ids = {r['id'] for r in search_results}
-            for result in pattern_results:
-                if result['id'] not in existing_ids:
-                    search_results.append(result)
+        # PHASE 1: Hybrid retrieval - full-text and trigram candidates in one query
+        phase_start = time.perf_counter()
+        search_results = await self._execute_hybrid_search(enhanced_query, query, limit)
+        timings['retrieve_ms'] = _elapsed_ms(phase_start)
+        timings['candidates'] = len(search_results)
+        timings['fts_hits'] = sum(1 for r in search_results if r['fts_rank'] > 0)
+        timings['pattern_hits'] = sum(1 for r in search_results if r['pattern_rank'] > 0)
         
-        # Score and rank results
+        # PHASE 2: Score and rank results
+        phase_start = time.perf_counter()
         scored_results = await self._score_and_rank_results(
             search_results,
             query,
@@ -214,12 +226,28 @@ class KnowledgeQueryEngine:
             result for result in scored_results
             if result['final_score'] >= min_relevance
         ][:limit]
-        
-        # Update access counts
-        await self._update_access_counts([r['id'] for r in final_results])
+        timings['score_ms'] = _elapsed_ms(phase_start)
+        
+        # PHASE 3: Headlines for the survivors + access counts
+        phase_start = time.perf_counter()
+        final_ids = [r['id'] for r in final_results]
+        snippets, _ = await asyncio.gather(
+            self._fetch_headlines(enhanced_query, query, final_ids),
+            self._update_access_counts(final_ids)
+        )
+        for result in final_results:
+            result['snippet'] = snippets.get(result['id'])
+        timings['headline_ms'] = _elapsed_ms(phase_start)
+        
+        self.last_search_timings = timings
+        logger.info(
+            f"📊 Knowledge search phases: retrieve {timings['retrieve_ms']}ms "
+            f"({timings['fts_hits']} full-text, {timings['pattern_hits']} trigram), "
+            f"score {timings['score_ms']}ms, headlines {timings['headline_ms']}ms"
+        )
         
         # Cache the results
-        self.cache.set(cache_key, final_results)
+        await self.cache.set(cache_key, final_results)
         
         logger.info(f"Knowledge search for '{query}': {len(final_results)} results (personality: {personality_id})")
         return final_results
@@ -258,83 +286,6 @@ class KnowledgeQueryEngine:
         # Return top keywords
         return [word for word, count in keyword_counts.most_common(10)]
     
-    async def _pattern_match_search(self, query: str, limit: int) -> List[Dict]:
-        """
-        Fallback pattern matching search using ILIKE
-        Used when full-text search fails or returns poor results
-        """
-        pattern_query = """
-        SELECT 
-            ke.id,
-            ke.title,
-            ke.content,
-            ke.content_type,
-            ke.word_count,
-            ke.access_count,
-            ke.relevance_score,
-            ke.key_topics,
-            ke.project_id,
-            ke.summary,
-            ke.created_at,
-            kp.name as project_name,
-            kp.category as project_category,
-            ks.name as source_name,
-            ks.source_type,
-            -- Rank by position of term in content
-            CASE 
-                WHEN ke.title ILIKE $1 THEN 1.0
-                WHEN POSITION(LOWER($2) IN LOWER(ke.content)) < 500 THEN 0.8
-                WHEN POSITION(LOWER($2) IN LOWER(ke.content)) < 2000 THEN 0.6
-                WHEN POSITION(LOWER($2) IN LOWER(ke.content)) < 5000 THEN 0.4
-                ELSE 0.3
-            END as search_rank,
-            -- Context snippet
-            SUBSTRING(
-                ke.content,
-                GREATEST(1, POSITION(LOWER($2) IN LOWER(ke.content)) - 100),
-                300
-            ) as snippet
-        FROM knowledge_entries ke
-        LEFT JOIN knowledge_projects kp ON ke.project_id = kp.id
-        LEFT JOIN knowledge_sources ks ON ke.source_id = ks.id
-        WHERE (ke.content ILIKE $1 OR ke.title ILIKE $1)
-        AND ke.processed = true
-        ORDER BY search_rank DESC, ke.access_count DESC, ke.relevance_score DESC
-        LIMIT $3;
-        """
-        
-        try:
-            search_pattern = f'%{query}%'
-            results = await db_manager.fetch_all(pattern_query, search_pattern, query, limit)
-            
-            # Convert to standard format
-            formatted_results = []
-            for row in results:
-                formatted_results.append({
-                    'id': row['id'],
-                    'title': row['title'],
-                    'content': row['content'],
-                    'content_type': row['content_type'],
-                    'word_count': row['word_count'],
-                    'access_count': row['access_count'],
-                    'relevance_score': float(row['relevance_score']) if row['relevance_score'] else 5.0,
-                    'key_topics': row['key_topics'] or [],
-                    'project_id': row['project_id'],
-                    'project_name': row['project_name'],
-                    'project_category': row['project_category'],
-                    'source_name': row['source_name'],
-                    'source_type': row['source_type'],
-                    'search_rank': float(row['search_rank']),
-                    'snippet': row['snippet'],
-                    'created_at': row['created_at']
-                })
-            
-            return formatted_results
-            
-        except Exception as e:
-            logger.error(f"Pattern match search failed: {e}")
-            return []
-    
     def _build_enhanced_query(self, original_query: str, context_keywords: List[str]) -> str:
         """Build an enhanced search query with context"""
         query_parts = [original_query]
@@ -348,41 +299,25 @@ class KnowledgeQueryEngine:
         
         return ' '.join(query_parts)
     
-    async def _execute_knowledge_search(self, query: str, limit: int) -> List[Dict]:
-        """Execute the actual database search"""
-        search_query = """
-        SELECT 
-            ke.id,
-            ke.title,
-            ke.content,
-            ke.content_type,
-            ke.word_count,
-            ke.access_count,
-            ke.relevance_score,
-            ke.key_topics,
-            ke.project_id,
-            ke.summary,
-            ke.created_at,
-            kp.name as project_name,
-            kp.category as project_category,
-            ks.name as source_name,
-            ks.source_type,
-            -- Full-text search ranking
-            ts_rank(ke.search_vector, plainto_tsquery('english', $1)) as search_rank,
-            -- Highlighted content snippet
-            ts_headline('english', ke.content, plainto_tsquery('english', $1), 
-                       'MaxWords=50, MinWords=20, MaxFragments=2') as snippet
-        FROM knowledge_entries ke
-        LEFT JOIN knowledge_projects kp ON ke.project_id = kp.id
-        LEFT JOIN knowledge_sources ks ON ke.source_id = ks.id
-        WHERE ke.search_vector @@ plainto_tsquery('english', $1)
-        AND ke.processed = true
-        ORDER BY search_rank DESC, ke.relevance_score DESC, ke.access_count DESC
-        LIMIT $2;
-        """
+    async def _execute_hybrid_search(self, fts_query: str, raw_query: str, limit: int) -> List[Dict]:
+        """Execute the hybrid full-text + trigram search (single round-trip)"""
+        # LIMIT 0 skips the literal-match branch entirely
+        pattern_candidates = limit * HYBRID_SEARCH_CONFIG['pattern_candidates_factor']
+        pattern_scan = limit * HYBRID_SEARCH_CONFIG['pattern_scan_factor']
+        if len(raw_query.strip()) < HYBRID_SEARCH_CONFIG['pattern_min_length']:
+            pattern_candidates = pattern_scan = 0
         
         try:
-            results = await db_manager.fetch_all(search_query, query, limit)
+            results = await db_manager.fetch_all(
+                HYBRID_SEARCH_QUERY,
+                fts_query,
+                raw_query,
+                f'%{raw_query}%',
+                limit * HYBRID_SEARCH_CONFIG['fts_candidates_factor'],
+                pattern_candidates,
+                HYBRID_SEARCH_CONFIG['pattern_weight'],
+                pattern_scan
+            )
             
             # Convert to list of dicts with proper formatting
             knowledge_results = []
@@ -402,7 +337,9 @@ class KnowledgeQueryEngine:
                     'source_name': row['source_name'],
                     'source_type': row['source_type'],
                     'search_rank': float(row['search_rank']) if row['search_rank'] else 0.0,
-                    'snippet': row['snippet'],
+                    'fts_rank': float(row['fts_rank']),
+                    'pattern_rank': float(row['pattern_rank']),
+                    'snippet': None,
                     'summary': row['summary'],
                     'created_at': row['created_at'].isoformat() if row['created_at'] else None
                 }
@@ -414,6 +351,18 @@ class KnowledgeQueryEngine:
             logger.error(f"Knowledge search failed: {e}")
             return []
     
+    async def _fetch_headlines(self, fts_query: str, raw_query: str, entry_ids: List[Any]) -> Dict[Any, str]:
+        """Build snippets for the final results only"""
+        if not entry_ids:
+            return {}
+        
+        try:
+            rows = await db_manager.fetch_all(HEADLINE_QUERY, fts_query, raw_query, entry_ids)
+            return {row['id']: row['snippet'] for row in rows}
+        except Exception as e:
+            logger.error(f"Failed to build knowledge snippets: {e}")
+            return {}
+    
     async def _score_and_rank_results(self,
                                     results: List[Dict],
                                     original_query: str,
@@ -669,13 +618,13 @@ class KnowledgeQueryEngine:
         return quality_suggestions[:limit]
     
     def clear_cache(self):
-        """Clear the knowledge query cache"""
-        self.cache.clear()
+        """Clear this worker's knowledge query cache"""
+        self.cache.local.clear()
         logger.info("Knowledge query cache cleared")
     
     def cleanup_cache(self) -> int:
         """Remove expired cache entries. Returns count of removed entries."""
-        removed = self.cache.cleanup_expired()
+        removed = self.cache.local.cleanup_expired()
         if removed > 0:
             logger.info(f"Cleaned up {removed} expired cache entries")
         return removed
@@ -720,9 +669,9 @@ if __name__ == "__main__":
         engine = KnowledgeQueryEngine()
         
         # Test cache
-        print("\n📦 Testing TTL Cache:")
-        engine.cache.set("test_key", {"data": "test_value"})
-        result = engine.cache.get("test_key")
+        print("\n📦 Testing Cache:")
+        await engine.cache.set("test_key", {"data": "test_value"})
+        result = await engine.cache.get("test_key")
         print(f"  Cache set/get: {'✅ PASS' if result else '❌ FAIL'}")
         print(f"  Cache stats: {engine.cache_stats()}")
         
@@ -6,6 +6,9 @@ Updated: 2025-12-18 - Added notification thread filtering to prevent conversatio
 Updated: 2025-12-26 - Fixed UUID case-sensitivity bug causing every message to load COMPREHENSIVE context
 Updated: 2025-12-29 - Added iOS calendar/reminders integration + FIXED email body not being queried
 Updated: 2025-12-30 - Added iOS music, contacts, location, health/battery context + intent triggers
+Updated: 2026-10-16 - Query planner: concurrent source fetches with deadlines, dedup, per-source timings
+Updated: 2026-10-16 - query_conversations: newest-first keyset scan, notification flag instead of title LIKEs
+Updated: 2026-10-16 - query_meetings: keyword search on the Fathom full-text indexes, with matching transcript segments
 
 PURPOSE:
 Transform Syntax from conversation-window memory to database-driven memory.
@@ -18,18 +21,22 @@ ARCHITECTURE:
 1. Query Functions - One per database table
 2. Context Detection - Determines what level of context to load
 3. Intent Detection - Analyzes user message to decide what to query
-4. Orchestrator - Builds comprehensive context from all sources
-5. Formatters - Presents context in AI-readable format
+4. Query Planner - Turns level + intent into concurrent, deduplicated fetches
+5. Orchestrator - Builds comprehensive context from all sources
+6. Formatters - Presents context in AI-readable format
 
 INTEGRATION:
 Called from modules/ai/router.py before building AI context window
 """
 
+import asyncio
 import logging
 import json
 import re
+import time
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta, timezone
-from typing import Dict, List, Optional, Any, Tuple
+from typing import Dict, List, Optional, Any, Tuple, Callable, Awaitable
 
 # Import database manager
 from modules.core.database import db_manager
@@ -73,19 +80,13 @@ CONTEXT_CONFIG = {
 # These are AI-generated notification threads, NOT user conversations.
 # Including them in memory context causes the AI to regenerate the same content.
 
-EXCLUDED_THREAD_PATTERNS = [
-#    'Bluesky Draft:%',           # AI-generated Bluesky drafts
-#    'Trending Opportunities',     # Trend notifications
-#    'Intelligence Briefings',     # Proactive intelligence
-#    'Weather Alerts',             # Weather notifications
-#    'Prayer Times',               # Prayer reminders
-#    'Meeting Summaries',          # Fathom meeting summaries
-#    'Email Notifications',        # Email alerts
-#    'Calendar Alerts',            # Calendar reminders
-#    'Reminders',                  # General reminders
-#    'Engagement Opportunities',   # Bluesky engagement
-#    'Analytics Reports',          # Analytics notifications
-]
+# Notification threads (Weather Alerts, Bluesky Draft: *, Prayer Times, Trending
+# Opportunities, Meeting Summaries...) are all created with platform = 'system', so
+# conversation_threads.is_notification_thread is derived from that at write time.
+# query_conversations filters on the flag - no per-query title LIKE patterns.
+# Currently OFF: notification threads stay in cross-thread memory.
+
+EXCLUDE_NOTIFICATION_THREADS = False
 
 
 # ============================================================================
@@ -162,13 +163,17 @@ async def query_conversations(
     limit: int = 100,
     keywords: Optional[List[str]] = None,
     exclude_thread_id: Optional[str] = None,
-    include_notification_threads: bool = False
+    include_notification_threads: bool = False,
+    before: Optional[Tuple[datetime, str]] = None
 ) -> List[Dict[str, Any]]:
     """
-    Query conversation_messages across ALL threads
+    Query conversation_messages across ALL threads, newest first
     
     This enables TRUE CROSS-THREAD MEMORY
     
+    Keyset scan on idx_conversation_messages_user_recent (user_id, created_at DESC, id DESC):
+    Postgres reads the newest rows off the index and stops at LIMIT, no window sort.
+    
     Args:
         user_id: User ID to query
         days: Number of days to look back
@@ -177,6 +182,7 @@ async def query_conversations(
         exclude_thread_id: Thread ID to exclude (current thread)
         include_notification_threads: If False, excludes AI-generated notification threads
                                       to prevent regenerating the same content (default: False)
+        before: Keyset cursor - (created_at, id) of the last message of the previous page
     """
     try:
         where_clauses = ["cm.user_id = $1"]
@@ -189,28 +195,24 @@ async def query_conversations(
             where_clauses.append(f"cm.created_at >= NOW() - INTERVAL '1 day' * ${param_count}")
             params.append(days)
         
+        # Next page: strictly older than the cursor row (id breaks created_at ties)
+        if before:
+            where_clauses.append(f"(cm.created_at, cm.id) < (${param_count + 1}, ${param_count + 2})")
+            params.extend(before)
+            param_count += 2
+        
         # Exclude current thread (to avoid duplication)
         if exclude_thread_id:
             param_count += 1
             where_clauses.append(f"NOT (cm.thread_id = ${param_count} AND cm.created_at >= NOW() - INTERVAL '1 hour')")
             params.append(exclude_thread_id)
         
-        # ================================================================
-        # NEW: Exclude notification-generated threads to prevent loops
-        # ================================================================
-        if not include_notification_threads and EXCLUDED_THREAD_PATTERNS:
-            exclusion_conditions = []
-            for pattern in EXCLUDED_THREAD_PATTERNS:
-                param_count += 1
-                exclusion_conditions.append(f"ct.title NOT LIKE ${param_count}")
-                params.append(pattern)
-            
-            if exclusion_conditions:
-                where_clauses.append(f"({' AND '.join(exclusion_conditions)})")
+        # Exclude notification-generated threads to prevent loops (precomputed flag)
+        if not include_notification_threads and EXCLUDE_NOTIFICATION_THREADS:
+            where_clauses.append("ct.is_notification_thread IS NOT TRUE")
         
-        # Build query with JOIN to conversation_threads for title filtering
         query = f"""
-            SELECT DISTINCT ON (cm.id)
+            SELECT
                 cm.id,
                 cm.thread_id,
                 cm.role,
@@ -220,7 +222,7 @@ async def query_conversations(
             FROM conversation_messages cm
             LEFT JOIN conversation_threads ct ON cm.thread_id = ct.id
             WHERE {' AND '.join(where_clauses)}
-            ORDER BY cm.id, cm.created_at DESC
+            ORDER BY cm.created_at DESC, cm.id DESC
             LIMIT ${param_count + 1}
         """
         params.append(limit)
@@ -239,14 +241,37 @@ async def query_conversations(
         return []
 
 
+def conversations_cursor(messages: List[Dict[str, Any]]) -> Optional[Tuple[datetime, str]]:
+    """Keyset cursor for the page after `messages` (pass as query_conversations(before=...))"""
+    if not messages:
+        return None
+    last = messages[-1]
+    return (last['created_at'], last['id'])
+
+
 async def query_meetings(
     user_id: str,
     days: int = 14,
     limit: int = 10,
     keywords: Optional[List[str]] = None
 ) -> List[Dict[str, Any]]:
-    """Query fathom_meetings for recent meeting summaries"""
+    """
+    Query fathom_meetings for recent meeting summaries.
+
+    With keywords, meetings are ranked on the stored search vectors and carry
+    their matching transcript segments ('matching_segments'); if nothing
+    matches, the most recent meetings are returned as before.
+    """
     try:
+        if keywords:
+            from modules.integrations.fathom.database_manager import FathomDatabaseManager
+            meetings = await FathomDatabaseManager().search_meetings(
+                ' '.join(keywords), limit, match='any', days=days
+            )
+            if meetings:
+                logger.info(f"📅 Found {len(meetings)} meetings matching keywords")
+                return meetings
+
         query = """
             SELECT 
                 id,
@@ -1089,6 +1114,12 @@ def format_meetings_context(meetings: List[Dict]) -> str:
                 lines.append("   Key Points:")
                 for point in points[:3]:
                     lines.append(f"     • {point}")
+
+        if meeting.get('matching_segments'):
+            lines.append("   Matching Transcript Segments:")
+            for segment in meeting['matching_segments']:
+                timestamp = f"[{segment['timestamp']}] " if segment.get('timestamp') else ""
+                lines.append(f"     • {timestamp}{' '.join(segment['snippet'].split())}")
     
     lines.extend([
         "",
@@ -1673,6 +1704,302 @@ def format_health_context(device_context: Dict) -> str:
     return "\n".join(lines)
 
 
+# ============================================================================
+# QUERY PLANNER
+# ============================================================================
+# Turns context level + intent into a set of independent source fetches,
+# runs them concurrently, and assembles formatted sections in plan order.
+# Identical fetches (same function + args) are deduplicated, so sections
+# that share a source (e.g. location + health) cost one round-trip.
+
+PLANNER_CONFIG = {
+    'source_timeout_seconds': 2.5,   # Per-source deadline
+    'total_budget_seconds': 4.0,     # Deadline for the whole fan-out
+    'max_concurrent_sources': 6,     # Fetches in flight at once - below the DB pool's 10 connections
+}
+
+# Per-source latency from the most recent build_memory_context() call
+_last_source_timings: Dict[str, Dict[str, Any]] = {}
+
+
+@dataclass
+class SourceFetch:
+    """One query against one data source. Fetches with equal keys are deduplicated."""
+    name: str
+    func: Callable[..., Awaitable[Any]]
+    kwargs: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def key(self) -> Tuple:
+        return (self.name, tuple(sorted((k, repr(v)) for k, v in self.kwargs.items())))
+
+
+@dataclass
+class PlannedSection:
+    """A formatted context section, built from the result of one fetch."""
+    fetch: SourceFetch
+    formatter: Callable[[Any], Optional[str]]
+
+
+class QueryPlan:
+    """Ordered list of sections plus the deduplicated set of fetches behind them."""
+
+    def __init__(self):
+        self.sections: List[PlannedSection] = []
+        self.fetches: Dict[Tuple, SourceFetch] = {}
+
+    def add(
+        self,
+        name: str,
+        func: Callable[..., Awaitable[Any]],
+        formatter: Callable[[Any], Optional[str]],
+        **kwargs
+    ) -> None:
+        fetch = SourceFetch(name=name, func=func, kwargs=kwargs)
+        fetch = self.fetches.setdefault(fetch.key, fetch)
+        self.sections.append(PlannedSection(fetch=fetch, formatter=formatter))
+
+    async def execute(self) -> Tuple[List[str], Dict[str, Dict[str, Any]]]:
+        """
+        Run all fetches concurrently (at most max_concurrent_sources at a time,
+        so one briefing can't take the whole connection pool), then format
+        sections in plan order. A source's deadline starts once it gets a slot.
+
+        Returns:
+            (context_parts, timings) - timings maps fetch label to
+            {'ms': float, 'status': 'ok' | 'timeout' | 'error' | 'over_budget'}
+        """
+        timings: Dict[str, Dict[str, Any]] = {}
+        source_timeout = PLANNER_CONFIG['source_timeout_seconds']
+        slots = asyncio.Semaphore(PLANNER_CONFIG['max_concurrent_sources'])
+
+        async def run(fetch: SourceFetch) -> Any:
+            label = _fetch_label(fetch)
+            async with slots:
+                start = time.perf_counter()
+                try:
+                    result = await asyncio.wait_for(fetch.func(**fetch.kwargs), timeout=source_timeout)
+                    timings[label] = {'ms': _elapsed_ms(start), 'status': 'ok'}
+                    return result
+                except asyncio.TimeoutError:
+                    timings[label] = {'ms': _elapsed_ms(start), 'status': 'timeout'}
+                    logger.warning(f"⏱️ Memory source '{label}' exceeded {source_timeout}s deadline - skipped")
+                except Exception as e:
+                    timings[label] = {'ms': _elapsed_ms(start), 'status': 'error'}
+                    logger.error(f"❌ Memory source '{label}' failed: {e}")
+                return None
+
+        tasks = {key: asyncio.create_task(run(fetch)) for key, fetch in self.fetches.items()}
+        start = time.perf_counter()
+        if tasks:
+            _, pending = await asyncio.wait(
+                tasks.values(),
+                timeout=PLANNER_CONFIG['total_budget_seconds']
+            )
+            for task in pending:
+                task.cancel()
+            # Let the cancelled fetches unwind (and hand back their connections) before returning
+            await asyncio.gather(*pending, return_exceptions=True)
+            for key, task in tasks.items():
+                if task in pending:
+                    timings[_fetch_label(self.fetches[key])] = {'ms': _elapsed_ms(start), 'status': 'over_budget'}
+
+        results = {
+            key: task.result()
+            for key, task in tasks.items()
+            if task.done() and not task.cancelled()
+        }
+
+        context_parts = []
+        for section in self.sections:
+            result = results.get(section.fetch.key)
+            formatted = section.formatter(result)
+            if formatted:
+                context_parts.append(formatted)
+
+        return context_parts, timings
+
+
+def _elapsed_ms(start: float) -> float:
+    return round((time.perf_counter() - start) * 1000, 1)
+
+
+def _fetch_label(fetch: SourceFetch) -> str:
+    """Human-readable label; disambiguates same-named fetches with different args."""
+    if fetch.name == 'conversations':
+        return f"conversations_{fetch.kwargs.get('days')}d"
+    return fetch.name
+
+
+def _format_if(formatter: Callable[[Any], str]) -> Callable[[Any], Optional[str]]:
+    """Wrap a formatter so empty/None results produce no section."""
+    return lambda result: formatter(result) if result else None
+
+
+def _format_music_or_empty(music: Optional[Dict]) -> str:
+    if music:
+        return format_music_context(music)
+    # Let the AI know we checked but nothing is playing
+    return "\n🎵 No music currently playing (checked iOS device)\n"
+
+
+def _extract_contact_search_term(user_message: str) -> Optional[str]:
+    """Try to extract a contact name from the query"""
+    name_patterns = [
+        r"who is (\w+)",
+        r"contact (?:for |info for )?(\w+)",
+        r"(\w+)'s (?:number|email|phone|contact)",
+        r"call (\w+)",
+        r"text (\w+)",
+        r"email (\w+)"
+    ]
+    for pattern in name_patterns:
+        match = re.search(pattern, user_message.lower())
+        if match:
+            return match.group(1)
+    return None
+
+
+def _log_warm_conversations(hot_count: int) -> Callable[[Any], None]:
+    """Warm cache is not injected - just note that deeper history exists."""
+    def formatter(older_conversations):
+        if older_conversations and len(older_conversations) > hot_count:
+            logger.info(f"📚 Loaded {len(older_conversations)} total conversations (warm cache)")
+        return None
+    return formatter
+
+
+def plan_memory_queries(
+    user_id: str,
+    user_message: str,
+    thread_id: Optional[str],
+    context_level: str,
+    intent: Dict[str, bool]
+) -> QueryPlan:
+    """
+    Build the query plan for a message.
+
+    Section order here IS the order sections appear in the final context,
+    regardless of which fetch finishes first.
+    """
+    plan = QueryPlan()
+    limits = CONTEXT_CONFIG['limits']
+
+    # ALWAYS: Load recent conversations (hot cache)
+    # NOTE: Notification threads are EXCLUDED by default to prevent loops
+    plan.add(
+        'conversations', query_conversations, _format_if(format_conversations_context),
+        user_id=user_id,
+        days=CONTEXT_CONFIG['hot_cache_days'],
+        limit=limits['hot_conversations'],
+        exclude_thread_id=thread_id,
+        include_notification_threads=False
+    )
+
+    # COMPREHENSIVE/FULL: Load additional conversation history
+    if context_level in ['comprehensive', 'full']:
+        plan.add(
+            'conversations', query_conversations, _log_warm_conversations(limits['hot_conversations']),
+            user_id=user_id,
+            days=CONTEXT_CONFIG['warm_cache_days'],
+            limit=limits['warm_conversations'],
+            exclude_thread_id=thread_id,
+            include_notification_threads=False
+        )
+
+    # FULL: Load everything including iOS data
+    if context_level == 'full' or intent['needs_briefing']:
+        logger.info("📊 Full briefing mode - loading all data sources")
+        plan.add('meetings', query_meetings, _format_if(format_meetings_context),
+                 user_id=user_id, days=14, limit=limits['meetings'])
+        plan.add('calendar', query_calendar, _format_if(format_calendar_context),
+                 user_id=user_id, days_ahead=7, limit=limits['calendar_events'])
+        plan.add('ios_calendar', query_ios_calendar, _format_if(format_ios_calendar_context),
+                 user_id=user_id, days_ahead=7, limit=limits['ios_calendar'])
+        plan.add('ios_reminders', query_ios_reminders, _format_if(format_ios_reminders_context),
+                 user_id=user_id, include_completed=False, limit=limits['ios_reminders'])
+        plan.add('music', get_current_music, _format_if(format_music_context),
+                 user_id=user_id)
+        plan.add('device_context', get_device_context, _format_if(format_location_context),
+                 user_id=user_id)
+        plan.add('device_context', get_device_context, _format_if(format_health_context),
+                 user_id=user_id)
+        plan.add('emails', query_emails, _format_if(format_emails_context),
+                 user_id=user_id, days=7, limit=limits['emails'],
+                 unread_only=False, important_only=False)
+        plan.add('tasks', query_tasks, _format_if(format_tasks_context),
+                 user_id=user_id, limit=limits['tasks'])
+        plan.add('trends', query_trends, _format_if(format_trends_context),
+                 user_id=user_id, days=7, limit=limits['trends'])
+        plan.add('weather', query_weather, _format_if(format_weather_context),
+                 user_id=user_id)
+        return plan
+
+    # INTENT-BASED: Query specific databases based on user message
+    if intent['query_meetings']:
+        plan.add('meetings', query_meetings, _format_if(format_meetings_context),
+                 user_id=user_id, days=14, limit=10, keywords=[user_message])
+
+    if intent['query_emails']:
+        plan.add('emails', query_emails, _format_if(format_emails_context),
+                 user_id=user_id, days=7, limit=15)
+
+    if intent['query_calendar']:
+        # Query both Google and iOS calendars
+        plan.add('calendar', query_calendar, _format_if(format_calendar_context),
+                 user_id=user_id, days_ahead=7, limit=20)
+        plan.add('ios_calendar', query_ios_calendar, _format_if(format_ios_calendar_context),
+                 user_id=user_id, days_ahead=7, limit=20)
+
+    if intent['query_trends']:
+        plan.add('trends', query_trends, _format_if(format_trends_context),
+                 user_id=user_id, days=7, limit=10)
+
+    if intent['query_knowledge']:
+        plan.add('knowledge', query_knowledge_base, _format_if(format_knowledge_context),
+                 user_id=user_id, query_text=user_message, limit=limits['knowledge_base'])
+
+    if intent['query_weather']:
+        plan.add('weather', query_weather, _format_if(format_weather_context),
+                 user_id=user_id)
+
+    if intent['query_tasks']:
+        plan.add('tasks', query_tasks, _format_if(format_tasks_context),
+                 user_id=user_id, limit=15)
+
+    if intent['query_ios_reminders']:
+        plan.add('ios_reminders', query_ios_reminders, _format_if(format_ios_reminders_context),
+                 user_id=user_id, limit=20)
+
+    if intent['query_music']:
+        plan.add('music', get_current_music, _format_music_or_empty, user_id=user_id)
+
+    if intent['query_contacts']:
+        search_term = _extract_contact_search_term(user_message)
+        plan.add('contacts', query_ios_contacts,
+                 _format_if(lambda contacts: format_contacts_context(contacts, search_term)),
+                 user_id=user_id, search_term=search_term, limit=limits['ios_contacts'])
+
+    # Location and health share one device_context fetch
+    if intent['query_location']:
+        plan.add('device_context', get_device_context, _format_if(format_location_context),
+                 user_id=user_id)
+
+    if intent['query_health']:
+        plan.add('device_context', get_device_context, _format_if(format_health_context),
+                 user_id=user_id)
+
+    return plan
+
+
+def get_last_source_timings() -> Dict[str, Dict[str, Any]]:
+    """
+    Per-source latency from the most recent memory context build.
+    Use this to see which source dominates time-to-first-token.
+    """
+    return dict(_last_source_timings)
+
+
 # ============================================================================
 # MAIN ORCHESTRATOR
 # ============================================================================
@@ -1688,9 +2015,13 @@ async def build_memory_context(
     2. Query intent (what the user is asking about)
     
     This is called BEFORE building the AI prompt to inject relevant memory.
+    Sources are fetched concurrently via the query planner; total latency
+    is bounded by the slowest source (capped by PLANNER_CONFIG), not the sum.
     
     NO LOOPS: This function only QUERIES data, never triggers actions.
     """
+    global _last_source_timings
+    
     try:
         logger.info("="*80)
         logger.info("🧠 MEMORY QUERY LAYER - Starting context build")
@@ -1702,216 +2033,11 @@ async def build_memory_context(
         # Step 2: Detect query intent
         intent = detect_query_intent(user_message)
         
-        # Step 3: Build context based on level and intent
-        context_parts = []
-        
-        # ALWAYS: Load recent conversations (hot cache)
-        # NOTE: Notification threads are now EXCLUDED by default to prevent loops
-        conversations = await query_conversations(
-            user_id=user_id,
-            days=CONTEXT_CONFIG['hot_cache_days'],
-            limit=CONTEXT_CONFIG['limits']['hot_conversations'],
-            exclude_thread_id=thread_id,
-            include_notification_threads=False  # Prevents regenerating AI drafts
-        )
-        if conversations:
-            context_parts.append(format_conversations_context(conversations))
-        
-        # COMPREHENSIVE/FULL: Load additional conversation history
-        if context_level in ['comprehensive', 'full']:
-            older_conversations = await query_conversations(
-                user_id=user_id,
-                days=CONTEXT_CONFIG['warm_cache_days'],
-                limit=CONTEXT_CONFIG['limits']['warm_conversations'],
-                exclude_thread_id=thread_id,
-                include_notification_threads=False  # Prevents regenerating AI drafts
-            )
-            # Don't duplicate, just note we have deeper history
-            if older_conversations and len(older_conversations) > len(conversations):
-                logger.info(f"📚 Loaded {len(older_conversations)} total conversations (warm cache)")
-        
-        # FULL: Load everything including iOS data
-        if context_level == 'full' or intent['needs_briefing']:
-            logger.info("📊 Full briefing mode - loading all data sources")
-            
-            # Meetings
-            meetings = await query_meetings(
-                user_id=user_id,
-                days=14,
-                limit=CONTEXT_CONFIG['limits']['meetings']
-            )
-            if meetings:
-                context_parts.append(format_meetings_context(meetings))
-            
-            # Google Calendar
-            calendar = await query_calendar(
-                user_id=user_id,
-                days_ahead=7,
-                limit=CONTEXT_CONFIG['limits']['calendar_events']
-            )
-            if calendar:
-                context_parts.append(format_calendar_context(calendar))
-            
-            # iOS Calendar
-            ios_calendar = await query_ios_calendar(
-                user_id=user_id,
-                days_ahead=7,
-                limit=CONTEXT_CONFIG['limits']['ios_calendar']
-            )
-            if ios_calendar:
-                context_parts.append(format_ios_calendar_context(ios_calendar))
-            
-            # iOS Reminders
-            ios_reminders = await query_ios_reminders(
-                user_id=user_id,
-                include_completed=False,
-                limit=CONTEXT_CONFIG['limits']['ios_reminders']
-            )
-            if ios_reminders:
-                context_parts.append(format_ios_reminders_context(ios_reminders))
-            
-            # Current Music
-            current_music = await get_current_music(user_id)
-            if current_music:
-                context_parts.append(format_music_context(current_music))
-            
-            # Device Context (Location + Health/Battery)
-            device_context = await get_device_context(user_id)
-            if device_context:
-                context_parts.append(format_location_context(device_context))
-                context_parts.append(format_health_context(device_context))
-            
-            # Emails (FIXED - now includes body!)
-            emails = await query_emails(
-                user_id=user_id,
-                days=7,
-                limit=CONTEXT_CONFIG['limits']['emails'],
-                unread_only=False,
-                important_only=False
-            )
-            if emails:
-                context_parts.append(format_emails_context(emails))
-            
-            # Tasks
-            tasks = await query_tasks(
-                user_id=user_id,
-                limit=CONTEXT_CONFIG['limits']['tasks']
-            )
-            if tasks:
-                context_parts.append(format_tasks_context(tasks))
-            
-            # Trends
-            trends = await query_trends(
-                user_id=user_id,
-                days=7,
-                limit=CONTEXT_CONFIG['limits']['trends']
-            )
-            if trends:
-                context_parts.append(format_trends_context(trends))
-            
-            # Weather
-            weather = await query_weather(user_id)
-            if weather:
-                context_parts.append(format_weather_context(weather))
-        
-        # INTENT-BASED: Query specific databases based on user message
-        else:
-            if intent['query_meetings']:
-                meetings = await query_meetings(user_id=user_id, days=14, limit=10)
-                if meetings:
-                    context_parts.append(format_meetings_context(meetings))
-            
-            if intent['query_emails']:
-                emails = await query_emails(user_id=user_id, days=7, limit=15)
-                if emails:
-                    context_parts.append(format_emails_context(emails))
-            
-            if intent['query_calendar']:
-                # Query both Google and iOS calendars
-                calendar = await query_calendar(user_id=user_id, days_ahead=7, limit=20)
-                if calendar:
-                    context_parts.append(format_calendar_context(calendar))
-                
-                ios_calendar = await query_ios_calendar(user_id=user_id, days_ahead=7, limit=20)
-                if ios_calendar:
-                    context_parts.append(format_ios_calendar_context(ios_calendar))
-            
-            if intent['query_trends']:
-                trends = await query_trends(user_id=user_id, days=7, limit=10)
-                if trends:
-                    context_parts.append(format_trends_context(trends))
-            
-            if intent['query_knowledge']:
-                knowledge = await query_knowledge_base(
-                    user_id=user_id,
-                    query_text=user_message,
-                    limit=CONTEXT_CONFIG['limits']['knowledge_base']
-                )
-                if knowledge:
-                    context_parts.append(format_knowledge_context(knowledge))
-            
-            if intent['query_weather']:
-                weather = await query_weather(user_id)
-                if weather:
-                    context_parts.append(format_weather_context(weather))
-            
-            if intent['query_tasks']:
-                tasks = await query_tasks(user_id=user_id, limit=15)
-                if tasks:
-                    context_parts.append(format_tasks_context(tasks))
-            
-            # iOS Reminders - triggered by reminder keywords
-            if intent['query_ios_reminders']:
-                ios_reminders = await query_ios_reminders(user_id=user_id, limit=20)
-                if ios_reminders:
-                    context_parts.append(format_ios_reminders_context(ios_reminders))
-            
-            # Music - triggered by music keywords (NEW)
-            if intent['query_music']:
-                current_music = await get_current_music(user_id)
-                if current_music:
-                    context_parts.append(format_music_context(current_music))
-                else:
-                    # Let the AI know we checked but nothing is playing
-                    context_parts.append("\n🎵 No music currently playing (checked iOS device)\n")
-            
-            # Contacts - triggered by contact keywords (NEW)
-            if intent['query_contacts']:
-                # Try to extract a name from the query
-                search_term = None
-                name_patterns = [
-                    r"who is (\w+)",
-                    r"contact (?:for |info for )?(\w+)",
-                    r"(\w+)'s (?:number|email|phone|contact)",
-                    r"call (\w+)",
-                    r"text (\w+)",
-                    r"email (\w+)"
-                ]
-                for pattern in name_patterns:
-                    match = re.search(pattern, user_message.lower())
-                    if match:
-                        search_term = match.group(1)
-                        break
-                
-                contacts = await query_ios_contacts(
-                    user_id=user_id,
-                    search_term=search_term,
-                    limit=CONTEXT_CONFIG['limits']['ios_contacts']
-                )
-                if contacts:
-                    context_parts.append(format_contacts_context(contacts, search_term))
-            
-            # Location - triggered by location keywords (NEW)
-            if intent['query_location']:
-                device_context = await get_device_context(user_id)
-                if device_context:
-                    context_parts.append(format_location_context(device_context))
-            
-            # Health/Battery - triggered by health keywords (NEW)
-            if intent['query_health']:
-                device_context = await get_device_context(user_id)
-                if device_context:
-                    context_parts.append(format_health_context(device_context))
+        # Step 3: Plan and run all source fetches concurrently
+        plan = plan_memory_queries(user_id, user_message, thread_id, context_level, intent)
+        build_start = time.perf_counter()
+        context_parts, timings = await plan.execute()
+        _last_source_timings = timings
         
         # Combine all context parts
         if not context_parts:
@@ -1920,6 +2046,8 @@ async def build_memory_context(
         
         full_context = "\n".join(context_parts)
         
+        slowest = max(timings.items(), key=lambda item: item[1]['ms'], default=None)
+        
         # Use atomic summary logging to prevent interleaving with concurrent requests
         # This replaces multiple logger.info calls that could be split across threads
         log_summary(
@@ -1929,6 +2057,9 @@ async def build_memory_context(
                 "level": context_level,
                 "sources": len(context_parts),
                 "threads": len([p for p in context_parts if "CONVERSATION" in p]),
+                "fetches": len(plan.fetches),
+                "fetch_ms": _elapsed_ms(build_start),
+                "slowest": f"{slowest[0]} ({slowest[1]['ms']}ms)" if slowest else "n/a",
             },
             logger_name=__name__
         )
@@ -1946,4 +2077,4 @@ async def build_memory_context(
 # EXPORT
 # ============================================================================
 
-__all__ = ['build_memory_context']
+__all__ = ['build_memory_context', 'get_last_source_timings', 'query_conversations', 'conversations_cursor']
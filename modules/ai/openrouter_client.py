@@ -278,23 +278,25 @@ class OpenRouterClient:
         payload.pop('requirements', None)
         payload.pop('task_type', None)
         
+        # Streaming: return a generator that owns the HTTP response for its
+        # whole lifetime (returning from inside `async with` would close it)
+        if stream:
+            return self._stream_completion(payload)
+        
         session = await self._get_session()
         
         try:
             async with session.post(f"{self.base_url}/chat/completions", json=payload) as response:
                 if response.status == 200:
-                    if stream:
-                        return self._handle_stream_response(response)
-                    else:
-                        result = await response.json()
-                        # Add metadata
-                        result['_metadata'] = {
-                            'model_used': model,
-                            'task_type': task_type or 'default',
-                            'timestamp': datetime.utcnow().isoformat(),
-                            'response_time_ms': None  # Could add timing if needed
-                        }
-                        return result
+                    result = await response.json()
+                    # Add metadata
+                    result['_metadata'] = {
+                        'model_used': model,
+                        'task_type': task_type or 'default',
+                        'timestamp': datetime.utcnow().isoformat(),
+                        'response_time_ms': None  # Could add timing if needed
+                    }
+                    return result
                 else:
                     error_text = await response.text()
                     logger.error(f"OpenRouter API error {response.status}: {error_text}")
@@ -304,6 +306,22 @@ class OpenRouterClient:
             logger.error(f"Error in chat completion: {e}")
             raise
     
+    async def _stream_completion(self, payload: Dict) -> AsyncGenerator[Dict, None]:
+        """
+        Stream a chat completion, yielding OpenRouter chunks as they arrive.
+        The HTTP response stays open until the caller finishes iterating.
+        """
+        session = await self._get_session()
+        
+        async with session.post(f"{self.base_url}/chat/completions", json=payload) as response:
+            if response.status != 200:
+                error_text = await response.text()
+                logger.error(f"OpenRouter API error {response.status}: {error_text}")
+                raise Exception(f"OpenRouter API error: {response.status}")
+            
+            async for chunk in self._handle_stream_response(response):
+                yield chunk
+    
     async def _handle_stream_response(self, response) -> AsyncGenerator[Dict, None]:
         """Handle streaming response from OpenRouter"""
         async for line in response.content:
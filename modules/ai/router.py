@@ -7,6 +7,8 @@ Date: 9/27/25 - Added extensive debugging and fixed critical bugs
 Date: 9/27/25 - Added prayer notifications, location detection, and Google Trends integration
 Date: 9/28/25 - Added Voice Synthesis and Image Generation to integration chain
 Date: 2/3/26 - Added project_id support for Claude-style project folders
+Date: 10/16/26 - Added /chat/stream (SSE token streaming)
+Date: 10/16/26 - /chat-json document text comes from the shared extraction pool
 """
 
 __all__ = [
@@ -46,10 +48,13 @@ from .openrouter_client import get_openrouter_client, cleanup_openrouter_client
 from .inception_client import get_inception_client, cleanup_inception_client
 from .conversation_manager import get_memory_manager, cleanup_memory_managers
 from .knowledge_query import get_knowledge_engine
+from ..core.cache import get_all_cache_stats
+from ..core.document_extractor import get_document_extractor
 from .personality_engine import get_personality_engine
 from .feedback_processor import get_feedback_processor
 
-from modules.ai.memory_query_layer import build_memory_context
+from modules.ai.memory_query_layer import build_memory_context, get_last_source_timings
+from .command_router import get_command_router, MessageClassification
 
 logger = logging.getLogger(__name__)
 
@@ -155,6 +160,170 @@ async def get_current_user_id() -> str:
     """Get current user ID - placeholder for now"""
     return DEFAULT_USER_ID
 
+#-- Shared AI Message Assembly (used by /chat and /chat/stream)
+async def _build_ai_messages(
+    message: str,
+    message_content: str,
+    thread_id: str,
+    personality_id: str,
+    project_id: Optional[str],
+    include_knowledge: bool,
+    datetime_context: Dict,
+    image_attachments: Optional[List[Dict]],
+    memory_manager,
+    knowledge_engine,
+    personality_engine,
+    command: Optional[MessageClassification] = None
+) -> tuple[list, Optional[str], list, dict]:
+    """
+    Build the OpenRouter message array for a regular AI turn:
+    conversation history, knowledge base, RSS context, personality prompt,
+    datetime context and the user message (with vision blocks if images).
+    
+    Returns: (ai_messages, model_override, knowledge_sources, context_info)
+    """
+    from .chat import get_rss_marketing_context
+    
+    if command is None:
+        command = get_command_router().classify(message)
+    
+    knowledge_sources = []
+    
+    # Get conversation history
+    logger.info("📚 DEBUG: Getting conversation history...")
+    conversation_history, context_info = await memory_manager.get_context_for_ai(
+        thread_id, max_tokens=20000
+    )
+    logger.info(f"✅ DEBUG: Conversation history retrieved: {context_info.get('total_messages', 0)} messages")
+
+    # Search knowledge base if requested
+    if include_knowledge:
+        logger.info("🔍 DEBUG: Searching knowledge base...")
+        try:
+            knowledge_results = await knowledge_engine.search_knowledge(
+                query=message_content,
+                personality_id=personality_id,
+                limit=5
+            )
+            knowledge_sources = knowledge_results
+            logger.info(f"✅ DEBUG: Knowledge search completed: {len(knowledge_sources)} sources found")
+        except Exception as e:
+            logger.error(f"❌ DEBUG: Knowledge search failed: {e}")
+            knowledge_sources = []
+    else:
+        logger.info("⭐ DEBUG: Skipping knowledge search (disabled)")
+        knowledge_sources = []
+
+    # Get RSS marketing context for writing assistance (integration #3)
+    rss_context = ""
+    if command.has('rss') or command.has('writing_context'):
+        logger.info("📰 DEBUG: Adding RSS Learning context to AI response...")
+        try:
+            rss_context = await get_rss_marketing_context(message)
+            logger.info(f"✅ DEBUG: RSS context retrieved (length: {len(rss_context)} chars)")
+        except Exception as e:
+            logger.error(f"❌ DEBUG: RSS context failed: {e}")
+            rss_context = ""
+
+    # Build system prompt with personality (now async with project support - 2/3/26)
+    logger.info("🎭 DEBUG: Building personality system prompt...")
+    try:
+        personality_prompt = await personality_engine.get_personality_system_prompt(
+            personality_id,
+            conversation_context=conversation_history,
+            project_id=project_id
+        )
+        logger.info(f"✅ DEBUG: Personality prompt generated (length: {len(personality_prompt)} chars)")
+        if project_id:
+            logger.info(f"📂 DEBUG: Project instructions included for project_id: {project_id}")
+    except Exception as e:
+        logger.error(f"❌ DEBUG: Personality prompt generation failed: {e}")
+        personality_prompt = "You are a helpful AI assistant."
+
+    # Create enhanced system prompt with context
+    system_parts = [
+        personality_prompt,
+        f"""Current DateTime Context: {datetime_context['full_datetime']}
+Today is {datetime_context.get('day_of_week', 'Unknown')}, {datetime_context.get('month_name', 'Unknown')} {datetime_context.get('current_date', 'Unknown')}.
+Current time: {datetime_context.get('current_time_12h', 'Unknown')} ({datetime_context.get('timezone', 'Unknown')})
+
+User Context: The user is asking questions on {datetime_context['full_datetime']}.
+When discussing time or dates, use the current information provided above.
+
+Integration Status: All systems active - Weather, Bluesky, RSS Learning, Marketing Scraper, Prayer Times, Google Trends, Voice Synthesis, Image Generation, and Health monitoring are available via chat commands."""
+    ]
+
+    # Add RSS context if available
+    if rss_context:
+        system_parts.append(rss_context)
+        logger.info("📰 DEBUG: RSS context added to system prompt")
+
+    # Add knowledge context
+    if knowledge_sources:
+        knowledge_context = "RELEVANT KNOWLEDGE BASE INFORMATION:\n"
+        for source in knowledge_sources:
+            knowledge_context += f"- {source['title']}: {source['content'][:200]}...\n"
+        system_parts.append(knowledge_context)
+        logger.info(f"📚 DEBUG: Knowledge context added: {len(knowledge_sources)} sources")
+
+    # Build AI messages
+    logger.info("💬 DEBUG: Building AI message array...")
+    ai_messages = [{
+        "role": "system",
+        "content": "\n\n".join(system_parts)
+    }]
+
+    # Add conversation history
+    ai_messages.extend(conversation_history)
+    logger.info(f"✅ DEBUG: AI messages array built: {len(ai_messages)} total messages")
+
+    # Add current message
+    # Add user message with vision support if images are present
+    has_images = bool(image_attachments)
+
+    if has_images:
+        # Vision-enabled message format (array of content blocks)
+        logger.info(f"📸 Building vision message with {len(image_attachments)} images")
+
+        content_blocks = [
+            {
+                "type": "text",
+                "text": message_content
+            }
+        ]
+
+        # Add images using image_url format
+        logger.info(f"🔍 DEBUG: image_attachments contents:")
+        for idx, img in enumerate(image_attachments):
+            logger.info(f"🔍 DEBUG [{idx}]: filename={img.get('filename')}, type={img.get('type')}, media_type={img.get('media_type')}")
+
+        for img in image_attachments:
+            content_blocks.append({
+                "type": "image_url",
+                "image_url": {
+                    "url": f"data:{img['media_type']};base64,{img['base64']}"
+                }
+            })
+            logger.info(f"📸 Added image to request: {img['filename']}")
+
+        ai_messages.append({
+            "role": "user",
+            "content": content_blocks  # Array format for vision
+        })
+
+        # Force vision-capable model for images
+        model_override = "anthropic/claude-3.5-sonnet"
+        logger.info(f"📸 Using vision model: {model_override}")
+    else:
+        # Text-only message (original format)
+        ai_messages.append({
+            "role": "user",
+            "content": message_content
+        })
+        model_override = None
+    
+    return ai_messages, model_override, knowledge_sources, context_info
+
 #-- Main Chat Endpoint (THE CORE FUNCTIONALITY WITH EXTENSIVE DEBUG)
 @router.post("/chat", response_model=ChatResponse)
 async def chat_with_ai(
@@ -308,25 +477,24 @@ async def chat_with_ai(
         try:
             from .chat import (
                  get_current_datetime_context,
-                 detect_weather_request, get_weather_for_user,get_weather_forecast_for_user,
-                 detect_prayer_command, process_prayer_command,
-                 detect_bluesky_reply_approval, post_bluesky_reply_from_thread,
-                 detect_prayer_notification_command, process_prayer_notification_command,
-                 detect_intelligence_command, handle_intelligence_command,
-                 detect_location_command, process_location_command,
-                 detect_bluesky_command, process_bluesky_command,
-                 detect_rss_command, get_rss_marketing_context,
-                 detect_scraper_command, process_scraper_command,
-                 detect_trends_command, process_trends_command,
-                 detect_voice_command, process_voice_command,
-                 detect_image_command, process_image_command,
-                 detect_google_command, process_google_command,
-                 detect_pattern_complaint, handle_pattern_complaint,
-                 detect_reminder_command, process_reminder_create,
+                 get_weather_for_user, get_weather_forecast_for_user,
+                 process_prayer_command,
+                 post_bluesky_reply_from_thread,
+                 process_prayer_notification_command,
+                 handle_intelligence_command,
+                 process_location_command,
+                 process_bluesky_command,
+                 process_scraper_command,
+                 process_trends_command,
+                 process_voice_command,
+                 process_image_command,
+                 process_google_command,
+                 handle_pattern_complaint,
+                 process_reminder_create,
                  process_reminder_list, process_reminder_cancel,
-                 detect_email_detail_command, process_email_detail_command,
-                 detect_draft_creation_command, process_draft_creation_command, detect_meeting_query,
-                 detect_show_meetings_command, format_recent_meetings_response,
+                 process_email_detail_command,
+                 process_draft_creation_command,
+                 format_recent_meetings_response,
                  search_meetings, get_recent_meetings_context # NEW 10/2/25
             )
             logger.info("✅ DEBUG: All chat helper functions loaded successfully")
@@ -439,9 +607,13 @@ async def chat_with_ai(
         
         logger.info("🔍 DEBUG: Starting integration command detection...")
         
+        # Single-pass classification against every integration's triggers
+        command = get_command_router().classify(message)
+        winner_name = command.winner.name if command.winner else None
+        logger.info(f"🧭 DEBUG: Command classification: {command}")
+        
         # 1. 🌦️ Weather command detection (FIRST)
-        logger.info("🌦️ DEBUG: Checking for weather commands...")
-        is_weather, weather_type = detect_weather_request(message)
+        is_weather, weather_type = command.args('weather', (False, None))
 
         if is_weather:
             logger.info(f"✅ DEBUG: Weather command detected - type: {weather_type}")
@@ -500,7 +672,7 @@ Weather data powered by Tomorrow.io"""
                 special_response = f"🌦️ **Weather Processing Error**\n\nError: {str(e)}"
         
         # 🦋 BLUESKY REPLY POSTING FROM THREAD - 11/21/25
-        if detect_bluesky_reply_approval(message) and thread_id:
+        if command.has('bluesky_reply_approval') and thread_id:
             # Check if this thread has Bluesky opportunity data
             thread_messages = await memory_manager.get_conversation_history(thread_id, limit=10)
             opportunity_id = None
@@ -545,7 +717,7 @@ Weather data powered by Tomorrow.io"""
                     )
         
         # 2. 🔵 Bluesky command detection (SECOND)
-        elif detect_bluesky_command(message):
+        elif winner_name == 'bluesky':
             logger.info("🔵 DEBUG: Bluesky command detected - processing...")
             try:
                 # Import directly to avoid cache issues
@@ -586,18 +758,13 @@ Weather data powered by Tomorrow.io"""
                 special_response = f"🔵 **Bluesky Processing Error**\n\nError: {str(e)}"
         
         # 3. 📰 RSS Learning command detection (THIRD)
-        elif detect_rss_command(message):
-            logger.info("📰 DEBUG: RSS Learning command detected - processing...")
+        elif winner_name == 'rss':
             # RSS is handled differently - it provides context rather than direct responses
-            # We'll get the context and let the AI incorporate it naturally
-            try:
-                rss_context = await get_rss_marketing_context(message)
-                logger.info("✅ DEBUG: RSS context retrieved, will process in AI section")
-            except Exception as e:
-                logger.error(f"❌ DEBUG: RSS context retrieval failed: {e}")
+            # The AI section fetches it (once) and lets the AI incorporate it naturally
+            logger.info("📰 DEBUG: RSS Learning command detected - context added in AI section")
         
         # 4. 🔍 Marketing Scraper command detection (FOURTH)
-        elif detect_scraper_command(message):
+        elif winner_name == 'scraper':
             logger.info("🔍 DEBUG: Marketing scraper command detected - processing...")
             try:
                 special_response = await process_scraper_command(message, user_id)
@@ -607,7 +774,7 @@ Weather data powered by Tomorrow.io"""
                 special_response = f"🔍 **Scraper Processing Error**\n\nError: {str(e)}"
         
         # 5. 🕌 Prayer Times command detection (FIFTH) - with IP location
-        elif detect_prayer_command(message):
+        elif winner_name == 'prayer':
             logger.info("🕌 DEBUG: Prayer times command detected - processing with IP location...")
             try:
                 # Get client IP address for location detection
@@ -623,7 +790,7 @@ Weather data powered by Tomorrow.io"""
                 special_response = f"🕌 **Prayer Times Processing Error**\n\nError: {str(e)}"
         
         # 5.1 🔔 Prayer Notification Management (FIFTH-A) - with IP location
-        elif detect_prayer_notification_command(message):
+        elif winner_name == 'prayer_notification':
             logger.info("🔔 DEBUG: Prayer notification command detected")
             try:
                 client_ip = request.client.host if hasattr(request, 'client') and request.client else None
@@ -634,7 +801,7 @@ Weather data powered by Tomorrow.io"""
                 special_response = f"🔔 **Prayer Notification Error**\n\nUnable to process notification request: {str(e)}"
         
         # 5.2 🧠 Intelligence System Commands (FIFTH-B) - added 10/22/25
-        elif detect_intelligence_command(message):
+        elif winner_name == 'intelligence':
             logger.info("🧠 DEBUG: Intelligence system command detected")
             try:
                 special_response = await handle_intelligence_command(message, user_id)
@@ -644,7 +811,7 @@ Weather data powered by Tomorrow.io"""
                 special_response = f"🧠 **Intelligence System Error**\n\nError: {str(e)}"
         
         # 5.2 📍 Location Detection Commands (FIFTH-B)
-        elif detect_location_command(message):
+        elif winner_name == 'location':
             logger.info("📍 DEBUG: Location command detected")
             try:
                 client_ip = request.client.host if hasattr(request, 'client') and request.client else None
@@ -655,10 +822,10 @@ Weather data powered by Tomorrow.io"""
                 special_response = f"📍 **Location Detection Error**\n\nUnable to process location request: {str(e)}"
         
         # 5.3 🚫 Pattern Fatigue Complaints (FIFTH-C)
-        elif detect_pattern_complaint(message)[0]:
+        elif winner_name == 'pattern_complaint':
             logger.info("🚫 DEBUG: Pattern complaint detected")
             try:
-                is_complaint, pattern_type, complaint_text = detect_pattern_complaint(message)
+                is_complaint, pattern_type, complaint_text = command.winner.args
                 special_response = await handle_pattern_complaint(user_id, pattern_type, complaint_text)
                 logger.info("✅ DEBUG: Pattern complaint handled successfully")
             except Exception as e:
@@ -666,7 +833,7 @@ Weather data powered by Tomorrow.io"""
                 special_response = "I understand you want me to stop that pattern. I'll try to be less repetitive."
         
         # 6. 📈 Google Trends command detection (SIXTH)
-        elif detect_trends_command(message)[0]:  # [0] gets the boolean from the tuple
+        elif winner_name == 'trends':
             logger.info("📈 DEBUG: Google Trends command detected - processing...")
             try:
                 special_response = await process_trends_command(message, user_id)
@@ -676,7 +843,7 @@ Weather data powered by Tomorrow.io"""
                 special_response = f"📈 **Google Trends Processing Error**\n\nError: {str(e)}"
         
         # 7. 🎤 Voice Synthesis command detection (SEVENTH) - NEW 9/28/25
-        elif detect_voice_command(message):
+        elif winner_name == 'voice':
             logger.info("🎤 DEBUG: Voice synthesis command detected - processing...")
             try:
                 special_response = await process_voice_command(message, user_id)
@@ -686,7 +853,7 @@ Weather data powered by Tomorrow.io"""
                 special_response = f"🎤 **Voice Synthesis Processing Error**\n\nError: {str(e)}"
         
         # 8. 🎨 Image Generation command detection (EIGHTH) - NEW 9/28/25
-        elif detect_image_command(message):
+        elif winner_name == 'image':
             logger.info("🎨 DEBUG: Image generation command detected - processing...")
             try:
                 special_response = await process_image_command(message, user_id)
@@ -696,8 +863,8 @@ Weather data powered by Tomorrow.io"""
                 special_response = f"🎨 **Image Generation Processing Error**\n\nError: {str(e)}"
         
         # 8.5. ⏰ Reminder commands - 10/16/25
-        elif detect_reminder_command(message):
-            command_type = detect_reminder_command(message)
+        elif winner_name == 'reminder':
+            command_type = command.winner.args
             logger.info(f"⏰ DEBUG: Reminder command detected - type: {command_type}")
             
             try:
@@ -716,7 +883,7 @@ Weather data powered by Tomorrow.io"""
                 special_response = f"⏰ **Reminder Error:** {str(e)}"
         
        # 9. 🔍 Google Workspace command detection (NINTH) - NEW 9/30/25
-        elif detect_google_command(message)[0]:
+        elif winner_name == 'google':
             logger.info("🔍 DEBUG: Google Workspace command detected - processing...")
             try:
                 logger.info(f"🔍 DEBUG: Calling process_google_command with user_id={user_id}")
@@ -730,12 +897,12 @@ Weather data powered by Tomorrow.io"""
                 special_response = f"🔍 **Google Workspace Processing Error**\n\nError: {str(e)}"
         
         # 10. 📧 Email Detail & Draft Commands (TENTH) - NEW 10/2/25
-        elif detect_email_detail_command(message)[0] or detect_draft_creation_command(message)[0]:
+        elif winner_name in ('email_detail', 'draft_creation'):
             logger.info("📧 DEBUG: Email or draft command detected - determining type...")
             
             # Get the actual detection results
-            is_email_cmd, action_type, email_num = detect_email_detail_command(message)
-            is_draft_cmd, draft_email_num, draft_instruction = detect_draft_creation_command(message)
+            is_email_cmd, action_type, email_num = command.args('email_detail', (False, '', None))
+            is_draft_cmd, draft_email_num, draft_instruction = command.args('draft_creation', (False, None, None))
             
             logger.info(f"🔍 DEBUG: Command check - email:{is_email_cmd}, draft:{is_draft_cmd}")
             
@@ -763,7 +930,7 @@ Weather data powered by Tomorrow.io"""
                     special_response = f"✉️ **Draft Creation Error**\n\nError: {str(e)}"
         
         # 10.4 📅 Show Recent Meetings Command (TENTH) - NEW 10/31/25
-        if detect_show_meetings_command(message):
+        if command.has('show_meetings'):
             logger.info("📅 DEBUG: 'Show recent meetings' command detected")
             try:
                 special_response = await format_recent_meetings_response(user_id, days=14, limit=10)
@@ -789,7 +956,7 @@ Weather data powered by Tomorrow.io"""
             logger.error(f"❌ Failed to add proactive meeting context: {e}")
         
         # Check if this is an explicit meeting query
-        is_meeting_query, meeting_query_type = detect_meeting_query(message)
+        is_meeting_query, meeting_query_type = command.args('meeting_query', (False, None))
         
         if is_meeting_query:
             logger.info(f"📅 Meeting query detected: {meeting_query_type}")
@@ -816,7 +983,7 @@ Weather data powered by Tomorrow.io"""
                 logger.error(f"❌ Failed to get meeting context: {e}")
         
     # 11. 🏥 Health Check command detection (NINTH)
-        elif any(term in message.lower() for term in ['health check', 'system status', 'system health', 'how are you feeling']):
+        elif command.has('health_check'):
             logger.info("🏥 DEBUG: Health check command detected - processing...")
             try:
                 from ..core.health import get_health_status
@@ -849,138 +1016,20 @@ All systems operational and ready to assist!"""
             logger.info("🧠 DEBUG: Processing regular AI chat request...")
             
             try:
-                # Get conversation history
-                logger.info("📚 DEBUG: Getting conversation history...")
-                conversation_history, context_info = await memory_manager.get_context_for_ai(
-                    thread_id, max_tokens=20000
+                ai_messages, model_override, knowledge_sources, context_info = await _build_ai_messages(
+                    message=message,
+                    message_content=message_content,
+                    thread_id=thread_id,
+                    personality_id=personality_id,
+                    project_id=project_id,
+                    include_knowledge=include_knowledge,
+                    datetime_context=datetime_context,
+                    image_attachments=image_attachments,
+                    memory_manager=memory_manager,
+                    knowledge_engine=knowledge_engine,
+                    personality_engine=personality_engine,
+                    command=command
                 )
-                logger.info(f"✅ DEBUG: Conversation history retrieved: {context_info.get('total_messages', 0)} messages")
-                
-                # Search knowledge base if requested
-                if include_knowledge:
-                    logger.info("🔍 DEBUG: Searching knowledge base...")
-                    try:
-                        knowledge_results = await knowledge_engine.search_knowledge(
-                            query=message_content,
-                            personality_id=personality_id,
-                            limit=5
-                        )
-                        knowledge_sources = knowledge_results
-                        logger.info(f"✅ DEBUG: Knowledge search completed: {len(knowledge_sources)} sources found")
-                    except Exception as e:
-                        logger.error(f"❌ DEBUG: Knowledge search failed: {e}")
-                        knowledge_sources = []
-                else:
-                    logger.info("⭐ DEBUG: Skipping knowledge search (disabled)")
-                    knowledge_sources = []
-                        
-                # Get RSS marketing context for writing assistance (integration #3)
-                rss_context = ""
-                if detect_rss_command(message) or any(term in message.lower() for term in ['write', 'content', 'marketing', 'blog', 'email']):
-                    logger.info("📰 DEBUG: Adding RSS Learning context to AI response...")
-                    try:
-                        rss_context = await get_rss_marketing_context(message)
-                        logger.info(f"✅ DEBUG: RSS context retrieved (length: {len(rss_context)} chars)")
-                    except Exception as e:
-                        logger.error(f"❌ DEBUG: RSS context failed: {e}")
-                        rss_context = ""
-                
-                # Build system prompt with personality (now async with project support - 2/3/26)
-                logger.info("🎭 DEBUG: Building personality system prompt...")
-                try:
-                    personality_prompt = await personality_engine.get_personality_system_prompt(
-                        personality_id,
-                        conversation_context=conversation_history,
-                        project_id=project_id
-                    )
-                    logger.info(f"✅ DEBUG: Personality prompt generated (length: {len(personality_prompt)} chars)")
-                    if project_id:
-                        logger.info(f"📂 DEBUG: Project instructions included for project_id: {project_id}")
-                except Exception as e:
-                    logger.error(f"❌ DEBUG: Personality prompt generation failed: {e}")
-                    personality_prompt = "You are a helpful AI assistant."
-                
-                # Create enhanced system prompt with context
-                system_parts = [
-                    personality_prompt,
-                    f"""Current DateTime Context: {datetime_context['full_datetime']}
-Today is {datetime_context.get('day_of_week', 'Unknown')}, {datetime_context.get('month_name', 'Unknown')} {datetime_context.get('current_date', 'Unknown')}.
-Current time: {datetime_context.get('current_time_12h', 'Unknown')} ({datetime_context.get('timezone', 'Unknown')})
-
-User Context: The user is asking questions on {datetime_context['full_datetime']}.
-When discussing time or dates, use the current information provided above.
-
-Integration Status: All systems active - Weather, Bluesky, RSS Learning, Marketing Scraper, Prayer Times, Google Trends, Voice Synthesis, Image Generation, and Health monitoring are available via chat commands."""
-                ]
-                
-                # Add RSS context if available
-                if rss_context:
-                    system_parts.append(rss_context)
-                    logger.info("📰 DEBUG: RSS context added to system prompt")
-                
-                # Add knowledge context
-                if knowledge_sources:
-                    knowledge_context = "RELEVANT KNOWLEDGE BASE INFORMATION:\n"
-                    for source in knowledge_sources:
-                        knowledge_context += f"- {source['title']}: {source['content'][:200]}...\n"
-                    system_parts.append(knowledge_context)
-                    logger.info(f"📚 DEBUG: Knowledge context added: {len(knowledge_sources)} sources")
-                
-                # Build AI messages
-                logger.info("💬 DEBUG: Building AI message array...")
-                ai_messages = [{
-                    "role": "system",
-                    "content": "\n\n".join(system_parts)
-                }]
-                
-                # Add conversation history
-                ai_messages.extend(conversation_history)
-                logger.info(f"✅ DEBUG: AI messages array built: {len(ai_messages)} total messages")
-                
-                # Add current message
-                # Add user message with vision support if images are present
-                has_images = 'image_attachments' in locals() and len(image_attachments) > 0
-                
-                if has_images:
-                    # Vision-enabled message format (array of content blocks)
-                    logger.info(f"📸 Building vision message with {len(image_attachments)} images")
-                    
-                    content_blocks = [
-                        {
-                            "type": "text",
-                            "text": message_content
-                        }
-                    ]
-                    
-                    # Add images using image_url format
-                    logger.info(f"🔍 DEBUG: image_attachments contents:")
-                    for idx, img in enumerate(image_attachments):
-                        logger.info(f"🔍 DEBUG [{idx}]: filename={img.get('filename')}, type={img.get('type')}, media_type={img.get('media_type')}")
-                    
-                    for img in image_attachments:
-                        content_blocks.append({
-                            "type": "image_url",
-                            "image_url": {
-                                "url": f"data:{img['media_type']};base64,{img['base64']}"
-                            }
-                        })
-                        logger.info(f"📸 Added image to request: {img['filename']}")
-                    
-                    ai_messages.append({
-                        "role": "user",
-                        "content": content_blocks  # Array format for vision
-                    })
-                    
-                    # Force vision-capable model for images
-                    model_override = "anthropic/claude-3.5-sonnet"
-                    logger.info(f"📸 Using vision model: {model_override}")
-                else:
-                    # Text-only message (original format)
-                    ai_messages.append({
-                        "role": "user",
-                        "content": message_content
-                    })
-                    model_override = None
                 
                 # Get AI response (ONLY ONCE, AFTER message is added)
                 logger.info("🤖 DEBUG: Calling OpenRouter for AI response...")
@@ -1165,9 +1214,6 @@ async def chat_with_ai_json(
     so we extract text from documents on the backend instead.
     """
     import base64
-    import tempfile
-    import os
-    from pathlib import Path
     
     # DEBUG: Log what fields we received from iOS
     logger.info(f"📱 iOS /chat-json request received:")
@@ -1187,91 +1233,11 @@ async def chat_with_ai_json(
             return False
         return mime_type.startswith('image/')
     
-    # Helper function to extract text from document bytes
+    # Helper function to extract text from document bytes (parsed in the extraction pool, cached by content hash)
     async def extract_document_text(data: bytes, mime_type: str, filename: str) -> str:
         """Extract text content from document bytes based on MIME type"""
         try:
-            # Create temp file to process
-            suffix = Path(filename).suffix or '.bin'
-            with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as tmp_file:
-                tmp_file.write(data)
-                tmp_path = tmp_file.name
-            
-            try:
-                extracted_text = ""
-                
-                # PDF extraction
-                if mime_type == 'application/pdf' or suffix.lower() == '.pdf':
-                    try:
-                        import pdfplumber
-                        with pdfplumber.open(tmp_path) as pdf:
-                            pages_text = []
-                            for i, page in enumerate(pdf.pages[:20]):  # Limit to first 20 pages
-                                text = page.extract_text()
-                                if text:
-                                    pages_text.append(f"[Page {i+1}]\n{text}")
-                            extracted_text = "\n\n".join(pages_text)
-                            logger.info(f"📄 Extracted {len(extracted_text)} chars from PDF ({len(pdf.pages)} pages)")
-                    except Exception as e:
-                        logger.error(f"PDF extraction failed: {e}")
-                        extracted_text = f"[PDF file: {filename} - extraction failed: {str(e)}]"
-                
-                # Word document extraction (.docx)
-                elif mime_type == 'application/vnd.openxmlformats-officedocument.wordprocessingml.document' or suffix.lower() == '.docx':
-                    try:
-                        from docx import Document
-                        doc = Document(tmp_path)
-                        paragraphs = [p.text for p in doc.paragraphs if p.text.strip()]
-                        extracted_text = "\n\n".join(paragraphs)
-                        logger.info(f"📄 Extracted {len(extracted_text)} chars from DOCX ({len(paragraphs)} paragraphs)")
-                    except Exception as e:
-                        logger.error(f"DOCX extraction failed: {e}")
-                        extracted_text = f"[Word document: {filename} - extraction failed: {str(e)}]"
-                
-                # Excel extraction (.xlsx)
-                elif mime_type == 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet' or suffix.lower() == '.xlsx':
-                    try:
-                        import openpyxl
-                        wb = openpyxl.load_workbook(tmp_path, read_only=True, data_only=True)
-                        sheets_text = []
-                        for sheet_name in wb.sheetnames[:5]:  # Limit to first 5 sheets
-                            sheet = wb[sheet_name]
-                            rows_text = []
-                            for row in list(sheet.iter_rows(values_only=True))[:100]:  # Limit to first 100 rows
-                                row_str = " | ".join([str(cell) if cell is not None else "" for cell in row])
-                                if row_str.strip():
-                                    rows_text.append(row_str)
-                            if rows_text:
-                                sheets_text.append(f"[Sheet: {sheet_name}]\n" + "\n".join(rows_text))
-                        extracted_text = "\n\n".join(sheets_text)
-                        logger.info(f"📄 Extracted {len(extracted_text)} chars from XLSX ({len(wb.sheetnames)} sheets)")
-                    except Exception as e:
-                        logger.error(f"XLSX extraction failed: {e}")
-                        extracted_text = f"[Excel file: {filename} - extraction failed: {str(e)}]"
-                
-                # Plain text files
-                elif mime_type.startswith('text/') or suffix.lower() in ['.txt', '.md', '.csv', '.json']:
-                    try:
-                        extracted_text = data.decode('utf-8', errors='replace')[:50000]  # Limit to 50k chars
-                        logger.info(f"📄 Read {len(extracted_text)} chars from text file")
-                    except Exception as e:
-                        logger.error(f"Text file read failed: {e}")
-                        extracted_text = f"[Text file: {filename} - read failed: {str(e)}]"
-                
-                # Unsupported format
-                else:
-                    extracted_text = f"[Attached file: {filename} (type: {mime_type}) - text extraction not supported for this format]"
-                    logger.warning(f"⚠️ Unsupported document type for extraction: {mime_type}")
-                
-                return extracted_text
-                
-            finally:
-                # Clean up temp file
-                try:
-                    os.unlink(tmp_path)
-                except:
-                    pass
-                    
+            return await get_document_extractor().extract_text(data, filename, mime_type)
         except Exception as e:
             logger.error(f"❌ Document extraction failed: {e}")
             return f"[Document: {filename} - processing failed: {str(e)}]"
@@ -1412,6 +1378,249 @@ async def chat_with_ai_json(
         gps_longitude=request.longitude
     )
 
+#-- Streaming Chat Endpoint (SSE)
+STREAM_GESTURE_WINDOW = 80  # Trailing chars scanned for *gesture* markers as tokens arrive
+
+def _sse_event(event: str, data: Dict) -> str:
+    """Format one Server-Sent Event"""
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+def _gesture_payload(gesture_result: Optional[Dict[str, str]]) -> Optional[Dict[str, str]]:
+    if not gesture_result:
+        return None
+    return GestureInfo(
+        detected=gesture_result['gesture'],
+        video=gesture_result['video'],
+        video_url=f"/static/gestures/{gesture_result['video']}"
+    ).dict()
+
+@router.post("/chat/stream")
+async def chat_with_ai_stream(
+    request: ChatRequest,
+    user_id: str = Depends(get_current_user_id)
+):
+    """
+    Streaming chat endpoint (Server-Sent Events) - same JSON body as /chat-json.
+    
+    Events, in order:
+    - meta:    {thread_id, personality_id} - sent before the model is called
+    - token:   {text} - raw model tokens as they arrive
+    - gesture: {detected, video, video_url} - as soon as a gesture marker streams past
+    - replace: {response} - full final text, only if post-processing changed it
+    - done:    {message_id, thread_id, model_used, response_time_ms, gesture, knowledge_sources}
+    - error:   {message}
+    
+    Personality post-processing and file generation run on the tail once the
+    model finishes; messages are persisted after the stream closes.
+    Attachments and integration commands go through the buffered /chat path
+    and arrive as a single replace + done pair.
+    """
+    from fastapi.responses import StreamingResponse
+    
+    async def buffered_stream():
+        # Headers are already sent by the time this runs - failures become an error event
+        try:
+            result = await chat_with_ai_json(request, user_id)
+        except HTTPException as e:
+            logger.error(f"❌ STREAM FAILED (buffered): {e.detail}")
+            yield _sse_event('error', {'message': str(e.detail)})
+            return
+        except Exception as e:
+            logger.error(f"❌ STREAM FAILED (buffered): {e}", exc_info=True)
+            yield _sse_event('error', {'message': str(e)})
+            return
+        yield _sse_event('meta', {'thread_id': result.thread_id, 'personality_id': result.personality_id})
+        yield _sse_event('replace', {'response': result.response})
+        yield _sse_event('done', {
+            'message_id': result.message_id,
+            'thread_id': result.thread_id,
+            'model_used': result.model_used,
+            'response_time_ms': result.response_time_ms,
+            'gesture': result.gesture.dict() if result.gesture else None,
+            'knowledge_sources': result.knowledge_sources
+        })
+    
+    command = get_command_router().classify(request.message)
+    has_attachment = bool(request.attachment_data or request.image_base64)
+    if has_attachment or command.answered_by_integration:
+        logger.info("🌊 Stream: attachment or integration command - using buffered path")
+        return StreamingResponse(buffered_stream(), media_type="text/event-stream")
+    
+    async def event_stream():
+        from .chat import (
+            get_current_datetime_context, detect_gesture,
+            search_meetings, get_recent_meetings_context
+        )
+        
+        start_time = time.time()
+        message = request.message
+        personality_id = request.personality_id
+        thread_id = request.thread_id
+        memory_manager = get_memory_manager(user_id)
+        
+        response_parts: List[str] = []
+        model_used = "unknown"
+        knowledge_sources: List[Dict] = []
+        persisted = False
+        
+        async def persist_turn(final_text: str) -> Optional[str]:
+            try:
+                await memory_manager.add_message(thread_id=thread_id, role="user", content=message)
+                return await memory_manager.add_message(
+                    thread_id=thread_id,
+                    role="assistant",
+                    content=final_text,
+                    model_used=model_used,
+                    response_time_ms=int((time.time() - start_time) * 1000),
+                    knowledge_sources_used=[source.get('id', '') for source in knowledge_sources]
+                )
+            except Exception as e:
+                logger.error(f"❌ Stream: failed to persist messages: {e}")
+                return None
+        
+        try:
+            # Memory context uses the client's thread_id, same as /chat
+            full_message = message
+            try:
+                memory_context = await build_memory_context(
+                    user_id=user_id,
+                    user_message=message,
+                    thread_id=thread_id
+                )
+                if memory_context:
+                    full_message = memory_context + "\n\n" + full_message
+            except Exception as e:
+                logger.error(f"❌ Stream: failed to load memory context: {e}")
+            
+            # Ensure thread exists (and pick up its project)
+            project_id = None
+            thread_row = None
+            if thread_id:
+                from ..core.database import db_manager
+                thread_row = await db_manager.fetch_one(
+                    "SELECT id, primary_project_id FROM conversation_threads WHERE id = $1 AND user_id = $2",
+                    thread_id, user_id
+                )
+            if thread_row:
+                project_id = thread_row.get('primary_project_id')
+            else:
+                thread_id = await memory_manager.create_conversation_thread(platform='web', title=None)
+            
+            yield _sse_event('meta', {'thread_id': thread_id, 'personality_id': personality_id})
+            
+            # Meeting context (proactive + explicit meeting queries)
+            try:
+                recent_context = await get_recent_meetings_context(user_id=user_id, days=7, limit=5)
+                if recent_context:
+                    full_message += recent_context
+                is_meeting_query, meeting_query_type = command.args('meeting_query', (False, None))
+                if is_meeting_query:
+                    full_message += await search_meetings(
+                        query=message,
+                        user_id=user_id,
+                        query_type=meeting_query_type,
+                        limit=5
+                    )
+            except Exception as e:
+                logger.error(f"❌ Stream: failed to add meeting context: {e}")
+            
+            ai_messages, model_override, knowledge_sources, _ = await _build_ai_messages(
+                message=message,
+                message_content=full_message,
+                thread_id=thread_id,
+                personality_id=personality_id,
+                project_id=project_id,
+                include_knowledge=request.include_knowledge,
+                datetime_context=get_current_datetime_context(),
+                image_attachments=None,
+                memory_manager=memory_manager,
+                knowledge_engine=get_knowledge_engine(),
+                personality_engine=get_personality_engine(),
+                command=command
+            )
+            
+            openrouter_client = await get_openrouter_client()
+            chunks = await openrouter_client.chat_completion(
+                messages=ai_messages,
+                model=model_override,
+                max_tokens=4000,
+                temperature=0.7,
+                stream=True
+            )
+            
+            gesture_sent = False
+            async for chunk in chunks:
+                model_used = chunk.get('model', model_used)
+                choices = chunk.get('choices') or [{}]
+                text = (choices[0].get('delta') or {}).get('content')
+                if not text:
+                    continue
+                
+                response_parts.append(text)
+                yield _sse_event('token', {'text': text})
+                
+                # Gesture markers are *...* - only rescan the tail when one may have closed
+                if not gesture_sent and '*' in text:
+                    tail = "".join(response_parts)[-STREAM_GESTURE_WINDOW:]
+                    early_gesture = _gesture_payload(detect_gesture(tail))
+                    if early_gesture:
+                        gesture_sent = True
+                        yield _sse_event('gesture', early_gesture)
+            
+            raw_response = "".join(response_parts)
+            
+            # Tail processing: personality filters and generated files
+            final_response = raw_response
+            try:
+                final_response = await get_personality_engine().process_personality_response(
+                    raw_response, personality_id, user_id
+                )
+            except Exception as e:
+                logger.warning(f"⚠️ Stream: personality processing failed: {e}")
+            
+            gesture = _gesture_payload(detect_gesture(final_response))
+            final_response, generated_files = process_generated_files(final_response)
+            if final_response != raw_response:
+                yield _sse_event('replace', {'response': final_response})
+            
+            response_time_ms = int((time.time() - start_time) * 1000)
+            persisted = True
+            message_id = await persist_turn(final_response) or str(uuid.uuid4())
+            
+            yield _sse_event('done', {
+                'message_id': message_id,
+                'thread_id': thread_id,
+                'model_used': model_used,
+                'response_time_ms': response_time_ms,
+                'gesture': gesture,
+                'files': generated_files,
+                'knowledge_sources': [
+                    {
+                        'id': source.get('id', ''),
+                        'title': source.get('title', ''),
+                        'snippet': source.get('content', '')[:200],
+                        'score': source.get('score', 0.0)
+                    }
+                    for source in knowledge_sources
+                ]
+            })
+            logger.info(f"✅ STREAM SUCCESS: {len(final_response)} chars in {response_time_ms}ms")
+        
+        except Exception as e:
+            logger.error(f"❌ STREAM FAILED: {e}", exc_info=True)
+            yield _sse_event('error', {'message': str(e)})
+        
+        finally:
+            # Client disconnected mid-stream: keep whatever was generated
+            if not persisted and response_parts and thread_id:
+                asyncio.create_task(persist_turn("".join(response_parts)))
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 #-- Support Endpoints (NO DUPLICATION - CLEAN SUPPORT ONLY)
 
 @router.post("/feedback", response_model=FeedbackResponse)
@@ -1764,6 +1973,10 @@ async def get_ai_stats():
             },
             "personality_stats": personality_stats,
             "feedback_stats": feedback_summary,
+            "memory_source_timings": get_last_source_timings(),
+            "knowledge_search_timings": get_knowledge_engine().last_search_timings,
+            "cache_stats": get_all_cache_stats(),
+            "document_extraction": get_document_extractor().get_status(),
             "integration_order": "weather->bluesky->rss->scraper->prayer->google_trends->voice->image->health->ai",
             "system_health": {
                 "memory_active": True,
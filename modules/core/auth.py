@@ -14,6 +14,16 @@ CHANGELOG Session 19:
 - ADDED: __all__ exports
 - MOVED: json and timezone imports to top level
 - ADDED: Deprecation warnings on sync wrappers (to track usage)
+
+CHANGELOG 2026-10-16:
+- ADDED: In-process session cache (USER_SESSIONS namespace) - validate_session no
+  longer hits the database on every request. Entries honour the session's own
+  expires_at and are dropped by destroy_session.
+- CHANGED: last_activity is write-behind - touches are collected in memory and
+  flushed every ACTIVITY_FLUSH_INTERVAL_SECONDS with one UPDATE ... FROM unnest
+  (session_activity_flush job on the scheduler)
+- CHANGED: Session table is created once by AuthManager.initialize() at startup,
+  not checked on every call
 """
 
 import asyncio
@@ -28,10 +38,29 @@ from typing import Optional, Dict, Any
 import bcrypt
 from fastapi import Cookie
 
+from .cache import get_cache, invalidate, USER_SESSIONS
 from .database import db_manager
+from .scheduler import get_scheduler
 
 logger = logging.getLogger(__name__)
 
+# Session cache - L1 only (session data never goes to the shared L2). Workers cannot
+# evict each other's entries, so the TTL bounds how long a session destroyed in
+# another worker keeps validating here.
+SESSION_CACHE_TTL_SECONDS = 60
+SESSION_CACHE_MAX_SIZE = 500
+
+# How often pending last_activity touches are written back
+ACTIVITY_FLUSH_INTERVAL_SECONDS = 60
+
+SESSION_ACTIVITY_FLUSH_QUERY = """
+UPDATE user_sessions AS s
+SET last_activity = u.last_activity
+FROM unnest($1::varchar[], $2::timestamptz[]) AS u(session_token, last_activity)
+WHERE s.session_token = u.session_token
+  AND (s.last_activity IS NULL OR s.last_activity < u.last_activity)
+"""
+
 __all__ = [
     'AuthManager',
     'get_current_user',
@@ -52,6 +81,38 @@ class AuthManager:
     _session_timeout = timedelta(hours=24)  # 24-hour sessions
     _table_initialized = False
     
+    # Write-behind state: session_token -> latest activity not yet in the database
+    _pending_activity: Dict[str, datetime] = {}
+    
+    # =========================================================================
+    # Startup / Shutdown
+    # =========================================================================
+    
+    @staticmethod
+    async def initialize():
+        """
+        Create the session table and register the last_activity flush job.
+        Call once at startup, after the database pool is connected.
+        """
+        await AuthManager._ensure_session_table()
+        
+        # Per-process buffer, so every worker flushes its own (not leased)
+        scheduler = get_scheduler()
+        if scheduler.get_job('session_activity_flush') is None:
+            scheduler.add_job(
+                'session_activity_flush',
+                AuthManager.flush_activity,
+                interval=ACTIVITY_FLUSH_INTERVAL_SECONDS,
+                leased=False
+            )
+            logger.info(f"🔐 Session activity flush scheduled (every {ACTIVITY_FLUSH_INTERVAL_SECONDS}s)")
+    
+    @staticmethod
+    async def shutdown():
+        """Write back any pending last_activity touches"""
+        await get_scheduler().remove_job('session_activity_flush')
+        await AuthManager.flush_activity()
+    
     # =========================================================================
     # Session Table Management
     # =========================================================================
@@ -89,6 +150,53 @@ class AuthManager:
                 logger.error(f"❌ Failed to create session table: {e}")
                 raise
     
+    # =========================================================================
+    # Session Cache and Write-Behind Activity
+    # =========================================================================
+    
+    @staticmethod
+    def _session_cache():
+        return get_cache(
+            USER_SESSIONS,
+            max_size=SESSION_CACHE_MAX_SIZE,
+            ttl_seconds=SESSION_CACHE_TTL_SECONDS
+        )
+    
+    @staticmethod
+    def _touch(session_token: str):
+        """Record activity for a session; written back by flush_activity()"""
+        AuthManager._pending_activity[session_token] = datetime.now(timezone.utc)
+    
+    @staticmethod
+    async def flush_activity() -> int:
+        """
+        Write pending last_activity values with a single UPDATE.
+        Returns the number of sessions flushed.
+        """
+        if not AuthManager._pending_activity:
+            return 0
+        
+        pending = AuthManager._pending_activity
+        AuthManager._pending_activity = {}
+        
+        try:
+            await db_manager.execute(
+                SESSION_ACTIVITY_FLUSH_QUERY,
+                list(pending.keys()),
+                list(pending.values())
+            )
+            logger.debug(f"🔐 Flushed last_activity for {len(pending)} sessions")
+            return len(pending)
+            
+        except Exception as e:
+            # Put the touches back (newer ones recorded meanwhile win) and retry next cycle
+            for session_token, touched_at in pending.items():
+                current = AuthManager._pending_activity.get(session_token)
+                if current is None or current < touched_at:
+                    AuthManager._pending_activity[session_token] = touched_at
+            logger.error(f"❌ Failed to flush session activity: {e}")
+            return 0
+    
     # =========================================================================
     # Password Hashing
     # =========================================================================
@@ -171,8 +279,6 @@ class AuthManager:
         """
         Create a new session for the user (stored in PostgreSQL)
         """
-        await AuthManager._ensure_session_table()
-        
         session_token = str(uuid.uuid4())
         expires_at = datetime.now(timezone.utc) + AuthManager._session_timeout
         
@@ -208,22 +314,36 @@ class AuthManager:
     @staticmethod
     async def validate_session(session_token: str) -> Optional[Dict[str, Any]]:
         """
-        Validate a session token and return user info if valid
+        Validate a session token and return user info if valid.
+        
+        Served from the session cache when possible; the database is only read on
+        a miss. last_activity is recorded in memory and flushed in batches.
         """
         if not session_token:
             logger.debug("🔐 No session token provided")
             return None
         
-        await AuthManager._ensure_session_table()
-        
-        # Query session from database
-        query = """
-        SELECT session_token, user_id, user_email, user_data, created_at, expires_at, last_activity
-        FROM user_sessions
-        WHERE session_token = $1
-        """
+        cache = AuthManager._session_cache()
         
         try:
+            cached = await cache.get(session_token)
+            if cached is not None:
+                expires_at, user_info = cached
+                if datetime.now(timezone.utc) > expires_at:
+                    logger.info(f"🔐 Session expired for {user_info.get('email')}")
+                    await AuthManager.destroy_session(session_token)
+                    return None
+                
+                AuthManager._touch(session_token)
+                return dict(user_info)
+            
+            # Query session from database
+            query = """
+            SELECT session_token, user_id, user_email, user_data, created_at, expires_at, last_activity
+            FROM user_sessions
+            WHERE session_token = $1
+            """
+            
             session = await db_manager.fetch_one(query, session_token)
             
             if not session:
@@ -244,12 +364,6 @@ class AuthManager:
                 await AuthManager.destroy_session(session_token)
                 return None
             
-            # Update last activity
-            await db_manager.execute(
-                "UPDATE user_sessions SET last_activity = NOW() WHERE session_token = $1",
-                session_token
-            )
-            
             # Parse and return user data
             user_data = session['user_data']
             
@@ -259,8 +373,12 @@ class AuthManager:
             else:
                 user_info = dict(user_data)
             
+            # Tagged with its own token so destroy_session can drop exactly this entry
+            await cache.set(session_token, (expires_at, user_info), tags=[session_token])
+            AuthManager._touch(session_token)
+            
             logger.debug(f"🔐 Session valid for {session['user_email']}")
-            return user_info
+            return dict(user_info)
             
         except Exception as e:
             logger.error(f"❌ Session validation error: {e}")
@@ -272,7 +390,9 @@ class AuthManager:
         if not session_token:
             return False
         
-        await AuthManager._ensure_session_table()
+        # Drop the cached entry and any pending touch before the row goes
+        await invalidate(USER_SESSIONS, session_token)
+        AuthManager._pending_activity.pop(session_token, None)
         
         try:
             # Get user email for logging before deletion
@@ -299,7 +419,7 @@ class AuthManager:
     @staticmethod
     async def cleanup_expired_sessions():
         """Clean up expired sessions from the database"""
-        await AuthManager._ensure_session_table()
+        AuthManager._session_cache().local.cleanup_expired()
         
         try:
             result = await db_manager.execute(
@@ -318,7 +438,8 @@ class AuthManager:
     @staticmethod
     async def get_session_info() -> Dict[str, Any]:
         """Get information about current sessions (for admin purposes)"""
-        await AuthManager._ensure_session_table()
+        # Write back pending touches so last_activity is current
+        await AuthManager.flush_activity()
         
         try:
             # Get active sessions count and details
@@ -0,0 +1,507 @@
+# modules/core/cache.py
+"""
+Shared two-tier cache for Syntax Prime V2.
+Replaces the per-module TTLCache copies (knowledge_query.py, conversation_manager.py).
+
+Created: 2026-10-16
+
+TIERS:
+1. L1 - in-process LRU with TTL. O(1) get/set/evict (OrderedDict), tag index
+   for O(k) invalidation, hit/miss/eviction counters.
+2. L2 - optional, shared by every uvicorn worker so warm results survive
+   restarts and are not recomputed per worker:
+   - postgres: UNLOGGED cache_entries table (no WAL, truncated on crash - fine for a cache)
+   - file:     one JSON file per entry under CACHE_L2_PATH (single-host deployments)
+   Chosen with CACHE_L2_BACKEND=none|postgres|file. Only caches created with
+   shared=True use it; values must be JSON-serializable (UUIDs/datetimes become strings).
+
+   Workers cannot evict each other's L1, so a shared cache keeps its L1 TTL short
+   (l1_ttl_seconds) - cross-worker staleness after an invalidation is bounded by it.
+
+KEYS:
+    stable_key(...) hashes its arguments with SHA-1 over canonical JSON, so the
+    same query gives the same key in every worker (unlike hash(), which is salted
+    per process).
+
+USAGE:
+    from modules.core.cache import get_cache, stable_key, invalidate, KNOWLEDGE_SEARCH
+
+    cache = get_cache(KNOWLEDGE_SEARCH, max_size=200, ttl_seconds=3600, shared=True)
+    key = stable_key(query, personality_id, limit)
+    results = await cache.get(key)
+    if results is None:
+        results = await expensive_search()
+        await cache.set(key, results, tags=[personality_id])
+
+    # Writers
+    await invalidate(KNOWLEDGE_SEARCH)                  # whole namespace
+    await invalidate(CONVERSATION_HISTORY, thread_id)   # one tag
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import random
+import time
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+__all__ = [
+    'TTLCache',
+    'LayeredCache',
+    'PostgresCacheStore',
+    'FileCacheStore',
+    'stable_key',
+    'get_cache',
+    'invalidate',
+    'init_cache_backend',
+    'get_all_cache_stats',
+    'KNOWLEDGE_SEARCH',
+    'CONVERSATION_HISTORY',
+    'USER_SESSIONS',
+    'NOTIFICATION_SETTINGS',
+    'SHARED_NAMESPACES',
+]
+
+# Well-known namespaces - writers invalidate these
+KNOWLEDGE_SEARCH = 'knowledge_search'
+CONVERSATION_HISTORY = 'conversation_history'
+USER_SESSIONS = 'user_sessions'
+NOTIFICATION_SETTINGS = 'notification_settings'
+
+# Namespaces with an L2 tier. Writers may invalidate one of these from a process
+# that never created the cache, so they are known up front; get_cache(shared=True)
+# adds to the set.
+SHARED_NAMESPACES = {KNOWLEDGE_SEARCH}
+
+# Default L1 TTL for shared caches (bounds cross-worker staleness)
+SHARED_L1_TTL_SECONDS = 60
+
+# Roughly one L2 write in this many also purges expired rows/files
+L2_PURGE_EVERY_N_WRITES = 500
+
+
+def stable_key(*parts: Any) -> str:
+    """Process-independent cache key from arbitrary JSON-able parts."""
+    canonical = json.dumps(parts, sort_keys=True, default=str, separators=(',', ':'))
+    return hashlib.sha1(canonical.encode('utf-8')).hexdigest()
+
+
+# =============================================================================
+# L1: In-Process LRU + TTL
+# =============================================================================
+
+class TTLCache:
+    """
+    Thread-safe LRU cache with TTL expiration.
+
+    Features:
+    - O(1) get/set and LRU eviction (OrderedDict, oldest entry first)
+    - TTL checked on read; cleanup_expired() sweeps the rest
+    - Optional tags per entry; invalidate(tag) removes only those entries
+    - Hit/miss/eviction/expiration counters
+    """
+
+    def __init__(self, max_size: int = 100, ttl_seconds: float = 300):
+        self._cache: OrderedDict = OrderedDict()  # key -> (expires_at, value, tags)
+        self._tags: Dict[str, Set[str]] = {}
+        self._max_size = max_size
+        self._ttl_seconds = ttl_seconds
+        self._lock = Lock()
+        self._counters = {'hits': 0, 'misses': 0, 'evictions': 0, 'expirations': 0}
+
+    def get(self, key: str) -> Optional[Any]:
+        """Get value from cache if exists and not expired."""
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry is None:
+                self._counters['misses'] += 1
+                return None
+
+            if entry[0] <= time.monotonic():
+                self._remove(key)
+                self._counters['expirations'] += 1
+                self._counters['misses'] += 1
+                return None
+
+            self._cache.move_to_end(key)
+            self._counters['hits'] += 1
+            return entry[1]
+
+    def set(self, key: str, value: Any, tags: Iterable[str] = ()) -> None:
+        """Set value in cache, evicting the least recently used entry if full."""
+        tags = tuple(tags)
+        with self._lock:
+            if key in self._cache:
+                self._remove(key)
+
+            while len(self._cache) >= self._max_size:
+                oldest_key = next(iter(self._cache))
+                self._remove(oldest_key)
+                self._counters['evictions'] += 1
+
+            self._cache[key] = (time.monotonic() + self._ttl_seconds, value, tags)
+            for tag in tags:
+                self._tags.setdefault(tag, set()).add(key)
+
+    def delete(self, key: str) -> bool:
+        with self._lock:
+            if key not in self._cache:
+                return False
+            self._remove(key)
+            return True
+
+    def invalidate(self, tag: Optional[str] = None) -> int:
+        """
+        Invalidate entries carrying a tag.
+        If tag is None, clears entire cache.
+        Returns count of removed entries.
+        """
+        with self._lock:
+            if tag is None:
+                count = len(self._cache)
+                self._cache.clear()
+                self._tags.clear()
+                return count
+
+            keys = self._tags.pop(tag, set())
+            for key in list(keys):
+                self._remove(key)
+            return len(keys)
+
+    def clear(self) -> None:
+        """Clear all cache entries."""
+        self.invalidate()
+
+    def cleanup_expired(self) -> int:
+        """Remove all expired entries. Returns count of removed entries."""
+        with self._lock:
+            now = time.monotonic()
+            expired_keys = [key for key, entry in self._cache.items() if entry[0] <= now]
+            for key in expired_keys:
+                self._remove(key)
+            self._counters['expirations'] += len(expired_keys)
+            return len(expired_keys)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return cache statistics."""
+        with self._lock:
+            lookups = self._counters['hits'] + self._counters['misses']
+            return {
+                "size": len(self._cache),
+                "max_size": self._max_size,
+                "ttl_seconds": self._ttl_seconds,
+                **self._counters,
+                "hit_rate": round(self._counters['hits'] / lookups, 3) if lookups else 0.0
+            }
+
+    def _remove(self, key: str) -> None:
+        """Drop a key and its tag index entries (caller holds the lock)."""
+        _, _, tags = self._cache.pop(key)
+        for tag in tags:
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+
+
+# =============================================================================
+# L2 Backends
+# =============================================================================
+
+class PostgresCacheStore:
+    """L2 tier in an UNLOGGED table (shared by all workers, no WAL overhead)."""
+
+    CREATE_TABLE_SQL = """
+    CREATE UNLOGGED TABLE IF NOT EXISTS cache_entries (
+        namespace TEXT NOT NULL,
+        cache_key TEXT NOT NULL,
+        value JSONB NOT NULL,
+        tags TEXT[] NOT NULL DEFAULT '{}',
+        expires_at TIMESTAMP WITH TIME ZONE NOT NULL,
+        PRIMARY KEY (namespace, cache_key)
+    );
+    CREATE INDEX IF NOT EXISTS idx_cache_entries_tags ON cache_entries USING gin(tags);
+    """
+
+    def __init__(self):
+        from .database import db_manager
+        self.db = db_manager
+
+    async def setup(self) -> None:
+        await self.db.execute(self.CREATE_TABLE_SQL)
+        await self.purge_expired()
+
+    async def get(self, namespace: str, key: str) -> Optional[Any]:
+        row = await self.db.fetch_one(
+            """
+            SELECT value FROM cache_entries
+            WHERE namespace = $1 AND cache_key = $2 AND expires_at > NOW()
+            """,
+            namespace, key
+        )
+        return json.loads(row['value']) if row else None
+
+    async def set(self, namespace: str, key: str, value: Any, ttl_seconds: float, tags: List[str]) -> None:
+        await self.db.execute(
+            """
+            INSERT INTO cache_entries (namespace, cache_key, value, tags, expires_at)
+            VALUES ($1, $2, $3::jsonb, $4, NOW() + make_interval(secs => $5))
+            ON CONFLICT (namespace, cache_key) DO UPDATE
+            SET value = EXCLUDED.value, tags = EXCLUDED.tags, expires_at = EXCLUDED.expires_at
+            """,
+            namespace, key, json.dumps(value, default=str), tags, float(ttl_seconds)
+        )
+
+    async def invalidate(self, namespace: str, tag: Optional[str] = None) -> None:
+        if tag is None:
+            await self.db.execute("DELETE FROM cache_entries WHERE namespace = $1", namespace)
+        else:
+            await self.db.execute(
+                "DELETE FROM cache_entries WHERE namespace = $1 AND tags @> ARRAY[$2]::text[]",
+                namespace, tag
+            )
+
+    async def purge_expired(self) -> None:
+        await self.db.execute("DELETE FROM cache_entries WHERE expires_at <= NOW()")
+
+
+class FileCacheStore:
+    """L2 tier as JSON files (one per entry) - shared by workers on one host."""
+
+    def __init__(self, root: str):
+        self.root = root
+
+    async def setup(self) -> None:
+        await asyncio.to_thread(os.makedirs, self.root, exist_ok=True)
+        await self.purge_expired()
+
+    def _path(self, namespace: str, key: str) -> str:
+        return os.path.join(self.root, namespace, f"{key}.json")
+
+    def _read(self, path: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _get_sync(self, namespace: str, key: str) -> Optional[Any]:
+        entry = self._read(self._path(namespace, key))
+        if entry is None or entry['expires_at'] <= time.time():
+            return None
+        return entry['value']
+
+    def _set_sync(self, namespace: str, key: str, payload: str) -> None:
+        path = self._path(namespace, key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(payload)
+        os.replace(tmp_path, path)  # Atomic - readers never see a partial file
+
+    def _invalidate_sync(self, namespace: str, tag: Optional[str]) -> None:
+        directory = os.path.join(self.root, namespace)
+        if not os.path.isdir(directory):
+            return
+        for name in os.listdir(directory):
+            path = os.path.join(directory, name)
+            if tag is not None:
+                entry = self._read(path)
+                if entry is None or tag not in entry.get('tags', []):
+                    continue
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def _purge_sync(self) -> None:
+        now = time.time()
+        for directory, _, names in os.walk(self.root):
+            for name in names:
+                path = os.path.join(directory, name)
+                entry = self._read(path)
+                if entry is None or entry.get('expires_at', 0) <= now:
+                    try:
+                        os.remove(path)
+                    except OSError:
+                        pass
+
+    async def get(self, namespace: str, key: str) -> Optional[Any]:
+        return await asyncio.to_thread(self._get_sync, namespace, key)
+
+    async def set(self, namespace: str, key: str, value: Any, ttl_seconds: float, tags: List[str]) -> None:
+        payload = json.dumps(
+            {'expires_at': time.time() + ttl_seconds, 'tags': tags, 'value': value},
+            default=str
+        )
+        await asyncio.to_thread(self._set_sync, namespace, key, payload)
+
+    async def invalidate(self, namespace: str, tag: Optional[str] = None) -> None:
+        await asyncio.to_thread(self._invalidate_sync, namespace, tag)
+
+    async def purge_expired(self) -> None:
+        await asyncio.to_thread(self._purge_sync)
+
+
+_l2_backend = None
+
+
+async def init_cache_backend() -> None:
+    """
+    Set up the L2 tier from CACHE_L2_BACKEND (call once at startup, after the
+    database pool is up). Until then - or if setup fails - caches are L1-only.
+    """
+    global _l2_backend
+    backend = settings.cache_l2_backend
+
+    if backend == 'none':
+        logger.info("🗄️ Cache L2 disabled (in-process L1 only)")
+        return
+
+    try:
+        if backend == 'postgres':
+            store = PostgresCacheStore()
+        elif backend == 'file':
+            store = FileCacheStore(settings.cache_l2_path)
+        else:
+            logger.warning(f"⚠️ Unknown CACHE_L2_BACKEND '{backend}' - using L1 only")
+            return
+
+        await store.setup()
+        _l2_backend = store
+        logger.info(f"🗄️ Cache L2 ready: {backend}")
+    except Exception as e:
+        logger.error(f"❌ Cache L2 setup failed ({backend}), using L1 only: {e}")
+
+
+# =============================================================================
+# Layered Cache
+# =============================================================================
+
+class LayeredCache:
+    """
+    One cache namespace: L1 in front of the (optional) shared L2.
+    L2 failures are logged and treated as misses - a cache never breaks a request.
+    """
+
+    def __init__(self, namespace: str, max_size: int, ttl_seconds: float,
+                 shared: bool = False, l1_ttl_seconds: Optional[float] = None):
+        self.namespace = namespace
+        self.ttl_seconds = ttl_seconds
+        self.shared = shared
+        if l1_ttl_seconds is None:
+            l1_ttl_seconds = min(ttl_seconds, SHARED_L1_TTL_SECONDS) if shared else ttl_seconds
+        self.local = TTLCache(max_size=max_size, ttl_seconds=l1_ttl_seconds)
+        self._l2_counters = {'l2_hits': 0, 'l2_misses': 0, 'l2_errors': 0}
+        self._l2_writes = 0
+
+    @property
+    def _l2(self):
+        return _l2_backend if self.shared else None
+
+    async def get(self, key: str) -> Optional[Any]:
+        value = self.local.get(key)
+        if value is not None or self._l2 is None:
+            return value
+
+        try:
+            value = await self._l2.get(self.namespace, key)
+        except Exception as e:
+            self._l2_counters['l2_errors'] += 1
+            logger.warning(f"⚠️ Cache L2 get failed ({self.namespace}): {e}")
+            return None
+
+        if value is None:
+            self._l2_counters['l2_misses'] += 1
+            return None
+
+        self._l2_counters['l2_hits'] += 1
+        self.local.set(key, value)
+        return value
+
+    async def set(self, key: str, value: Any, tags: Iterable[str] = ()) -> None:
+        tags = list(tags)
+        self.local.set(key, value, tags)
+        if self._l2 is None:
+            return
+
+        try:
+            await self._l2.set(self.namespace, key, value, self.ttl_seconds, tags)
+            self._l2_writes += 1
+            if random.randrange(L2_PURGE_EVERY_N_WRITES) == 0:
+                await self._l2.purge_expired()
+        except Exception as e:
+            self._l2_counters['l2_errors'] += 1
+            logger.warning(f"⚠️ Cache L2 set failed ({self.namespace}): {e}")
+
+    async def invalidate(self, tag: Optional[str] = None) -> int:
+        """Drop entries with this tag (or everything) from both tiers."""
+        removed = self.local.invalidate(tag)
+        if self.shared:
+            await _invalidate_l2(self.namespace, tag)
+        return removed
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            **self.local.stats(),
+            'shared': self.shared,
+            'l2_backend': type(self._l2).__name__ if self._l2 else None,
+            'l2_writes': self._l2_writes,
+            **self._l2_counters
+        }
+
+
+async def _invalidate_l2(namespace: str, tag: Optional[str]) -> None:
+    if _l2_backend is None:
+        return
+    try:
+        await _l2_backend.invalidate(namespace, tag)
+    except Exception as e:
+        logger.warning(f"⚠️ Cache L2 invalidate failed ({namespace}): {e}")
+
+
+# =============================================================================
+# Registry and Invalidation Hooks
+# =============================================================================
+
+_caches: Dict[str, LayeredCache] = {}
+
+
+def get_cache(namespace: str, max_size: int = 100, ttl_seconds: float = 300,
+              shared: bool = False, l1_ttl_seconds: Optional[float] = None) -> LayeredCache:
+    """Get or create the cache for a namespace (settings apply on first call)."""
+    cache = _caches.get(namespace)
+    if cache is None:
+        cache = LayeredCache(namespace, max_size, ttl_seconds, shared, l1_ttl_seconds)
+        _caches[namespace] = cache
+        if shared:
+            SHARED_NAMESPACES.add(namespace)
+    return cache
+
+
+async def invalidate(namespace: str, tag: Optional[str] = None) -> int:
+    """
+    Writer hook: drop cached entries for a namespace (optionally one tag).
+    Works even if this process never created the namespace - L2 is still cleared
+    for namespaces in SHARED_NAMESPACES; L1-only namespaces have nothing to clear.
+    """
+    cache = _caches.get(namespace)
+    if cache is not None:
+        return await cache.invalidate(tag)
+    if namespace in SHARED_NAMESPACES:
+        await _invalidate_l2(namespace, tag)
+    return 0
+
+
+def get_all_cache_stats() -> Dict[str, Dict[str, Any]]:
+    """Per-namespace metrics (for /health and /ai/stats)."""
+    return {namespace: cache.stats() for namespace, cache in _caches.items()}
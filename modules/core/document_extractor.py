@@ -0,0 +1,603 @@
+# modules/core/document_extractor.py
+"""
+Document text extraction service for Syntax Prime V2.
+Moves PDF / Word / Excel / CSV / text / Python parsing for chat uploads
+(process_uploaded_files and the /chat-json attachment path) off the event loop.
+
+Created: 2026-10-16
+
+DESIGN:
+1. Bounded process pool - pdfplumber, pandas, python-docx and openpyxl are
+   CPU-bound pure Python, so threads would still hold the GIL. At most
+   DOCUMENT_EXTRACT_WORKERS jobs run at once; others wait for a slot.
+2. Per-job timeout - a job that runs past DOCUMENT_EXTRACT_TIMEOUT_SECONDS
+   fails the request and its worker process is killed, so a pathological file
+   cannot pin a pool slot. The pool restarts on next use.
+3. Content-hash cache - results are keyed by the SHA-256 of the file bytes, so
+   the same attachment sent again (retries, re-uploads, other workers via L2)
+   is never parsed twice.
+4. Page streaming for PDFs - iter_pdf_pages() parses PDF_PAGE_BATCH_SIZE pages
+   per job and prefetches the next batch while the caller consumes the current
+   one. Callers stop as soon as they have enough text, so a 300-page PDF costs
+   one batch when only the first pages are used.
+
+USAGE:
+    from modules.core.document_extractor import get_document_extractor
+
+    extractor = get_document_extractor()
+    analysis = await extractor.analyze(content, '.pdf', path=saved_path)
+    text = await extractor.extract_text(data, filename, mime_type)
+
+    async with aclosing(extractor.iter_pdf_pages(data)) as pages:
+        async for page in pages:
+            ...  # {'page': 1, 'page_count': 12, 'text': '...'}
+"""
+
+import ast
+import asyncio
+import hashlib
+import logging
+import multiprocessing
+import os
+import tempfile
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import aclosing
+from pathlib import Path
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional
+
+from modules.core.cache import get_cache, stable_key
+
+logger = logging.getLogger(__name__)
+
+__all__ = [
+    'DocumentExtractor',
+    'get_document_extractor',
+    'DOCUMENT_EXTRACT_WORKERS',
+    'DOCUMENT_EXTRACT_TIMEOUT_SECONDS',
+    'PDF_PAGE_BATCH_SIZE',
+]
+
+# Parsing is CPU-bound; two workers keep large uploads from starving the API's own cores
+DOCUMENT_EXTRACT_WORKERS = min(2, os.cpu_count() or 1)
+DOCUMENT_EXTRACT_TIMEOUT_SECONDS = 30
+
+# Pages parsed per PDF job - small enough that the first pages arrive quickly
+PDF_PAGE_BATCH_SIZE = 4
+
+# Extracted text is content-addressed, so it never goes stale - TTL only bounds memory
+DOCUMENT_TEXT_CACHE = 'document_text'
+DOCUMENT_TEXT_CACHE_TTL_SECONDS = 24 * 3600
+DOCUMENT_TEXT_CACHE_MAX_SIZE = 200
+
+# Limits matching the original chat.py helpers
+ANALYSIS_PDF_MAX_PAGES = 5
+ANALYSIS_PDF_MAX_CHARS = 2000
+CHAT_PDF_MAX_PAGES = 20
+CHAT_TEXT_MAX_CHARS = 50000
+
+DOCX_MIME_TYPE = 'application/vnd.openxmlformats-officedocument.wordprocessingml.document'
+XLSX_MIME_TYPE = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+
+
+# =============================================================================
+# Worker Functions (run in the process pool - picklable args and results only)
+# =============================================================================
+
+def _quiet_pdf_warnings() -> None:
+    # Suppress PDF font parsing warnings (Issue 5E fix) - they fire in the worker now
+    warnings.filterwarnings('ignore', message='.*FontBBox.*')
+    warnings.filterwarnings('ignore', category=UserWarning, module='pdfminer')
+
+
+def _extract_pdf_pages(path: str, start: int, stop: int) -> Dict[str, Any]:
+    """Text of pages [start, stop) plus the total page count (pages numbered from 1)"""
+    import pdfplumber
+    _quiet_pdf_warnings()
+
+    pages = []
+    with pdfplumber.open(path) as pdf:
+        page_count = len(pdf.pages)
+        for index in range(start, min(stop, page_count)):
+            page = pdf.pages[index]
+            pages.append([index + 1, page.extract_text() or ''])
+            page.close()  # drop the parsed layout before the next page
+    return {'page_count': page_count, 'pages': pages}
+
+
+def _analyze_image(path: str) -> Dict[str, Any]:
+    from PIL import Image
+
+    with Image.open(path) as img:
+        width, height = img.size
+        format_name = img.format
+        mode = img.mode
+
+    return {
+        'type': 'image',
+        'description': f'{format_name} image ({width}x{height}, {mode})',
+        'metadata': {
+            'width': width,
+            'height': height,
+            'format': format_name,
+            'mode': mode
+        },
+        'extracted_text': f"Image file: {width}x{height} {format_name}"
+    }
+
+
+def _analyze_text(path: str) -> Dict[str, Any]:
+    with open(path, 'r', encoding='utf-8') as f:
+        content = f.read()
+
+    line_count = len(content.splitlines())
+    word_count = len(content.split())
+
+    return {
+        'type': 'text',
+        'description': f'Text file ({line_count} lines, {word_count} words)',
+        'extracted_text': content[:2000],  # First 2000 chars
+        'metadata': {'line_count': line_count, 'word_count': word_count}
+    }
+
+
+def _analyze_csv(path: str) -> Dict[str, Any]:
+    import pandas as pd
+
+    df = pd.read_csv(path)
+    rows, cols = df.shape
+    columns = [str(column) for column in df.columns]
+
+    return {
+        'type': 'csv',
+        'description': f'CSV file ({rows} rows, {cols} columns)',
+        'extracted_text': f"CSV Preview:\n{df.head().to_string()}",
+        'metadata': {'rows': int(rows), 'columns': int(cols), 'column_names': columns}
+    }
+
+
+def _analyze_docx(path: str) -> Dict[str, Any]:
+    from docx import Document
+
+    doc = Document(path)
+    text_content = "".join(paragraph.text + "\n" for paragraph in doc.paragraphs)
+
+    # Extract table data
+    table_text = ""
+    for table in doc.tables[:3]:  # First 3 tables
+        for row in table.rows:
+            table_text += "".join(cell.text + " | " for cell in row.cells) + "\n"
+
+    paragraph_count = len(doc.paragraphs)
+    table_count = len(doc.tables)
+    word_count = len(text_content.split())
+
+    return {
+        'type': 'document',
+        'description': f'Word document with {paragraph_count} paragraphs, {table_count} tables, {word_count} words',
+        'extracted_text': (text_content + "\n\n" + table_text)[:3000],  # First 3000 chars
+        'metadata': {
+            'paragraph_count': paragraph_count,
+            'table_count': table_count,
+            'word_count': word_count
+        }
+    }
+
+
+def _analyze_excel(path: str) -> Dict[str, Any]:
+    import openpyxl
+
+    workbook = openpyxl.load_workbook(path, data_only=True)
+    sheet_names = workbook.sheetnames
+
+    # Analyze first sheet
+    first_sheet = workbook.active
+    row_count = first_sheet.max_row
+    col_count = first_sheet.max_column
+
+    # Extract sample data (first 10 rows)
+    extracted_text = f"Sheet: {first_sheet.title}\n\n"
+    for row in first_sheet.iter_rows(max_row=10, values_only=True):
+        extracted_text += " | ".join(str(cell) if cell is not None else '' for cell in row) + "\n"
+
+    sheet_summaries = [
+        f"{name}: {workbook[name].max_row} rows × {workbook[name].max_column} cols"
+        for name in sheet_names[:5]  # First 5 sheets
+    ]
+
+    return {
+        'type': 'spreadsheet',
+        'description': f'Excel file with {len(sheet_names)} sheets, {row_count} rows × {col_count} columns in active sheet',
+        'extracted_text': extracted_text[:3000],
+        'metadata': {
+            'sheet_count': len(sheet_names),
+            'sheet_names': sheet_names[:10],  # First 10 sheet names
+            'active_sheet': first_sheet.title,
+            'row_count': row_count,
+            'column_count': col_count,
+            'sheet_summaries': sheet_summaries
+        }
+    }
+
+
+def _analyze_python(path: str) -> Dict[str, Any]:
+    with open(path, 'r', encoding='utf-8') as f:
+        source_code = f.read()
+
+    functions: List[str] = []
+    classes: List[str] = []
+    imports: List[str] = []
+    try:
+        for node in ast.walk(ast.parse(source_code)):
+            if isinstance(node, ast.FunctionDef):
+                functions.append(node.name)
+            elif isinstance(node, ast.ClassDef):
+                classes.append(node.name)
+            elif isinstance(node, ast.Import):
+                imports.extend(alias.name for alias in node.names)
+            elif isinstance(node, ast.ImportFrom) and node.module:
+                imports.append(node.module)
+    except SyntaxError:
+        pass
+
+    lines = source_code.splitlines()
+    code_lines = [line for line in lines if line.strip() and not line.strip().startswith('#')]
+    comment_lines = [line for line in lines if line.strip().startswith('#')]
+    unique_imports = list(dict.fromkeys(imports))
+
+    return {
+        'type': 'code',
+        'description': f'Python file with {len(functions)} functions, {len(classes)} classes, {len(lines)} lines',
+        'extracted_text': source_code[:2000],  # First 2000 chars
+        'metadata': {
+            'language': 'python',
+            'line_count': len(lines),
+            'code_lines': len(code_lines),
+            'comment_lines': len(comment_lines),
+            'function_count': len(functions),
+            'class_count': len(classes),
+            'import_count': len(unique_imports),
+            'functions': functions[:10],  # First 10 function names
+            'classes': classes[:10],  # First 10 class names
+            'imports': unique_imports[:15]  # First 15 unique imports
+        }
+    }
+
+
+_ANALYZERS: Dict[str, Callable[[str], Dict[str, Any]]] = {
+    '.png': _analyze_image, '.jpg': _analyze_image, '.jpeg': _analyze_image, '.gif': _analyze_image,
+    '.txt': _analyze_text, '.md': _analyze_text,
+    '.csv': _analyze_csv,
+    '.doc': _analyze_docx, '.docx': _analyze_docx,
+    '.xls': _analyze_excel, '.xlsx': _analyze_excel,
+    '.py': _analyze_python,
+}
+
+
+def _analyze_file(path: str, file_type: str) -> Dict[str, Any]:
+    """Worker entry point for every non-PDF upload analysis"""
+    return _ANALYZERS[file_type](path)
+
+
+def _extract_docx_text(path: str) -> str:
+    from docx import Document
+
+    paragraphs = [p.text for p in Document(path).paragraphs if p.text.strip()]
+    return "\n\n".join(paragraphs)
+
+
+def _extract_xlsx_text(path: str) -> str:
+    import openpyxl
+
+    wb = openpyxl.load_workbook(path, read_only=True, data_only=True)
+    try:
+        sheets_text = []
+        for sheet_name in wb.sheetnames[:5]:  # Limit to first 5 sheets
+            rows_text = []
+            for row in wb[sheet_name].iter_rows(max_row=100, values_only=True):  # First 100 rows
+                row_str = " | ".join(str(cell) if cell is not None else "" for cell in row)
+                if row_str.strip():
+                    rows_text.append(row_str)
+            if rows_text:
+                sheets_text.append(f"[Sheet: {sheet_name}]\n" + "\n".join(rows_text))
+        return "\n\n".join(sheets_text)
+    finally:
+        wb.close()
+
+
+# =============================================================================
+# Process Pool
+# =============================================================================
+
+# Created on first use. 'spawn' because the app process has live threads (DB pool,
+# executors) that make fork unsafe; workers are long-lived so the import cost is paid once.
+_document_executor: Optional[ProcessPoolExecutor] = None
+
+
+def _get_document_executor() -> ProcessPoolExecutor:
+    """Get the shared extraction process pool (started lazily)"""
+    global _document_executor
+    if _document_executor is None:
+        _document_executor = ProcessPoolExecutor(
+            max_workers=DOCUMENT_EXTRACT_WORKERS,
+            mp_context=multiprocessing.get_context('spawn')
+        )
+    return _document_executor
+
+
+def _reset_document_executor(kill: bool = False) -> None:
+    """Drop the pool; with kill=True its worker processes are terminated (timed-out jobs)"""
+    global _document_executor
+    executor, _document_executor = _document_executor, None
+    if executor is None:
+        return
+    if kill:
+        # ProcessPoolExecutor cannot cancel a running job - terminating is the only way out
+        for process in list((executor._processes or {}).values()):
+            process.terminate()
+    executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _content_hash(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def _spill_to_temp(data: bytes, suffix: str) -> str:
+    """Write bytes to a temp file so workers get a path instead of a pickled copy"""
+    with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as tmp_file:
+        tmp_file.write(data)
+        return tmp_file.name
+
+
+def _unlink_quietly(path: str) -> None:
+    try:
+        os.unlink(path)
+    except OSError:
+        pass
+
+
+# =============================================================================
+# Extraction Service
+# =============================================================================
+
+class DocumentExtractor:
+    """Bounded, cached, off-loop document parsing shared by every chat upload path"""
+
+    def __init__(self):
+        self._slots = asyncio.Semaphore(DOCUMENT_EXTRACT_WORKERS)
+        self.stats = {
+            'jobs': 0,
+            'cache_hits': 0,
+            'cache_misses': 0,
+            'timeouts': 0,
+            'failures': 0,
+            'pool_restarts': 0,
+            'thread_fallbacks': 0,
+        }
+
+    @staticmethod
+    def _cache():
+        return get_cache(
+            DOCUMENT_TEXT_CACHE,
+            max_size=DOCUMENT_TEXT_CACHE_MAX_SIZE,
+            ttl_seconds=DOCUMENT_TEXT_CACHE_TTL_SECONDS,
+            shared=True
+        )
+
+    async def _cached(self, key: str, produce: Callable) -> Any:
+        cache = self._cache()
+        value = await cache.get(key)
+        if value is not None:
+            self.stats['cache_hits'] += 1
+            return value
+
+        self.stats['cache_misses'] += 1
+        value = await produce()
+        await cache.set(key, value)
+        return value
+
+    async def _run(self, func: Callable, *args) -> Any:
+        """
+        Run one job in the pool with a timeout. The timeout covers execution only:
+        the slot is taken before the job is submitted, so queueing does not count.
+        """
+        async with self._slots:
+            self.stats['jobs'] += 1
+            loop = asyncio.get_running_loop()
+            for attempt in range(2):
+                try:
+                    future = loop.run_in_executor(_get_document_executor(), func, *args)
+                    return await asyncio.wait_for(future, DOCUMENT_EXTRACT_TIMEOUT_SECONDS)
+                except asyncio.TimeoutError:
+                    self.stats['timeouts'] += 1
+                    logger.warning(f"⏱️ Document job {func.__name__} timed out after "
+                                   f"{DOCUMENT_EXTRACT_TIMEOUT_SECONDS}s - restarting extraction pool")
+                    _reset_document_executor(kill=True)
+                    raise TimeoutError(f"extraction timed out after {DOCUMENT_EXTRACT_TIMEOUT_SECONDS}s")
+                except BrokenProcessPool as e:
+                    # A worker died (crash, or killed after another job's timeout) - retry once on a fresh pool
+                    self.stats['pool_restarts'] += 1
+                    _reset_document_executor()
+                    if attempt:
+                        raise RuntimeError(f"extraction worker crashed: {e}")
+                    logger.warning(f"⚠️ Document extraction pool broke ({e}), retrying on a new pool")
+                except OSError as e:
+                    # Pool cannot start (process limits) - parse in a thread rather than fail
+                    self.stats['thread_fallbacks'] += 1
+                    logger.warning(f"⚠️ Document extraction pool unavailable ({e}), parsing in a thread")
+                    _reset_document_executor()
+                    return await asyncio.wait_for(asyncio.to_thread(func, *args), DOCUMENT_EXTRACT_TIMEOUT_SECONDS)
+
+    # -------------------------------------------------------------------------
+    # PDF page streaming
+    # -------------------------------------------------------------------------
+
+    async def iter_pdf_pages(self, data: bytes, max_pages: Optional[int] = None,
+                             path: Optional[str] = None) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Yield {'page', 'page_count', 'text'} per page, parsing PDF_PAGE_BATCH_SIZE pages
+        per job. The next batch is already parsing while the caller handles this one;
+        stopping early (break / aclose) cancels it. Each batch is cached on its own, so a
+        stream that stopped early resumes from cache the next time.
+        """
+        digest = _content_hash(data)
+        source = {'path': path, 'spilled': False}
+
+        async def load_batch(start: int) -> Dict[str, Any]:
+            async def parse():
+                if source['path'] is None:
+                    source['path'] = await asyncio.to_thread(_spill_to_temp, data, '.pdf')
+                    source['spilled'] = True
+                return await self._run(_extract_pdf_pages, source['path'], start, start + PDF_PAGE_BATCH_SIZE)
+            return await self._cached(stable_key('pdf_pages', digest, start, PDF_PAGE_BATCH_SIZE), parse)
+
+        start = 0
+        next_batch: Optional[asyncio.Task] = asyncio.create_task(load_batch(start))
+        try:
+            while next_batch is not None:
+                batch = await next_batch
+                next_batch = None
+
+                page_count = batch['page_count']
+                limit = page_count if max_pages is None else min(page_count, max_pages)
+                start += PDF_PAGE_BATCH_SIZE
+                if start < limit:
+                    next_batch = asyncio.create_task(load_batch(start))
+
+                for number, text in batch['pages']:
+                    if number > limit:
+                        return
+                    yield {'page': number, 'page_count': page_count, 'text': text}
+        finally:
+            if next_batch is not None:
+                next_batch.cancel()
+                try:
+                    await next_batch
+                except BaseException:
+                    pass
+            if source['spilled']:
+                await asyncio.to_thread(_unlink_quietly, source['path'])
+
+    async def _collect_pdf_pages(self, data: bytes, max_pages: int, max_chars: Optional[int] = None,
+                                 path: Optional[str] = None) -> Dict[str, Any]:
+        """Pages with text up to max_pages, stopping early once max_chars have been read"""
+        pages: List[Dict[str, Any]] = []
+        page_count = 0
+        chars = 0
+        async with aclosing(self.iter_pdf_pages(data, max_pages=max_pages, path=path)) as stream:
+            async for page in stream:
+                page_count = page['page_count']
+                if page['text']:
+                    pages.append(page)
+                    chars += len(page['text']) + 1
+                if max_chars is not None and chars >= max_chars:
+                    break
+        return {'page_count': page_count, 'pages': pages}
+
+    # -------------------------------------------------------------------------
+    # Public API
+    # -------------------------------------------------------------------------
+
+    async def analyze(self, data: bytes, file_type: str, path: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Upload analysis for process_uploaded_files: {'type', 'description',
+        'extracted_text', 'metadata'}. Raises on parse failure or timeout.
+        """
+        file_type = file_type.lower()
+        if file_type == '.pdf':
+            return await self._cached(
+                stable_key('analysis', _content_hash(data), file_type),
+                lambda: self._analyze_pdf(data, path)
+            )
+        if file_type not in _ANALYZERS:
+            return {'description': f"Unsupported file type: {file_type}"}
+
+        async def parse():
+            if path is not None:
+                return await self._run(_analyze_file, path, file_type)
+            temp_path = await asyncio.to_thread(_spill_to_temp, data, file_type)
+            try:
+                return await self._run(_analyze_file, temp_path, file_type)
+            finally:
+                await asyncio.to_thread(_unlink_quietly, temp_path)
+
+        return await self._cached(stable_key('analysis', _content_hash(data), file_type), parse)
+
+    async def _analyze_pdf(self, data: bytes, path: Optional[str]) -> Dict[str, Any]:
+        result = await self._collect_pdf_pages(
+            data, max_pages=ANALYSIS_PDF_MAX_PAGES, max_chars=ANALYSIS_PDF_MAX_CHARS, path=path
+        )
+        text_content = "".join(page['text'] + "\n" for page in result['pages'])
+        return {
+            'type': 'pdf',
+            'description': f"PDF document with {result['page_count']} pages",
+            'extracted_text': text_content[:ANALYSIS_PDF_MAX_CHARS],
+            'metadata': {'page_count': result['page_count']}
+        }
+
+    async def extract_text(self, data: bytes, filename: str, mime_type: str) -> str:
+        """
+        Plain text of an attachment for the /chat-json path. Unsupported types and
+        failures come back as a bracketed note, as before, so the chat still goes through.
+        """
+        suffix = (Path(filename).suffix or '.bin').lower()
+        mime_type = mime_type or ''
+
+        if mime_type == 'application/pdf' or suffix == '.pdf':
+            label, produce = 'PDF file', lambda: self._pdf_chat_text(data)
+        elif mime_type == DOCX_MIME_TYPE or suffix == '.docx':
+            label, produce = 'Word document', lambda: self._file_text(_extract_docx_text, data, suffix)
+        elif mime_type == XLSX_MIME_TYPE or suffix == '.xlsx':
+            label, produce = 'Excel file', lambda: self._file_text(_extract_xlsx_text, data, suffix)
+        elif mime_type.startswith('text/') or suffix in ['.txt', '.md', '.csv', '.json']:
+            # Decoding is cheap - only the kept prefix is decoded
+            return data[:CHAT_TEXT_MAX_CHARS * 4].decode('utf-8', errors='replace')[:CHAT_TEXT_MAX_CHARS]
+        else:
+            logger.warning(f"⚠️ Unsupported document type for extraction: {mime_type}")
+            return f"[Attached file: {filename} (type: {mime_type}) - text extraction not supported for this format]"
+
+        try:
+            text = await self._cached(stable_key('chat_text', _content_hash(data), label), produce)
+            logger.info(f"📄 Extracted {len(text)} chars from {label.lower()} {filename}")
+            return text
+        except Exception as e:
+            self.stats['failures'] += 1
+            logger.error(f"❌ {label} extraction failed for {filename}: {e}")
+            return f"[{label}: {filename} - extraction failed: {str(e)}]"
+
+    async def _pdf_chat_text(self, data: bytes) -> str:
+        result = await self._collect_pdf_pages(data, max_pages=CHAT_PDF_MAX_PAGES)
+        return "\n\n".join(f"[Page {page['page']}]\n{page['text']}" for page in result['pages'])
+
+    async def _file_text(self, func: Callable[[str], str], data: bytes, suffix: str) -> str:
+        temp_path = await asyncio.to_thread(_spill_to_temp, data, suffix)
+        try:
+            return await self._run(func, temp_path)
+        finally:
+            await asyncio.to_thread(_unlink_quietly, temp_path)
+
+    def get_status(self) -> Dict[str, Any]:
+        return {
+            'workers': DOCUMENT_EXTRACT_WORKERS,
+            'pool_running': _document_executor is not None,
+            'timeout_seconds': DOCUMENT_EXTRACT_TIMEOUT_SECONDS,
+            'pdf_page_batch_size': PDF_PAGE_BATCH_SIZE,
+            **self.stats
+        }
+
+    def shutdown(self) -> None:
+        """Stop the worker processes (app shutdown)"""
+        _reset_document_executor(kill=True)
+
+
+# Global instance
+_document_extractor: Optional[DocumentExtractor] = None
+
+
+def get_document_extractor() -> DocumentExtractor:
+    """Get the shared document extraction service"""
+    global _document_extractor
+    if _document_extractor is None:
+        _document_extractor = DocumentExtractor()
+    return _document_extractor
@@ -0,0 +1,736 @@
+# modules/core/scheduler.py
+"""
+Background job scheduler for Syntax Prime V2.
+Replaces the hand-written `while True: ... asyncio.sleep(...)` loops in app.py and
+GoogleWorkspaceBackgroundTasks._run_periodic_task.
+
+Created: 2026-10-16
+
+FEATURES:
+1. Declarative registration - every `interval` seconds or on a 5-field `cron`
+   expression (minute hour day-of-month month day-of-week, evaluated in `tz`).
+2. Leases - with several uvicorn workers or replicas, a leased job runs once per
+   slot, not once per process. The claim is a short transaction guarded by
+   pg_try_advisory_xact_lock; the lease itself lives in scheduler_jobs (owner,
+   lease_until, next_run_at) and is renewed while the job runs, so no pooled
+   connection is held for the length of a job. A crashed owner's lease expires
+   after LEASE_SECONDS.
+3. Skip-if-running - a job that is still running when it comes due again (here or
+   on another replica) is skipped, not stacked.
+4. Jitter - each start is pushed back by a random 0..jitter seconds so replicas and
+   jobs sharing an interval don't all fire on the same tick.
+5. Metrics - per-job duration and lag (actual start minus due time) histograms,
+   run/failure/skip counters. Served by GET /api/scheduler/jobs.
+
+Jobs that only touch in-process state (e.g. flushing this worker's buffers)
+register with leased=False and run in every process.
+
+USAGE:
+    from modules.core.scheduler import get_scheduler
+
+    scheduler = get_scheduler()
+    scheduler.add_job('weather_collection', collect_weather, interval=7200, retry_after=300)
+    scheduler.add_job('daily_digest', send_digest, cron='0 8 * * *', tz='America/New_York')
+    await scheduler.start()
+    ...
+    await scheduler.stop()
+"""
+
+import asyncio
+import hashlib
+import logging
+import os
+import random
+import socket
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+from zoneinfo import ZoneInfo
+
+from .database import db_manager
+
+logger = logging.getLogger(__name__)
+
+__all__ = [
+    'JobScheduler',
+    'ScheduledJob',
+    'CronSchedule',
+    'Histogram',
+    'get_scheduler',
+]
+
+# Lease length; renewed every LEASE_SECONDS / 3 while the job runs
+LEASE_SECONDS = 300
+
+# Default jitter for interval jobs: this fraction of the interval, capped
+DEFAULT_JITTER_FRACTION = 0.1
+DEFAULT_MAX_JITTER_SECONDS = 60
+
+# Longest the dispatcher sleeps between checks (guards against clock jumps)
+MAX_DISPATCH_SLEEP_SECONDS = 30
+
+# Upper bounds (seconds) shared by the duration and lag histograms
+HISTOGRAM_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600, 1800, 3600)
+
+SCHEDULER_TABLE_SQL = """
+CREATE TABLE IF NOT EXISTS scheduler_jobs (
+    job_name TEXT PRIMARY KEY,
+    next_run_at TIMESTAMP WITH TIME ZONE,
+    lease_owner TEXT,
+    lease_until TIMESTAMP WITH TIME ZONE,
+    last_started_at TIMESTAMP WITH TIME ZONE,
+    last_finished_at TIMESTAMP WITH TIME ZONE,
+    last_status TEXT,
+    last_error TEXT,
+    last_duration_ms INTEGER
+);
+"""
+
+CLAIM_STATE_QUERY = """
+INSERT INTO scheduler_jobs (job_name, next_run_at) VALUES ($1, NOW())
+ON CONFLICT (job_name) DO UPDATE SET job_name = EXCLUDED.job_name
+RETURNING next_run_at, lease_owner, lease_until, NOW() AS db_now
+"""
+
+CLAIM_UPDATE_QUERY = """
+UPDATE scheduler_jobs
+SET lease_owner = $2,
+    lease_until = NOW() + make_interval(secs => $3),
+    last_started_at = NOW(),
+    next_run_at = $4
+WHERE job_name = $1
+"""
+
+RENEW_LEASE_QUERY = """
+UPDATE scheduler_jobs
+SET lease_until = NOW() + make_interval(secs => $3)
+WHERE job_name = $1 AND lease_owner = $2
+"""
+
+RELEASE_LEASE_QUERY = """
+UPDATE scheduler_jobs
+SET lease_owner = NULL,
+    lease_until = NULL,
+    last_finished_at = NOW(),
+    last_status = $3,
+    last_error = $4,
+    last_duration_ms = $5,
+    next_run_at = COALESCE($6, next_run_at)
+WHERE job_name = $1 AND lease_owner = $2
+"""
+
+
+# =============================================================================
+# Schedules
+# =============================================================================
+
+class CronSchedule:
+    """
+    Minimal 5-field cron expression: minute hour day-of-month month day-of-week.
+    Supports *, lists (1,15), ranges (1-5) and steps (*/15, 0-30/10). Day-of-week
+    is 0-6 from Sunday (7 also means Sunday). As in cron, when both day fields are
+    restricted a day matching either one qualifies.
+    """
+
+    FIELD_RANGES = ((0, 59), (0, 23), (1, 31), (1, 12), (0, 7))
+
+    def __init__(self, expression: str, tz: str = 'UTC'):
+        fields = expression.split()
+        if len(fields) != 5:
+            raise ValueError(f"Cron expression needs 5 fields, got {len(fields)}: '{expression}'")
+
+        self.expression = expression
+        self.tz = ZoneInfo(tz)
+        parsed = [self._parse_field(field, low, high) for field, (low, high) in zip(fields, self.FIELD_RANGES)]
+        self.minutes, self.hours, self.days, self.months, weekdays = parsed
+        self.weekdays = {day % 7 for day in weekdays}
+        self._days_restricted = fields[2] != '*'
+        self._weekdays_restricted = fields[4] != '*'
+
+    @staticmethod
+    def _parse_field(field: str, low: int, high: int) -> set:
+        values = set()
+        for part in field.split(','):
+            step = 1
+            if '/' in part:
+                part, step_text = part.split('/', 1)
+                step = int(step_text)
+                if step < 1:
+                    raise ValueError(f"Invalid cron step: '{field}'")
+
+            if part == '*':
+                start, end = low, high
+            elif '-' in part:
+                start_text, end_text = part.split('-', 1)
+                start, end = int(start_text), int(end_text)
+            else:
+                start = int(part)
+                end = high if step > 1 else start
+
+            if start < low or end > high or start > end:
+                raise ValueError(f"Cron field '{field}' outside {low}-{high}")
+            values.update(range(start, end + 1, step))
+        return values
+
+    def _day_matches(self, moment: datetime) -> bool:
+        day_ok = moment.day in self.days
+        weekday_ok = (moment.weekday() + 1) % 7 in self.weekdays
+        if self._days_restricted and self._weekdays_restricted:
+            return day_ok or weekday_ok
+        return day_ok and weekday_ok
+
+    def next_after(self, after: datetime) -> datetime:
+        """First matching minute strictly after `after` (returned in UTC)."""
+        local = after.astimezone(self.tz).replace(tzinfo=None, second=0, microsecond=0)
+        moment = local + timedelta(minutes=1)
+
+        # Jump a whole month/day/hour at a time when that field can't match
+        for _ in range(50000):
+            if moment.month not in self.months:
+                moment = (moment.replace(day=1, hour=0, minute=0) + timedelta(days=32)).replace(day=1)
+            elif not self._day_matches(moment):
+                moment = moment.replace(hour=0, minute=0) + timedelta(days=1)
+            elif moment.hour not in self.hours:
+                moment = moment.replace(minute=0) + timedelta(hours=1)
+            elif moment.minute not in self.minutes:
+                moment += timedelta(minutes=1)
+            else:
+                return moment.replace(tzinfo=self.tz).astimezone(timezone.utc)
+
+        raise ValueError(f"Cron expression never matches: '{self.expression}'")
+
+
+# =============================================================================
+# Metrics
+# =============================================================================
+
+class Histogram:
+    """Fixed-bucket histogram (cumulative counts, Prometheus style) with sum/min/max."""
+
+    def __init__(self, buckets: Tuple[float, ...] = HISTOGRAM_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self._counts = [0] * (len(self.buckets) + 1)  # last slot is +Inf
+        self.count = 0
+        self.total = 0.0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+
+    def observe(self, value: float) -> None:
+        value = max(value, 0.0)
+        index = len(self.buckets)
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                index = i
+                break
+        self._counts[index] += 1
+        self.count += 1
+        self.total += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Upper bound of the bucket holding the q-th observation (capped at max)."""
+        if not self.count:
+            return None
+        target = q * self.count
+        cumulative = 0
+        for bound, bucket_count in zip(self.buckets, self._counts):
+            cumulative += bucket_count
+            if cumulative >= target:
+                return min(bound, self.max)
+        return self.max
+
+    def snapshot(self) -> Dict[str, Any]:
+        cumulative = 0
+        buckets = {}
+        for bound, bucket_count in zip(self.buckets, self._counts):
+            cumulative += bucket_count
+            buckets[f"le_{bound:g}"] = cumulative
+        buckets['le_inf'] = self.count
+
+        def rounded(value):
+            return round(value, 3) if value is not None else None
+
+        return {
+            'count': self.count,
+            'sum': rounded(self.total),
+            'mean': rounded(self.total / self.count) if self.count else None,
+            'min': rounded(self.min),
+            'max': rounded(self.max),
+            'p50': rounded(self.quantile(0.5)),
+            'p95': rounded(self.quantile(0.95)),
+            'buckets': buckets,
+        }
+
+
+# =============================================================================
+# Jobs
+# =============================================================================
+
+class ScheduledJob:
+    """One registered job: schedule, run policy, runtime state and metrics."""
+
+    def __init__(self, name: str, func: Callable[[], Awaitable[Any]], *,
+                 interval: Optional[float] = None, cron: Optional[str] = None,
+                 tz: str = 'UTC', start_delay: float = 0,
+                 jitter: Optional[float] = None, retry_after: Optional[float] = None,
+                 timeout: Optional[float] = None, leased: bool = True,
+                 pause_after_errors: Optional[int] = None, pause_seconds: float = 0):
+        if (interval is None) == (cron is None):
+            raise ValueError(f"Job '{name}' needs exactly one of interval or cron")
+        if interval is not None and interval <= 0:
+            raise ValueError(f"Job '{name}' interval must be positive")
+
+        self.name = name
+        self.func = func
+        self.interval = interval
+        self.cron = CronSchedule(cron, tz) if cron else None
+        self.start_delay = start_delay
+        if jitter is None:
+            jitter = min(interval * DEFAULT_JITTER_FRACTION, DEFAULT_MAX_JITTER_SECONDS) if interval else 0
+        self.jitter = jitter
+        self.retry_after = retry_after
+        self.timeout = timeout
+        self.leased = leased
+        self.pause_after_errors = pause_after_errors
+        self.pause_seconds = pause_seconds
+        self.lock_key = int.from_bytes(
+            hashlib.sha1(f"scheduler:{name}".encode('utf-8')).digest()[:8], 'big', signed=True
+        )
+
+        # Runtime state
+        self.next_due: Optional[datetime] = None
+        self.task: Optional[asyncio.Task] = None
+        self.consecutive_errors = 0
+        self.paused_until: Optional[datetime] = None
+        self.last_run: Optional[datetime] = None
+        self.last_success: Optional[datetime] = None
+        self.last_error: Optional[str] = None
+
+        # Metrics
+        self.duration = Histogram()
+        self.lag = Histogram()
+        self.counters = {
+            'runs': 0,
+            'successes': 0,
+            'failures': 0,
+            'timeouts': 0,
+            'skipped_running': 0,   # still running here when due again
+            'skipped_lease': 0,     # running or being claimed on another replica
+            'skipped_not_due': 0,   # another replica already ran this slot
+            'skipped_paused': 0,
+            'lease_errors': 0,
+        }
+
+    @property
+    def is_running(self) -> bool:
+        return self.task is not None and not self.task.done()
+
+    def next_slot(self, after: datetime) -> datetime:
+        """Next nominal start after `after` (no jitter)."""
+        if self.cron:
+            return self.cron.next_after(after)
+        return after + timedelta(seconds=self.interval)
+
+    def with_jitter(self, moment: datetime) -> datetime:
+        if self.jitter <= 0:
+            return moment
+        return moment + timedelta(seconds=random.uniform(0, self.jitter))
+
+    def status(self) -> Dict[str, Any]:
+        def iso(value):
+            return value.isoformat() if value else None
+
+        return {
+            'schedule': f"cron '{self.cron.expression}' ({self.cron.tz.key})" if self.cron else f"every {self.interval:g}s",
+            'leased': self.leased,
+            'jitter_seconds': self.jitter,
+            'is_running': self.is_running,
+            'next_due': iso(self.next_due),
+            'last_run': iso(self.last_run),
+            'last_success': iso(self.last_success),
+            'last_error': self.last_error,
+            'consecutive_errors': self.consecutive_errors,
+            'paused_until': iso(self.paused_until),
+            **self.counters,
+            'duration_seconds': self.duration.snapshot(),
+            'lag_seconds': self.lag.snapshot(),
+        }
+
+
+# =============================================================================
+# Scheduler
+# =============================================================================
+
+class JobScheduler:
+    """
+    Single dispatcher loop for every registered job.
+
+    This is a singleton - use get_scheduler() to access.
+    """
+
+    def __init__(self):
+        self.owner = f"{socket.gethostname()}:{os.getpid()}"
+        self._jobs: Dict[str, ScheduledJob] = {}
+        self._running = False
+        self._dispatcher: Optional[asyncio.Task] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._table_ready = False
+
+    # -------------------------------------------------------------------------
+    # Registration
+    # -------------------------------------------------------------------------
+
+    def add_job(self, name: str, func: Callable[[], Awaitable[Any]], *,
+                interval: Optional[float] = None, cron: Optional[str] = None,
+                tz: str = 'UTC', start_delay: float = 0,
+                jitter: Optional[float] = None, retry_after: Optional[float] = None,
+                timeout: Optional[float] = None, leased: bool = True,
+                pause_after_errors: Optional[int] = None, pause_seconds: float = 0) -> ScheduledJob:
+        """
+        Register a job (before or after start()).
+
+        Args:
+            name: Unique job name (also the lease key)
+            func: Zero-argument coroutine function, one run per call
+            interval: Seconds between starts (fixed rate)
+            cron: 5-field cron expression, evaluated in `tz`
+            start_delay: Seconds to wait before the first run in this process
+            jitter: Max random delay added to each start (default: 10% of interval, max 60s)
+            retry_after: After a failure, run again this soon instead of waiting a full interval
+            timeout: Cancel a run that takes longer than this many seconds
+            leased: Run once across replicas (False: in every process)
+            pause_after_errors: Pause the job after this many consecutive failures...
+            pause_seconds: ...for this long
+        """
+        if name in self._jobs:
+            raise ValueError(f"Job '{name}' is already registered")
+
+        job = ScheduledJob(
+            name, func, interval=interval, cron=cron, tz=tz,
+            start_delay=start_delay, jitter=jitter, retry_after=retry_after, timeout=timeout,
+            leased=leased, pause_after_errors=pause_after_errors, pause_seconds=pause_seconds
+        )
+        now = datetime.now(timezone.utc)
+        if job.cron:
+            job.next_due = job.with_jitter(job.cron.next_after(now + timedelta(seconds=start_delay)))
+        else:
+            job.next_due = job.with_jitter(now + timedelta(seconds=start_delay))
+
+        self._jobs[name] = job
+        self._wake()
+        logger.debug(f"🗓️ Job registered: {name} ({job.status()['schedule']})")
+        return job
+
+    async def remove_job(self, name: str) -> bool:
+        """Unregister a job, cancelling a run in progress."""
+        job = self._jobs.pop(name, None)
+        if job is None:
+            return False
+        await self._cancel_run(job)
+        return True
+
+    def get_job(self, name: str) -> Optional[ScheduledJob]:
+        return self._jobs.get(name)
+
+    # -------------------------------------------------------------------------
+    # Lifecycle
+    # -------------------------------------------------------------------------
+
+    async def start(self) -> None:
+        """Create the lease table and start the dispatcher (call once at startup)."""
+        if self._running:
+            return
+
+        await self._ensure_table()
+        self._running = True
+        self._wakeup = asyncio.Event()
+        self._dispatcher = asyncio.create_task(self._dispatch_loop())
+        logger.info(f"🗓️ Job scheduler started ({len(self._jobs)} jobs, owner {self.owner})")
+
+    async def stop(self) -> None:
+        """Stop dispatching and cancel runs in progress (their leases are released)."""
+        if not self._running:
+            return
+
+        self._running = False
+        if self._dispatcher is not None:
+            self._dispatcher.cancel()
+            try:
+                await self._dispatcher
+            except asyncio.CancelledError:
+                pass
+            self._dispatcher = None
+
+        for job in list(self._jobs.values()):
+            await self._cancel_run(job)
+        logger.info("🗓️ Job scheduler stopped")
+
+    async def run_now(self, name: str) -> bool:
+        """
+        Run a job immediately and wait for it (skip-if-running still applies).
+        Returns True if the job ran and succeeded.
+        """
+        job = self._jobs.get(name)
+        if job is None:
+            logger.error(f"Unknown job: {name}")
+            return False
+        if job.is_running:
+            job.counters['skipped_running'] += 1
+            logger.info(f"⏭️ {name} already running - manual run skipped")
+            return False
+
+        now = datetime.now(timezone.utc)
+        job.task = asyncio.create_task(self._execute(job, now, force=True))
+        return await job.task
+
+    async def _ensure_table(self) -> None:
+        if self._table_ready:
+            return
+        try:
+            await db_manager.execute(SCHEDULER_TABLE_SQL)
+            self._table_ready = True
+        except Exception as e:
+            # Leased jobs will keep skipping (and retrying the claim) until the DB is back
+            logger.error(f"❌ Failed to create scheduler_jobs table: {e}")
+
+    def _wake(self) -> None:
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    async def _cancel_run(self, job: ScheduledJob) -> None:
+        if job.is_running:
+            job.task.cancel()
+            try:
+                await job.task
+            except (asyncio.CancelledError, Exception):
+                pass
+
+    # -------------------------------------------------------------------------
+    # Dispatch
+    # -------------------------------------------------------------------------
+
+    async def _dispatch_loop(self) -> None:
+        while self._running:
+            try:
+                self._wakeup.clear()
+                now = datetime.now(timezone.utc)
+
+                for job in list(self._jobs.values()):
+                    if job.next_due is not None and job.next_due <= now:
+                        self._dispatch(job, now)
+
+                pending = [job.next_due for job in self._jobs.values() if job.next_due is not None]
+                sleep_for = MAX_DISPATCH_SLEEP_SECONDS
+                if pending:
+                    sleep_for = min(sleep_for, max((min(pending) - now).total_seconds(), 0))
+
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=sleep_for)
+                except asyncio.TimeoutError:
+                    pass
+
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"❌ Scheduler dispatch error: {e}")
+                await asyncio.sleep(1)
+
+    def _dispatch(self, job: ScheduledJob, now: datetime) -> None:
+        due = job.next_due
+
+        # Fixed rate: the next slot is counted from this one, not from when the run ends
+        next_slot = job.next_slot(due)
+        if next_slot <= now:
+            next_slot = job.next_slot(now)
+        job.next_due = job.with_jitter(next_slot)
+
+        if job.is_running:
+            job.counters['skipped_running'] += 1
+            logger.info(f"⏭️ {job.name} still running - skipping this slot")
+            return
+
+        job.task = asyncio.create_task(self._execute(job, due))
+
+    async def _execute(self, job: ScheduledJob, due: datetime, force: bool = False) -> bool:
+        now = datetime.now(timezone.utc)
+
+        if job.paused_until is not None:
+            if now < job.paused_until and not force:
+                job.counters['skipped_paused'] += 1
+                logger.debug(f"⏸️ {job.name} paused until {job.paused_until.isoformat()}")
+                return False
+            job.paused_until = None
+            job.consecutive_errors = 0
+            logger.info(f"▶️ {job.name} resuming after pause")
+
+        if job.leased and not await self._claim(job, force):
+            return False
+
+        job.counters['runs'] += 1
+        job.last_run = now
+        job.lag.observe((now - due).total_seconds())
+        renewer = asyncio.create_task(self._renew_lease(job)) if job.leased else None
+
+        status, error, success = 'success', None, False
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        try:
+            logger.debug(f"🔄 Running: {job.name}")
+            if job.timeout:
+                await asyncio.wait_for(job.func(), timeout=job.timeout)
+            else:
+                await job.func()
+            success = True
+
+        except asyncio.CancelledError:
+            status, error = 'cancelled', 'cancelled'
+            raise
+        except asyncio.TimeoutError:
+            status, error = 'timeout', f"timed out after {job.timeout:g}s"
+            job.counters['timeouts'] += 1
+        except Exception as e:
+            status, error = 'failed', str(e)
+
+        finally:
+            elapsed = loop.time() - started
+            job.duration.observe(elapsed)
+            if renewer is not None:
+                renewer.cancel()
+
+            retry_at = None
+            if success:
+                job.counters['successes'] += 1
+                job.consecutive_errors = 0
+                job.last_success = datetime.now(timezone.utc)
+                job.last_error = None
+                logger.debug(f"✅ Completed: {job.name} in {elapsed:.2f}s")
+            elif status != 'cancelled':
+                retry_at = self._record_failure(job, error)
+
+            if job.leased:
+                await self._release(job, status, error, int(elapsed * 1000), retry_at)
+
+        return success
+
+    def _record_failure(self, job: ScheduledJob, error: str) -> Optional[datetime]:
+        """Count a failure; returns an earlier next run if the job retries sooner."""
+        now = datetime.now(timezone.utc)
+        job.counters['failures'] += 1
+        job.consecutive_errors += 1
+        job.last_error = error
+        logger.error(f"❌ {job.name} failed (attempt {job.consecutive_errors}): {error}")
+
+        if job.pause_after_errors and job.consecutive_errors >= job.pause_after_errors:
+            job.paused_until = now + timedelta(seconds=job.pause_seconds)
+            logger.warning(
+                f"⏸️ {job.name} paused for {job.pause_seconds / 60:g} minutes "
+                f"after {job.consecutive_errors} consecutive errors"
+            )
+            return None
+
+        if job.retry_after is not None:
+            retry_at = now + timedelta(seconds=job.retry_after)
+            if job.next_due is None or retry_at < job.next_due:
+                job.next_due = retry_at
+                self._wake()
+                return retry_at
+        return None
+
+    # -------------------------------------------------------------------------
+    # Leases
+    # -------------------------------------------------------------------------
+
+    async def _claim(self, job: ScheduledJob, force: bool) -> bool:
+        """Take the lease for this slot. False if held elsewhere or already run."""
+        if not self._table_ready:
+            await self._ensure_table()
+
+        try:
+            async with db_manager.transaction() as conn:
+                if not await conn.fetchval("SELECT pg_try_advisory_xact_lock($1)", job.lock_key):
+                    job.counters['skipped_lease'] += 1
+                    logger.debug(f"🔒 {job.name} is being claimed by another process")
+                    return False
+
+                state = await conn.fetchrow(CLAIM_STATE_QUERY, job.name)
+                db_now = state['db_now']
+
+                if state['lease_until'] is not None and state['lease_until'] > db_now:
+                    job.counters['skipped_lease'] += 1
+                    logger.info(f"⏭️ {job.name} running on {state['lease_owner']} - skipping this slot")
+                    return False
+
+                if not force and state['next_run_at'] is not None and state['next_run_at'] > db_now:
+                    # Another replica already ran this slot - follow its schedule
+                    job.counters['skipped_not_due'] += 1
+                    job.next_due = job.with_jitter(state['next_run_at'])
+                    self._wake()
+                    return False
+
+                await conn.execute(
+                    CLAIM_UPDATE_QUERY,
+                    job.name, self.owner, float(LEASE_SECONDS), job.next_slot(db_now)
+                )
+                return True
+
+        except Exception as e:
+            job.counters['lease_errors'] += 1
+            logger.error(f"❌ {job.name} lease claim failed: {e}")
+            return False
+
+    async def _renew_lease(self, job: ScheduledJob) -> None:
+        while True:
+            await asyncio.sleep(LEASE_SECONDS / 3)
+            try:
+                await db_manager.execute(RENEW_LEASE_QUERY, job.name, self.owner, float(LEASE_SECONDS))
+            except Exception as e:
+                logger.warning(f"⚠️ {job.name} lease renewal failed: {e}")
+
+    async def _release(self, job: ScheduledJob, status: str, error: Optional[str],
+                       duration_ms: int, retry_at: Optional[datetime]) -> None:
+        try:
+            await db_manager.execute(
+                RELEASE_LEASE_QUERY,
+                job.name, self.owner, status, error[:1000] if error else None, duration_ms, retry_at
+            )
+        except Exception as e:
+            logger.warning(f"⚠️ {job.name} lease release failed (expires in {LEASE_SECONDS}s): {e}")
+
+    # -------------------------------------------------------------------------
+    # Status
+    # -------------------------------------------------------------------------
+
+    def get_status(self) -> Dict[str, Any]:
+        """This process's view: schedule, state, counters and histograms per job."""
+        return {
+            'running': self._running,
+            'owner': self.owner,
+            'jobs': {name: job.status() for name, job in sorted(self._jobs.items())},
+        }
+
+    async def get_shared_state(self) -> List[Dict[str, Any]]:
+        """Lease table rows - the last run of each job on any replica."""
+        rows = await db_manager.fetch_all(
+            """
+            SELECT job_name, next_run_at, lease_owner, lease_until, last_started_at,
+                   last_finished_at, last_status, last_error, last_duration_ms
+            FROM scheduler_jobs
+            ORDER BY job_name
+            """
+        )
+        return [
+            {key: value.isoformat() if isinstance(value, datetime) else value for key, value in dict(row).items()}
+            for row in rows
+        ]
+
+
+# =============================================================================
+# Singleton
+# =============================================================================
+
+_scheduler = JobScheduler()
+
+
+def get_scheduler() -> JobScheduler:
+    """Get the process-wide job scheduler."""
+    return _scheduler
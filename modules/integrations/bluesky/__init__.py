@@ -9,6 +9,7 @@ with AI-powered engagement intelligence, keyword matching, and approval workflow
 
 from .multi_account_client import BlueskyMultiClient, get_bluesky_multi_client
 from .engagement_analyzer import EngagementAnalyzer, get_engagement_analyzer
+from .keyword_matcher import KeywordMatcher, get_keyword_matcher
 from .approval_system import ApprovalSystem, get_approval_system
 from .notification_manager import NotificationManager, get_notification_manager
 from .router import router
@@ -17,11 +18,13 @@ from .integration_info import get_integration_info, check_module_health, get_acc
 __all__ = [
     'BlueskyMultiClient',
     'EngagementAnalyzer', 
+    'KeywordMatcher',
     'ApprovalSystem',
     'NotificationManager',
     'router',
     'get_bluesky_multi_client',
     'get_engagement_analyzer',
+    'get_keyword_matcher',
     'get_approval_system', 
     'get_notification_manager',
     'get_integration_info',
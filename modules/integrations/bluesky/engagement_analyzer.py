@@ -2,35 +2,55 @@
 """
 Engagement Analyzer - Keyword Intelligence + Cross-Account Routing
 Analyzes posts against keyword database for engagement opportunities
+
+Updated: 2026-10-16 - Keyword scoring uses the shared Aho-Corasick KeywordMatcher (whole-word,
+                      all accounts in one pass); conversation-hook patterns precompiled
 """
 
 import asyncio
-from datetime import datetime
 from typing import Dict, List, Any, Optional, Tuple
 import re
 import logging
 
-from ...core.database import db_manager
+from .keyword_matcher import VALID_KEYWORD_TABLES, WORD_PATTERN, get_keyword_matcher
 
 logger = logging.getLogger(__name__)
 
-# Valid keyword tables - SQL injection prevention
-VALID_KEYWORD_TABLES = frozenset({
-    'bcdodge_keywords',
-    'roseandangel_keywords',
-    'tvsignals_keywords',
-    'mealsnfeelz_keywords',
-    'damnitcarl_keywords',
-    'amcf_keywords',
-})
+# Conversation hooks - each group compiled into one alternation, searched once per post
+CONVERSATION_HOOK_PATTERNS = {
+    'is_question': ('Question/Discussion starter', [
+        r'\?', r'what do you think', r'thoughts on', r'anyone else',
+        r'does anyone', r'who has experience', r'how do you'
+    ]),
+    'seeks_advice': ('Seeking advice/recommendations', [
+        r'need advice', r'looking for help', r'suggestions',
+        r'recommendations', r'has anyone', r'best way to'
+    ]),
+    'shares_experience': ('Sharing experience/insights', [
+        r'just learned', r'discovered', r'found out', r'realized',
+        r'my experience', r'what i learned', r'lesson learned'
+    ]),
+    'controversial_topic': ('Hot take/controversial opinion', [
+        r'hot take', r'unpopular opinion', r'controversial', r'change my mind',
+        r'disagree with me', r'fight me on this'
+    ]),
+    'asks_for_recommendations': ('Asking for recommendations', [
+        r'recommend', r'suggestions for', r'best.*for', r'looking for.*app',
+        r'tool.*recommend', r'what.*use for'
+    ]),
+}
+
+COMPILED_HOOK_PATTERNS = [
+    (flag, hook, re.compile('|'.join(f'(?:{pattern})' for pattern in patterns)))
+    for flag, (hook, patterns) in CONVERSATION_HOOK_PATTERNS.items()
+]
 
 
 class EngagementAnalyzer:
     """Analyzes Bluesky posts for engagement opportunities using keyword intelligence"""
     
     def __init__(self):
-        self.keyword_cache = {}
-        self.cache_duration = 3600  # 1 hour cache for keywords
+        self.keyword_matcher = get_keyword_matcher()
         
         # Engagement opportunity types
         self.opportunity_types = {
@@ -47,73 +67,38 @@ class EngagementAnalyzer:
         return table_name in VALID_KEYWORD_TABLES
     
     async def get_account_keywords(self, account_id: str, keywords_table: str) -> List[str]:
-        """Get keywords for specific account from database"""
-        cache_key = f"{account_id}_{keywords_table}"
-        
-        if cache_key in self.keyword_cache:
-            cached_time, keywords = self.keyword_cache[cache_key]
-            if (datetime.now() - cached_time).total_seconds() < self.cache_duration:
-                return keywords
-        
+        """Get keywords for specific account (reloaded only when its table changes)"""
         # Validate table name against allowlist
         if not self._validate_table_name(keywords_table):
             logger.error(f"Invalid keywords table name: {keywords_table}")
             return []
         
-        try:
-            # Safe query - table name validated against allowlist
-            query = f"SELECT keyword FROM {keywords_table} WHERE is_active = true"
-            results = await db_manager.fetch_all(query)
-            
-            keywords = [row['keyword'].lower() for row in results]
-            
-            # Cache the results
-            self.keyword_cache[cache_key] = (datetime.now(), keywords)
-            
-            logger.info(f"Loaded {len(keywords)} keywords for {account_id} from {keywords_table}")
-            return keywords
-            
-        except Exception as e:
-            logger.error(f"Failed to load keywords for {account_id}: {e}")
-            return []
+        await self.keyword_matcher.refresh()
+        return self.keyword_matcher.keywords_for(account_id)
     
-    def calculate_keyword_match_score(self, post_text: str, keywords: List[str]) -> Tuple[float, List[str]]:
+    def calculate_keyword_match_score(self, post_text: str, account_id: str) -> Tuple[float, List[str]]:
         """Calculate keyword match score and return matching keywords"""
-        if not keywords or not post_text:
+        keyword_count = len(self.keyword_matcher.keywords_for(account_id))
+        if not keyword_count or not post_text:
             return 0.0, []
         
-        post_lower = post_text.lower()
-        post_words = re.findall(r'\b\w+\b', post_lower)
-        
-        matched_keywords = []
-        match_score = 0.0
-        
-        for keyword in keywords:
-            keyword_lower = keyword.lower()
-            
-            # Exact phrase match (higher weight)
-            if keyword_lower in post_lower:
-                matched_keywords.append(keyword)
-                match_score += 2.0
-            
-            # Individual word matches (lower weight)
-            elif any(word in keyword_lower.split() for word in post_words):
-                keyword_words = keyword_lower.split()
-                if any(word in post_words for word in keyword_words):
-                    matched_keywords.append(keyword)
-                    match_score += 1.0
+        match = self.keyword_matcher.match(post_text).get(account_id)
+        if not match:
+            return 0.0, []
+        
+        # Exact phrase match (higher weight), individual word matches (lower weight)
+        matched_keywords = match.keywords
+        match_score = 2.0 * len(match.phrase_matches) + 1.0 * len(match.word_matches)
+        post_word_count = max(len(WORD_PATTERN.findall(post_text.lower())), 1)
         
         # Normalize score based on number of keywords and post length
-        if matched_keywords:
-            # Score based on percentage of keywords matched vs total keywords
-            keyword_coverage = len(set(matched_keywords)) / len(keywords)
-            # Boost for multiple matches in shorter posts
-            density_bonus = min(match_score / len(post_words) * 100, 0.5)
-            final_score = min((keyword_coverage * 0.8 + density_bonus * 0.2), 1.0)
-        else:
-            final_score = 0.0
+        # Score based on percentage of keywords matched vs total keywords
+        keyword_coverage = len(matched_keywords) / keyword_count
+        # Boost for multiple matches in shorter posts
+        density_bonus = min(match_score / post_word_count * 100, 0.5)
+        final_score = min((keyword_coverage * 0.8 + density_bonus * 0.2), 1.0)
         
-        return final_score, list(set(matched_keywords))
+        return final_score, matched_keywords
     
     def detect_conversation_opportunities(self, post_text: str) -> Dict[str, Any]:
         """Detect if post contains conversation starters or engagement hooks"""
@@ -128,50 +113,10 @@ class EngagementAnalyzer:
             'engagement_hooks': []
         }
         
-        # Question indicators
-        question_patterns = [
-            r'\?', r'what do you think', r'thoughts on', r'anyone else',
-            r'does anyone', r'who has experience', r'how do you'
-        ]
-        if any(re.search(pattern, post_lower) for pattern in question_patterns):
-            opportunities['is_question'] = True
-            opportunities['engagement_hooks'].append('Question/Discussion starter')
-        
-        # Advice seeking
-        advice_patterns = [
-            r'need advice', r'looking for help', r'suggestions',
-            r'recommendations', r'has anyone', r'best way to'
-        ]
-        if any(re.search(pattern, post_lower) for pattern in advice_patterns):
-            opportunities['seeks_advice'] = True
-            opportunities['engagement_hooks'].append('Seeking advice/recommendations')
-        
-        # Experience sharing
-        experience_patterns = [
-            r'just learned', r'discovered', r'found out', r'realized',
-            r'my experience', r'what i learned', r'lesson learned'
-        ]
-        if any(re.search(pattern, post_lower) for pattern in experience_patterns):
-            opportunities['shares_experience'] = True
-            opportunities['engagement_hooks'].append('Sharing experience/insights')
-        
-        # Hot takes / controversial
-        controversial_patterns = [
-            r'hot take', r'unpopular opinion', r'controversial', r'change my mind',
-            r'disagree with me', r'fight me on this'
-        ]
-        if any(re.search(pattern, post_lower) for pattern in controversial_patterns):
-            opportunities['controversial_topic'] = True
-            opportunities['engagement_hooks'].append('Hot take/controversial opinion')
-        
-        # Recommendations
-        rec_patterns = [
-            r'recommend', r'suggestions for', r'best.*for', r'looking for.*app',
-            r'tool.*recommend', r'what.*use for'
-        ]
-        if any(re.search(pattern, post_lower) for pattern in rec_patterns):
-            opportunities['asks_for_recommendations'] = True
-            opportunities['engagement_hooks'].append('Asking for recommendations')
+        for flag, hook, pattern in COMPILED_HOOK_PATTERNS:
+            if pattern.search(post_lower):
+                opportunities[flag] = True
+                opportunities['engagement_hooks'].append(hook)
         
         return opportunities
     
@@ -201,11 +146,11 @@ class EngagementAnalyzer:
         reply_count = post_info.get('replyCount', 0)
         repost_count = post_info.get('repostCount', 0)
         
-        # Load keywords for this account
-        keywords = await self.get_account_keywords(account_id, account_config['keywords_table'])
+        # Make sure the keyword automaton is loaded (no-op while fresh)
+        await self.keyword_matcher.refresh()
         
         # Calculate keyword match score
-        keyword_score, matched_keywords = self.calculate_keyword_match_score(post_text, keywords)
+        keyword_score, matched_keywords = self.calculate_keyword_match_score(post_text, account_id)
         
         # Skip low-relevance posts early (lowered threshold for testing)
         if keyword_score < 0.02:  # 2% threshold
@@ -428,7 +373,7 @@ class EngagementAnalyzer:
     
     def clear_cache(self):
         """Clear keyword cache"""
-        self.keyword_cache.clear()
+        self.keyword_matcher.invalidate()
         logger.info("Engagement analyzer cache cleared")
 
 # Global analyzer instance
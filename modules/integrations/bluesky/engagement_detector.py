@@ -3,6 +3,10 @@ Bluesky Engagement Detector
 Scans timelines for conversations matching keywords
 
 UPDATED: 2026-01-02 - Fixed post_cid capture for proper reply threading
+UPDATED: 2026-10-16 - Keywords matched through the shared Aho-Corasick KeywordMatcher
+                      (whole-word, all accounts in one pass, reloaded only when a table changes)
+UPDATED: 2026-10-16 - Timelines fetched for all accounts concurrently and only posts not seen
+                      by an earlier scan are analyzed (see BlueskyMultiClient.get_new_timeline_posts)
 """
 
 import asyncio
@@ -14,6 +18,7 @@ import logging
 import sys
 
 from ...core.database import db_manager
+from .keyword_matcher import get_keyword_matcher
 
 logging.basicConfig(
     level=logging.INFO,
@@ -66,67 +71,31 @@ class BlueskyEngagementDetector:
         self,
         account_id: str
     ) -> List[str]:
-        """Get keywords for a Bluesky account"""
-        
-        # Get the keywords table from multi_account_client config
-        from .multi_account_client import get_bluesky_multi_client
-        multi_client = get_bluesky_multi_client()
-        account_info = multi_client.get_account_info(account_id)
-        
-        table_name = account_info.get('keywords_table')
-        if not table_name:
-            logger.warning(f"No keywords table for account: {account_id}")
-            return []
-        
-        # Validate table name against allowlist
-        if not self._validate_table_name(table_name):
-            logger.error(f"Invalid keywords table name: {table_name}")
+        """Get keywords for a Bluesky account (from the shared keyword matcher)"""
+        matcher = get_keyword_matcher()
+        if account_id not in matcher.account_tables:
+            logger.warning(f"No valid keywords table for account: {account_id}")
             return []
         
-        conn = None
-        try:
-            conn = await db_manager.get_connection()
-            
-            # Safe query - table name validated against allowlist
-            query = f'''
-                SELECT keyword
-                FROM {table_name}
-                WHERE is_active = true
-                ORDER BY created_at DESC
-            '''
-            
-            rows = await conn.fetch(query)
-            keywords = [row['keyword'].lower() for row in rows]
-            
-            logger.info(f"✅ Loaded {len(keywords)} keywords for {account_id} from {table_name}")
-            return keywords
+        await matcher.refresh()
+        keywords = matcher.keywords_for(account_id)
         
-        except Exception as e:
-            logger.error(f"Failed to load keywords for {account_id}: {e}")
-            return []
-        finally:
-            if conn:
-                await db_manager.release_connection(conn)
+        logger.info(f"✅ {len(keywords)} keywords for {account_id} from {matcher.account_tables[account_id]}")
+        return keywords
     
     def _match_keywords(
         self,
         post_text: str,
-        keywords: List[str]
+        account_id: str
     ) -> List[str]:
         """
-        Match keywords against post text
+        Match an account's keywords against post text (whole words/phrases)
         
         Returns:
             List of matched keywords
         """
-        post_text_lower = post_text.lower()
-        matched = []
-        
-        for keyword in keywords:
-            if keyword in post_text_lower:
-                matched.append(keyword)
-        
-        return matched
+        match = get_keyword_matcher().match(post_text).get(account_id)
+        return list(match.phrase_matches) if match else []
     
     # ========================================================================
     # ENGAGEMENT SCORING
@@ -213,13 +182,20 @@ class BlueskyEngagementDetector:
     
     async def scan_for_opportunities(
         self,
-        account_id: str
+        account_id: str,
+        timeline: Optional[List[Dict[str, Any]]] = None,
+        timeline_state: Optional[Dict[str, Any]] = None
     ) -> List[Dict[str, Any]]:
         """
         Scan timeline for engagement opportunities
         
         Args:
             account_id: Bluesky account to scan (bcdodge, damnitcarl, etc.)
+            timeline: Already-fetched posts; when omitted, the account's new
+                      timeline posts since the last scan are fetched
+            timeline_state: Pending state from fetch_new_timeline_posts() for
+                      `timeline`; saved only once the scan has stored its
+                      opportunities, so a failed scan sees the same posts again
         
         Returns:
             List of opportunity dicts
@@ -249,21 +225,24 @@ class BlueskyEngagementDetector:
             except Exception as e:
                 logger.error(f"   ❌ Failed to load keywords: {e}")
                 
-            # Get Bluesky client
-            client = await self._get_bluesky_client()
-            
-            # Authenticate account
-            authenticated = await client.authenticate_account(account_id)
-            if not authenticated:
-                logger.error(f"Failed to authenticate {account_id}")
-                return []
-            
-            # Get timeline
-            logger.info(f"Fetching timeline for {account_id}...")
-            timeline = await client.get_timeline(account_id, limit=50)
+            if timeline is None:
+                # Get Bluesky client
+                client = await self._get_bluesky_client()
+                
+                # Reuses the session until it expires
+                authenticated = await client.ensure_session(account_id)
+                if not authenticated:
+                    logger.error(f"Failed to authenticate {account_id}")
+                    return []
+                
+                # Only posts added since the last scan
+                logger.info(f"Fetching new timeline posts for {account_id}...")
+                timeline, timeline_state = await client.fetch_new_timeline_posts(account_id)
             
             if not timeline:
-                logger.warning(f"No timeline posts for {account_id}")
+                logger.info(f"No new timeline posts for {account_id}")
+                if timeline_state:
+                    await multi_client.commit_timeline_state(account_id, timeline_state)
                 return []
             
             # Get keywords for this account
@@ -293,7 +272,7 @@ class BlueskyEngagementDetector:
                         continue
                     
                     # Match keywords
-                    matched_keywords = self._match_keywords(post_text, keywords)
+                    matched_keywords = self._match_keywords(post_text, account_id)
                     
                     if not matched_keywords:
                         continue
@@ -353,6 +332,9 @@ class BlueskyEngagementDetector:
             
             logger.info(f"Stored {stored_count} new opportunities")
             
+            if timeline_state:
+                await multi_client.commit_timeline_state(account_id, timeline_state)
+            
             return opportunities
         
         except Exception as e:
@@ -538,9 +520,17 @@ class BlueskyEngagementDetector:
         accounts = ['personal', 'damn_it_carl', 'binge_tv', 'rose_angel', 'meals_feelz']
         results = {}
         
+        # All timelines at once - the client rate limits each account separately.
+        # Each account's timeline state is saved by scan_for_opportunities once it succeeds.
+        client = await self._get_bluesky_client()
+        timeline_states = {}
+        timelines = await client.get_all_timelines(new_only=True, pending_states=timeline_states)
+        
         for account_id in accounts:
             logger.info(f"\n📊 Scanning {account_id}...")
-            opportunities = await self.scan_for_opportunities(account_id)
+            opportunities = await self.scan_for_opportunities(
+                account_id, timelines.get(account_id, []), timeline_states.get(account_id)
+            )
             results[account_id] = len(opportunities)
             
             # Notify about top opportunities
@@ -568,9 +558,6 @@ class BlueskyEngagementDetector:
                 finally:
                     if conn:
                         await db_manager.release_connection(conn)
-            
-            # Rate limit between accounts
-            await asyncio.sleep(5)
         
         return results
 
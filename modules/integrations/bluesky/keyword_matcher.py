@@ -0,0 +1,341 @@
+# modules/integrations/bluesky/keyword_matcher.py
+"""
+Bluesky Keyword Matcher - one Aho-Corasick automaton for every account's keywords
+
+Every active keyword (and each word inside a multi-word keyword) from all accounts'
+keyword tables goes into a single automaton, so one pass over a post finds the
+matches for all 5 accounts at once. Matches are whole-word: "ai" does not match
+"said". The automaton is rebuilt only when a keyword table's contents change
+(checked with one md5 signature query at most every KEYWORD_SIGNATURE_CHECK_SECONDS).
+
+Usage:
+    matcher = get_keyword_matcher()
+    await matcher.refresh()
+    matches = matcher.match(post_text)          # {account_id: KeywordMatch}
+    matches.get('personal', NO_MATCH).keywords
+
+Created: 2026-10-16
+"""
+
+import asyncio
+import logging
+import re
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from ...core.database import db_manager
+
+logger = logging.getLogger(__name__)
+
+# Valid keyword tables - SQL injection prevention
+VALID_KEYWORD_TABLES = frozenset({
+    'bcdodge_keywords',
+    'roseandangel_keywords',
+    'tvsignals_keywords',
+    'mealsnfeelz_keywords',
+    'damnitcarl_keywords',
+    'amcf_keywords',
+})
+
+# How often refresh() asks Postgres whether any keyword table changed
+KEYWORD_SIGNATURE_CHECK_SECONDS = 300
+
+# Per-text match results kept between rebuilds (the same post shows up in several timelines)
+MATCH_MEMO_SIZE = 1024
+
+WORD_PATTERN = re.compile(r'\b\w+\b')
+
+# Pattern kinds
+PHRASE = 'phrase'   # the whole keyword
+WORD = 'word'       # one word of a multi-word keyword
+
+
+@dataclass(frozen=True)
+class KeywordMatch:
+    """
+    Keywords of one account found in a post, in keyword-table order.
+    Immutable - match() hands the same memoized instance to every caller.
+    """
+    phrase_matches: Tuple[str, ...] = ()  # whole keyword present
+    word_matches: Tuple[str, ...] = ()    # only some of its words present
+    keyword_count: int = 0                # active keywords for the account
+
+    @property
+    def keywords(self) -> List[str]:
+        return [*self.phrase_matches, *self.word_matches]
+
+
+NO_MATCH = KeywordMatch()
+
+
+class AhoCorasick:
+    """
+    Aho-Corasick automaton over lowercase patterns.
+
+    Each pattern carries a payload; iter_matches() yields (start, end, payload)
+    for every whole-word occurrence in a single pass over the text.
+    """
+
+    def __init__(self, patterns: Iterable[Tuple[str, Any]]):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[Tuple[int, Any]]] = [[]]
+
+        for pattern, payload in patterns:
+            if pattern:
+                self._add(pattern, payload)
+        self._build_failure_links()
+
+    def _add(self, pattern: str, payload: Any) -> None:
+        state = 0
+        for char in pattern:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][char] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            state = next_state
+        self._out[state].append((len(pattern), payload))
+
+    def _build_failure_links(self) -> None:
+        # Breadth-first, so a state's failure target is always finished before it
+        queue = list(self._goto[0].values())
+        head = 0
+        while head < len(queue):
+            state = queue[head]
+            head += 1
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(char, 0)
+                self._fail[next_state] = target if target != next_state else 0
+                self._out[next_state] = self._out[next_state] + self._out[self._fail[next_state]]
+
+    def iter_matches(self, text: str) -> Iterator[Tuple[int, int, Any]]:
+        goto, fail, out = self._goto, self._fail, self._out
+        length_of_text = len(text)
+        state = 0
+        for index, char in enumerate(text):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if not out[state]:
+                continue
+            # Every output here ends with this char, so one end check covers them all
+            # (word chars as in regex \w: alphanumeric or underscore)
+            end = index + 1
+            if end < length_of_text and (char.isalnum() or char == '_'):
+                following = text[end]
+                if following.isalnum() or following == '_':
+                    continue
+            for length, payload in out[state]:
+                start = end - length
+                if start > 0:
+                    first, previous = text[start], text[start - 1]
+                    if (first.isalnum() or first == '_') and (previous.isalnum() or previous == '_'):
+                        continue
+                yield start, end, payload
+
+    @property
+    def state_count(self) -> int:
+        return len(self._goto)
+
+
+def build_automaton(account_keywords: Dict[str, List[str]]) -> AhoCorasick:
+    """
+    One automaton for all accounts.
+
+    Payloads are lists of (account_id, keyword_index, kind), so a pattern shared
+    by several accounts (or several keywords) is stored once.
+    """
+    patterns: Dict[str, List[Tuple[str, int, str]]] = {}
+    for account_id, keywords in account_keywords.items():
+        for index, keyword in enumerate(keywords):
+            patterns.setdefault(keyword, []).append((account_id, index, PHRASE))
+            words = keyword.split()
+            if len(words) > 1:
+                for word in set(words):
+                    patterns.setdefault(word, []).append((account_id, index, WORD))
+    return AhoCorasick(patterns.items())
+
+
+class KeywordMatcher:
+    """All accounts' keywords behind one automaton, rebuilt when the tables change"""
+
+    def __init__(self, account_tables: Dict[str, str]):
+        self.account_tables = {
+            account_id: table for account_id, table in account_tables.items()
+            if table in VALID_KEYWORD_TABLES
+        }
+        self.account_keywords: Dict[str, List[str]] = {}
+        self._signatures: Dict[str, str] = {}
+        self._automaton: Optional[AhoCorasick] = None
+        self._memo: 'OrderedDict[str, Dict[str, KeywordMatch]]' = OrderedDict()
+        self._last_check = 0.0
+        self._lock = asyncio.Lock()
+
+        self.rebuilds = 0
+        self.last_rebuild_ms = 0.0
+
+    async def refresh(self, force: bool = False) -> None:
+        """Rebuild the automaton if any keyword table changed since the last build"""
+        if not force and self._automaton is not None and \
+                time.monotonic() - self._last_check < KEYWORD_SIGNATURE_CHECK_SECONDS:
+            return
+
+        async with self._lock:
+            if not force and self._automaton is not None and \
+                    time.monotonic() - self._last_check < KEYWORD_SIGNATURE_CHECK_SECONDS:
+                return
+
+            try:
+                signatures = await self._load_signatures()
+                changed = [
+                    table for table in set(self.account_tables.values())
+                    if signatures.get(table) != self._signatures.get(table)
+                ]
+                if changed or self._automaton is None:
+                    await self._rebuild(changed, signatures)
+                self._last_check = time.monotonic()
+            except Exception as e:
+                logger.error(f"Failed to refresh Bluesky keyword matcher: {e}")
+                if self._automaton is None:
+                    self._automaton = build_automaton({})
+
+    async def _load_signatures(self) -> Dict[str, str]:
+        """md5 of each table's active keywords - one row per table, one query"""
+        tables = sorted(set(self.account_tables.values()))
+        if not tables:
+            return {}
+
+        # Safe query - table names validated against allowlist
+        query = " UNION ALL ".join(
+            f"""SELECT '{table}' AS table_name,
+                       md5(COALESCE(string_agg(lower(keyword), E'\\n' ORDER BY created_at DESC, keyword), '')) AS signature
+                FROM {table} WHERE is_active = true"""
+            for table in tables
+        )
+        rows = await db_manager.fetch_all(query)
+        return {row['table_name']: row['signature'] for row in rows}
+
+    async def _rebuild(self, changed_tables: List[str], signatures: Dict[str, str]) -> None:
+        table_keywords = {}
+        for table in changed_tables:
+            rows = await db_manager.fetch_all(
+                f"SELECT keyword FROM {table} WHERE is_active = true ORDER BY created_at DESC"
+            )
+            # Lowercased, de-duplicated, table order kept
+            table_keywords[table] = list(dict.fromkeys(
+                row['keyword'].lower().strip() for row in rows if row['keyword']
+            ))
+
+        account_keywords = dict(self.account_keywords)
+        for account_id, table in self.account_tables.items():
+            if table in table_keywords:
+                account_keywords[account_id] = table_keywords[table]
+
+        start_time = time.perf_counter()
+        automaton = await asyncio.to_thread(build_automaton, account_keywords)
+        self._install(account_keywords, automaton, (time.perf_counter() - start_time) * 1000)
+        self._signatures.update({table: signatures.get(table) for table in changed_tables})
+
+        total = sum(len(keywords) for keywords in account_keywords.values())
+        logger.info(
+            f"✅ Bluesky keyword automaton rebuilt: {total} keywords, "
+            f"{automaton.state_count} states ({self.last_rebuild_ms:.0f}ms, tables: {', '.join(changed_tables) or 'none'})"
+        )
+
+    def load_keywords(self, account_keywords: Dict[str, List[str]]) -> None:
+        """Build from keyword lists directly (no database) - for scripts and benchmarks"""
+        account_keywords = {
+            account_id: list(dict.fromkeys(k.lower().strip() for k in keywords if k))
+            for account_id, keywords in account_keywords.items()
+        }
+        start_time = time.perf_counter()
+        automaton = build_automaton(account_keywords)
+        self._install(account_keywords, automaton, (time.perf_counter() - start_time) * 1000)
+        self._last_check = time.monotonic()
+
+    def _install(self, account_keywords: Dict[str, List[str]], automaton: AhoCorasick, build_ms: float) -> None:
+        self.account_keywords = account_keywords
+        self._automaton = automaton
+        self._memo.clear()
+        self.rebuilds += 1
+        self.last_rebuild_ms = build_ms
+
+    def invalidate(self) -> None:
+        """Force a signature check (and rebuild if needed) on the next refresh()"""
+        self._last_check = 0.0
+        self._signatures.clear()
+
+    def keywords_for(self, account_id: str) -> List[str]:
+        return self.account_keywords.get(account_id, [])
+
+    def match(self, post_text: str) -> Dict[str, KeywordMatch]:
+        """
+        Keyword matches for every account in one pass over the post.
+
+        Accounts with no match are left out. Call refresh() first. The dict is
+        the caller's own; the KeywordMatch values are shared (and frozen).
+        """
+        text = post_text.lower()
+        cached = self._memo.get(text)
+        if cached is not None:
+            self._memo.move_to_end(text)
+            return dict(cached)
+
+        phrase_hits: Dict[str, set] = {}
+        word_hits: Dict[str, set] = {}
+        if self._automaton is not None:
+            for _, _, payload in self._automaton.iter_matches(text):
+                for account_id, index, kind in payload:
+                    hits = phrase_hits if kind == PHRASE else word_hits
+                    hits.setdefault(account_id, set()).add(index)
+
+        results = {}
+        for account_id in phrase_hits.keys() | word_hits.keys():
+            keywords = self.account_keywords[account_id]
+            phrases = phrase_hits.get(account_id, set())
+            words = word_hits.get(account_id, set()) - phrases
+            results[account_id] = KeywordMatch(
+                phrase_matches=tuple(keywords[i] for i in sorted(phrases)),
+                word_matches=tuple(keywords[i] for i in sorted(words)),
+                keyword_count=len(keywords)
+            )
+
+        self._memo[text] = results
+        if len(self._memo) > MATCH_MEMO_SIZE:
+            self._memo.popitem(last=False)
+        return dict(results)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'accounts': len(self.account_tables),
+            'keywords': {account_id: len(keywords) for account_id, keywords in self.account_keywords.items()},
+            'states': self._automaton.state_count if self._automaton else 0,
+            'rebuilds': self.rebuilds,
+            'last_rebuild_ms': round(self.last_rebuild_ms, 1),
+            'memoized_posts': len(self._memo)
+        }
+
+
+# Global matcher instance
+_keyword_matcher = None
+
+def get_keyword_matcher() -> KeywordMatcher:
+    """Get the global keyword matcher (accounts and tables from the multi-account client)"""
+    global _keyword_matcher
+    if _keyword_matcher is None:
+        from .multi_account_client import get_bluesky_multi_client
+        accounts = get_bluesky_multi_client().accounts
+        _keyword_matcher = KeywordMatcher({
+            account_id: config.get('keywords_table')
+            for account_id, config in accounts.items()
+        })
+    return _keyword_matcher
@@ -2,17 +2,75 @@
 """
 Multi-Account Bluesky API Client
 Handles authentication and operations across 5 accounts
+
+Updated: 2026-10-16 - aiohttp with per-account request spacing and a shared concurrency cap;
+                      sessions reused until the access token expires (then refreshed, not
+                      re-created); timelines fetched concurrently and only new posts returned
+                      (newest-seen post + feed cursor persisted in bluesky_timeline_state)
 """
 
 import os
-import requests
+import base64
+import json
+import time
+import aiohttp
 import asyncio
 from datetime import datetime, timedelta
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
 import logging
 
+from ...core.database import db_manager
+
 logger = logging.getLogger(__name__)
 
+# Requests in flight across all accounts, and the minimum gap between one account's requests
+BLUESKY_MAX_CONCURRENT_REQUESTS = 5
+BLUESKY_MIN_REQUEST_INTERVAL_SECONDS = 1.0
+
+# Access tokens are refreshed this long before they expire
+ACCESS_TOKEN_REFRESH_MARGIN = timedelta(minutes=5)
+DEFAULT_ACCESS_TOKEN_LIFETIME = timedelta(hours=2)  # if the JWT has no readable exp
+
+# Incremental timeline scans
+TIMELINE_PAGE_SIZE = 50
+TIMELINE_MAX_PAGES = 4  # per scan; a longer gap is resumed from the saved cursor
+
+# Also in syntax_prime_schema.sql (MIGRATIONS); created by the client on first use
+TIMELINE_STATE_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS bluesky_timeline_state (
+        account_id TEXT PRIMARY KEY,
+        newest_post_uri TEXT,
+        newest_indexed_at TIMESTAMP WITH TIME ZONE,
+        backfill_cursor TEXT,
+        backfill_stop_uri TEXT,
+        backfill_stop_at TIMESTAMP WITH TIME ZONE,
+        updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+    )
+"""
+
+
+def _jwt_expiry(token: Optional[str]) -> Optional[datetime]:
+    """exp claim of a JWT as a local datetime (the signature isn't checked - we only schedule refreshes)"""
+    try:
+        payload = token.split('.')[1]
+        payload += '=' * (-len(payload) % 4)
+        exp = json.loads(base64.urlsafe_b64decode(payload)).get('exp')
+        return datetime.fromtimestamp(exp) if exp else None
+    except Exception:
+        return None
+
+
+def _feed_item_time(item: Dict[str, Any]) -> Optional[datetime]:
+    """When a feed item entered the timeline (repost time for reposts)"""
+    stamp = (item.get('reason') or {}).get('indexedAt') or item.get('post', {}).get('indexedAt')
+    if not stamp:
+        return None
+    try:
+        return datetime.fromisoformat(stamp.replace('Z', '+00:00'))
+    except ValueError:
+        return None
+
+
 class BlueskyMultiClient:
     """Multi-account Bluesky client with smart rate limiting"""
     
@@ -23,6 +81,14 @@ class BlueskyMultiClient:
         self.last_scan = {}
         self.scan_interval = timedelta(hours=3, minutes=30)  # 3.5 hour intervals
         
+        self.http_session: Optional[aiohttp.ClientSession] = None
+        self.timeout = aiohttp.ClientTimeout(total=15, connect=10)
+        self._request_semaphore = asyncio.Semaphore(BLUESKY_MAX_CONCURRENT_REQUESTS)
+        self._request_locks: Dict[str, asyncio.Lock] = {}
+        self._auth_locks: Dict[str, asyncio.Lock] = {}
+        self._last_request: Dict[str, float] = {}
+        self._timeline_table_ready = False
+        
     def _load_account_config(self) -> Dict[str, Dict]:
         """Load account configuration from environment variables"""
         return {
@@ -84,32 +150,141 @@ class BlueskyMultiClient:
             }
         }
     
+    # ------------------------------------------------------------------------
+    # HTTP + SESSIONS
+    # ------------------------------------------------------------------------
+    
+    async def _get_http_session(self) -> aiohttp.ClientSession:
+        if self.http_session is None or self.http_session.closed:
+            self.http_session = aiohttp.ClientSession(timeout=self.timeout)
+        return self.http_session
+    
+    async def close(self):
+        """Close the shared HTTP session (call at shutdown)"""
+        if self.http_session and not self.http_session.closed:
+            await self.http_session.close()
+        self.http_session = None
+    
+    async def _throttle(self, account_id: str):
+        """Space out requests per account (accounts are rate limited separately)"""
+        lock = self._request_locks.setdefault(account_id, asyncio.Lock())
+        async with lock:
+            wait = BLUESKY_MIN_REQUEST_INTERVAL_SECONDS - (time.monotonic() - self._last_request.get(account_id, 0.0))
+            if wait > 0:
+                await asyncio.sleep(wait)
+            self._last_request[account_id] = time.monotonic()
+    
+    async def _request(
+        self,
+        account_id: str,
+        method: str,
+        endpoint: str,
+        params: Optional[Dict[str, Any]] = None,
+        json_body: Optional[Dict[str, Any]] = None,
+        token: Optional[str] = None,
+        authenticated: bool = True
+    ) -> Dict[str, Any]:
+        """
+        One XRPC call for an account. Authenticated calls make sure the session is
+        valid first and retry once after refreshing if the server says the token expired.
+        """
+        for attempt in range(2):
+            headers = {}
+            if authenticated:
+                if not await self.ensure_session(account_id):
+                    raise RuntimeError(f"Not authenticated: {account_id}")
+                headers = self.get_auth_headers(account_id)
+            elif token:
+                headers = {"Authorization": f"Bearer {token}"}
+            
+            await self._throttle(account_id)
+            session = await self._get_http_session()
+            async with self._request_semaphore:
+                async with session.request(
+                    method,
+                    f"{self.api_base}/xrpc/{endpoint}",
+                    params=params,
+                    json=json_body,
+                    headers=headers
+                ) as response:
+                    if response.status in (400, 401) and authenticated and attempt == 0:
+                        error = (await response.json(content_type=None) or {}).get('error')
+                        if error in ('ExpiredToken', 'InvalidToken'):
+                            logger.info(f"🔄 Bluesky token expired for {account_id}, refreshing")
+                            self.sessions.get(account_id, {})['access_expires_at'] = datetime.now()
+                            continue
+                    response.raise_for_status()
+                    return await response.json(content_type=None)
+        raise RuntimeError(f"Bluesky request failed after token refresh: {endpoint}")
+    
+    def _store_session(self, account_id: str, session_data: Dict[str, Any]):
+        now = datetime.now()
+        access_jwt = session_data.get('accessJwt')
+        refresh_jwt = session_data.get('refreshJwt')
+        self.sessions[account_id] = {
+            'access_jwt': access_jwt,
+            'refresh_jwt': refresh_jwt,
+            'authenticated_at': now,
+            'access_expires_at': _jwt_expiry(access_jwt) or now + DEFAULT_ACCESS_TOKEN_LIFETIME,
+            'refresh_expires_at': _jwt_expiry(refresh_jwt),
+            'handle': self.accounts[account_id]['handle']
+        }
+    
+    def _session_valid(self, account_id: str) -> bool:
+        session = self.sessions.get(account_id)
+        if not session or not session.get('access_jwt'):
+            return False
+        expires_at = session.get('access_expires_at')
+        return bool(expires_at) and expires_at - ACCESS_TOKEN_REFRESH_MARGIN > datetime.now()
+    
+    async def ensure_session(self, account_id: str) -> bool:
+        """
+        Reuse the current session while its access token is valid, refresh it
+        with the refresh token when it's about to expire, and only create a new
+        session (a password login) when neither works.
+        """
+        if self._session_valid(account_id):
+            return True
+        
+        lock = self._auth_locks.setdefault(account_id, asyncio.Lock())
+        async with lock:
+            if self._session_valid(account_id):
+                return True
+            
+            session = self.sessions.get(account_id)
+            refresh_expires_at = session.get('refresh_expires_at') if session else None
+            if session and session.get('refresh_jwt') and (refresh_expires_at is None or refresh_expires_at > datetime.now()):
+                try:
+                    session_data = await self._request(
+                        account_id, 'POST', 'com.atproto.server.refreshSession',
+                        token=session['refresh_jwt'], authenticated=False
+                    )
+                    self._store_session(account_id, session_data)
+                    logger.info(f"🔄 Refreshed Bluesky session: {self.accounts[account_id]['handle']}")
+                    return True
+                except Exception as e:
+                    logger.warning(f"Session refresh failed for {account_id}, logging in again: {e}")
+            
+            return await self.authenticate_account(account_id)
+    
     async def authenticate_account(self, account_id: str) -> bool:
-        """Authenticate a specific account"""
+        """Authenticate a specific account (always creates a new session)"""
         account = self.accounts.get(account_id)
         if not account or not account['password']:
             logger.warning(f"Account {account_id} not configured or missing password")
             return False
         
         try:
-            auth_url = f"{self.api_base}/xrpc/com.atproto.server.createSession"
-            
             auth_data = {
                 "identifier": account['handle'],
                 "password": account['password']
             }
             
-            response = requests.post(auth_url, json=auth_data, timeout=10)
-            response.raise_for_status()
-            
-            session_data = response.json()
-            
-            self.sessions[account_id] = {
-                'access_jwt': session_data.get('accessJwt'),
-                'refresh_jwt': session_data.get('refreshJwt'),
-                'authenticated_at': datetime.now(),
-                'handle': account['handle']
-            }
+            session_data = await self._request(
+                account_id, 'POST', 'com.atproto.server.createSession',
+                json_body=auth_data, authenticated=False
+            )
+            self._store_session(account_id, session_data)
             
             logger.info(f"✅ Authenticated Bluesky account: {account['handle']}")
             return True
@@ -119,16 +294,16 @@ class BlueskyMultiClient:
             return False
     
     async def authenticate_all_accounts(self) -> Dict[str, bool]:
-        """Authenticate all configured accounts"""
-        results = {}
-        
-        for account_id in self.accounts.keys():
-            if self.accounts[account_id]['password']:  # Only try if password is set
-                results[account_id] = await self.authenticate_account(account_id)
-            else:
-                results[account_id] = False
+        """Authenticate all configured accounts (concurrently; valid sessions are reused)"""
+        configured = [account_id for account_id in self.accounts if self.accounts[account_id]['password']]
+        for account_id in self.accounts:
+            if account_id not in configured:
                 logger.warning(f"Skipping {account_id} - no password configured")
         
+        outcomes = await asyncio.gather(*(self.ensure_session(account_id) for account_id in configured))
+        results = {account_id: False for account_id in self.accounts}
+        results.update(dict(zip(configured, outcomes)))
+        
         authenticated_count = sum(results.values())
         logger.info(f"🔵 Bluesky Multi-Account Status: {authenticated_count}/{len(results)} accounts authenticated")
         
@@ -145,27 +320,26 @@ class BlueskyMultiClient:
             "Content-Type": "application/json"
         }
     
+    # ------------------------------------------------------------------------
+    # TIMELINES
+    # ------------------------------------------------------------------------
+    
+    async def _fetch_timeline_page(
+        self,
+        account_id: str,
+        limit: int,
+        cursor: Optional[str] = None
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        params = {"limit": limit}
+        if cursor:
+            params["cursor"] = cursor
+        timeline_data = await self._request(account_id, 'GET', 'app.bsky.feed.getTimeline', params=params)
+        return timeline_data.get('feed', []), timeline_data.get('cursor')
+    
     async def get_timeline(self, account_id: str, limit: int = 50) -> List[Dict[str, Any]]:
-        """Fetch timeline for specific account"""
-        if account_id not in self.sessions:
-            if not await self.authenticate_account(account_id):
-                return []
-        
+        """Fetch the latest posts of an account's timeline (newest first)"""
         try:
-            timeline_url = f"{self.api_base}/xrpc/app.bsky.feed.getTimeline"
-            params = {"limit": limit}
-            
-            response = requests.get(
-                timeline_url,
-                headers=self.get_auth_headers(account_id),
-                params=params,
-                timeout=15
-            )
-            response.raise_for_status()
-            
-            timeline_data = response.json()
-            posts = timeline_data.get('feed', [])
-            
+            posts, _ = await self._fetch_timeline_page(account_id, limit)
             logger.info(f"📱 Fetched {len(posts)} posts from {account_id} timeline")
             return posts
             
@@ -173,13 +347,149 @@ class BlueskyMultiClient:
             logger.error(f"❌ Failed to fetch timeline for {account_id}: {e}")
             return []
     
-    async def get_all_timelines(self) -> Dict[str, List[Dict]]:
-        """Fetch timelines for all authenticated accounts"""
-        timelines = {}
+    async def _walk_timeline(
+        self,
+        account_id: str,
+        cursor: Optional[str],
+        stop_uri: Optional[str],
+        stop_at: Optional[datetime],
+        max_pages: int
+    ) -> Tuple[List[Dict[str, Any]], Optional[str], bool, int]:
+        """
+        Page back through the timeline until a post at or before (stop_uri, stop_at).
+        
+        Returns:
+            (posts newer than the stop point, cursor to continue from,
+             whether the stop point was reached, pages fetched)
+        """
+        posts = []
+        pages = 0
+        while pages < max_pages:
+            feed, next_cursor = await self._fetch_timeline_page(account_id, TIMELINE_PAGE_SIZE, cursor)
+            pages += 1
+            for item in feed:
+                sort_at = _feed_item_time(item)
+                uri = item.get('post', {}).get('uri')
+                if stop_at and sort_at and (sort_at < stop_at or (uri == stop_uri and sort_at <= stop_at)):
+                    return posts, next_cursor, True, pages
+                posts.append(item)
+            cursor = next_cursor
+            if not feed or not cursor:
+                return posts, cursor, True, pages
+        return posts, cursor, False, pages
+    
+    async def get_new_timeline_posts(self, account_id: str) -> List[Dict[str, Any]]:
+        """
+        Timeline posts this account hasn't scanned yet, marked as scanned right away.
+        
+        For callers that only look at the posts. Scanners should use
+        fetch_new_timeline_posts() and commit the state once the posts are processed.
+        """
+        posts, new_state = await self.fetch_new_timeline_posts(account_id)
+        if new_state is not None:
+            await self.commit_timeline_state(account_id, new_state)
+        return posts
+    
+    async def fetch_new_timeline_posts(self, account_id: str) -> Tuple[List[Dict[str, Any]], Optional[Dict[str, Any]]]:
+        """
+        Timeline posts this account hasn't scanned yet (newest first), plus the
+        timeline state to save once they have been processed.
+        
+        The newest post seen is saved per account in bluesky_timeline_state; a
+        scan pages back until it reaches it, up to TIMELINE_MAX_PAGES. If the cap
+        is hit first, the feed cursor and the old stop point are saved and the
+        gap is filled from there on later scans. The first scan of an account
+        takes one page.
+        
+        Nothing is saved here: until commit_timeline_state() is called, the next
+        fetch returns the same posts again. Returns ([], None) if the fetch failed.
+        """
+        try:
+            state = await self._load_timeline_state(account_id)
+            
+            if not state or not state.get('newest_post_uri'):
+                posts, _ = await self._fetch_timeline_page(account_id, TIMELINE_PAGE_SIZE)
+                new_state = {'backfill_cursor': None, 'backfill_stop_uri': None, 'backfill_stop_at': None}
+            else:
+                posts, cursor, reached, pages = await self._walk_timeline(
+                    account_id, None, state['newest_post_uri'], state['newest_indexed_at'], TIMELINE_MAX_PAGES
+                )
+                new_state = {
+                    'backfill_cursor': state.get('backfill_cursor'),
+                    'backfill_stop_uri': state.get('backfill_stop_uri'),
+                    'backfill_stop_at': state.get('backfill_stop_at')
+                }
+                
+                if not reached:
+                    # Too many new posts for one scan - remember where to resume
+                    if new_state['backfill_cursor']:
+                        logger.warning(f"⚠️ {account_id}: dropping an older unscanned timeline gap")
+                    new_state = {
+                        'backfill_cursor': cursor,
+                        'backfill_stop_uri': state['newest_post_uri'],
+                        'backfill_stop_at': state['newest_indexed_at']
+                    }
+                elif new_state['backfill_cursor'] and pages < TIMELINE_MAX_PAGES:
+                    older, cursor, reached, _ = await self._walk_timeline(
+                        account_id, new_state['backfill_cursor'], new_state['backfill_stop_uri'],
+                        new_state['backfill_stop_at'], TIMELINE_MAX_PAGES - pages
+                    )
+                    posts.extend(older)
+                    new_state['backfill_cursor'] = None if reached else cursor
+                    if reached:
+                        new_state['backfill_stop_uri'] = None
+                        new_state['backfill_stop_at'] = None
+            
+            if posts:
+                new_state['newest_post_uri'] = posts[0].get('post', {}).get('uri')
+                new_state['newest_indexed_at'] = _feed_item_time(posts[0])
+            else:
+                new_state['newest_post_uri'] = state.get('newest_post_uri') if state else None
+                new_state['newest_indexed_at'] = state.get('newest_indexed_at') if state else None
+            
+            logger.info(f"📱 Fetched {len(posts)} new posts from {account_id} timeline")
+            return posts, new_state
+            
+        except Exception as e:
+            logger.error(f"❌ Failed to fetch new timeline posts for {account_id}: {e}")
+            return [], None
+    
+    async def commit_timeline_state(self, account_id: str, state: Dict[str, Any]):
+        """Mark the posts from fetch_new_timeline_posts() as scanned"""
+        try:
+            await self._save_timeline_state(account_id, state)
+        except Exception as e:
+            logger.error(f"❌ Failed to save timeline state for {account_id}: {e}")
+    
+    async def get_all_timelines(self, new_only: bool = True,
+                                pending_states: Optional[Dict[str, Dict[str, Any]]] = None) -> Dict[str, List[Dict]]:
+        """
+        Fetch timelines for all configured accounts concurrently.
+        
+        With new_only (default) each account returns only posts it hasn't
+        scanned yet; otherwise the latest page. If pending_states is given, the
+        new timeline states are put there instead of being saved - the caller
+        commits each one (commit_timeline_state) after processing that account.
+        """
+        configured = self.get_configured_accounts()
+        
+        async def fetch(account_id: str) -> List[Dict]:
+            if not await self.ensure_session(account_id):
+                return []
+            if not new_only:
+                return await self.get_timeline(account_id)
+            if pending_states is None:
+                return await self.get_new_timeline_posts(account_id)
+            posts, new_state = await self.fetch_new_timeline_posts(account_id)
+            if new_state is not None:
+                pending_states[account_id] = new_state
+            return posts
         
-        for account_id in self.accounts.keys():
+        results = await asyncio.gather(*(fetch(account_id) for account_id in configured))
+        
+        timelines = {}
+        for account_id, timeline in zip(configured, results):
             if account_id in self.sessions:
-                timeline = await self.get_timeline(account_id)
                 timelines[account_id] = timeline
                 
                 # Update last scan time
@@ -187,15 +497,50 @@ class BlueskyMultiClient:
         
         return timelines
     
+    async def _ensure_timeline_table(self):
+        if self._timeline_table_ready:
+            return
+        await db_manager.execute(TIMELINE_STATE_SCHEMA)
+        self._timeline_table_ready = True
+    
+    async def _load_timeline_state(self, account_id: str) -> Optional[Dict[str, Any]]:
+        await self._ensure_timeline_table()
+        row = await db_manager.fetch_one(
+            '''SELECT newest_post_uri, newest_indexed_at, backfill_cursor, backfill_stop_uri, backfill_stop_at
+               FROM bluesky_timeline_state WHERE account_id = $1''',
+            account_id
+        )
+        return dict(row) if row else None
+    
+    async def _save_timeline_state(self, account_id: str, state: Dict[str, Any]):
+        await db_manager.execute(
+            '''INSERT INTO bluesky_timeline_state (
+                   account_id, newest_post_uri, newest_indexed_at,
+                   backfill_cursor, backfill_stop_uri, backfill_stop_at, updated_at
+               ) VALUES ($1, $2, $3, $4, $5, $6, NOW())
+               ON CONFLICT (account_id) DO UPDATE SET
+                   newest_post_uri = EXCLUDED.newest_post_uri,
+                   newest_indexed_at = EXCLUDED.newest_indexed_at,
+                   backfill_cursor = EXCLUDED.backfill_cursor,
+                   backfill_stop_uri = EXCLUDED.backfill_stop_uri,
+                   backfill_stop_at = EXCLUDED.backfill_stop_at,
+                   updated_at = NOW()''',
+            account_id, state.get('newest_post_uri'), state.get('newest_indexed_at'),
+            state.get('backfill_cursor'), state.get('backfill_stop_uri'), state.get('backfill_stop_at')
+        )
+    
+    # ------------------------------------------------------------------------
+    # POSTING
+    # ------------------------------------------------------------------------
+    
     async def create_post(self, account_id: str, text: str, reply_to: Optional[Dict] = None) -> Dict[str, Any]:
         """Create a post on specific account"""
-        if account_id not in self.sessions:
-            if not await self.authenticate_account(account_id):
-                return {"success": False, "error": "Authentication failed"}
-        
         if len(text) > 300:
             return {"success": False, "error": f"Post too long ({len(text)}/300 characters)"}
         
+        if not await self.ensure_session(account_id):
+            return {"success": False, "error": "Authentication failed"}
+        
         try:
             record = {
                 "$type": "app.bsky.feed.post",
@@ -206,22 +551,13 @@ class BlueskyMultiClient:
             if reply_to:
                 record["reply"] = reply_to
             
-            create_url = f"{self.api_base}/xrpc/com.atproto.repo.createRecord"
             post_data = {
                 "repo": self.accounts[account_id]['handle'],
                 "collection": "app.bsky.feed.post",
                 "record": record
             }
             
-            response = requests.post(
-                create_url,
-                headers=self.get_auth_headers(account_id),
-                json=post_data,
-                timeout=10
-            )
-            response.raise_for_status()
-            
-            result = response.json()
+            result = await self._request(account_id, 'POST', 'com.atproto.repo.createRecord', json_body=post_data)
             
             logger.info(f"✅ Posted to {account_id}: '{text[:50]}...'")
             
@@ -7,6 +7,9 @@ UPDATED: 2025-12-19
 - Added proactive_engine integration for unified detect→draft→notify flow
 - Added /proactive/* endpoints for managing proactive queue
 - Updated background scan to use proactive engine
+
+UPDATED: 2026-10-16
+- Background scan fetches all accounts' timelines concurrently and only processes new posts
 """
 
 import asyncio
@@ -614,15 +617,22 @@ async def _background_scan_proactive(
         total_posts_scanned = 0
         total_opportunities_created = 0
         
+        # Fetch every account's new posts concurrently (rate limited per account by the client).
+        # Timeline state is committed per account after its posts are processed, so an
+        # account that fails below is re-read from the same point next scan.
+        fetched = await asyncio.gather(
+            *(multi_client.fetch_new_timeline_posts(account_id) for account_id in accounts_to_scan)
+        )
+        
         # Scan each account
-        for account_id in accounts_to_scan:
+        for account_id, (timeline, timeline_state) in zip(accounts_to_scan, fetched):
             try:
                 logger.info(f"📱 Scanning {account_id}...")
                 
-                # Get timeline
-                timeline = await multi_client.get_timeline(account_id, limit=50)
                 if not timeline:
-                    logger.warning(f"No timeline returned for {account_id}")
+                    logger.info(f"No new timeline posts for {account_id}")
+                    if timeline_state:
+                        await multi_client.commit_timeline_state(account_id, timeline_state)
                     continue
                 
                 total_posts_scanned += len(timeline)
@@ -672,11 +682,10 @@ async def _background_scan_proactive(
                         logger.error(f"Error processing post: {e}")
                         continue
                 
+                if timeline_state:
+                    await multi_client.commit_timeline_state(account_id, timeline_state)
                 logger.info(f"✅ {account_id}: {account_opportunities} opportunities created")
                 
-                # Small delay between accounts to avoid rate limiting
-                await asyncio.sleep(2)
-                
             except Exception as e:
                 logger.error(f"Failed to scan {account_id}: {e}")
                 continue
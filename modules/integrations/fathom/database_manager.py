@@ -25,21 +25,145 @@ FIXES APPLIED (Session 6 - Fathom Review):
 - Fixed get_meeting_statistics() which couldn't unnest JSON string participants
 - Added _get_topics() call to get_meeting_by_id() for consistency
 - ADDED: add_meeting_to_knowledge_base() to bridge meetings into chat's knowledge system
+
+UPDATED: 2026-10-16 - Meeting search uses a stored, weighted search_vector (title A, summary B,
+                      transcript C) instead of re-tokenizing every transcript per query.
+                      Transcripts are also split into timestamped chunks
+                      (fathom_transcript_chunks) so results carry the matching segments.
+                      The columns are added by a background migration started at app
+                      startup; until it finishes, search falls back to the old query.
 """
 
+import asyncio
 import logging
 import json
-from typing import Dict, List, Optional, Any
+import re
+import time
+from typing import Dict, List, Optional, Any, Tuple
 from datetime import datetime, timedelta
 from dataclasses import dataclass
 
 from ...core.database import db_manager
+from ...core.cache import invalidate, KNOWLEDGE_SEARCH
 
 logger = logging.getLogger(__name__)
 
 # Hardcoded user ID - this is a single-user personal project
 DEFAULT_USER_ID = 'b7c60682-4815-4d9d-8ebe-66c6cd24eff9'
 
+# Transcript chunks: consecutive segments are grouped up to about this many characters
+TRANSCRIPT_CHUNK_CHARS = 1200
+
+# Matching transcript segments returned per meeting by searches
+SEGMENTS_PER_MEETING = 3
+
+# Also in syntax_prime_schema.sql (MIGRATIONS); applied by ensure_search_schema() in a
+# background task - the first run rewrites fathom_meetings under an exclusive lock, so
+# it must never run under a request's deadline.
+# Generated columns keep the vectors current on every insert and update.
+MEETING_SEARCH_SCHEMA = """
+    ALTER TABLE fathom_meetings ADD COLUMN IF NOT EXISTS search_vector tsvector
+        GENERATED ALWAYS AS (
+            setweight(to_tsvector('english', COALESCE(title, '')), 'A') ||
+            setweight(to_tsvector('english', COALESCE(ai_summary, '')), 'B') ||
+            setweight(to_tsvector('english', COALESCE(transcript_text, '')), 'C')
+        ) STORED;
+    CREATE INDEX IF NOT EXISTS idx_fathom_meetings_search_vector
+        ON fathom_meetings USING GIN (search_vector);
+
+    CREATE TABLE IF NOT EXISTS fathom_transcript_chunks (
+        meeting_id UUID NOT NULL REFERENCES fathom_meetings(id) ON DELETE CASCADE,
+        chunk_index INTEGER NOT NULL,
+        start_seconds INTEGER,
+        end_seconds INTEGER,
+        speakers TEXT[],
+        chunk_text TEXT NOT NULL,
+        search_vector tsvector GENERATED ALWAYS AS (to_tsvector('english', chunk_text)) STORED,
+        PRIMARY KEY (meeting_id, chunk_index)
+    );
+    CREATE INDEX IF NOT EXISTS idx_fathom_transcript_chunks_search_vector
+        ON fathom_transcript_chunks USING GIN (search_vector);
+"""
+
+# Query text -> tsquery. 'all' needs every word (plainto_tsquery); 'any' ORs them,
+# for conversational questions where most words won't be in the meeting.
+TSQUERY_SQL = {
+    'all': "plainto_tsquery('english', $1)",
+    'any': "replace(plainto_tsquery('english', $1)::text, ' & ', ' | ')::tsquery",
+}
+
+# Meeting vector used until the migration has added search_vector (the pre-migration query)
+LEGACY_MEETING_VECTOR_SQL = (
+    "to_tsvector('english', COALESCE(m.title, '') || ' ' || "
+    "COALESCE(m.ai_summary, '') || ' ' || COALESCE(m.transcript_text, ''))"
+)
+
+# A failed search-schema migration is retried at most this often
+SEARCH_SCHEMA_RETRY_SECONDS = 300
+
+SPEAKER_LINE_PATTERN = re.compile(r'^([^:\n]{1,60}):\s')
+
+
+def _segment_seconds(segment: Dict[str, Any]) -> Optional[int]:
+    """Start of a transcript segment in seconds ('start' number or 'timestamp' HH:MM:SS)"""
+    for key in ('start', 'start_time', 'timestamp'):
+        value = segment.get(key)
+        if value is None:
+            continue
+        if isinstance(value, (int, float)):
+            return int(value)
+        if isinstance(value, str):
+            try:
+                seconds = 0
+                for part in value.split(':'):
+                    seconds = seconds * 60 + float(part)
+                return int(seconds)
+            except ValueError:
+                continue
+    return None
+
+
+def format_timestamp(seconds: Optional[int]) -> str:
+    """Seconds into a meeting as H:MM:SS / M:SS ('' when unknown)"""
+    if seconds is None:
+        return ''
+    hours, remainder = divmod(int(seconds), 3600)
+    minutes, secs = divmod(remainder, 60)
+    return f"{hours}:{minutes:02d}:{secs:02d}" if hours else f"{minutes}:{secs:02d}"
+
+
+def chunk_transcript(lines: List[Tuple[Optional[str], str, Optional[int]]]) -> List[Dict[str, Any]]:
+    """
+    Group transcript lines (speaker, text, start_seconds) into chunks of about
+    TRANSCRIPT_CHUNK_CHARS, never splitting a line. A chunk ends where the next
+    one starts.
+    """
+    chunks = []
+    current: List[Tuple[Optional[str], str, Optional[int]]] = []
+    size = 0
+    
+    def flush(next_start: Optional[int]):
+        if not current:
+            return
+        speakers = list(dict.fromkeys(speaker for speaker, _, _ in current if speaker))
+        chunks.append({
+            'chunk_index': len(chunks),
+            'start_seconds': current[0][2],
+            'end_seconds': next_start,
+            'speakers': speakers,
+            'chunk_text': "\n".join(f"{speaker}: {text}" if speaker else text for speaker, text, _ in current)
+        })
+    
+    for line in lines:
+        if current and size + len(line[1]) > TRANSCRIPT_CHUNK_CHARS:
+            flush(line[2])
+            current = []
+            size = 0
+        current.append(line)
+        size += len(line[1])
+    flush(None)
+    return chunks
+
 
 @dataclass
 class MeetingRecord:
@@ -166,6 +290,11 @@ class FathomDatabaseManager:
             
             logger.info(f"✅ Stored meeting: {title} (ID: {db_meeting_id})")
             
+            # Timestamped transcript chunks for segment-level search
+            await self._store_transcript_chunks(
+                db_meeting_id, self._transcript_lines(transcript_data, transcript_text)
+            )
+            
             # Store action items
             action_items = summary_data.get('action_items', [])
             if action_items:
@@ -349,6 +478,8 @@ class FathomDatabaseManager:
                 )
                 logger.info(f"✅ Added knowledge entry for meeting: {title}")
             
+            await invalidate(KNOWLEDGE_SEARCH)
+            
         except Exception as e:
             # Don't fail the whole meeting storage if knowledge bridge fails
             logger.error(f"⚠️ Failed to bridge meeting to knowledge base: {e}")
@@ -477,6 +608,44 @@ class FathomDatabaseManager:
             except:
                 return ""
     
+    def _transcript_lines(self, transcript_data: Any,
+                          transcript_text: str) -> List[Tuple[Optional[str], str, Optional[int]]]:
+        """
+        (speaker, text, start_seconds) per transcript segment.
+        
+        Uses the raw segments when Fathom sent them (they carry timestamps);
+        otherwise splits the stored text on blank lines, without timestamps.
+        """
+        segments = transcript_data
+        if isinstance(segments, dict):
+            segments = segments.get('transcript')
+        
+        lines = []
+        if isinstance(segments, list):
+            for segment in segments:
+                if not isinstance(segment, dict):
+                    continue
+                text = (segment.get('text') or '').strip()
+                if not text:
+                    continue
+                speaker = segment.get('speaker')
+                if isinstance(speaker, dict):
+                    speaker = speaker.get('display_name') or speaker.get('name')
+                lines.append((speaker if isinstance(speaker, str) else None, text, _segment_seconds(segment)))
+            if lines:
+                return lines
+        
+        for paragraph in (transcript_text or '').split("\n\n"):
+            paragraph = paragraph.strip()
+            if not paragraph:
+                continue
+            match = SPEAKER_LINE_PATTERN.match(paragraph)
+            if match:
+                lines.append((match.group(1), paragraph[match.end():].strip(), None))
+            else:
+                lines.append((None, paragraph, None))
+        return lines
+    
     # ============================================================================
     # ACTION ITEMS & TOPICS STORAGE
     # ============================================================================
@@ -535,6 +704,110 @@ class FathomDatabaseManager:
         except Exception as e:
             logger.error(f"❌ Failed to store topics: {e}")
     
+    async def _store_transcript_chunks(self, meeting_id: str,
+                                       lines: List[Tuple[Optional[str], str, Optional[int]]]) -> None:
+        """
+        Store a meeting's transcript chunks (kept as-is if the meeting already has them).
+        Before the search migration has run this is skipped - its backfill chunks the meeting.
+        """
+        if not _search_schema_ready:
+            await self.ensure_search_schema()
+            return
+        try:
+            chunks = chunk_transcript(lines)
+            if not chunks:
+                return
+            
+            async with self.db.transaction() as conn:
+                await conn.executemany(
+                    '''
+                    INSERT INTO fathom_transcript_chunks
+                    (meeting_id, chunk_index, start_seconds, end_seconds, speakers, chunk_text)
+                    VALUES ($1::uuid, $2, $3, $4, $5, $6)
+                    ON CONFLICT (meeting_id, chunk_index) DO NOTHING
+                    ''',
+                    [
+                        (meeting_id, chunk['chunk_index'], chunk['start_seconds'],
+                         chunk['end_seconds'], chunk['speakers'], chunk['chunk_text'])
+                        for chunk in chunks
+                    ]
+                )
+            
+            logger.info(f"✅ Stored {len(chunks)} transcript chunks")
+            
+        except Exception as e:
+            logger.error(f"❌ Failed to store transcript chunks: {e}")
+    
+    async def ensure_search_schema(self) -> Optional[asyncio.Task]:
+        """
+        Start the search migration (columns, chunk table, indexes, then the chunk
+        backfill) as a background task, once per process. Called at app startup;
+        searches and stores also call it in case startup didn't. Never waits for the
+        migration - returns its task, or None once the schema is ready.
+        """
+        global _search_schema_task
+        async with _search_schema_lock:
+            if _search_schema_ready:
+                return None
+            if _search_schema_task is not None:
+                if not _search_schema_task.done():
+                    return _search_schema_task
+                if time.monotonic() - _search_schema_failed_at < SEARCH_SCHEMA_RETRY_SECONDS:
+                    return _search_schema_task
+            _search_schema_task = asyncio.create_task(self._migrate_search_schema())
+            return _search_schema_task
+    
+    async def _migrate_search_schema(self) -> None:
+        """Apply MEETING_SEARCH_SCHEMA, then chunk the transcripts of existing meetings"""
+        global _search_schema_ready, _search_schema_failed_at
+        try:
+            start = time.perf_counter()
+            await self.db.execute(MEETING_SEARCH_SCHEMA)
+            _search_schema_ready = True
+            logger.info(f"✅ Fathom search schema ready in {time.perf_counter() - start:.1f}s")
+        except Exception as e:
+            _search_schema_failed_at = time.monotonic()
+            logger.error(f"❌ Fathom search schema migration failed (search uses the old query): {e}")
+            return
+        await self.backfill_transcript_chunks()
+    
+    async def backfill_transcript_chunks(self, batch_size: int = 50) -> int:
+        """Chunk the stored transcripts of meetings that have no chunks yet"""
+        total = 0
+        last_id = '00000000-0000-0000-0000-000000000000'
+        try:
+            while True:
+                rows = await self.db.fetch_all(
+                    '''
+                    SELECT m.id, m.transcript_text
+                    FROM fathom_meetings m
+                    WHERE m.id > $2::uuid
+                    AND COALESCE(m.transcript_text, '') <> ''
+                    AND NOT EXISTS (
+                        SELECT 1 FROM fathom_transcript_chunks c WHERE c.meeting_id = m.id
+                    )
+                    ORDER BY m.id
+                    LIMIT $1
+                    ''',
+                    batch_size, last_id
+                )
+                if not rows:
+                    break
+                last_id = str(rows[-1]['id'])
+                for row in rows:
+                    lines = self._transcript_lines(None, row['transcript_text'])
+                    if not chunk_transcript(lines):
+                        lines = [(None, row['transcript_text'].strip() or '-', None)]
+                    await self._store_transcript_chunks(str(row['id']), lines)
+                total += len(rows)
+            
+            if total:
+                logger.info(f"✅ Chunked transcripts of {total} existing meetings")
+            
+        except Exception as e:
+            logger.error(f"❌ Failed to backfill transcript chunks: {e}")
+        return total
+    
     # ============================================================================
     # MEETING RETRIEVAL
     # ============================================================================
@@ -716,32 +989,53 @@ class FathomDatabaseManager:
             return []
     
     async def search_meetings(self, query_text: str,
-                            limit: int = 10) -> List[Dict[str, Any]]:
+                            limit: int = 10,
+                            match: str = 'all',
+                            meeting_ids: Optional[List[str]] = None,
+                            days: Optional[int] = None) -> List[Dict[str, Any]]:
         """
         Search meetings by keywords in title, summary, or transcript
-        Uses PostgreSQL full-text search for better results
+        
+        Ranks on the stored search_vector (title > summary > transcript) and
+        attaches up to SEGMENTS_PER_MEETING matching transcript segments to each
+        result as 'matching_segments' (snippet, start/end seconds, timestamp).
+        
+        Args:
+            query_text: Search words
+            limit: Max meetings
+            match: 'all' words required, or 'any' word (ranked by how many match)
+            meeting_ids: Only search these meetings
+            days: Only meetings from the last N days
         """
         try:
-            query = '''
-                SELECT id, recording_id, title, meeting_date,
-                       duration_minutes, participants, ai_summary,
-                       key_points, created_at,
-                       ts_rank(to_tsvector('english', 
-                           COALESCE(title, '') || ' ' || 
-                           COALESCE(ai_summary, '') || ' ' ||
-                           COALESCE(transcript_text, '')
-                       ), plainto_tsquery('english', $1)) as rank
-                FROM fathom_meetings
-                WHERE to_tsvector('english', 
-                    COALESCE(title, '') || ' ' || 
-                    COALESCE(ai_summary, '') || ' ' ||
-                    COALESCE(transcript_text, '')
-                ) @@ plainto_tsquery('english', $1)
-                ORDER BY rank DESC, meeting_date DESC
+            # Until the background migration has added search_vector, tokenize on the fly
+            if _search_schema_ready:
+                vector = "m.search_vector"
+            else:
+                await self.ensure_search_schema()
+                vector = LEGACY_MEETING_VECTOR_SQL
+            
+            conditions = [f"{vector} @@ q.query"]
+            params: List[Any] = [query_text, limit]
+            if meeting_ids is not None:
+                params.append(meeting_ids)
+                conditions.append(f"m.id = ANY(${len(params)}::uuid[])")
+            if days is not None:
+                params.append(days)
+                conditions.append(f"m.meeting_date >= NOW() - INTERVAL '1 day' * ${len(params)}")
+            
+            query = f'''
+                SELECT m.id, m.recording_id, m.title, m.meeting_date,
+                       m.duration_minutes, m.participants, m.ai_summary,
+                       m.key_points, m.created_at,
+                       ts_rank({vector}, q.query) as rank
+                FROM fathom_meetings m, {TSQUERY_SQL[match]} AS q(query)
+                WHERE {' AND '.join(conditions)}
+                ORDER BY rank DESC, m.meeting_date DESC
                 LIMIT $2
             '''
             
-            results = await self.db.fetch_all(query, query_text, limit)
+            results = await self.db.fetch_all(query, *params)
             
             # Parse JSON strings back to lists
             meetings = []
@@ -759,12 +1053,69 @@ class FathomDatabaseManager:
                         meeting['key_points'] = []
                 meetings.append(meeting)
             
+            if meetings:
+                segments = await self.search_transcript_segments(
+                    query_text, [str(m['id']) for m in meetings], match=match
+                )
+                for meeting in meetings:
+                    meeting['matching_segments'] = segments.get(str(meeting['id']), [])
+            
             return meetings
             
         except Exception as e:
             logger.error(f"❌ Failed to search meetings: {e}")
             return []
     
+    async def search_transcript_segments(self, query_text: str,
+                                         meeting_ids: List[str],
+                                         per_meeting: int = SEGMENTS_PER_MEETING,
+                                         match: str = 'all') -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Best-matching transcript chunks of the given meetings, keyed by meeting id
+        
+        Each segment has chunk_index, start_seconds, end_seconds, timestamp,
+        speakers and a ts_headline snippet (matches wrapped in **bold**).
+        """
+        if not meeting_ids:
+            return {}
+        if not _search_schema_ready:
+            await self.ensure_search_schema()
+            return {}
+        try:
+            query = f'''
+                SELECT meeting_id, chunk_index, start_seconds, end_seconds, speakers,
+                       ts_headline('english', chunk_text, query,
+                                   'StartSel=**, StopSel=**, MaxWords=40, MinWords=15, MaxFragments=2') as snippet,
+                       rank
+                FROM (
+                    SELECT c.*, q.query,
+                           ts_rank(c.search_vector, q.query) as rank,
+                           row_number() OVER (
+                               PARTITION BY c.meeting_id
+                               ORDER BY ts_rank(c.search_vector, q.query) DESC, c.chunk_index
+                           ) as position
+                    FROM fathom_transcript_chunks c, {TSQUERY_SQL[match]} AS q(query)
+                    WHERE c.meeting_id = ANY($2::uuid[])
+                    AND c.search_vector @@ q.query
+                ) ranked
+                WHERE position <= $3
+                ORDER BY meeting_id, rank DESC
+            '''
+            
+            rows = await self.db.fetch_all(query, query_text, meeting_ids, per_meeting)
+            
+            segments: Dict[str, List[Dict[str, Any]]] = {}
+            for row in rows:
+                segment = dict(row)
+                meeting_id = str(segment.pop('meeting_id'))
+                segment['timestamp'] = format_timestamp(segment['start_seconds'])
+                segments.setdefault(meeting_id, []).append(segment)
+            return segments
+            
+        except Exception as e:
+            logger.error(f"❌ Failed to search transcript segments: {e}")
+            return {}
+    
     async def get_meetings_by_date_range(self, start_date: datetime,
                                         end_date: datetime) -> List[Dict[str, Any]]:
         """Get meetings within a date range"""
@@ -944,6 +1295,13 @@ class FathomDatabaseManager:
             }
 
 
+# Search columns/chunk table: migrated once per process by a single background task
+_search_schema_ready = False
+_search_schema_task: Optional[asyncio.Task] = None
+_search_schema_failed_at = 0.0
+_search_schema_lock = asyncio.Lock()
+
+
 # ============================================================================
 # CONVENIENCE FUNCTIONS FOR EXTERNAL USE
 # ============================================================================
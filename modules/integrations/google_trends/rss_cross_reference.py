@@ -9,20 +9,108 @@ Key Features:
 - Provides strategic timing insights for content creation
 - Amplifies trend opportunities with industry context
 - Detects market sentiment alignment
+
+Updated: 2026-10-16 - One pass over an in-memory inverted index of the RSS window
+                      (token -> entries over title, description, tags) instead of a
+                      LIKE query per trending keyword; results cached until new RSS
+                      entries or trend rows arrive
 """
 
 import asyncio
-from typing import Dict, List, Any, Optional, Tuple
+from typing import Dict, List, Any, Optional, Set, Tuple
 from datetime import datetime, timedelta, date, timezone
+import json
 import re
 import logging
 from dataclasses import dataclass
 from collections import defaultdict
 
+from ...core.cache import get_cache, stable_key
 from ...core.database import db_manager
 
 logger = logging.getLogger(__name__)
 
+# Cached correlation results (keyed by lookback + data signatures, so new rows miss)
+TREND_RSS_CACHE = 'trend_rss_correlations'
+TREND_RSS_CACHE_TTL_SECONDS = 3600
+
+# Related entries kept per keyword (newest first), as the old per-keyword query did
+MAX_RELATED_ENTRIES = 20
+
+# Words shorter than this don't pull in entries on their own
+MIN_MATCH_WORD_LENGTH = 3
+
+TOKEN_PATTERN = re.compile(r'\b\w+\b')
+
+
+def _tags_text(tags: Any) -> str:
+    if not tags:
+        return ''
+    if isinstance(tags, str):
+        try:
+            tags = json.loads(tags)
+        except ValueError:
+            return tags
+    if isinstance(tags, (list, tuple)):
+        return ' '.join(str(tag) for tag in tags)
+    return str(tags)
+
+
+class RSSInvertedIndex:
+    """
+    The RSS window held in memory, with token -> entry ids over title,
+    description and tags.
+
+    Entries are stored newest first, so a lower id is a newer entry and sorting
+    candidate ids gives the old ORDER BY created_at DESC.
+    """
+
+    def __init__(self, entries: List[Dict[str, Any]], business_terms: Dict[str, List[str]]):
+        self.entries = entries
+        self.postings: Dict[str, Set[int]] = defaultdict(set)
+        self._texts: List[str] = []
+        self.business_entries: Dict[str, Set[int]] = {area: set() for area in business_terms}
+
+        for entry_id, entry in enumerate(entries):
+            tags = _tags_text(entry.get('tags')).lower()
+            text = ' '.join((entry.get('title') or '', entry.get('description') or '', tags)).lower()
+            self._texts.append(text)
+            for token in set(TOKEN_PATTERN.findall(text)):
+                self.postings[token].add(entry_id)
+
+            # Business relevance terms match category/tags, as before
+            labels = f"{(entry.get('category') or '').lower()} {tags}"
+            for area, terms in business_terms.items():
+                if any(term in labels for term in terms):
+                    self.business_entries[area].add(entry_id)
+
+    def related_entries(self, keyword: str, business_area: str) -> List[Dict[str, Any]]:
+        """
+        Entries containing the keyword phrase, any of its words (3+ letters, whole
+        words), or a business relevance term for the area - newest first.
+        """
+        keyword_lower = keyword.lower()
+        words = set(TOKEN_PATTERN.findall(keyword_lower))
+
+        candidates = set(self.business_entries.get(business_area, ()))
+        for word in words:
+            if len(word) >= MIN_MATCH_WORD_LENGTH:
+                candidates |= self.postings.get(word, set())
+
+        # Phrase: entries with every word, confirmed on the text
+        if words:
+            postings = sorted((self.postings.get(word, set()) for word in words), key=len)
+            if postings[0]:
+                phrase_ids = set.intersection(*postings) - candidates
+                candidates.update(i for i in phrase_ids if keyword_lower in self._texts[i])
+
+        return [self.entries[i] for i in sorted(candidates)[:MAX_RELATED_ENTRIES]]
+
+    @property
+    def token_count(self) -> int:
+        return len(self.postings)
+
+
 @dataclass
 class TrendRSSCorrelation:
     """Container for trend-RSS correlation analysis"""
@@ -96,6 +184,11 @@ class RSSCrossReference:
                 'overview', 'summary', 'update', 'news', 'information'
             ]
         }
+        
+        # RSS window index, rebuilt only when the RSS rows change
+        self._rss_index: Optional[RSSInvertedIndex] = None
+        self._rss_index_signature: Optional[Tuple] = None
+        self._cache = get_cache(TREND_RSS_CACHE, max_size=8, ttl_seconds=TREND_RSS_CACHE_TTL_SECONDS)
     
     def _make_timezone_aware(self, dt: datetime) -> datetime:
         """Make a datetime timezone-aware if it isn't already"""
@@ -108,176 +201,154 @@ class RSSCrossReference:
     # ============================================================================
     
     async def correlate_trends_with_rss(self, hours_lookback: int = 72) -> List[TrendRSSCorrelation]:
-        """Find correlations between trending keywords and RSS content"""
-        conn = None
-        try:
-            conn = await db_manager.get_connection()
-            
-            cutoff_time = datetime.now(timezone.utc) - timedelta(hours=hours_lookback)
-            
-            # Get recent trending keywords
-            trending_keywords = await conn.fetch('''
-                SELECT DISTINCT ON (keyword, business_area)
-                       keyword, business_area, trend_score, created_at
-                FROM trend_monitoring 
-                WHERE created_at >= $1 
-                AND trend_score >= 15  -- Low threshold for correlation analysis
-                ORDER BY keyword, business_area, created_at DESC
-            ''', cutoff_time)
-            
-            # Release connection before calling other async methods
-            await db_manager.release_connection(conn)
-            conn = None
-            
-            correlations = []
-            
-            for trend_row in trending_keywords:
-                correlation = await self._analyze_keyword_rss_correlation(
-                    keyword=trend_row['keyword'],
-                    business_area=trend_row['business_area'],
-                    trend_score=trend_row['trend_score'],
-                    hours_lookback=hours_lookback
-                )
-                
-                if correlation and correlation.correlation_strength >= 0.3:
-                    correlations.append(correlation)
-            
-            # Sort by correlation strength and strategic value
-            correlations.sort(key=lambda x: (
-                x.correlation_strength * x.content_amplification
-            ), reverse=True)
-            
-            return correlations
-            
-        finally:
-            if conn:
-                await db_manager.release_connection(conn)
+        """
+        Find correlations between trending keywords and RSS content
+        
+        The RSS window is loaded once and indexed; every trending keyword is then
+        matched against the index in one pass. The window starts on the hour, so
+        results stay cached until RSS entries or trend rows are added (or age out).
+        """
+        now = datetime.now(timezone.utc)
+        cutoff_time = now.replace(minute=0, second=0, microsecond=0) - timedelta(hours=hours_lookback)
+        
+        signature = await db_manager.fetch_one('''
+            SELECT
+                (SELECT COUNT(*) || ':' || COALESCE(MAX(created_at)::text, '')
+                 FROM rss_feed_entries WHERE created_at >= $1) AS rss_signature,
+                (SELECT COUNT(*) || ':' || COALESCE(MAX(created_at)::text, '')
+                 FROM trend_monitoring WHERE created_at >= $1) AS trend_signature
+        ''', cutoff_time)
+        
+        cache_key = stable_key(hours_lookback, cutoff_time, signature['rss_signature'], signature['trend_signature'])
+        cached = await self._cache.get(cache_key)
+        if cached is not None:
+            return cached
+        
+        index = await self._get_rss_index(cutoff_time, signature['rss_signature'])
+        
+        # Get recent trending keywords
+        trending_keywords = await db_manager.fetch_all('''
+            SELECT DISTINCT ON (keyword, business_area)
+                   keyword, business_area, trend_score, created_at
+            FROM trend_monitoring 
+            WHERE created_at >= $1 
+            AND trend_score >= 15  -- Low threshold for correlation analysis
+            ORDER BY keyword, business_area, created_at DESC
+        ''', cutoff_time)
+        
+        correlations = await asyncio.to_thread(self._correlate_with_index, index, trending_keywords)
+        
+        await self._cache.set(cache_key, correlations)
+        return correlations
     
-    async def _analyze_keyword_rss_correlation(self, keyword: str, business_area: str,
-                                             trend_score: int, hours_lookback: int) -> Optional[TrendRSSCorrelation]:
-        """Analyze correlation between a specific keyword and RSS content"""
-        conn = None
-        try:
-            conn = await db_manager.get_connection()
-            
-            cutoff_time = datetime.now(timezone.utc) - timedelta(hours=hours_lookback)
-            
-            # Get relevant RSS entries
-            related_entries = await self._find_related_rss_entries(
-                conn, keyword, business_area, cutoff_time
-            )
-            
+    def _correlate_with_index(self, index: RSSInvertedIndex,
+                              trending_keywords: List[Any]) -> List[TrendRSSCorrelation]:
+        """Score every trending keyword against the RSS index"""
+        correlations = []
+        
+        for trend_row in trending_keywords:
+            related_entries = index.related_entries(trend_row['keyword'], trend_row['business_area'])
             if not related_entries:
-                return None
-            
-            # Calculate correlation strength
-            correlation_strength = self._calculate_correlation_strength(
-                keyword, related_entries
-            )
-            
-            if correlation_strength < 0.3:
-                return None
-            
-            # Analyze sentiment alignment
-            sentiment_alignment = self._analyze_sentiment_alignment(related_entries)
-            
-            # Determine market timing
-            market_timing = self._determine_market_timing(
-                keyword, trend_score, related_entries
-            )
-            
-            # Calculate strategic metrics
-            competitive_advantage = self._calculate_competitive_advantage(
-                keyword, business_area, related_entries
-            )
-            
-            content_amplification = self._calculate_content_amplification(
-                correlation_strength, sentiment_alignment, len(related_entries)
-            )
-            
-            # Generate strategic insights
-            strategic_recommendation = self._generate_strategic_recommendation(
-                keyword, market_timing, sentiment_alignment, competitive_advantage
-            )
-            
-            optimal_content_angle = self._suggest_content_angle(
-                keyword, business_area, related_entries, sentiment_alignment
-            )
-            
-            timing_advantage = self._assess_timing_advantage(
-                market_timing, sentiment_alignment, trend_score
-            )
+                continue
             
-            return TrendRSSCorrelation(
-                keyword=keyword,
-                business_area=business_area,
-                trend_score=trend_score,
-                related_rss_entries=[dict(entry) for entry in related_entries],
-                correlation_strength=correlation_strength,
-                sentiment_alignment=sentiment_alignment,
-                market_timing=market_timing,
-                competitive_advantage=competitive_advantage,
-                content_amplification=content_amplification,
-                strategic_recommendation=strategic_recommendation,
-                optimal_content_angle=optimal_content_angle,
-                timing_advantage=timing_advantage
+            correlation = self._build_correlation(
+                keyword=trend_row['keyword'],
+                business_area=trend_row['business_area'],
+                trend_score=trend_row['trend_score'],
+                related_entries=related_entries
             )
             
-        finally:
-            if conn:
-                await db_manager.release_connection(conn)
-    
-    async def _find_related_rss_entries(self, conn: Any, keyword: str,
-                                      business_area: str, cutoff_time: datetime) -> List[Dict[str, Any]]:
-        """Find RSS entries related to the trending keyword"""
+            if correlation and correlation.correlation_strength >= 0.3:
+                correlations.append(correlation)
         
-        keyword_lower = keyword.lower()
-        keyword_words = set(re.findall(r'\b\w+\b', keyword_lower))
+        # Sort by correlation strength and strategic value
+        correlations.sort(key=lambda x: (
+            x.correlation_strength * x.content_amplification
+        ), reverse=True)
         
-        # Get business-relevant RSS categories
-        business_relevance = self.business_rss_relevance.get(business_area, [])
-        
-        # Build search query for RSS content
-        # Search in title, description, full_content, and marketing_insights
-        search_conditions = []
-        params = [cutoff_time]
-        
-        # Exact keyword match (highest priority)
-        search_conditions.append("(LOWER(title) LIKE $2 OR LOWER(description) LIKE $2 OR LOWER(full_content) LIKE $2)")
-        params.append(f'%{keyword_lower}%')
-        
-        # Individual word matches
-        for i, word in enumerate(keyword_words):
-            if len(word) >= 3:  # Skip very short words
-                param_num = len(params) + 1
-                search_conditions.append(f"(LOWER(title) LIKE ${param_num} OR LOWER(description) LIKE ${param_num})")
-                params.append(f'%{word}%')
-        
-        # Business relevance terms
-        for term in business_relevance:
-            param_num = len(params) + 1
-            search_conditions.append(f"(LOWER(category) LIKE ${param_num} OR LOWER(tags::text) LIKE ${param_num})")
-            params.append(f'%{term}%')
-        
-        if not search_conditions:
-            return []
-        
-        query = f'''
-            SELECT title, description, full_content, category, tags, 
-                   marketing_insights, sentiment_score, pub_date, created_at
+        return correlations
+    
+    async def _get_rss_index(self, cutoff_time: datetime, rss_signature: str) -> RSSInvertedIndex:
+        """RSS entries since cutoff_time, indexed (reused while the window is unchanged)"""
+        signature = (cutoff_time, rss_signature)
+        if self._rss_index is not None and self._rss_index_signature == signature:
+            return self._rss_index
+        
+        # full_content is only scored on its first 500 characters
+        rows = await db_manager.fetch_all('''
+            SELECT COALESCE(title, '') AS title, COALESCE(description, '') AS description,
+                   COALESCE(LEFT(full_content, 500), '') AS full_content,
+                   category, tags, COALESCE(marketing_insights, '') AS marketing_insights,
+                   sentiment_score, pub_date, created_at
             FROM rss_feed_entries 
-            WHERE created_at >= $1 
-            AND ({' OR '.join(search_conditions)})
+            WHERE created_at >= $1
             ORDER BY created_at DESC
-            LIMIT 20
-        '''
+        ''', cutoff_time)
         
-        try:
-            rows = await conn.fetch(query, *params)
-            return [dict(row) for row in rows]
-        except Exception as e:
-            logger.error(f"Error finding related RSS entries: {e}")
-            return []
+        index = await asyncio.to_thread(
+            RSSInvertedIndex, [dict(row) for row in rows], self.business_rss_relevance
+        )
+        self._rss_index = index
+        self._rss_index_signature = signature
+        
+        logger.info(f"📰 Indexed {len(index.entries)} RSS entries ({index.token_count} tokens) for trend cross-reference")
+        return index
+    
+    def _build_correlation(self, keyword: str, business_area: str, trend_score: int,
+                           related_entries: List[Dict[str, Any]]) -> Optional[TrendRSSCorrelation]:
+        """Analyze correlation between a specific keyword and its related RSS entries"""
+        # Calculate correlation strength
+        correlation_strength = self._calculate_correlation_strength(
+            keyword, related_entries
+        )
+        
+        if correlation_strength < 0.3:
+            return None
+        
+        # Analyze sentiment alignment
+        sentiment_alignment = self._analyze_sentiment_alignment(related_entries)
+        
+        # Determine market timing
+        market_timing = self._determine_market_timing(
+            keyword, trend_score, related_entries
+        )
+        
+        # Calculate strategic metrics
+        competitive_advantage = self._calculate_competitive_advantage(
+            keyword, business_area, related_entries
+        )
+        
+        content_amplification = self._calculate_content_amplification(
+            correlation_strength, sentiment_alignment, len(related_entries)
+        )
+        
+        # Generate strategic insights
+        strategic_recommendation = self._generate_strategic_recommendation(
+            keyword, market_timing, sentiment_alignment, competitive_advantage
+        )
+        
+        optimal_content_angle = self._suggest_content_angle(
+            keyword, business_area, related_entries, sentiment_alignment
+        )
+        
+        timing_advantage = self._assess_timing_advantage(
+            market_timing, sentiment_alignment, trend_score
+        )
+        
+        return TrendRSSCorrelation(
+            keyword=keyword,
+            business_area=business_area,
+            trend_score=trend_score,
+            related_rss_entries=[dict(entry) for entry in related_entries],
+            correlation_strength=correlation_strength,
+            sentiment_alignment=sentiment_alignment,
+            market_timing=market_timing,
+            competitive_advantage=competitive_advantage,
+            content_amplification=content_amplification,
+            strategic_recommendation=strategic_recommendation,
+            optimal_content_angle=optimal_content_angle,
+            timing_advantage=timing_advantage
+        )
     
     def _calculate_correlation_strength(self, keyword: str, rss_entries: List[Dict[str, Any]]) -> float:
         """Calculate correlation strength between keyword and RSS entries"""
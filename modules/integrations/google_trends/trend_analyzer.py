@@ -10,16 +10,22 @@ Key Features:
 - Cross-business trend correlation
 - Content timing optimization
 - Historical pattern learning
+
+Updated: 2026-10-16 - Cross-business correlation pivots the window into a date-aligned
+                      keyword x area x day matrix (NaN-masked missing days) and computes
+                      every pair's correlation with NumPy in one pass
 """
 
 import asyncio
-from typing import Dict, List, Any, Optional, Tuple
+from typing import Dict, List, Any, Iterable, Optional, Tuple
 from datetime import datetime, timedelta, date
 import statistics
 import logging
 from dataclasses import dataclass
 from collections import defaultdict
 
+import numpy as np
+
 from ...core.database import db_manager
 
 logger = logging.getLogger(__name__)
@@ -48,6 +54,114 @@ class BusinessTrendCorrelation:
     shared_momentum: str
 
 
+# Keywords per NumPy block in correlate_business_areas
+CORRELATION_BLOCK_SIZE = 4096
+
+
+@dataclass
+class TrendWindow:
+    """Trend scores pivoted into a date-aligned keyword x business area x day matrix"""
+    keywords: List[str]
+    business_areas: List[str]
+    start_date: date
+    scores: np.ndarray    # float, shape (keywords, areas, days); NaN where no data
+    observed: np.ndarray  # bool, same shape; True where a score exists
+
+
+def pivot_trend_window(rows: Iterable[Any], start_date: date, days: int) -> TrendWindow:
+    """
+    Pivot (keyword, business_area, trend_date, trend_score) rows into a TrendWindow.
+
+    Day d of the matrix is start_date + d, so series line up by date; days with
+    no row stay NaN/unobserved. Keywords and areas are sorted. Rows outside the
+    window are ignored. Expects one row per (keyword, area, date).
+    """
+    day_index = {start_date + timedelta(days=d): d for d in range(days)}
+    keyword_index: Dict[str, int] = {}
+    area_index: Dict[str, int] = {}
+    k_idx, a_idx, d_idx, values = [], [], [], []
+    for row in rows:
+        d = day_index.get(row['trend_date'])
+        if d is None:
+            continue
+        k_idx.append(keyword_index.setdefault(row['keyword'], len(keyword_index)))
+        a_idx.append(area_index.setdefault(row['business_area'], len(area_index)))
+        d_idx.append(d)
+        values.append(row['trend_score'])
+
+    # Renumber keywords and areas in sorted order
+    keywords = sorted(keyword_index)
+    areas = sorted(area_index)
+    keyword_rank = np.empty(len(keywords), dtype=np.intp)
+    keyword_rank[[keyword_index[k] for k in keywords]] = np.arange(len(keywords))
+    area_rank = np.empty(len(areas), dtype=np.intp)
+    area_rank[[area_index[a] for a in areas]] = np.arange(len(areas))
+
+    scores = np.full((len(keywords), len(areas), days), np.nan)
+    if values:
+        scores[keyword_rank[k_idx], area_rank[a_idx], d_idx] = values
+
+    return TrendWindow(
+        keywords=keywords,
+        business_areas=areas,
+        start_date=start_date,
+        scores=scores,
+        observed=~np.isnan(scores)
+    )
+
+
+def correlate_business_areas(window: TrendWindow, min_points: int = 3) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    |Pearson r| between every pair of business areas for every keyword, in one pass.
+
+    Each pair is compared only on the days both areas have a score (pairwise
+    complete), and needs at least min_points such days; otherwise r is NaN.
+    A flat series (zero variance) gives 0.
+
+    Returns:
+        (area_i, area_j, correlations) - area index pairs with i < j, and an
+        array of shape (keywords, pairs)
+    """
+    area_i, area_j = np.triu_indices(len(window.business_areas), k=1)
+    correlations = np.full((len(window.keywords), len(area_i)), np.nan)
+    if not len(area_i):
+        return area_i, area_j, correlations
+
+    # Keyword blocks bound the (keywords, pairs, days) temporaries
+    for start in range(0, len(window.keywords), CORRELATION_BLOCK_SIZE):
+        block = slice(start, start + CORRELATION_BLOCK_SIZE)
+        observed = window.observed[block]
+        scores = window.scores[block]
+
+        joint = observed[:, area_i, :] & observed[:, area_j, :]   # (K, P, D)
+        x = np.where(joint, scores[:, area_i, :], 0.0)
+        y = np.where(joint, scores[:, area_j, :], 0.0)
+
+        n = joint.sum(axis=2)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            dx = np.where(joint, x - (x.sum(axis=2) / n)[..., None], 0.0)
+            dy = np.where(joint, y - (y.sum(axis=2) / n)[..., None], 0.0)
+            covariance = (dx * dy).sum(axis=2)
+            denominator = np.sqrt((dx * dx).sum(axis=2) * (dy * dy).sum(axis=2))
+            block_correlations = np.where(denominator > 0, np.abs(covariance) / denominator, 0.0)
+
+        block_correlations[n < min_points] = np.nan
+        correlations[block] = block_correlations
+
+    return area_i, area_j, correlations
+
+
+def _shared_momentum(series: np.ndarray) -> str:
+    """Compare the last three observed scores with the first three"""
+    recent = series[-3:].mean() if len(series) >= 3 else series[-1]
+    early = series[:3].mean() if len(series) >= 3 else series[0]
+    if recent > early * 1.2:
+        return 'rising'
+    if recent < early * 0.8:
+        return 'declining'
+    return 'stable'
+
+
 # Singleton instance
 _trend_analyzer_instance: Optional['TrendAnalyzer'] = None
 
@@ -401,121 +515,89 @@ class TrendAnalyzer:
     # ============================================================================
     
     async def find_cross_business_correlations(self, days: int = 14,
-                                             min_correlation: float = 0.6) -> List[BusinessTrendCorrelation]:
-        """Find trending keywords that correlate across business areas"""
+                                             min_correlation: float = 0.6,
+                                             limit: int = 10) -> List[BusinessTrendCorrelation]:
+        """
+        Find trending keywords that correlate across business areas
+        
+        Scores are lined up by date (see pivot_trend_window), so two areas are
+        only compared on days both have data.
+        """
         conn = None
         try:
             conn = await db_manager.get_connection()
             
             cutoff_date = date.today() - timedelta(days=days)
             
-            # Get trend data for all business areas
+            # Only keywords tracked in 2+ business areas can correlate; one score per day
             all_trends = await conn.fetch('''
-                SELECT keyword, business_area, trend_date, trend_score
-                FROM trend_monitoring 
+                SELECT keyword, business_area, trend_date, AVG(trend_score) AS trend_score
+                FROM trend_monitoring
                 WHERE trend_date >= $1 AND trend_score IS NOT NULL
-                ORDER BY keyword, business_area, trend_date
+                AND keyword IN (
+                    SELECT keyword FROM trend_monitoring
+                    WHERE trend_date >= $1 AND trend_score IS NOT NULL
+                    GROUP BY keyword
+                    HAVING COUNT(DISTINCT business_area) >= 2
+                )
+                GROUP BY keyword, business_area, trend_date
+                ORDER BY keyword, business_area
             ''', cutoff_date)
-            
-            # Group by keyword and business area
-            keyword_trends = defaultdict(lambda: defaultdict(list))
-            
-            for row in all_trends:
-                keyword_trends[row['keyword']][row['business_area']].append(row['trend_score'])
-            
-            correlations = []
-            
-            # Find keywords that appear in multiple business areas
-            for keyword, business_data in keyword_trends.items():
-                if len(business_data) < 2:  # Need at least 2 business areas
-                    continue
-                
-                business_areas = list(business_data.keys())
-                
-                for i, primary_business in enumerate(business_areas):
-                    primary_scores = business_data[primary_business]
-                    
-                    if len(primary_scores) < 3:  # Need enough data points
-                        continue
-                    
-                    correlated_keywords = []
-                    
-                    for j, other_business in enumerate(business_areas):
-                        if i >= j:  # Avoid duplicates
-                            continue
-                        
-                        other_scores = business_data[other_business]
-                        
-                        if len(other_scores) < 3:
-                            continue
-                        
-                        # Calculate correlation between score patterns
-                        correlation = self._calculate_correlation(primary_scores, other_scores)
-                        
-                        if correlation >= min_correlation:
-                            correlated_keywords.append((keyword, other_business, correlation))
-                    
-                    if correlated_keywords:
-                        # Determine shared momentum
-                        avg_primary = statistics.mean(primary_scores[-3:]) if len(primary_scores) >= 3 else primary_scores[-1]
-                        recent_primary = statistics.mean(primary_scores[:3]) if len(primary_scores) >= 3 else primary_scores[0]
-                        
-                        if avg_primary > recent_primary * 1.2:
-                            momentum = 'rising'
-                        elif avg_primary < recent_primary * 0.8:
-                            momentum = 'declining'
-                        else:
-                            momentum = 'stable'
-                        
-                        correlation_strength = max([corr for _, _, corr in correlated_keywords])
-                        
-                        correlations.append(BusinessTrendCorrelation(
-                            primary_keyword=keyword,
-                            primary_business=primary_business,
-                            correlated_keywords=correlated_keywords,
-                            correlation_strength=correlation_strength,
-                            shared_momentum=momentum
-                        ))
-            
-            # Sort by correlation strength
-            correlations.sort(key=lambda x: x.correlation_strength, reverse=True)
-            
-            return correlations[:10]  # Return top 10 correlations
-            
         finally:
             if conn:
                 await db_manager.release_connection(conn)
+        
+        # Window through today (trend_date >= cutoff)
+        window = await asyncio.to_thread(
+            pivot_trend_window,
+            [{**dict(row), 'trend_score': float(row['trend_score'])} for row in all_trends],
+            cutoff_date,
+            days + 1
+        )
+        return await asyncio.to_thread(
+            self.correlations_from_window, window, min_correlation, limit
+        )
     
-    def _calculate_correlation(self, scores1: List[int], scores2: List[int]) -> float:
-        """Calculate correlation between two score series"""
-        try:
-            # Normalize series to same length
-            min_length = min(len(scores1), len(scores2))
-            s1 = scores1[-min_length:]
-            s2 = scores2[-min_length:]
-            
-            if min_length < 2:
-                return 0.0
-            
-            # Calculate Pearson correlation coefficient
-            mean1 = statistics.mean(s1)
-            mean2 = statistics.mean(s2)
-            
-            numerator = sum((s1[i] - mean1) * (s2[i] - mean2) for i in range(min_length))
-            
-            sum_sq1 = sum((s1[i] - mean1) ** 2 for i in range(min_length))
-            sum_sq2 = sum((s2[i] - mean2) ** 2 for i in range(min_length))
-            
-            denominator = (sum_sq1 * sum_sq2) ** 0.5
-            
-            if denominator == 0:
-                return 0.0
-            
-            correlation = numerator / denominator
-            return abs(correlation)  # Return absolute correlation
-            
-        except Exception:
-            return 0.0
+    def correlations_from_window(self, window: TrendWindow, min_correlation: float = 0.6,
+                                 limit: int = 10) -> List[BusinessTrendCorrelation]:
+        """
+        BusinessTrendCorrelation for each (keyword, primary area) with at least one
+        later area correlated at min_correlation or above; strongest first
+        """
+        area_i, area_j, correlations = correlate_business_areas(window, self.min_data_points)
+        
+        with np.errstate(invalid='ignore'):
+            strong = np.where(correlations >= min_correlation, correlations, np.nan)   # (keywords, pairs)
+        
+        # Strength of each (keyword, primary area) = its best pair; rank them all at once
+        strength = np.full((len(window.keywords), len(window.business_areas)), np.nan)
+        for a in range(len(window.business_areas)):
+            pairs = area_i == a
+            if pairs.any():
+                strength[:, a] = np.fmax.reduce(strong[:, pairs], axis=1)
+        
+        flat = strength.ravel()
+        candidates = np.flatnonzero(~np.isnan(flat))
+        top = candidates[np.argsort(-flat[candidates], kind='stable')[:limit]]
+        
+        # Objects only for the results returned
+        results = []
+        for k, a in zip(*np.unravel_index(top, strength.shape)):
+            pairs = np.flatnonzero((area_i == a) & ~np.isnan(strong[k]))
+            correlated_keywords = [
+                (window.keywords[k], window.business_areas[area_j[p]], float(strong[k, p]))
+                for p in pairs
+            ]
+            primary_scores = window.scores[k, a][window.observed[k, a]]
+            results.append(BusinessTrendCorrelation(
+                primary_keyword=window.keywords[k],
+                primary_business=window.business_areas[a],
+                correlated_keywords=correlated_keywords,
+                correlation_strength=float(strength[k, a]),
+                shared_momentum=_shared_momentum(primary_scores)
+            ))
+        
+        return results
     
     # ============================================================================
     # CONTENT TIMING OPTIMIZATION
@@ -11,23 +11,89 @@ Key Features:
 - Momentum detection for trend alerts
 
 FIXED: Now uses centralized db_manager instead of direct asyncpg.connect()
+UPDATED 10/16/26: pytrends runs on a bounded thread pool (never blocks the event loop),
+                  with an async rate limiter and a daily quota that resets at midnight.
+                  Quota is only spent on requests that reached Google.
 """
 
 import asyncio
 import random
 import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime, timedelta, date
 from dataclasses import dataclass
 
 from pytrends.request import TrendReq
 import pandas as pd
+from requests.exceptions import ConnectionError as RequestsConnectionError
 
 from ...core.database import db_manager
 
 logger = logging.getLogger(__name__)
 
 
+# pytrends does blocking HTTP + pandas work. It runs here, never on the event loop.
+# Two workers: one request in flight plus one being post-processed is plenty at 3s spacing.
+PYTRENDS_MAX_WORKERS = 2
+_pytrends_executor = ThreadPoolExecutor(max_workers=PYTRENDS_MAX_WORKERS, thread_name_prefix='pytrends')
+
+
+class RequestRateLimiter:
+    """Spaces request starts at least min_interval (with jitter) apart, across all callers"""
+    
+    def __init__(self, min_interval: float):
+        self.min_interval = min_interval
+        self._lock = asyncio.Lock()
+        self._next_request_at = 0.0
+    
+    async def acquire(self):
+        async with self._lock:
+            wait = self._next_request_at - time.monotonic()
+            if wait > 0:
+                await asyncio.sleep(wait)
+            # Random jitter to avoid detection patterns
+            self._next_request_at = time.monotonic() + self.min_interval * random.uniform(0.5, 1.5)
+    
+    def penalize(self, seconds: float):
+        """Push the next request back (after an error / likely 429)"""
+        self._next_request_at = max(self._next_request_at, time.monotonic() + seconds)
+
+
+class DailyQuota:
+    """Request counter that resets when the date changes"""
+    
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.used = 0
+        self.day = date.today()
+    
+    def _roll_over(self):
+        today = date.today()
+        if today != self.day:
+            self.day = today
+            self.used = 0
+    
+    def try_consume(self) -> bool:
+        self._roll_over()
+        if self.used >= self.limit:
+            return False
+        self.used += 1
+        return True
+    
+    def refund(self):
+        """Give back a request that never reached Google"""
+        self._roll_over()
+        self.used = max(0, self.used - 1)
+    
+    @property
+    def remaining(self) -> int:
+        self._roll_over()
+        return self.limit - self.used
+
+
 @dataclass
 class TrendData:
     """Container for trend information"""
@@ -46,13 +112,15 @@ class GoogleTrendsClient:
     def __init__(self):
         """Initialize GoogleTrendsClient - uses centralized db_manager"""
         # No database_url needed - we use the centralized db_manager
-        self.pytrends = None
+        # One TrendReq per executor thread (it keeps per-request state)
+        self._thread_local = threading.local()
+        self._initialized = False
         
         # Rate limiting - 45% under Google's limits for safety
         self.batch_size = 5  # Keywords per request (Google allows up to 5)
         self.request_delay = 3.0  # 3 seconds between requests (45% under typical limits)
-        self.daily_request_limit = 800  # Conservative daily limit
-        self.requests_made_today = 0
+        self.rate_limiter = RequestRateLimiter(self.request_delay)
+        self.quota = DailyQuota(800)  # Conservative daily limit
         
         # Low threshold settings (learned from TV signals missing events)
         self.alert_thresholds = {
@@ -66,14 +134,32 @@ class GoogleTrendsClient:
         self.primary_region = 'US'
         self.virginia_region = 'US-VA'  # Virginia-specific trends
     
-    async def initialize_client(self):
-        """Initialize pytrends client with proper settings"""
-        try:
-            self.pytrends = TrendReq(
+    @property
+    def requests_made_today(self) -> int:
+        return self.quota.limit - self.quota.remaining
+    
+    @property
+    def daily_request_limit(self) -> int:
+        return self.quota.limit
+    
+    def _get_pytrends(self) -> TrendReq:
+        """This thread's pytrends client (runs on the executor - TrendReq() does HTTP)"""
+        pytrends = getattr(self._thread_local, 'pytrends', None)
+        if pytrends is None:
+            pytrends = TrendReq(
                 hl='en-US',  # Language
                 tz=300,      # Eastern Time Zone (Virginia)
                 timeout=(10, 25),  # Connection and read timeouts
             )
+            self._thread_local.pytrends = pytrends
+        return pytrends
+    
+    async def initialize_client(self):
+        """Initialize pytrends client with proper settings"""
+        try:
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(_pytrends_executor, self._get_pytrends)
+            self._initialized = True
             logger.info("Google Trends client initialized successfully")
             return True
         except Exception as e:
@@ -89,89 +175,113 @@ class GoogleTrendsClient:
     
     async def fetch_trend_data(self, keywords: List[str], timeframe: str = 'today 3-m') -> Dict[str, TrendData]:
         """Fetch trend data for a batch of keywords"""
-        if not self.pytrends:
+        if not self._initialized:
             if not await self.initialize_client():
                 return {}
         
+        # Check rate limiting - reserve now so concurrent callers can't overshoot,
+        # refund below if the request never got to Google
+        if not self.quota.try_consume():
+            logger.warning("Daily request limit reached, skipping request")
+            return {}
+        reached_google = threading.Event()  # set by the executor thread
+        
         try:
-            # Check rate limiting
-            if self.requests_made_today >= self.daily_request_limit:
-                logger.warning("Daily request limit reached, skipping request")
-                return {}
-            
             # Build the query - limit to 5 keywords per request
             query_keywords = keywords[:self.batch_size]
             
+            await self.rate_limiter.acquire()
             logger.info(f"Fetching trends for: {', '.join(query_keywords)}")
             
-            # Build payload for pytrends
-            self.pytrends.build_payload(
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(
+                _pytrends_executor, self._fetch_trend_data_blocking,
+                query_keywords, timeframe, reached_google
+            )
+            
+        except Exception as e:
+            logger.error(f"Error fetching trend data for {keywords}: {e}")
+            if reached_google.is_set():
+                self.rate_limiter.penalize(5)  # Extra delay on error (likely a 429)
+            return {}
+        finally:
+            # Local failures (client init, cancelled while queued, connection refused)
+            # don't cost a request
+            if not reached_google.is_set():
+                self.quota.refund()
+    
+    def _fetch_trend_data_blocking(self, query_keywords: List[str], timeframe: str,
+                                   reached_google: threading.Event) -> Dict[str, TrendData]:
+        """pytrends calls + pandas processing (runs on the executor thread)"""
+        pytrends = self._get_pytrends()
+        
+        # Build payload for pytrends (first HTTP call to Google)
+        try:
+            pytrends.build_payload(
                 kw_list=query_keywords,
                 cat=0,  # All categories
                 timeframe=timeframe,
                 geo=self.primary_region,  # US trends
                 gprop=''  # Web search
             )
+        except RequestsConnectionError:
+            raise  # Never got a connection - Google didn't see it
+        except Exception:
+            reached_google.set()  # Google answered with an error (429 etc.)
+            raise
+        reached_google.set()
+        
+        # Get interest over time data
+        interest_data = pytrends.interest_over_time()
+        
+        # Get interest by region (for Virginia focus)
+        try:
+            region_data = pytrends.interest_by_region(
+                resolution='REGION',
+                inc_low_vol=True,
+                inc_geo_code=True
+            )
+        except Exception:
+            region_data = pd.DataFrame()  # Fallback if region data fails
+        
+        # Process the data
+        trend_results = {}
+        
+        if not interest_data.empty:
+            # Get the latest date's data
+            latest_date = interest_data.index[-1].date()
             
-            # Get interest over time data
-            interest_data = self.pytrends.interest_over_time()
-            
-            # Get interest by region (for Virginia focus)
-            try:
-                region_data = self.pytrends.interest_by_region(
-                    resolution='REGION',
-                    inc_low_vol=True,
-                    inc_geo_code=True
-                )
-            except Exception:
-                region_data = pd.DataFrame()  # Fallback if region data fails
-            
-            self.requests_made_today += 1
-            
-            # Process the data
-            trend_results = {}
-            
-            if not interest_data.empty:
-                # Get the latest date's data
-                latest_date = interest_data.index[-1].date()
-                
-                for keyword in query_keywords:
-                    if keyword in interest_data.columns:
-                        # Get recent trend scores
-                        recent_scores = interest_data[keyword].tail(7).tolist()  # Last 7 data points
-                        current_score = recent_scores[-1] if recent_scores else 0
-                        
-                        # Calculate momentum
-                        momentum = self.calculate_momentum(recent_scores)
-                        
-                        # Get Virginia-specific score if available
-                        virginia_score = None
-                        if not region_data.empty and keyword in region_data.columns:
-                            # Look for Virginia in the regional data
-                            virginia_row = region_data[region_data.index.str.contains('Virginia', case=False, na=False)]
-                            if not virginia_row.empty:
-                                virginia_score = virginia_row[keyword].iloc[0]
-                        
-                        trend_results[keyword] = TrendData(
-                            keyword=keyword,
-                            business_area='',  # Will be set by caller
-                            trend_score=int(current_score),
-                            trend_date=latest_date,
-                            momentum=momentum,
-                            regional_score=int(virginia_score) if virginia_score else None,
-                            raw_data={
-                                'recent_scores': recent_scores,
-                                'timeframe': timeframe
-                            }
-                        )
-            
-            await self.smart_delay()  # Rate limiting delay
-            return trend_results
-            
-        except Exception as e:
-            logger.error(f"Error fetching trend data for {keywords}: {e}")
-            await asyncio.sleep(5)  # Extra delay on error
-            return {}
+            for keyword in query_keywords:
+                if keyword in interest_data.columns:
+                    # Get recent trend scores
+                    recent_scores = interest_data[keyword].tail(7).tolist()  # Last 7 data points
+                    current_score = recent_scores[-1] if recent_scores else 0
+                    
+                    # Calculate momentum
+                    momentum = self.calculate_momentum(recent_scores)
+                    
+                    # Get Virginia-specific score if available
+                    virginia_score = None
+                    if not region_data.empty and keyword in region_data.columns:
+                        # Look for Virginia in the regional data
+                        virginia_row = region_data[region_data.index.str.contains('Virginia', case=False, na=False)]
+                        if not virginia_row.empty:
+                            virginia_score = virginia_row[keyword].iloc[0]
+                    
+                    trend_results[keyword] = TrendData(
+                        keyword=keyword,
+                        business_area='',  # Will be set by caller
+                        trend_score=int(current_score),
+                        trend_date=latest_date,
+                        momentum=momentum,
+                        regional_score=int(virginia_score) if virginia_score else None,
+                        raw_data={
+                            'recent_scores': recent_scores,
+                            'timeframe': timeframe
+                        }
+                    )
+        
+        return trend_results
     
     def calculate_momentum(self, scores: List[float]) -> str:
         """Calculate trend momentum from score history"""
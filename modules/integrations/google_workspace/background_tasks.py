@@ -12,6 +12,11 @@ This module handles:
 
 All tasks run in the background without user intervention.
 
+Updated: 2026-10-16 - Tasks are jobs on the shared scheduler (modules/core/scheduler.py)
+instead of one sleep loop each: leased across replicas, jittered, with metrics.
+Error pause (MAX_CONSECUTIVE_ERRORS / ERROR_BACKOFF_MINUTES) is the scheduler's
+pause_after_errors.
+
 Usage:
     from modules.integrations.google_workspace.background_tasks import google_background_tasks
     
@@ -25,15 +30,14 @@ Usage:
         await google_background_tasks.stop()
 """
 
-import asyncio
 import logging
-from datetime import datetime, timedelta, timezone
 from typing import Dict, Any, Optional, List
 
 logger = logging.getLogger(__name__)
 
 from . import SUPPORTED_SITES
 from modules.core.database import db_manager
+from modules.core.scheduler import get_scheduler
 
 # Single user ID (intentionally hardcoded for single-user system)
 DEFAULT_USER_ID = "b7c60682-4815-4d9d-8ebe-66c6cd24eff9"
@@ -55,6 +59,9 @@ STARTUP_DELAY = 30  # 30 seconds
 MAX_CONSECUTIVE_ERRORS = 5
 ERROR_BACKOFF_MINUTES = 30  # Pause for 30 min after max errors
 
+# Scheduler job names are prefixed to keep them apart from app.py's jobs
+JOB_PREFIX = 'google_'
+
 
 class GoogleWorkspaceBackgroundTasks:
     """
@@ -70,11 +77,6 @@ class GoogleWorkspaceBackgroundTasks:
     
     def __init__(self):
         self._running = False
-        self._tasks: Dict[str, asyncio.Task] = {}
-        self._last_run: Dict[str, datetime] = {}
-        self._last_success: Dict[str, datetime] = {}
-        self._error_counts: Dict[str, int] = {}
-        self._paused_until: Dict[str, datetime] = {}
         self._user_id: Optional[str] = None
         
         logger.info("🔄 Google Workspace Background Tasks initialized")
@@ -95,26 +97,17 @@ class GoogleWorkspaceBackgroundTasks:
         
         self._running = True
         
-        # Start each task
-        self._tasks['token_refresh'] = asyncio.create_task(
-            self._run_periodic_task('token_refresh', TOKEN_REFRESH_INTERVAL, self._refresh_tokens)
-        )
-        
-        self._tasks['email_sync'] = asyncio.create_task(
-            self._run_periodic_task('email_sync', EMAIL_SYNC_INTERVAL, self._sync_emails)
-        )
-        
-        self._tasks['analytics_sync'] = asyncio.create_task(
-            self._run_periodic_task('analytics_sync', ANALYTICS_SYNC_INTERVAL, self._sync_analytics)
-        )
-        
-        self._tasks['search_console_sync'] = asyncio.create_task(
-            self._run_periodic_task('search_console_sync', SEARCH_CONSOLE_SYNC_INTERVAL, self._sync_search_console)
-        )
-        
-        self._tasks['calendar_sync'] = asyncio.create_task(
-            self._run_periodic_task('calendar_sync', CALENDAR_SYNC_INTERVAL, self._sync_calendar)
-        )
+        # Register each task with the scheduler
+        scheduler = get_scheduler()
+        for task_name, (interval, task_func) in self._task_map().items():
+            scheduler.add_job(
+                JOB_PREFIX + task_name,
+                task_func,
+                interval=interval,
+                start_delay=STARTUP_DELAY,
+                pause_after_errors=MAX_CONSECUTIVE_ERRORS,
+                pause_seconds=ERROR_BACKOFF_MINUTES * 60
+            )
         
         logger.info("✅ All background tasks started")
         logger.info(f"   📝 Token refresh: every {TOKEN_REFRESH_INTERVAL // 60} minutes")
@@ -131,17 +124,12 @@ class GoogleWorkspaceBackgroundTasks:
         logger.info("🛑 Stopping Google Workspace background tasks...")
         self._running = False
         
-        # Cancel all tasks
-        for name, task in self._tasks.items():
-            if not task.done():
-                task.cancel()
-                try:
-                    await task
-                except asyncio.CancelledError:
-                    pass
-                logger.debug(f"   Stopped: {name}")
+        # Unregister (cancels any run in progress)
+        scheduler = get_scheduler()
+        for task_name in self._task_map():
+            await scheduler.remove_job(JOB_PREFIX + task_name)
+            logger.debug(f"   Stopped: {task_name}")
         
-        self._tasks.clear()
         logger.info("✅ All background tasks stopped")
     
     async def _get_user_id(self) -> Optional[str]:
@@ -150,64 +138,15 @@ class GoogleWorkspaceBackgroundTasks:
         logger.info(f"📌 Background tasks will run for user: {DEFAULT_USER_ID}")
         return DEFAULT_USER_ID
     
-    async def _run_periodic_task(self, task_name: str, interval: int, task_func):
-        """
-        Run a task periodically with error handling and backoff
-        
-        Args:
-            task_name: Name for logging
-            interval: Seconds between runs
-            task_func: Async function to run
-        """
-        # Initial startup delay
-        await asyncio.sleep(STARTUP_DELAY)
-        
-        # Initialize error tracking
-        self._error_counts[task_name] = 0
-        
-        while self._running:
-            try:
-                # Check if task is paused due to errors
-                if task_name in self._paused_until:
-                    if datetime.now() < self._paused_until[task_name]:
-                        wait_time = (self._paused_until[task_name] - datetime.now()).seconds
-                        logger.debug(f"⏸️ {task_name} paused for {wait_time}s more")
-                        await asyncio.sleep(60)  # Check again in 1 minute
-                        continue
-                    else:
-                        # Pause expired, reset
-                        del self._paused_until[task_name]
-                        self._error_counts[task_name] = 0
-                        logger.info(f"▶️ {task_name} resuming after pause")
-                
-                # Run the task
-                self._last_run[task_name] = datetime.now()
-                logger.info(f"🔄 Running: {task_name}")
-                
-                await task_func()
-                
-                # Success - reset error count
-                self._error_counts[task_name] = 0
-                self._last_success[task_name] = datetime.now()
-                logger.info(f"✅ Completed: {task_name}")
-                
-            except asyncio.CancelledError:
-                logger.debug(f"Task {task_name} cancelled")
-                break
-            except Exception as e:
-                self._error_counts[task_name] += 1
-                logger.error(f"❌ {task_name} failed (attempt {self._error_counts[task_name]}): {e}")
-                
-                # Check if we should pause
-                if self._error_counts[task_name] >= MAX_CONSECUTIVE_ERRORS:
-                    self._paused_until[task_name] = datetime.now() + timedelta(minutes=ERROR_BACKOFF_MINUTES)
-                    logger.warning(
-                        f"⏸️ {task_name} paused for {ERROR_BACKOFF_MINUTES} minutes "
-                        f"after {MAX_CONSECUTIVE_ERRORS} consecutive errors"
-                    )
-            
-            # Wait for next interval
-            await asyncio.sleep(interval)
+    def _task_map(self) -> Dict[str, tuple]:
+        """Task name -> (interval seconds, coroutine function)"""
+        return {
+            'token_refresh': (TOKEN_REFRESH_INTERVAL, self._refresh_tokens),
+            'email_sync': (EMAIL_SYNC_INTERVAL, self._sync_emails),
+            'analytics_sync': (ANALYTICS_SYNC_INTERVAL, self._sync_analytics),
+            'search_console_sync': (SEARCH_CONSOLE_SYNC_INTERVAL, self._sync_search_console),
+            'calendar_sync': (CALENDAR_SYNC_INTERVAL, self._sync_calendar),
+        }
     
     # =========================================================================
     # TASK IMPLEMENTATIONS
@@ -261,14 +200,15 @@ class GoogleWorkspaceBackgroundTasks:
                     # Initialize client for this account
                     await gmail_client.initialize(self._user_id, email)
                     
-                    # Fetch recent messages (this stores them in the database)
-                    messages = await gmail_client.get_recent_messages(
+                    # Pull changes since the last sync (first run: last 7 days, 50 messages)
+                    # - stores them in the database
+                    result = await gmail_client.sync_incremental(
                         email=email,
                         max_results=50,
                         days=7
                     )
                     
-                    logger.info(f"📧 Synced {len(messages)} emails from {email}")
+                    logger.info(f"📧 Synced {len(result['messages'])} emails from {email} ({result['mode']})")
                     
                 except Exception as e:
                     logger.error(f"📧 Failed to sync {email}: {e}")
@@ -375,14 +315,16 @@ class GoogleWorkspaceBackgroundTasks:
             'tasks': {}
         }
         
-        for task_name in ['token_refresh', 'email_sync', 'analytics_sync',
-                          'search_console_sync', 'calendar_sync']:
+        scheduler = get_scheduler()
+        for task_name in self._task_map():
+            job = scheduler.get_job(JOB_PREFIX + task_name)
             task_status = {
-                'last_run': self._last_run.get(task_name),
-                'last_success': self._last_success.get(task_name),
-                'error_count': self._error_counts.get(task_name, 0),
-                'paused_until': self._paused_until.get(task_name),
-                'is_running': task_name in self._tasks and not self._tasks[task_name].done()
+                'last_run': job.last_run if job else None,
+                'last_success': job.last_success if job else None,
+                'error_count': job.consecutive_errors if job else 0,
+                'paused_until': job.paused_until if job else None,
+                'is_running': job.is_running if job else False,
+                'next_due': job.next_due if job else None
             }
             status['tasks'][task_name] = task_status
         
@@ -399,13 +341,7 @@ class GoogleWorkspaceBackgroundTasks:
         Returns:
             True if task ran successfully
         """
-        task_map = {
-            'token_refresh': self._refresh_tokens,
-            'email_sync': self._sync_emails,
-            'analytics_sync': self._sync_analytics,
-            'search_console_sync': self._sync_search_console,
-            'calendar_sync': self._sync_calendar
-        }
+        task_map = self._task_map()
         
         if task_name not in task_map:
             logger.error(f"Unknown task: {task_name}")
@@ -417,9 +353,15 @@ class GoogleWorkspaceBackgroundTasks:
                 logger.error("No user found")
                 return False
         
+        # Through the scheduler when registered, so it won't overlap a scheduled run
+        scheduler = get_scheduler()
+        if scheduler.get_job(JOB_PREFIX + task_name) is not None:
+            logger.info(f"🔄 Manually running: {task_name}")
+            return await scheduler.run_now(JOB_PREFIX + task_name)
+        
         try:
             logger.info(f"🔄 Manually running: {task_name}")
-            await task_map[task_name]()
+            await task_map[task_name][1]()
             logger.info(f"✅ Manual run complete: {task_name}")
             return True
         except Exception as e:
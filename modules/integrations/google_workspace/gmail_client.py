@@ -4,10 +4,13 @@ Gmail Client - REFACTORED FOR AIOGOOGLE
 Multi-Account Email Intelligence with True Async Support
 
 UPDATED: 2025-12-19 - Now fetches full email body during sync for AI analysis
+Updated: 2026-10-16 - Incremental sync via users.history.list (historyId per account),
+                      concurrent message fetch, cached discovery, bulk upsert
 """
 
+import asyncio
 import logging
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
 from datetime import datetime, timedelta, timezone
 import base64
 
@@ -16,13 +19,62 @@ logger = logging.getLogger(__name__)
 try:
     from aiogoogle import Aiogoogle
     from aiogoogle.auth.creds import UserCreds
+    from aiogoogle.excs import HTTPError
     GMAIL_AVAILABLE = True
 except ImportError:
     GMAIL_AVAILABLE = False
     logger.warning("⚠️ aiogoogle not installed - run: pip install aiogoogle")
 
 from .oauth_manager import get_aiogoogle_credentials, GoogleTokenExpiredError
-from ...core.database import db_manager
+from ...core.database import db_manager, TRANSIENT_ERRORS
+
+# Concurrent users.messages.get calls per sync (each costs 5 of the 250 quota units/s per user)
+GMAIL_FETCH_CONCURRENCY = 10
+
+# History events that add mail or change the labels priority/category/requires_response read
+GMAIL_HISTORY_TYPES = ['messageAdded', 'labelAdded', 'labelRemoved']
+
+# Upper bound on messages fetched by one incremental sync; the rest wait for the next one
+GMAIL_INCREMENTAL_MAX_MESSAGES = 200
+
+GMAIL_UPSERT_QUERY = '''
+    INSERT INTO google_gmail_analysis 
+    (user_id, email_account, message_id, thread_id, sender_email, sender_name,
+     subject_line, snippet, body, priority_level, category, requires_response, 
+     email_date, analyzed_at)
+    VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11, $12, $13, NOW())
+    ON CONFLICT (user_id, message_id) DO UPDATE SET
+        sender_name = EXCLUDED.sender_name,
+        snippet = EXCLUDED.snippet,
+        body = EXCLUDED.body,
+        priority_level = EXCLUDED.priority_level,
+        category = EXCLUDED.category,
+        requires_response = EXCLUDED.requires_response,
+        analyzed_at = NOW()
+'''
+
+# Mailbox historyId per account - the resume point for users.history.list
+GMAIL_SYNC_STATE_TABLE_SQL = '''
+    CREATE TABLE IF NOT EXISTS google_gmail_sync_state (
+        user_id TEXT NOT NULL,
+        email_account TEXT NOT NULL,
+        history_id TEXT NOT NULL,
+        last_synced_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+        PRIMARY KEY (user_id, email_account)
+    )
+'''
+
+# Discovery documents are static - fetch each API description once per process
+_discovery_cache: Dict[str, Any] = {}
+
+
+async def discover_api(aiogoogle: 'Aiogoogle', api_name: str, api_version: str):
+    """aiogoogle.discover() with a process-wide cache (the result is session-independent)"""
+    cache_key = f"{api_name}:{api_version}"
+    if cache_key not in _discovery_cache:
+        _discovery_cache[cache_key] = await aiogoogle.discover(api_name, api_version)
+    return _discovery_cache[cache_key]
+
 
 class GmailClient:
     """
@@ -37,6 +89,7 @@ class GmailClient:
         self._user_creds = None
         self._email_account = None
         self._last_summary_emails = {}  # user_id -> {index: message_id} mapping
+        self._sync_state_ready = False
         logger.info("📧 Gmail client initialized (aiogoogle)")
     
     async def initialize(self, user_id: str, email: Optional[str] = None):
@@ -76,165 +129,331 @@ class GmailClient:
                 logger.debug(f"📧 No credentials loaded, initializing for email={email}")
                 await self.initialize(self._user_id, email)
             
-            # Calculate date query
-            after_date = datetime.now() - timedelta(days=days)
-            query = f"after:{int(after_date.timestamp())}"
-            
-            logger.info(f"📧 Fetching messages with FULL BODY (async): max={max_results}, days={days}")
-            
             async with Aiogoogle(user_creds=self._user_creds) as aiogoogle:
-                gmail_v1 = await aiogoogle.discover('gmail', 'v1')
-                
-                logger.debug(f"🔍 Calling Gmail API: users.messages.list")
-                
-                # THIS IS TRULY ASYNC - NO BLOCKING
-                results = await aiogoogle.as_user(
-                    gmail_v1.users.messages.list(
-                        userId='me',
-                        q=query,
-                        maxResults=max_results
-                    )
-                )
-                
-                messages = results.get('messages', [])
-                
-                if not messages:
-                    logger.info(f"ℹ️ No recent messages found for query: {query}")
-                    return []
-                
-                logger.info(f"📬 Found {len(messages)} messages, fetching FULL details with body...")
-                
-                # Get message details with FULL format (includes body)
-                detailed_messages = []
-                
-                for idx, msg in enumerate(messages):
-                    logger.debug(f"🔍 Fetching FULL message {idx+1}/{len(messages)}: {msg['id']}")
-                    
-                    # CHANGED: format='full' instead of 'metadata' to get body
-                    msg_detail = await aiogoogle.as_user(
-                        gmail_v1.users.messages.get(
-                            userId='me',
-                            id=msg['id'],
-                            format='full'  # FULL format includes body
-                        )
-                    )
-                    
-                    # Extract metadata from headers
-                    headers = {
-                        h['name']: h['value']
-                        for h in msg_detail.get('payload', {}).get('headers', [])
-                    }
-                    
-                    # Extract body using existing method
-                    body_text = self._extract_email_body(msg_detail.get('payload', {}))
-                    
-                    message_data = {
-                        'id': msg_detail['id'],
-                        'thread_id': msg_detail['threadId'],
-                        'from': headers.get('From', 'Unknown'),
-                        'to': headers.get('To', ''),
-                        'subject': headers.get('Subject', '(No Subject)'),
-                        'date': headers.get('Date', ''),
-                        'labels': msg_detail.get('labelIds', []),
-                        'snippet': msg_detail.get('snippet', ''),
-                        'body': body_text,  # NEW: Full body text
-                        'internal_date': msg_detail.get('internalDate', '')
-                    }
-                    
-                    detailed_messages.append(message_data)
-                    
-                    # Store in database for later analysis (now includes body)
-                    await self._store_email_data(message_data)
-                
+                gmail_v1 = await discover_api(aiogoogle, 'gmail', 'v1')
+                detailed_messages = await self._list_recent_messages(aiogoogle, gmail_v1, max_results, days)
+            
+            # Store in database for later analysis (one bulk upsert)
+            if detailed_messages and await self._store_messages(detailed_messages):
                 logger.info(f"✅ Retrieved and stored {len(detailed_messages)} messages with full body")
-                return detailed_messages
+            return detailed_messages
                 
         except Exception as e:
             logger.error(f"❌ Failed to get messages: {e}", exc_info=True)
             raise
     
-    async def _store_email_data(self, message: Dict[str, Any]):
+    async def _list_recent_messages(self, aiogoogle, gmail_v1,
+                                    max_results: int, days: int) -> List[Dict[str, Any]]:
+        """users.messages.list for the last `days`, then fetch each message with FULL body"""
+        # Calculate date query
+        after_date = datetime.now() - timedelta(days=days)
+        query = f"after:{int(after_date.timestamp())}"
+        
+        logger.info(f"📧 Fetching messages with FULL BODY (async): max={max_results}, days={days}")
+        logger.debug(f"🔍 Calling Gmail API: users.messages.list")
+        
+        # THIS IS TRULY ASYNC - NO BLOCKING
+        results = await aiogoogle.as_user(
+            gmail_v1.users.messages.list(
+                userId='me',
+                q=query,
+                maxResults=max_results
+            )
+        )
+        
+        messages = results.get('messages', [])
+        
+        if not messages:
+            logger.info(f"ℹ️ No recent messages found for query: {query}")
+            return []
+        
+        logger.info(f"📬 Found {len(messages)} messages, fetching FULL details with body...")
+        
+        # Get message details with FULL format (includes body), concurrently
+        return await self._fetch_messages(
+            aiogoogle, gmail_v1, [msg['id'] for msg in messages]
+        )
+    
+    # =========================================================================
+    # INCREMENTAL SYNC (users.history.list)
+    # =========================================================================
+    
+    async def sync_incremental(self, email: Optional[str] = None,
+                               max_results: int = 50, days: int = 7) -> Dict[str, Any]:
         """
-        Store email data in database for analysis
+        Pull only what changed since the last sync.
         
-        UPDATED: Now stores body and snippet columns
+        Uses the mailbox historyId saved for this account: users.history.list
+        returns the ids of messages added or relabelled since then, and only
+        those are fetched and upserted. With no saved historyId (first run) or
+        an expired one (Gmail keeps about a week of history), falls back to a
+        get_recent_messages(max_results, days) bootstrap.
+        
+        The historyId is only saved once the messages are stored; if the upsert
+        fails, the next run starts from the old position and fetches them again.
+        
+        Returns:
+            {'mode': 'incremental' | 'full', 'messages': [...], 'history_id': str,
+             'stored': bool}
         """
-        try:
-            conn = await db_manager.get_connection()
-            try:
-                # Parse date
-                try:
-                    email_date = datetime.fromtimestamp(int(message['internal_date']) / 1000)
-                except:
-                    email_date = datetime.now()
-                
-                # Determine priority from labels
-                labels = message.get('labels', [])
-                priority_level = 'normal'
-                if 'IMPORTANT' in labels:
-                    priority_level = 'high'
-                elif 'STARRED' in labels:
-                    priority_level = 'high'
-                
-                # Determine category from labels
-                category = 'inbox'
-                if 'SENT' in labels:
-                    category = 'sent'
-                elif 'DRAFT' in labels:
-                    category = 'draft'
-                elif 'SPAM' in labels:
-                    category = 'spam'
-                
-                # Check if requires response (heuristic)
-                requires_response = 'UNREAD' in labels and 'INBOX' in labels
-                
-                # Extract sender name from "Name <email@example.com>" format
-                sender_full = message.get('from', '')
-                sender_name = None
-                sender_email = sender_full
-                if '<' in sender_full and '>' in sender_full:
-                    sender_name = sender_full.split('<')[0].strip().strip('"')
-                    sender_email = sender_full.split('<')[1].split('>')[0]
-                
-                # UPDATED: Now includes body and snippet columns
-                await conn.execute('''
-                    INSERT INTO google_gmail_analysis 
-                    (user_id, email_account, message_id, thread_id, sender_email, sender_name,
-                     subject_line, snippet, body, priority_level, category, requires_response, 
-                     email_date, analyzed_at)
-                    VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11, $12, $13, NOW())
-                    ON CONFLICT (user_id, message_id) DO UPDATE SET
-                        sender_name = EXCLUDED.sender_name,
-                        snippet = EXCLUDED.snippet,
-                        body = EXCLUDED.body,
-                        priority_level = EXCLUDED.priority_level,
-                        category = EXCLUDED.category,
-                        requires_response = EXCLUDED.requires_response,
-                        analyzed_at = NOW()
-                ''',
-                self._user_id,
-                self._email_account or 'default',
-                message['id'],
-                message['thread_id'],
-                sender_email,
-                sender_name,
-                message['subject'],
-                message.get('snippet', ''),
-                message.get('body', ''),  # NEW: Store full body
-                priority_level,
-                category,
-                requires_response,
-                email_date
-                )
-                
-                logger.debug(f"💾 Stored email with body: {message['subject'][:50]}")
-                
-            finally:
-                await db_manager.release_connection(conn)
+        if not self._user_creds:
+            await self.initialize(self._user_id, email)
+        
+        start_history_id = await self._load_history_id()
+        
+        async with Aiogoogle(user_creds=self._user_creds) as aiogoogle:
+            gmail_v1 = await discover_api(aiogoogle, 'gmail', 'v1')
             
+            if start_history_id:
+                try:
+                    message_ids, history_id = await self._list_history_changes(
+                        aiogoogle, gmail_v1, start_history_id
+                    )
+                except HTTPError as e:
+                    if getattr(e.res, 'status_code', None) != 404:
+                        raise
+                    logger.warning(f"⚠️ Gmail historyId {start_history_id} expired for {self._email_account}, re-bootstrapping")
+                else:
+                    messages = await self._fetch_messages(aiogoogle, gmail_v1, message_ids)
+                    stored = await self._store_messages(messages)
+                    if stored:
+                        await self._save_history_id(history_id)
+                        logger.info(f"📬 Incremental Gmail sync for {self._email_account}: "
+                                    f"{len(message_ids)} changed, {len(messages)} stored (history {start_history_id} -> {history_id})")
+                    else:
+                        logger.warning(f"⚠️ Keeping Gmail historyId {start_history_id} for {self._email_account} "
+                                       f"- {len(messages)} messages will be fetched again next sync")
+                    return {'mode': 'incremental', 'messages': messages, 'history_id': history_id, 'stored': stored}
+            
+            # Bootstrap: take the mailbox position BEFORE listing, so nothing that
+            # arrives mid-bootstrap is skipped (re-fetching it later is a harmless upsert)
+            profile = await aiogoogle.as_user(gmail_v1.users.getProfile(userId='me'))
+            history_id = str(profile['historyId'])
+            messages = await self._list_recent_messages(aiogoogle, gmail_v1, max_results, days)
+        
+        stored = await self._store_messages(messages)
+        if stored:
+            await self._save_history_id(history_id)
+        else:
+            logger.warning(f"⚠️ Gmail bootstrap for {self._email_account} not stored - not saving historyId")
+        return {'mode': 'full', 'messages': messages, 'history_id': history_id, 'stored': stored}
+    
+    async def _list_history_changes(self, aiogoogle, gmail_v1,
+                                    start_history_id: str) -> Tuple[List[str], str]:
+        """
+        Page through users.history.list; returns (changed message ids oldest-first, new historyId).
+        
+        Stops at the first history record that takes the batch to
+        GMAIL_INCREMENTAL_MAX_MESSAGES and returns that record's id, so the
+        next sync resumes right after it instead of skipping the older changes.
+        """
+        changed: Dict[str, None] = {}  # insertion-ordered set
+        history_id = start_history_id
+        page_token = None
+        
+        while True:
+            params = {
+                'userId': 'me',
+                'startHistoryId': start_history_id,
+                'historyTypes': GMAIL_HISTORY_TYPES,
+                'maxResults': 500
+            }
+            if page_token:
+                params['pageToken'] = page_token
+            
+            page = await aiogoogle.as_user(gmail_v1.users.history.list(**params))
+            
+            for record in page.get('history', []):
+                for change_type in ('messagesAdded', 'labelsAdded', 'labelsRemoved'):
+                    for change in record.get(change_type, []):
+                        message_id = change['message']['id']
+                        changed.pop(message_id, None)  # move to the end: most recent change
+                        changed[message_id] = None
+                
+                if len(changed) >= GMAIL_INCREMENTAL_MAX_MESSAGES:
+                    history_id = str(record['id'])
+                    logger.warning(f"⚠️ Gmail sync for {self._email_account} capped at {len(changed)} messages "
+                                   f"(history {history_id}) - the rest follow next sync")
+                    return list(changed), history_id
+            
+            history_id = str(page.get('historyId', history_id))
+            page_token = page.get('nextPageToken')
+            if not page_token:
+                break
+        
+        return list(changed), history_id
+    
+    async def _fetch_messages(self, aiogoogle, gmail_v1, message_ids: List[str]) -> List[Dict[str, Any]]:
+        """
+        Fetch messages with format='full', at most GMAIL_FETCH_CONCURRENCY at a time.
+        Messages that fail (e.g. deleted since they were listed) are skipped.
+        Result keeps the order of message_ids.
+        """
+        semaphore = asyncio.Semaphore(GMAIL_FETCH_CONCURRENCY)
+        
+        async def fetch(message_id: str) -> Optional[Dict[str, Any]]:
+            async with semaphore:
+                try:
+                    # format='full' includes the body for AI analysis
+                    msg_detail = await aiogoogle.as_user(
+                        gmail_v1.users.messages.get(userId='me', id=message_id, format='full')
+                    )
+                except Exception as e:
+                    logger.warning(f"⚠️ Skipping Gmail message {message_id}: {e}")
+                    return None
+                return self._build_message_data(msg_detail)
+        
+        results = await asyncio.gather(*[fetch(message_id) for message_id in message_ids])
+        return [message for message in results if message]
+    
+    def _build_message_data(self, msg_detail: Dict[str, Any]) -> Dict[str, Any]:
+        """Flatten a users.messages.get response into the dict the rest of the client uses"""
+        # Extract metadata from headers
+        headers = {
+            h['name']: h['value']
+            for h in msg_detail.get('payload', {}).get('headers', [])
+        }
+        
+        return {
+            'id': msg_detail['id'],
+            'thread_id': msg_detail['threadId'],
+            'from': headers.get('From', 'Unknown'),
+            'to': headers.get('To', ''),
+            'subject': headers.get('Subject', '(No Subject)'),
+            'date': headers.get('Date', ''),
+            'labels': msg_detail.get('labelIds', []),
+            'snippet': msg_detail.get('snippet', ''),
+            'body': self._extract_email_body(msg_detail.get('payload', {})),
+            'internal_date': msg_detail.get('internalDate', '')
+        }
+    
+    async def _ensure_sync_state_table(self):
+        if not self._sync_state_ready:
+            await db_manager.execute(GMAIL_SYNC_STATE_TABLE_SQL)
+            self._sync_state_ready = True
+    
+    async def _load_history_id(self) -> Optional[str]:
+        """Saved mailbox historyId for the current account, if any"""
+        try:
+            await self._ensure_sync_state_table()
+            row = await db_manager.fetch_one('''
+                SELECT history_id FROM google_gmail_sync_state
+                WHERE user_id = $1 AND email_account = $2
+            ''', str(self._user_id), self._email_account or 'default')
+            return row['history_id'] if row else None
+        except Exception as e:
+            logger.error(f"❌ Failed to load Gmail history id: {e}")
+            return None
+    
+    async def _save_history_id(self, history_id: str):
+        try:
+            await self._ensure_sync_state_table()
+            await db_manager.execute('''
+                INSERT INTO google_gmail_sync_state (user_id, email_account, history_id, last_synced_at)
+                VALUES ($1, $2, $3, NOW())
+                ON CONFLICT (user_id, email_account) DO UPDATE SET
+                    history_id = EXCLUDED.history_id,
+                    last_synced_at = NOW()
+            ''', str(self._user_id), self._email_account or 'default', history_id)
         except Exception as e:
+            logger.error(f"❌ Failed to save Gmail history id: {e}")
+    
+    # =========================================================================
+    # STORAGE
+    # =========================================================================
+    
+    def _email_row(self, message: Dict[str, Any]) -> tuple:
+        """google_gmail_analysis parameters for one message (GMAIL_UPSERT_QUERY order)"""
+        # Parse date
+        try:
+            email_date = datetime.fromtimestamp(int(message['internal_date']) / 1000)
+        except:
+            email_date = datetime.now()
+        
+        # Determine priority from labels
+        labels = message.get('labels', [])
+        priority_level = 'normal'
+        if 'IMPORTANT' in labels:
+            priority_level = 'high'
+        elif 'STARRED' in labels:
+            priority_level = 'high'
+        
+        # Determine category from labels
+        category = 'inbox'
+        if 'SENT' in labels:
+            category = 'sent'
+        elif 'DRAFT' in labels:
+            category = 'draft'
+        elif 'SPAM' in labels:
+            category = 'spam'
+        
+        # Check if requires response (heuristic)
+        requires_response = 'UNREAD' in labels and 'INBOX' in labels
+        
+        # Extract sender name from "Name <email@example.com>" format
+        sender_full = message.get('from', '')
+        sender_name = None
+        sender_email = sender_full
+        if '<' in sender_full and '>' in sender_full:
+            sender_name = sender_full.split('<')[0].strip().strip('"')
+            sender_email = sender_full.split('<')[1].split('>')[0]
+        
+        return (
+            self._user_id,
+            self._email_account or 'default',
+            message['id'],
+            message['thread_id'],
+            sender_email,
+            sender_name,
+            message['subject'],
+            message.get('snippet', ''),
+            message.get('body', ''),
+            priority_level,
+            category,
+            requires_response,
+            email_date
+        )
+    
+    async def _store_messages(self, messages: List[Dict[str, Any]]) -> bool:
+        """
+        Bulk upsert messages (with body and snippet) into google_gmail_analysis:
+        one connection, one transaction, one pipelined executemany.
+        
+        If the batch is rejected, retries row by row and skips (and logs) the
+        messages Postgres will not take, e.g. a NUL byte in the body - one bad
+        email must not hold the historyId back forever.
+        Returns False only if the database itself failed (nothing was stored).
+        """
+        if not messages:
+            return True
+        
+        rows = [self._email_row(message) for message in messages]
+        try:
+            async with db_manager.transaction() as conn:
+                await conn.executemany(GMAIL_UPSERT_QUERY, rows)
+            logger.debug(f"💾 Stored {len(messages)} emails with body")
+            return True
+        except TRANSIENT_ERRORS as e:
             logger.error(f"❌ Failed to store email data: {e}", exc_info=True)
-            # Don't raise - storing is optional, continue even if it fails
+            # Don't raise - callers that only read the messages carry on;
+            # sync_incremental keeps its historyId so they are fetched again
+            return False
+        except Exception as e:
+            logger.warning(f"⚠️ Bulk email upsert rejected ({e}) - retrying {len(rows)} rows one by one")
+        
+        skipped = 0
+        for message, row in zip(messages, rows):
+            try:
+                await db_manager.execute(GMAIL_UPSERT_QUERY, *row)
+            except TRANSIENT_ERRORS as e:
+                logger.error(f"❌ Failed to store email data: {e}", exc_info=True)
+                return False
+            except Exception as e:
+                skipped += 1
+                logger.error(f"❌ Skipping email {message['id']} ({(message.get('subject') or '')[:60]!r}): {e}")
+        
+        logger.debug(f"💾 Stored {len(rows) - skipped} emails with body, skipped {skipped}")
+        return True
     
     async def get_emails_requiring_response(self, days: int = 7, limit: int = 10) -> List[Dict[str, Any]]:
         """
@@ -466,7 +685,7 @@ class GmailClient:
                 await self.initialize(self._user_id)
             
             async with Aiogoogle(user_creds=self._user_creds) as aiogoogle:
-                gmail_v1 = await aiogoogle.discover('gmail', 'v1')
+                gmail_v1 = await discover_api(aiogoogle, 'gmail', 'v1')
                 
                 # Get full message including body
                 msg = await aiogoogle.as_user(
@@ -632,7 +851,7 @@ class GmailClient:
             }
             
             async with Aiogoogle(user_creds=self._user_creds, client_creds=client_creds) as aiogoogle:
-                gmail_v1 = await aiogoogle.discover('gmail', 'v1')
+                gmail_v1 = await discover_api(aiogoogle, 'gmail', 'v1')
                 
                 logger.debug(f"🔍 Calling Gmail API: users.drafts.create")
                 
@@ -726,7 +945,7 @@ class GmailClient:
             }
             
             async with Aiogoogle(user_creds=self._user_creds, client_creds=client_creds) as aiogoogle:
-                gmail_v1 = await aiogoogle.discover('gmail', 'v1')
+                gmail_v1 = await discover_api(aiogoogle, 'gmail', 'v1')
                 
                 logger.debug(f"🔍 Calling Gmail API: users.messages.send")
                 
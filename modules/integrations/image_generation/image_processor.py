@@ -10,18 +10,84 @@ Key Features:
 - File size optimization
 - Download preparation with proper metadata
 - Quality presets for different platforms
+
+Updated: 2026-10-16 - Batch API: the source is decoded once per worker and every
+                      size/format variant is rendered from it in a process pool.
+                      Variants come back as bytes; base64 only at the API boundary.
 """
 
 import asyncio
 import logging
 import base64
 import io
-from typing import Dict, Any, Optional, Tuple, List
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, Any, Optional, Tuple, List, Union
 from PIL import Image, ImageEnhance, ImageFilter
 import os
 
 logger = logging.getLogger(__name__)
 
+# =============================================================================
+# Process Pool
+# =============================================================================
+
+# PIL decode/resize/encode is CPU-bound; keep it off the event loop and off the GIL.
+IMAGE_PROCESS_WORKERS = min(4, os.cpu_count() or 1)
+
+# Created on first use. 'spawn' because the app process has live threads (DB pool,
+# executors) that make fork unsafe; workers are long-lived so the import cost is paid once.
+_image_executor: Optional[ProcessPoolExecutor] = None
+
+
+def _get_image_executor() -> ProcessPoolExecutor:
+    """Get the shared image process pool (started lazily)"""
+    global _image_executor
+    if _image_executor is None:
+        _image_executor = ProcessPoolExecutor(
+            max_workers=IMAGE_PROCESS_WORKERS,
+            mp_context=multiprocessing.get_context('spawn')
+        )
+    return _image_executor
+
+
+def _render_variants(image_data: bytes, variants: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Worker entry point: decode the source ONCE and render every requested variant from it.
+    Runs in the process pool, so it only takes and returns picklable data.
+    """
+    processor = ImageProcessor()
+    
+    source = Image.open(io.BytesIO(image_data))
+    source.load()
+    
+    rendered = []
+    for variant in variants:
+        try:
+            image = processor._process_image_pipeline(
+                source, variant['target_format'], variant['quality_preset'], variant['target_size']
+            )
+            output_buffer = io.BytesIO()
+            image.save(output_buffer, **processor._get_save_parameters(variant['target_format'], variant['quality_preset']))
+            rendered.append({
+                'name': variant['name'],
+                'success': True,
+                'image_bytes': output_buffer.getvalue(),
+                'dimensions': image.size,
+                'color_mode': image.mode
+            })
+        except Exception as e:
+            rendered.append({'name': variant['name'], 'success': False, 'error': str(e)})
+    
+    return {
+        'original_dimensions': source.size,
+        'original_format': source.format or 'PNG',
+        'original_mode': source.mode,
+        'variants': rendered
+    }
+
+
 class ImageProcessor:
     """
     Handles image processing, format conversion, and optimization
@@ -88,7 +154,116 @@ class ImageProcessor:
             }
         }
     
-    async def process_image(self, image_base64: str, target_format: str = 'png',
+    # =========================================================================
+    # Batch Processing
+    # =========================================================================
+    
+    async def process_batch(self, image: Union[str, bytes],
+                            variants: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Render several size/format variants of one image.
+        
+        The variants are split across the process pool; each worker decodes the
+        source once and renders its share from the decoded image.
+        
+        Args:
+            image: Raw source image bytes (base64 is accepted and decoded once here)
+            variants: Dicts with 'name' and optional 'target_format', 'quality_preset',
+                      'resolution_preset' and 'custom_size' (same meaning as process_image)
+            
+        Returns:
+            Dict with source metadata and a 'variants' dict keyed by name.
+            Successful variants carry 'image_bytes', failed ones 'error'.
+        """
+        jobs = []
+        for variant in variants:
+            target_format = variant.get('target_format', 'png')
+            resolution_preset = variant.get('resolution_preset', 'original')
+            jobs.append({
+                'name': variant['name'],
+                'target_format': target_format,
+                'quality_preset': variant.get('quality_preset', 'web_optimized'),
+                'target_size': variant.get('custom_size') or self.resolution_presets.get(resolution_preset)
+            })
+        
+        if not jobs:
+            return {'success': True, 'variants': {}}
+        
+        # One chunk per worker, round-robin so large and small variants spread evenly
+        chunk_count = min(len(jobs), IMAGE_PROCESS_WORKERS)
+        chunks = [jobs[i::chunk_count] for i in range(chunk_count)]
+        
+        try:
+            image_data = self._as_bytes(image)
+            chunk_results = await self._run_in_pool(image_data, chunks)
+        except Exception as e:
+            logger.error(f"Image processing failed: {e}")
+            return {'success': False, 'error': str(e), 'original_format': 'unknown', 'variants': {}}
+        
+        rendered = {
+            variant['name']: variant
+            for chunk_result in chunk_results
+            for variant in chunk_result['variants']
+        }
+        source_info = chunk_results[0]
+        
+        logger.info(f"Processed image: {source_info['original_dimensions'][0]}x{source_info['original_dimensions'][1]} "
+                    f"{source_info['original_format']} ({source_info['original_mode']}) -> "
+                    f"{len(jobs)} variants in {chunk_count} worker(s)")
+        
+        results = {}
+        for job in jobs:
+            variant = rendered[job['name']]
+            if not variant['success']:
+                results[job['name']] = {'success': False, 'error': variant['error']}
+                continue
+            
+            format_spec = self.format_specs.get(job['target_format'].lower(), {})
+            processed_size_bytes = len(variant['image_bytes'])
+            results[job['name']] = {
+                'success': True,
+                'image_bytes': variant['image_bytes'],
+                'dimensions': variant['dimensions'],
+                'format': job['target_format'].upper(),
+                'quality_preset': job['quality_preset'],
+                'size_bytes': processed_size_bytes,
+                'compression_ratio': round(processed_size_bytes / len(image_data), 3) if image_data else 1.0,
+                'format_specs': format_spec,
+                'metadata': {
+                    'color_mode': variant['color_mode'],
+                    'has_transparency': variant['color_mode'] in ('RGBA', 'LA'),
+                    'mime_type': format_spec.get('mime_type', 'image/png')
+                }
+            }
+        
+        return {
+            'success': True,
+            'original_dimensions': source_info['original_dimensions'],
+            'original_format': source_info['original_format'],
+            'original_size_bytes': len(image_data),
+            'variants': results
+        }
+    
+    async def _run_in_pool(self, image_data: bytes, chunks: List[List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+        """Render chunks in the process pool; fall back to a thread if the pool is unusable"""
+        global _image_executor
+        loop = asyncio.get_running_loop()
+        try:
+            return await asyncio.gather(*[
+                loop.run_in_executor(_get_image_executor(), _render_variants, image_data, chunk)
+                for chunk in chunks
+            ])
+        except (BrokenProcessPool, OSError) as e:
+            logger.warning(f"⚠️ Image process pool unavailable ({e}), rendering in a thread")
+            _image_executor = None
+            return [await asyncio.to_thread(_render_variants, image_data, [job for chunk in chunks for job in chunk])]
+    
+    @staticmethod
+    def _as_bytes(image: Union[str, bytes]) -> bytes:
+        """Accept raw bytes or base64 at the API boundary"""
+        return image if isinstance(image, (bytes, bytearray)) else base64.b64decode(image)
+    
+    async def process_image(self, image_base64: Union[str, bytes], target_format: str = 'png',
                           quality_preset: str = 'web_optimized',
                           resolution_preset: str = 'original',
                           custom_size: Tuple[int, int] = None) -> Dict[str, Any]:
@@ -96,7 +271,7 @@ class ImageProcessor:
         Process an image with format conversion and optimization
         
         Args:
-            image_base64: Base64 encoded image data
+            image_base64: Base64 encoded image data (raw bytes also accepted)
             target_format: Target format ('png', 'jpg', 'webp')
             quality_preset: Quality preset name
             resolution_preset: Resolution preset name
@@ -105,70 +280,45 @@ class ImageProcessor:
         Returns:
             Dict with processed image data and metadata
         """
-        try:
-            # Decode base64 image
-            image_data = base64.b64decode(image_base64)
-            original_image = Image.open(io.BytesIO(image_data))
-            
-            # Get original metadata
-            original_size = original_image.size
-            original_format = original_image.format or 'PNG'
-            original_mode = original_image.mode
-            
-            logger.info(f"Processing image: {original_size[0]}x{original_size[1]} {original_format} ({original_mode})")
-            
-            # Process the image
-            processed_image = await self._process_image_pipeline(
-                original_image, target_format, quality_preset, 
-                resolution_preset, custom_size
-            )
-            
-            # Convert back to base64
-            output_buffer = io.BytesIO()
-            save_params = self._get_save_parameters(target_format, quality_preset)
-            processed_image.save(output_buffer, **save_params)
-            
-            processed_base64 = base64.b64encode(output_buffer.getvalue()).decode('utf-8')
-            
-            # Calculate file sizes
-            original_size_bytes = len(image_data)
-            processed_size_bytes = len(output_buffer.getvalue())
-            compression_ratio = processed_size_bytes / original_size_bytes if original_size_bytes > 0 else 1.0
-            
-            return {
-                'success': True,
-                'processed_image_base64': processed_base64,
-                'original_dimensions': original_size,
-                'processed_dimensions': processed_image.size,
-                'original_format': original_format,
-                'processed_format': target_format.upper(),
-                'original_size_bytes': original_size_bytes,
-                'processed_size_bytes': processed_size_bytes,
-                'compression_ratio': round(compression_ratio, 3),
-                'quality_preset': quality_preset,
-                'resolution_preset': resolution_preset,
-                'format_specs': self.format_specs.get(target_format.lower(), {}),
-                'metadata': {
-                    'color_mode': processed_image.mode,
-                    'has_transparency': processed_image.mode in ('RGBA', 'LA'),
-                    'mime_type': self.format_specs.get(target_format.lower(), {}).get('mime_type', 'image/png')
-                }
-            }
-            
-        except Exception as e:
-            logger.error(f"Image processing failed: {e}")
-            return {
-                'success': False,
-                'error': str(e),
-                'original_format': 'unknown'
-            }
-    
-    async def _process_image_pipeline(self, image: Image.Image, target_format: str,
-                                    quality_preset: str, resolution_preset: str,
-                                    custom_size: Tuple[int, int] = None) -> Image.Image:
-        """Internal image processing pipeline"""
+        batch = await self.process_batch(image_base64, [{
+            'name': 'image',
+            'target_format': target_format,
+            'quality_preset': quality_preset,
+            'resolution_preset': resolution_preset,
+            'custom_size': custom_size
+        }])
+        
+        if not batch['success']:
+            return {'success': False, 'error': batch['error'], 'original_format': 'unknown'}
         
-        processed_image = image.copy()
+        variant = batch['variants']['image']
+        if not variant['success']:
+            return {'success': False, 'error': variant['error'], 'original_format': batch['original_format']}
+        
+        return {
+            'success': True,
+            'processed_image_base64': base64.b64encode(variant['image_bytes']).decode('utf-8'),
+            'original_dimensions': batch['original_dimensions'],
+            'processed_dimensions': variant['dimensions'],
+            'original_format': batch['original_format'],
+            'processed_format': variant['format'],
+            'original_size_bytes': batch['original_size_bytes'],
+            'processed_size_bytes': variant['size_bytes'],
+            'compression_ratio': variant['compression_ratio'],
+            'quality_preset': quality_preset,
+            'resolution_preset': resolution_preset,
+            'format_specs': variant['format_specs'],
+            'metadata': variant['metadata']
+        }
+    
+    def _process_image_pipeline(self, image: Image.Image, target_format: str,
+                                quality_preset: str,
+                                target_size: Optional[Tuple[int, int]] = None) -> Image.Image:
+        """
+        Internal image processing pipeline.
+        Never modifies the source image, so one decoded image can serve many variants.
+        """
+        processed_image = image
         
         # 1. Handle transparency for JPEG conversion
         if target_format.lower() in ('jpg', 'jpeg') and processed_image.mode in ('RGBA', 'LA'):
@@ -181,7 +331,6 @@ class ImageProcessor:
             processed_image = background
         
         # 2. Resize if needed
-        target_size = custom_size or self.resolution_presets.get(resolution_preset)
         if target_size:
             processed_image = self._smart_resize(processed_image, target_size)
         
@@ -284,7 +433,8 @@ class ImageProcessor:
         
         quality_settings = self.quality_presets.get(quality_preset, self.quality_presets['web_optimized'])
         
-        params = {'format': target_format.upper()}
+        # PIL only registers the JPEG writer under 'JPEG'
+        params = {'format': 'JPEG' if target_format.lower() in ('jpg', 'jpeg') else target_format.upper()}
         
         if target_format.lower() in ('jpg', 'jpeg'):
             params.update({
@@ -308,14 +458,14 @@ class ImageProcessor:
         
         return params
     
-    async def create_multiple_formats(self, image_base64: str,
+    async def create_multiple_formats(self, image_base64: Union[str, bytes],
                                     formats: List[str] = None,
                                     quality_preset: str = 'web_optimized') -> Dict[str, Any]:
         """
-        Create multiple format versions of an image
+        Create multiple format versions of an image (one decode, one batch)
         
         Args:
-            image_base64: Base64 encoded source image
+            image_base64: Base64 encoded source image (raw bytes also accepted)
             formats: List of target formats ['png', 'jpg', 'webp']
             quality_preset: Quality preset to use
             
@@ -325,26 +475,27 @@ class ImageProcessor:
         if formats is None:
             formats = ['png', 'jpg', 'webp']
         
-        results = {}
+        supported = [name for name in formats if name.lower() in self.format_specs]
+        logger.info(f"Creating {', '.join(name.upper() for name in supported)} versions...")
         
-        for format_name in formats:
-            if format_name.lower() in self.format_specs:
-                logger.info(f"Creating {format_name.upper()} version...")
-                
-                result = await self.process_image(
-                    image_base64, format_name, quality_preset
-                )
-                
-                if result['success']:
-                    results[format_name] = {
-                        'image_base64': result['processed_image_base64'],
-                        'file_size_bytes': result['processed_size_bytes'],
-                        'dimensions': result['processed_dimensions'],
-                        'mime_type': result['metadata']['mime_type'],
-                        'compression_ratio': result['compression_ratio']
-                    }
-                else:
-                    results[format_name] = {'error': result['error']}
+        batch = await self.process_batch(image_base64, [
+            {'name': name, 'target_format': name, 'quality_preset': quality_preset}
+            for name in supported
+        ])
+        
+        results = {}
+        for format_name in supported:
+            variant = batch['variants'].get(format_name)
+            if variant and variant['success']:
+                results[format_name] = {
+                    'image_base64': base64.b64encode(variant['image_bytes']).decode('utf-8'),
+                    'file_size_bytes': variant['size_bytes'],
+                    'dimensions': variant['dimensions'],
+                    'mime_type': variant['metadata']['mime_type'],
+                    'compression_ratio': variant['compression_ratio']
+                }
+            else:
+                results[format_name] = {'error': variant['error'] if variant else batch.get('error')}
         
         return {
             'formats_created': list(results.keys()),
@@ -353,12 +504,12 @@ class ImageProcessor:
             'quality_preset': quality_preset
         }
     
-    async def create_social_media_pack(self, image_base64: str) -> Dict[str, Any]:
+    async def create_social_media_pack(self, image_base64: Union[str, bytes]) -> Dict[str, Any]:
         """
-        Create a complete social media size pack
+        Create a complete social media size pack (one decode, one batch)
         
         Args:
-            image_base64: Base64 encoded source image
+            image_base64: Base64 encoded source image (raw bytes also accepted)
             
         Returns:
             Dict with all social media format versions
@@ -371,27 +522,30 @@ class ImageProcessor:
             'linkedin_post': (1200, 627)
         }
         
-        results = {}
+        logger.info(f"Creating {len(social_sizes)} social media versions...")
         
-        for size_name, dimensions in social_sizes.items():
-            logger.info(f"Creating {size_name} version ({dimensions[0]}x{dimensions[1]})...")
-            
-            result = await self.process_image(
-                image_base64, 
-                target_format='jpg',  # JPEG for social media efficiency
-                quality_preset='social_media',
-                custom_size=dimensions
-            )
-            
-            if result['success']:
+        batch = await self.process_batch(image_base64, [
+            {
+                'name': size_name,
+                'target_format': 'jpg',  # JPEG for social media efficiency
+                'quality_preset': 'social_media',
+                'custom_size': dimensions
+            }
+            for size_name, dimensions in social_sizes.items()
+        ])
+        
+        results = {}
+        for size_name in social_sizes:
+            variant = batch['variants'].get(size_name)
+            if variant and variant['success']:
                 results[size_name] = {
-                    'image_base64': result['processed_image_base64'],
-                    'dimensions': result['processed_dimensions'],
-                    'file_size_bytes': result['processed_size_bytes'],
+                    'image_base64': base64.b64encode(variant['image_bytes']).decode('utf-8'),
+                    'dimensions': variant['dimensions'],
+                    'file_size_bytes': variant['size_bytes'],
                     'platform': size_name.replace('_', ' ').title()
                 }
             else:
-                results[size_name] = {'error': result['error']}
+                results[size_name] = {'error': variant['error'] if variant else batch.get('error')}
         
         return {
             'social_media_pack': results,
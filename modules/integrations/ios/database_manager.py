@@ -18,21 +18,48 @@ Follows established patterns:
 - Timezone-aware datetimes
 
 Updated: 2026-01-06 - Added proactive action methods for iOS conversational execution
+Updated: 2026-10-16 - Calendar/reminders/contacts sync is one COPY + merge per payload,
+                      with deletion detection on full syncs
 """
 
 import logging
+import time
 from datetime import datetime, timezone, timedelta
 from typing import Optional, List, Dict, Any
 from uuid import UUID
 import json
 
-from modules.core.database import db_manager
+from modules.core.database import db_manager, TRANSIENT_ERRORS
 
 logger = logging.getLogger(__name__)
 
 # Single-user system - Carl's UUID
 DEFAULT_USER_ID = "b7c60682-4815-4d9d-8ebe-66c6cd24eff9"
 
+# Column order of the staged rows for each bulk sync (see _bulk_sync)
+CALENDAR_SYNC_COLUMNS = [
+    'user_id', 'device_identifier', 'event_id',
+    'title', 'start_time', 'end_time',
+    'location', 'notes', 'is_all_day', 'calendar_name',
+    'synced_at', 'updated_at'
+]
+
+REMINDER_SYNC_COLUMNS = [
+    'user_id', 'device_identifier', 'reminder_id',
+    'title', 'notes', 'due_date',
+    'is_completed', 'completed_at', 'priority', 'list_name',
+    'synced_at', 'updated_at'
+]
+
+CONTACT_SYNC_COLUMNS = [
+    'user_id', 'device_identifier', 'contact_id',
+    'given_name', 'family_name', 'nickname',
+    'organization', 'job_title',
+    'primary_email', 'primary_phone',
+    'birthday', 'notes', 'full_name',
+    'synced_at'
+]
+
 
 class iOSDatabaseManager:
     """Database operations for iOS integration"""
@@ -532,6 +559,183 @@ class iOSDatabaseManager:
             logger.error(f"❌ Failed to check quiet hours: {e}")
             return False
 
+    # =========================================================================
+    # BULK SYNC ENGINE (calendar, reminders, contacts)
+    # =========================================================================
+    
+    async def _bulk_sync(
+        self,
+        table: str,
+        key_column: str,
+        columns: List[str],
+        rows: List[tuple],
+        user_id: str,
+        device_identifier: str,
+        failed: int = 0,
+        full_sync: bool = False,
+        delete_scope: Optional[str] = None,
+        delete_scope_args: tuple = ()
+    ) -> Dict[str, Any]:
+        """
+        Set-based sync of one payload in a single transaction:
+        1. COPY the rows into a temp staging table (binary, one round trip)
+        2. Merge with one INSERT ... SELECT ... ON CONFLICT (user_id, key) DO UPDATE
+        3. On a full sync, delete this device's rows missing from the payload
+           (optionally narrowed by delete_scope, a condition on the target table `t`
+           whose parameters start at $3)
+        
+        rows must be in `columns` order. If a key repeats within the payload,
+        the last occurrence wins. `failed` carries rows rejected while parsing;
+        a rejected row never reaches the stage table, so any rejection skips the
+        full-sync delete rather than wiping items the phone did send.
+        
+        If Postgres rejects the batch (e.g. a NUL byte in one title), the payload
+        is retried row by row (_row_by_row_sync) so only the bad rows fail.
+        """
+        result = {
+            'synced': 0, 'failed': failed, 'inserted': 0, 'updated': 0, 'deleted': 0, 'timing_ms': {}
+        }
+        
+        # An empty "full" payload is far more likely an app bug than an empty address book
+        if not rows:
+            return result
+        
+        stage = f"{table}_sync_stage"
+        column_list = ', '.join(columns)
+        update_list = ',\n                    '.join(
+            f"{column} = EXCLUDED.{column}"
+            for column in columns if column not in ('user_id', key_column)
+        )
+        
+        start = time.perf_counter()
+        timing = {}
+        
+        try:
+            async with self.db.transaction() as conn:
+                await conn.execute(f"""
+                    CREATE TEMP TABLE {stage} ON COMMIT DROP AS
+                    SELECT {column_list}, 0 AS sync_ord FROM {table} WITH NO DATA
+                """)
+                await conn.copy_records_to_table(
+                    stage,
+                    records=[row + (ordinal,) for ordinal, row in enumerate(rows)],
+                    columns=columns + ['sync_ord']
+                )
+                timing['stage_ms'] = time.perf_counter() - start
+                
+                merged = await conn.fetch(f"""
+                    INSERT INTO {table} ({column_list})
+                    SELECT DISTINCT ON ({key_column}) {column_list}
+                    FROM {stage}
+                    ORDER BY {key_column}, sync_ord DESC
+                    ON CONFLICT (user_id, {key_column}) DO UPDATE SET
+                    {update_list}
+                    RETURNING (xmax = 0) AS inserted
+                """)
+                timing['merge_ms'] = time.perf_counter() - start - timing['stage_ms']
+                
+                if full_sync and failed:
+                    logger.warning(f"⚠️ Full sync into {table}: {failed} rows rejected, "
+                                   f"skipping delete of missing rows")
+                elif full_sync:
+                    status = await conn.execute(f"""
+                        DELETE FROM {table} t
+                        WHERE t.user_id = $1
+                          AND t.device_identifier = $2
+                          {f"AND {delete_scope}" if delete_scope else ""}
+                          AND NOT EXISTS (
+                              SELECT 1 FROM {stage} s WHERE s.{key_column} = t.{key_column}
+                          )
+                    """, UUID(user_id), device_identifier, *delete_scope_args)
+                    result['deleted'] = int(status.split()[-1])
+                    timing['delete_ms'] = time.perf_counter() - start - timing['stage_ms'] - timing['merge_ms']
+            
+        except TRANSIENT_ERRORS as e:
+            logger.error(f"❌ Bulk sync into {table} failed ({len(rows)} rows): {e}")
+            result['failed'] += len(rows)
+            return result
+        except Exception as e:
+            logger.warning(f"⚠️ Bulk sync into {table} rejected ({len(rows)} rows): {e} - retrying row by row")
+            return await self._row_by_row_sync(table, key_column, columns, rows, result, full_sync)
+        
+        timing['total_ms'] = time.perf_counter() - start
+        inserted = sum(1 for row in merged if row['inserted'])
+        
+        result.update({
+            'synced': len(rows),
+            'inserted': inserted,
+            'updated': len(merged) - inserted,
+            'timing_ms': {phase: round(seconds * 1000, 2) for phase, seconds in timing.items()}
+        })
+        return result
+    
+    async def _row_by_row_sync(
+        self,
+        table: str,
+        key_column: str,
+        columns: List[str],
+        rows: List[tuple],
+        result: Dict[str, Any],
+        full_sync: bool
+    ) -> Dict[str, Any]:
+        """
+        Fallback for a batch _bulk_sync could not merge: one upsert per row,
+        each under its own savepoint, so a row Postgres rejects is logged and
+        counted as failed while the rest of the payload still lands. Any
+        failure means the full-sync delete is skipped.
+        """
+        start = time.perf_counter()
+        column_list = ', '.join(columns)
+        placeholders = ', '.join(f"${n}" for n in range(1, len(columns) + 1))
+        update_list = ', '.join(
+            f"{column} = EXCLUDED.{column}"
+            for column in columns if column not in ('user_id', key_column)
+        )
+        key_index = columns.index(key_column)
+        inserted = rejected = 0
+        
+        try:
+            async with self.db.transaction() as conn:
+                for row in rows:
+                    try:
+                        async with conn.transaction():
+                            inserted += await conn.fetchval(f"""
+                                INSERT INTO {table} ({column_list})
+                                VALUES ({placeholders})
+                                ON CONFLICT (user_id, {key_column}) DO UPDATE SET {update_list}
+                                RETURNING (xmax = 0)
+                            """, *row)
+                    except TRANSIENT_ERRORS:
+                        raise
+                    except Exception as e:
+                        logger.error(f"❌ Failed to sync {table} row {row[key_index]}: {e}")
+                        rejected += 1
+        except Exception as e:
+            logger.error(f"❌ Row-by-row sync into {table} failed ({len(rows)} rows): {e}")
+            result['failed'] += len(rows)
+            return result
+        
+        if full_sync:
+            logger.warning(f"⚠️ Full sync into {table}: {rejected} rows rejected, "
+                           f"skipping delete of missing rows")
+        
+        result.update({
+            'synced': len(rows) - rejected,
+            'failed': result['failed'] + rejected,
+            'inserted': inserted,
+            'updated': len(rows) - rejected - inserted,
+            'timing_ms': {'row_by_row_ms': round((time.perf_counter() - start) * 1000, 2)}
+        })
+        result['timing_ms']['total_ms'] = result['timing_ms']['row_by_row_ms']
+        return result
+    
+    @staticmethod
+    def _parse_ios_datetime(value: Any) -> Optional[datetime]:
+        """iOS sends ISO strings, with Z for UTC"""
+        if isinstance(value, str):
+            return datetime.fromisoformat(value.replace('Z', '+00:00'))
+        return value
+    
     # =========================================================================
     # iOS CALENDAR SYNC
     # =========================================================================
@@ -540,69 +744,61 @@ class iOSDatabaseManager:
         self,
         device_identifier: str,
         events: List[Dict[str, Any]],
-        user_id: str = DEFAULT_USER_ID
-    ) -> Dict[str, int]:
+        user_id: str = DEFAULT_USER_ID,
+        full_sync: bool = False,
+        window_start: Optional[datetime] = None,
+        window_end: Optional[datetime] = None
+    ) -> Dict[str, Any]:
         """
-        Sync calendar events from iOS device.
-        Uses UPSERT to handle new and updated events.
+        Sync calendar events from iOS device in one bulk UPSERT.
+        
+        full_sync: the payload is every event the device has, so stored events
+        missing from it were deleted on the phone. If window_start and/or
+        window_end are given, only events starting at/after window_start and
+        before window_end are considered.
         """
-        synced = 0
-        failed = 0
         now = datetime.now(timezone.utc)
+        rows = []
+        failed = 0
         
         for event in events:
             try:
-                # Parse datetime strings
-                start_time = event.get('start_time')
-                end_time = event.get('end_time')
-                
-                if isinstance(start_time, str):
-                    start_time = datetime.fromisoformat(start_time.replace('Z', '+00:00'))
-                if isinstance(end_time, str):
-                    end_time = datetime.fromisoformat(end_time.replace('Z', '+00:00'))
-                
-                query = """
-                    INSERT INTO ios_calendar_events (
-                        user_id, device_identifier, event_id,
-                        title, start_time, end_time,
-                        location, notes, is_all_day, calendar_name,
-                        synced_at, updated_at
-                    )
-                    VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11, $11)
-                    ON CONFLICT (user_id, event_id) DO UPDATE SET
-                        title = EXCLUDED.title,
-                        start_time = EXCLUDED.start_time,
-                        end_time = EXCLUDED.end_time,
-                        location = EXCLUDED.location,
-                        notes = EXCLUDED.notes,
-                        is_all_day = EXCLUDED.is_all_day,
-                        calendar_name = EXCLUDED.calendar_name,
-                        synced_at = EXCLUDED.synced_at,
-                        updated_at = EXCLUDED.updated_at
-                """
-                
-                await self.db.execute(
-                    query,
+                rows.append((
                     UUID(user_id),
                     device_identifier,
                     event['event_id'],
                     event['title'],
-                    start_time,
-                    end_time,
+                    self._parse_ios_datetime(event.get('start_time')),
+                    self._parse_ios_datetime(event.get('end_time')),
                     event.get('location'),
                     event.get('notes'),
                     event.get('is_all_day', False),
                     event.get('calendar_name'),
+                    now,
                     now
-                )
-                synced += 1
-                
+                ))
             except Exception as e:
                 logger.error(f"❌ Failed to sync calendar event {event.get('event_id')}: {e}")
                 failed += 1
         
-        logger.info(f"📅 iOS calendar sync: {synced} synced, {failed} failed")
-        return {'synced': synced, 'failed': failed}
+        # Either bound alone still narrows the delete (an open-ended window)
+        scope, delete_scope_args = [], ()
+        for operator, bound in ((">=", window_start), ("<", window_end)):
+            if bound:
+                delete_scope_args += (self._parse_ios_datetime(bound),)
+                scope.append(f"t.start_time {operator} ${2 + len(delete_scope_args)}")
+        delete_scope = " AND ".join(scope) or None
+        
+        result = await self._bulk_sync(
+            'ios_calendar_events', 'event_id', CALENDAR_SYNC_COLUMNS, rows,
+            user_id, device_identifier, failed=failed, full_sync=full_sync,
+            delete_scope=delete_scope, delete_scope_args=delete_scope_args
+        )
+        
+        logger.info(f"📅 iOS calendar sync: {result['synced']} synced ({result['inserted']} new), "
+                    f"{result['deleted']} deleted, {result['failed']} failed "
+                    f"in {result['timing_ms'].get('total_ms', 0)}ms")
+        return result
     
     async def query_ios_calendar(
         self,
@@ -656,66 +852,46 @@ class iOSDatabaseManager:
         self,
         device_identifier: str,
         reminders: List[Dict[str, Any]],
-        user_id: str = DEFAULT_USER_ID
-    ) -> Dict[str, int]:
-        """Sync reminders from iOS device."""
-        synced = 0
-        failed = 0
+        user_id: str = DEFAULT_USER_ID,
+        full_sync: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Sync reminders from iOS device in one bulk UPSERT.
+        full_sync: stored reminders missing from the payload are deleted.
+        """
         now = datetime.now(timezone.utc)
+        rows = []
+        failed = 0
         
         for reminder in reminders:
             try:
-                # Parse datetime strings
-                due_date = reminder.get('due_date')
-                completed_at = reminder.get('completed_at')
-                
-                if isinstance(due_date, str):
-                    due_date = datetime.fromisoformat(due_date.replace('Z', '+00:00'))
-                if isinstance(completed_at, str):
-                    completed_at = datetime.fromisoformat(completed_at.replace('Z', '+00:00'))
-                
-                query = """
-                    INSERT INTO ios_reminders (
-                        user_id, device_identifier, reminder_id,
-                        title, notes, due_date,
-                        is_completed, completed_at, priority, list_name,
-                        synced_at, updated_at
-                    )
-                    VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11, $11)
-                    ON CONFLICT (user_id, reminder_id) DO UPDATE SET
-                        title = EXCLUDED.title,
-                        notes = EXCLUDED.notes,
-                        due_date = EXCLUDED.due_date,
-                        is_completed = EXCLUDED.is_completed,
-                        completed_at = EXCLUDED.completed_at,
-                        priority = EXCLUDED.priority,
-                        list_name = EXCLUDED.list_name,
-                        synced_at = EXCLUDED.synced_at,
-                        updated_at = EXCLUDED.updated_at
-                """
-                
-                await self.db.execute(
-                    query,
+                rows.append((
                     UUID(user_id),
                     device_identifier,
                     reminder['reminder_id'],
                     reminder['title'],
                     reminder.get('notes'),
-                    due_date,
+                    self._parse_ios_datetime(reminder.get('due_date')),
                     reminder.get('is_completed', False),
-                    completed_at,
+                    self._parse_ios_datetime(reminder.get('completed_at')),
                     reminder.get('priority', 0),
                     reminder.get('list_name'),
+                    now,
                     now
-                )
-                synced += 1
-                
+                ))
             except Exception as e:
                 logger.error(f"❌ Failed to sync reminder {reminder.get('reminder_id')}: {e}")
                 failed += 1
         
-        logger.info(f"✅ iOS reminders sync: {synced} synced, {failed} failed")
-        return {'synced': synced, 'failed': failed}
+        result = await self._bulk_sync(
+            'ios_reminders', 'reminder_id', REMINDER_SYNC_COLUMNS, rows,
+            user_id, device_identifier, failed=failed, full_sync=full_sync
+        )
+        
+        logger.info(f"✅ iOS reminders sync: {result['synced']} synced ({result['inserted']} new), "
+                    f"{result['deleted']} deleted, {result['failed']} failed "
+                    f"in {result['timing_ms'].get('total_ms', 0)}ms")
+        return result
     
     async def query_ios_reminders(
         self,
@@ -773,12 +949,16 @@ class iOSDatabaseManager:
         self,
         device_identifier: str,
         contacts: List[Dict[str, Any]],
-        user_id: str = DEFAULT_USER_ID
-    ) -> Dict[str, int]:
-        """Sync contacts from iOS device."""
-        synced = 0
-        failed = 0
+        user_id: str = DEFAULT_USER_ID,
+        full_sync: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Sync contacts from iOS device in one bulk UPSERT.
+        full_sync: stored contacts missing from the payload are deleted.
+        """
         now = datetime.now(timezone.utc)
+        rows = []
+        failed = 0
         
         for contact in contacts:
             try:
@@ -795,32 +975,7 @@ class iOSDatabaseManager:
                     except ValueError:
                         birthday = None
                 
-                query = """
-                    INSERT INTO ios_contacts (
-                        user_id, device_identifier, contact_id,
-                        given_name, family_name, nickname,
-                        organization, job_title,
-                        primary_email, primary_phone,
-                        birthday, notes, full_name,
-                        synced_at
-                    )
-                    VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11, $12, $13, $14)
-                    ON CONFLICT (user_id, contact_id) DO UPDATE SET
-                        given_name = EXCLUDED.given_name,
-                        family_name = EXCLUDED.family_name,
-                        nickname = EXCLUDED.nickname,
-                        organization = EXCLUDED.organization,
-                        job_title = EXCLUDED.job_title,
-                        primary_email = EXCLUDED.primary_email,
-                        primary_phone = EXCLUDED.primary_phone,
-                        birthday = EXCLUDED.birthday,
-                        notes = EXCLUDED.notes,
-                        full_name = EXCLUDED.full_name,
-                        synced_at = EXCLUDED.synced_at
-                """
-                
-                await self.db.execute(
-                    query,
+                rows.append((
                     UUID(user_id),
                     device_identifier,
                     contact['contact_id'],
@@ -835,15 +990,20 @@ class iOSDatabaseManager:
                     contact.get('notes'),
                     full_name,
                     now
-                )
-                synced += 1
-                
+                ))
             except Exception as e:
                 logger.error(f"❌ Failed to sync contact {contact.get('contact_id')}: {e}")
                 failed += 1
         
-        logger.info(f"👥 iOS contacts sync: {synced} synced, {failed} failed")
-        return {'synced': synced, 'failed': failed}
+        result = await self._bulk_sync(
+            'ios_contacts', 'contact_id', CONTACT_SYNC_COLUMNS, rows,
+            user_id, device_identifier, failed=failed, full_sync=full_sync
+        )
+        
+        logger.info(f"👥 iOS contacts sync: {result['synced']} synced ({result['inserted']} new), "
+                    f"{result['deleted']} deleted, {result['failed']} failed "
+                    f"in {result['timing_ms'].get('total_ms', 0)}ms")
+        return result
     
     async def query_ios_contacts(
         self,
@@ -186,6 +186,9 @@ class CalendarSyncRequest(BaseModel):
     """Request model for calendar sync"""
     device_identifier: str = Field(..., description="iOS device identifier")
     events: List[CalendarEventItem] = Field(..., description="Calendar events to sync")
+    full_sync: bool = Field(default=False, description="Payload is the complete calendar; delete stored events missing from it")
+    window_start: Optional[str] = Field(None, description="ISO datetime - full sync only covers events starting at/after this")
+    window_end: Optional[str] = Field(None, description="ISO datetime - full sync only covers events starting before this")
 
 
 class CalendarSyncResponse(BaseModel):
@@ -193,6 +196,8 @@ class CalendarSyncResponse(BaseModel):
     success: bool
     synced: int = 0
     failed: int = 0
+    deleted: int = 0
+    timing_ms: Dict[str, float] = Field(default_factory=dict)
     message: str
 
 
@@ -212,6 +217,7 @@ class RemindersSyncRequest(BaseModel):
     """Request model for reminders sync"""
     device_identifier: str = Field(..., description="iOS device identifier")
     reminders: List[ReminderItem] = Field(..., description="Reminders to sync")
+    full_sync: bool = Field(default=False, description="Payload is every reminder; delete stored reminders missing from it")
 
 
 class RemindersSyncResponse(BaseModel):
@@ -219,6 +225,8 @@ class RemindersSyncResponse(BaseModel):
     success: bool
     synced: int = 0
     failed: int = 0
+    deleted: int = 0
+    timing_ms: Dict[str, float] = Field(default_factory=dict)
     message: str
 
 
@@ -240,6 +248,7 @@ class ContactsSyncRequest(BaseModel):
     """Request model for contacts sync"""
     device_identifier: str = Field(..., description="iOS device identifier")
     contacts: List[ContactItem] = Field(..., description="Contacts to sync")
+    full_sync: bool = Field(default=False, description="Payload is the whole address book; delete stored contacts missing from it")
 
 
 class ContactsSyncResponse(BaseModel):
@@ -247,6 +256,8 @@ class ContactsSyncResponse(BaseModel):
     success: bool
     synced: int = 0
     failed: int = 0
+    deleted: int = 0
+    timing_ms: Dict[str, float] = Field(default_factory=dict)
     message: str
 
 
@@ -942,11 +953,15 @@ async def sync_calendar(request: CalendarSyncRequest):
         result = await db.sync_calendar_events(
             device_identifier=request.device_identifier,
             events=events_data,
+            full_sync=request.full_sync,
+            window_start=request.window_start,
+            window_end=request.window_end,
             user_id=DEFAULT_USER_ID
         )
         
         synced = result.get('synced', 0)
         failed = result.get('failed', 0)
+        deleted = result.get('deleted', 0)
         
         logger.info(f"📅 Calendar sync from {request.device_identifier}: {synced} synced, {failed} failed")
         
@@ -954,7 +969,9 @@ async def sync_calendar(request: CalendarSyncRequest):
             success=True,
             synced=synced,
             failed=failed,
-            message=f"Synced {synced} calendar events" + (f", {failed} failed" if failed > 0 else "")
+            deleted=deleted,
+            timing_ms=result.get('timing_ms', {}),
+            message=f"Synced {synced} calendar events" + (f", {deleted} deleted" if deleted > 0 else "") + (f", {failed} failed" if failed > 0 else "")
         )
         
     except Exception as e:
@@ -993,11 +1010,13 @@ async def sync_reminders(request: RemindersSyncRequest):
         result = await db.sync_reminders(
             device_identifier=request.device_identifier,
             reminders=reminders_data,
+            full_sync=request.full_sync,
             user_id=DEFAULT_USER_ID
         )
         
         synced = result.get('synced', 0)
         failed = result.get('failed', 0)
+        deleted = result.get('deleted', 0)
         
         logger.info(f"✅ Reminders sync from {request.device_identifier}: {synced} synced, {failed} failed")
         
@@ -1005,7 +1024,9 @@ async def sync_reminders(request: RemindersSyncRequest):
             success=True,
             synced=synced,
             failed=failed,
-            message=f"Synced {synced} reminders" + (f", {failed} failed" if failed > 0 else "")
+            deleted=deleted,
+            timing_ms=result.get('timing_ms', {}),
+            message=f"Synced {synced} reminders" + (f", {deleted} deleted" if deleted > 0 else "") + (f", {failed} failed" if failed > 0 else "")
         )
         
     except Exception as e:
@@ -1044,11 +1065,13 @@ async def sync_contacts(request: ContactsSyncRequest):
         result = await db.sync_contacts(
             device_identifier=request.device_identifier,
             contacts=contacts_data,
+            full_sync=request.full_sync,
             user_id=DEFAULT_USER_ID
         )
         
         synced = result.get('synced', 0)
         failed = result.get('failed', 0)
+        deleted = result.get('deleted', 0)
         
         logger.info(f"👥 Contacts sync from {request.device_identifier}: {synced} synced, {failed} failed")
         
@@ -1056,7 +1079,9 @@ async def sync_contacts(request: ContactsSyncRequest):
             success=True,
             synced=synced,
             failed=failed,
-            message=f"Synced {synced} contacts" + (f", {failed} failed" if failed > 0 else "")
+            deleted=deleted,
+            timing_ms=result.get('timing_ms', {}),
+            message=f"Synced {synced} contacts" + (f", {deleted} deleted" if deleted > 0 else "") + (f", {failed} failed" if failed > 0 else "")
         )
         
     except Exception as e:
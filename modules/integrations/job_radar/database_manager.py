@@ -28,6 +28,7 @@ from datetime import datetime, timedelta
 from uuid import UUID
 
 from ...core.database import db_manager
+from ...core.cache import invalidate, KNOWLEDGE_SEARCH
 
 logger = logging.getLogger(__name__)
 
@@ -555,6 +556,7 @@ class JobRadarDatabaseManager:
                 json.dumps(["job search", "career", job.get('company', ''), job.get('title', '')]),
                 float(job.get('overall_score', 50)) / 10.0  # Scale 0-100 to 0-10
             )
+            await invalidate(KNOWLEDGE_SEARCH)
             return str(result['id']) if result else None
         except Exception as e:
             logger.error(f"Error bridging job to knowledge: {e}")
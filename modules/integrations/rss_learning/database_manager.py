@@ -4,17 +4,114 @@ RSS Database Manager - Handles all database operations for RSS learning system
 Integrates with existing Syntax Prime V2 database architecture
 
 UPDATED: Session 15 - Added knowledge base integration for AI brain access
+Updated: 2026-10-16 - Bulk dedupe/update/insert for the feed pipeline, conditional GET validators
 """
 
-from typing import List, Dict, Any, Optional
-from datetime import datetime, timedelta
+from typing import List, Dict, Any, Optional, Set
 import logging
 import json
 
 from modules.core.database import db_manager
+from modules.core.cache import invalidate, KNOWLEDGE_SEARCH
 
 logger = logging.getLogger(__name__)
 
+# =============================================================================
+# Knowledge Base / Bulk Ingestion Queries
+# =============================================================================
+
+KNOWLEDGE_INSERT_QUERY = '''
+    INSERT INTO knowledge_entries (
+        source_id, title, content, content_type, summary,
+        key_topics, word_count, relevance_score, processed,
+        created_at, updated_at, search_vector
+    ) VALUES (
+        $1, $2::text, $3::text, $4, $5::text,
+        $6, $7, $8, $9,
+        NOW(), NOW(),
+        setweight(to_tsvector('english', COALESCE($2::text, '')), 'A') ||
+        setweight(to_tsvector('english', COALESCE($5::text, '')), 'B') ||
+        setweight(to_tsvector('english', COALESCE($3::text, '')), 'C')
+    )
+    ON CONFLICT DO NOTHING
+'''
+
+# Same row shape as KNOWLEDGE_INSERT_QUERY, one array per column
+KNOWLEDGE_BULK_INSERT_QUERY = '''
+    INSERT INTO knowledge_entries (
+        source_id, title, content, content_type, summary,
+        key_topics, word_count, relevance_score, processed,
+        created_at, updated_at, search_vector
+    )
+    SELECT
+        $1, k.title, k.content, k.content_type, k.summary,
+        k.key_topics::jsonb, k.word_count, k.relevance_score, TRUE,
+        NOW(), NOW(),
+        setweight(to_tsvector('english', COALESCE(k.title, '')), 'A') ||
+        setweight(to_tsvector('english', COALESCE(k.summary, '')), 'B') ||
+        setweight(to_tsvector('english', COALESCE(k.content, '')), 'C')
+    FROM unnest($2::text[], $3::text[], $4::text[], $5::text[], $6::text[], $7::int[], $8::float8[])
+        AS k(title, content, content_type, summary, key_topics, word_count, relevance_score)
+    ON CONFLICT DO NOTHING
+'''
+
+FEED_ENTRIES_EXISTING_QUERY = '''
+    SELECT id, guid, link
+    FROM rss_feed_entries
+    WHERE guid = ANY($1::text[]) OR link = ANY($2::text[])
+'''
+
+FEED_ENTRIES_BULK_UPDATE_QUERY = '''
+    UPDATE rss_feed_entries AS e
+    SET title = u.title,
+        description = u.description,
+        full_content = u.full_content,
+        updated_at = NOW()
+    FROM unnest($1::uuid[], $2::text[], $3::text[], $4::text[])
+        AS u(id, title, description, full_content)
+    WHERE e.id = u.id
+'''
+
+# Column order matches insert_feed_item; JSONB columns travel as text and are cast
+FEED_ENTRIES_BULK_INSERT_QUERY = '''
+    INSERT INTO rss_feed_entries (
+        source_id, title, description, link, pub_date, guid,
+        full_content, summary, category, keywords, tags,
+        campaign_type, target_audience, processed, sentiment_score,
+        marketing_insights, actionable_tips, trend_score, content_type,
+        relevance_score, ai_processed, fetch_date, created_at, updated_at
+    )
+    SELECT
+        i.source_id, i.title, i.description, i.link, i.pub_date, i.guid,
+        i.full_content, i.summary, i.category, i.keywords::jsonb, i.tags::jsonb,
+        i.campaign_type, i.target_audience, i.processed, i.sentiment_score,
+        i.marketing_insights, i.actionable_tips::jsonb, i.trend_score, i.content_type,
+        i.relevance_score, i.ai_processed, NOW(), NOW(), NOW()
+    FROM unnest(
+        $1::int[], $2::text[], $3::text[], $4::text[], $5::timestamptz[], $6::text[],
+        $7::text[], $8::text[], $9::text[], $10::text[], $11::text[],
+        $12::text[], $13::text[], $14::bool[], $15::float8[],
+        $16::text[], $17::text[], $18::float8[], $19::text[],
+        $20::float8[], $21::bool[]
+    ) AS i(
+        source_id, title, description, link, pub_date, guid,
+        full_content, summary, category, keywords, tags,
+        campaign_type, target_audience, processed, sentiment_score,
+        marketing_insights, actionable_tips, trend_score, content_type,
+        relevance_score, ai_processed
+    )
+    ON CONFLICT DO NOTHING
+    RETURNING guid
+'''
+
+# Conditional GET validators per feed - added at first use, so ingestion keeps
+# running on databases that never had the manual migration applied
+RSS_SOURCE_VALIDATORS_SQL = '''
+    ALTER TABLE rss_sources
+        ADD COLUMN IF NOT EXISTS etag TEXT,
+        ADD COLUMN IF NOT EXISTS last_modified TEXT
+'''
+
 # Singleton instance
 _rss_database_instance: Optional['RSSDatabase'] = None
 
@@ -33,6 +130,7 @@ class RSSDatabase:
     def __init__(self):
         self.db = db_manager
         self._rss_source_id: Optional[int] = None  # Cache for knowledge_sources ID
+        self._validators_ready = False
     
     # =========================================================================
     # KNOWLEDGE BASE INTEGRATION - NEW IN SESSION 15
@@ -72,6 +170,48 @@ class RSSDatabase:
         
         raise RuntimeError("Failed to create RSS knowledge source")
     
+    def _build_knowledge_row(self, source_id: int, item_data: Dict[str, Any]) -> tuple:
+        """Build the knowledge_entries column values for one RSS entry"""
+        # Build comprehensive content for knowledge base
+        # Combine title, insights, and full content for maximum searchability
+        title = item_data.get('title', 'Untitled RSS Entry')
+        insights = item_data.get('marketing_insights', '')
+        full_content = item_data.get('full_content', item_data.get('description', ''))
+        
+        # Create rich content block for knowledge base
+        content_parts = []
+        if title:
+            content_parts.append(f"Title: {title}")
+        if insights:
+            content_parts.append(f"Marketing Insights: {insights}")
+        if full_content:
+            content_parts.append(f"Content: {full_content}")
+        
+        knowledge_content = "\n\n".join(content_parts)
+        
+        # Extract key topics from keywords
+        keywords = item_data.get('keywords', [])
+        if isinstance(keywords, str):
+            try:
+                keywords = json.loads(keywords)
+            except json.JSONDecodeError:
+                keywords = []
+        
+        # Build summary from insights or truncated content
+        summary = insights if insights else (full_content[:500] + '...' if len(full_content) > 500 else full_content)
+        
+        return (
+            source_id,
+            title[:255] if title else None,  # Truncate title to varchar limit
+            knowledge_content,
+            item_data.get('content_type', 'rss_article'),
+            summary[:1000] if summary else None,  # Truncate summary
+            json.dumps(keywords[:10]) if keywords else '[]',  # Limit topics
+            len(knowledge_content.split()),  # Word count
+            item_data.get('relevance_score', 5.0),
+            True  # Mark as processed
+        )
+    
     async def _inject_to_knowledge_base(self, rss_entry_id: str, item_data: Dict[str, Any]) -> bool:
         """
         Inject RSS entry into knowledge_entries for AI brain access.
@@ -80,68 +220,14 @@ class RSSDatabase:
         try:
             source_id = await self._ensure_rss_knowledge_source()
             
-            # Build comprehensive content for knowledge base
-            # Combine title, insights, and full content for maximum searchability
-            title = item_data.get('title', 'Untitled RSS Entry')
-            insights = item_data.get('marketing_insights', '')
-            full_content = item_data.get('full_content', item_data.get('description', ''))
-            
-            # Create rich content block for knowledge base
-            content_parts = []
-            if title:
-                content_parts.append(f"Title: {title}")
-            if insights:
-                content_parts.append(f"Marketing Insights: {insights}")
-            if full_content:
-                content_parts.append(f"Content: {full_content}")
-            
-            knowledge_content = "\n\n".join(content_parts)
-            
-            # Extract key topics from keywords
-            keywords = item_data.get('keywords', [])
-            if isinstance(keywords, str):
-                try:
-                    keywords = json.loads(keywords)
-                except json.JSONDecodeError:
-                    keywords = []
-            
-            # Build summary from insights or truncated content
-            summary = insights if insights else (full_content[:500] + '...' if len(full_content) > 500 else full_content)
-            
-            # Calculate word count
-            word_count = len(knowledge_content.split())
-            
-            # Insert into knowledge_entries with search_vector
-            insert_query = '''
-                INSERT INTO knowledge_entries (
-                    source_id, title, content, content_type, summary,
-                    key_topics, word_count, relevance_score, processed,
-                    created_at, updated_at, search_vector
-                ) VALUES (
-                    $1, $2::text, $3::text, $4, $5::text,
-                    $6, $7, $8, $9,
-                    NOW(), NOW(),
-                    setweight(to_tsvector('english', COALESCE($2::text, '')), 'A') ||
-                    setweight(to_tsvector('english', COALESCE($5::text, '')), 'B') ||
-                    setweight(to_tsvector('english', COALESCE($3::text, '')), 'C')
-                )
-                ON CONFLICT DO NOTHING
-            '''
-            
             await self.db.execute(
-                insert_query,
-                source_id,
-                title[:255] if title else None,  # Truncate title to varchar limit
-                knowledge_content,
-                item_data.get('content_type', 'rss_article'),
-                summary[:1000] if summary else None,  # Truncate summary
-                json.dumps(keywords[:10]) if keywords else '[]',  # Limit topics
-                word_count,
-                item_data.get('relevance_score', 5.0),
-                True  # Mark as processed
+                KNOWLEDGE_INSERT_QUERY,
+                *self._build_knowledge_row(source_id, item_data)
             )
             
-            logger.debug(f"Injected RSS entry to knowledge base: {title[:50]}...")
+            await invalidate(KNOWLEDGE_SEARCH)
+            
+            logger.debug(f"Injected RSS entry to knowledge base: {item_data.get('title', '')[:50]}...")
             return True
             
         except Exception as e:
@@ -158,10 +244,16 @@ class RSSDatabase:
     # EXISTING RSS FEED OPERATIONS (Updated)
     # =========================================================================
     
+    async def _ensure_validator_columns(self):
+        if not self._validators_ready:
+            await self.db.execute(RSS_SOURCE_VALIDATORS_SQL)
+            self._validators_ready = True
+    
     async def get_sources_to_fetch(self) -> List[Dict[str, Any]]:
         """Get RSS sources that need fetching (weekly interval)"""
         query = '''
-            SELECT id, name, feed_url, category, fetch_interval, error_count
+            SELECT id, name, feed_url, category, fetch_interval, error_count,
+                   etag, last_modified
             FROM rss_sources 
             WHERE active = true 
             AND (last_fetched IS NULL OR 
@@ -171,6 +263,7 @@ class RSSDatabase:
         '''
         
         try:
+            await self._ensure_validator_columns()
             rows = await self.db.fetch_all(query)
             result = [dict(row) for row in rows]
             return self.make_json_serializable(result)
@@ -179,20 +272,24 @@ class RSSDatabase:
             return []
     
     async def update_source_status(self, source_id: int, success: bool,
-                                 error: str = None, items_count: int = 0):
-        """Update RSS source fetch status"""
+                                 error: str = None, items_count: int = 0,
+                                 etag: str = None, last_modified: str = None):
+        """Update RSS source fetch status (and the feed's conditional GET validators)"""
         try:
             if success:
+                await self._ensure_validator_columns()
                 query = '''
                     UPDATE rss_sources 
                     SET last_fetched = NOW(), 
                         error_count = 0, 
                         last_error = NULL,
                         items_fetched = COALESCE(items_fetched, 0) + $2,
+                        etag = $3,
+                        last_modified = $4,
                         updated_at = NOW()
                     WHERE id = $1
                 '''
-                await self.db.execute(query, source_id, items_count)
+                await self.db.execute(query, source_id, items_count, etag, last_modified)
             else:
                 query = '''
                     UPDATE rss_sources 
@@ -246,23 +343,7 @@ class RSSDatabase:
         """Insert new RSS feed item and sync to knowledge base"""
         
         # NUCLEAR SAFETY: Clamp ALL numeric values to DECIMAL(3,2) range
-        if 'sentiment_score' in item_data:
-            old_val = item_data['sentiment_score']
-            item_data['sentiment_score'] = max(-9.99, min(9.99, float(item_data['sentiment_score'] or 0)))
-            if old_val != item_data['sentiment_score']:
-                logger.warning(f"CLAMPED sentiment_score from {old_val} to {item_data['sentiment_score']}")
-                
-        if 'trend_score' in item_data:
-            old_val = item_data['trend_score']
-            item_data['trend_score'] = max(-9.99, min(9.99, float(item_data['trend_score'] or 5.0)))
-            if old_val != item_data['trend_score']:
-                logger.warning(f"CLAMPED trend_score from {old_val} to {item_data['trend_score']}")
-                
-        if 'relevance_score' in item_data:
-            old_val = item_data['relevance_score']
-            item_data['relevance_score'] = max(-9.99, min(9.99, float(item_data['relevance_score'] or 5.0)))
-            if old_val != item_data['relevance_score']:
-                logger.warning(f"CLAMPED relevance_score from {old_val} to {item_data['relevance_score']}")
+        self._clamp_scores(item_data)
                 
         query = '''
             INSERT INTO rss_feed_entries (
@@ -325,6 +406,131 @@ class RSSDatabase:
             logger.error(f"Failed to insert feed item: {e}")
             return False
     
+    def _clamp_scores(self, item_data: Dict[str, Any]):
+        """Clamp score fields in place to the DECIMAL(3,2) column range"""
+        for field, default in (('sentiment_score', 0.0), ('trend_score', 5.0), ('relevance_score', 5.0)):
+            if field in item_data:
+                old_val = item_data[field]
+                item_data[field] = max(-9.99, min(9.99, float(item_data[field] or default)))
+                if old_val != item_data[field]:
+                    logger.warning(f"CLAMPED {field} from {old_val} to {item_data[field]}")
+    
+    # =========================================================================
+    # BULK INGESTION (feed pipeline)
+    # =========================================================================
+    
+    async def find_existing_items(self, items: List[Dict[str, Any]]) -> Dict[str, str]:
+        """
+        One round trip for a whole feed: map each item's guid to the id of the
+        entry that already holds it (matched by guid or link).
+        """
+        if not items:
+            return {}
+        
+        guids = [item['guid'] for item in items if item.get('guid')]
+        links = [item['link'] for item in items if item.get('link')]
+        
+        try:
+            rows = await self.db.fetch_all(FEED_ENTRIES_EXISTING_QUERY, guids, links)
+        except Exception as e:
+            logger.error(f"Failed to find existing items: {e}")
+            return {}
+        
+        by_guid = {row['guid']: str(row['id']) for row in rows if row['guid']}
+        by_link = {row['link']: str(row['id']) for row in rows if row['link']}
+        
+        existing = {}
+        for item in items:
+            entry_id = by_guid.get(item.get('guid')) or by_link.get(item.get('link'))
+            if entry_id:
+                existing[item['guid']] = entry_id
+        return existing
+    
+    async def update_existing_items(self, updates: List[tuple]):
+        """Refresh title/description/content for (entry_id, item_data) pairs in one statement"""
+        if not updates:
+            return
+        
+        try:
+            await self.db.execute(
+                FEED_ENTRIES_BULK_UPDATE_QUERY,
+                [entry_id for entry_id, _ in updates],
+                [item['title'] for _, item in updates],
+                [item.get('description', '') for _, item in updates],
+                [item.get('full_content', '') for _, item in updates]
+            )
+        except Exception as e:
+            logger.error(f"Failed to update existing items: {e}")
+            raise
+    
+    async def insert_feed_items(self, items: List[Dict[str, Any]]) -> Set[str]:
+        """
+        Insert a batch of analyzed feed items and their knowledge entries.
+        Both inserts share one transaction; the knowledge search cache is
+        invalidated once per batch instead of once per item.
+        Returns the guids of the rows that were actually new; raises if the
+        batch could not be stored.
+        """
+        if not items:
+            return set()
+        
+        for item_data in items:
+            self._clamp_scores(item_data)
+        
+        columns = [
+            [item.get('source_id') for item in items],
+            [item.get('title', '')[:500] for item in items],
+            [item.get('description', '')[:1000] for item in items],
+            [item.get('link', '') for item in items],
+            [item.get('published_date') for item in items],
+            [item.get('guid', '') for item in items],
+            [item.get('full_content', '') for item in items],
+            [item.get('marketing_insights', '')[:500] for item in items],  # Use insights as summary
+            [item.get('category', 'marketing') for item in items],
+            [json.dumps(item.get('keywords', [])) for item in items],
+            [json.dumps(item.get('keywords', [])[:5]) for item in items],  # Use keywords as tags
+            [self._determine_campaign_type(item.get('category', '')) for item in items],
+            [item.get('target_audience', 'digital marketers') for item in items],
+            [item.get('processed', True) for item in items],
+            [item.get('sentiment_score', 0.0) for item in items],
+            [item.get('marketing_insights', '') for item in items],
+            [json.dumps(item.get('actionable_tips', [])) for item in items],
+            [item.get('trend_score', 5.0) for item in items],
+            [item.get('content_type', 'article') for item in items],
+            [item.get('relevance_score', 5.0) for item in items],
+            [item.get('ai_processed', False) for item in items],
+        ]
+        
+        try:
+            source_id = await self._ensure_rss_knowledge_source()
+            
+            async with self.db.transaction() as conn:
+                rows = await conn.fetch(FEED_ENTRIES_BULK_INSERT_QUERY, *columns)
+                inserted_guids = {row['guid'] for row in rows}
+                
+                knowledge_rows = [
+                    self._build_knowledge_row(source_id, item)
+                    for item in items if item.get('guid', '') in inserted_guids
+                ]
+                if knowledge_rows:
+                    # Transpose rows into one array per column (source_id and processed are constant)
+                    _, *knowledge_columns, _ = zip(*knowledge_rows)
+                    await conn.execute(
+                        KNOWLEDGE_BULK_INSERT_QUERY,
+                        source_id,
+                        *[list(column) for column in knowledge_columns]
+                    )
+            
+            if inserted_guids:
+                await invalidate(KNOWLEDGE_SEARCH)
+            
+            logger.info(f"Inserted {len(inserted_guids)}/{len(items)} RSS items (and knowledge entries) in one batch")
+            return inserted_guids
+            
+        except Exception as e:
+            logger.error(f"Failed to bulk insert feed items: {e}")
+            raise
+    
     def _determine_campaign_type(self, category: str) -> str:
         """Map category to campaign type"""
         campaign_map = {
@@ -354,6 +560,7 @@ class RSSDatabase:
         try:
             # Clean knowledge entries first
             await self.db.execute(cleanup_knowledge_query, days_old)
+            await invalidate(KNOWLEDGE_SEARCH)
             
             # Then clean RSS entries
             result = await self.db.fetch_all(cleanup_rss_query, days_old)
@@ -4,6 +4,8 @@ RSS Feed Processor - Fetches and processes marketing RSS feeds
 Handles weekly RSS collection with error handling and status tracking
 
 UPDATED: Session 15 - Added singleton pattern, use getter functions for dependencies
+Updated: 2026-10-16 - Staged ingestion pipeline: concurrent conditional-GET fetch,
+                      dedupe before analysis, bounded analysis, bulk insert
 """
 
 import asyncio
@@ -11,10 +13,11 @@ import aiohttp
 import feedparser
 import re
 import hashlib
+import time
 from datetime import datetime, timedelta
 from typing import List, Dict, Any, Optional
 import logging
-from urllib.parse import urljoin
+from urllib.parse import urljoin, urlparse
 import xml.etree.ElementTree as ET
 
 from .database_manager import get_rss_database
@@ -22,6 +25,17 @@ from .content_analyzer import get_content_analyzer
 
 logger = logging.getLogger(__name__)
 
+# Pipeline stages, in order: fetch+parse+dedupe -> AI analysis -> bulk insert
+PIPELINE_STAGES = ('fetch', 'analyze', 'insert')
+
+PIPELINE_CONFIG = {
+    'fetch_workers': 10,             # feeds in flight at once (matches the DB pool size)
+    'per_host_limit': 2,             # concurrent requests against any one host
+    'analysis_workers': 4,           # concurrent analyze_content calls
+    'insert_batch_size': 25,         # rows per bulk insert
+    'insert_linger_seconds': 2.0,    # how long the writer waits to fill a batch
+}
+
 # Singleton instance
 _feed_processor_instance: Optional['RSSFeedProcessor'] = None
 
@@ -53,6 +67,15 @@ class RSSFeedProcessor:
         }
         
         self.timeout = aiohttp.ClientTimeout(total=30, connect=10)
+        
+        # Pipeline state (rebuilt on every process_all_feeds run)
+        self._host_semaphores: Dict[str, asyncio.Semaphore] = {}
+        self._seen_item_keys: set = set()
+        self._stage_queues: Dict[str, asyncio.Queue] = {}
+        self._stage_in_flight: Dict[str, int] = {stage: 0 for stage in PIPELINE_STAGES}
+        self._stage_peak_depth: Dict[str, int] = {stage: 0 for stage in PIPELINE_STAGES}
+        self._run_counters: Dict[str, int] = {}
+        self.last_run_stats: Optional[Dict[str, Any]] = None
     
     @property
     def db(self):
@@ -129,7 +152,12 @@ class RSSFeedProcessor:
                     await asyncio.sleep(1)
     
     async def process_all_feeds(self) -> Dict[str, Any]:
-        """Process all active RSS sources"""
+        """
+        Process all active RSS sources through the staged pipeline:
+        fetch (concurrent, per-host limited, conditional GET) -> parse -> dedupe
+        -> analyze (bounded concurrency) -> bulk insert.
+        A full refresh takes about as long as the slowest feed, not the sum of all feeds.
+        """
         if not self.session:
             self.session = aiohttp.ClientSession(
                 headers=self.headers,
@@ -144,6 +172,52 @@ class RSSFeedProcessor:
             return {'processed': 0, 'sources': 0}
         
         logger.info(f"Processing {len(sources)} RSS sources")
+        start_time = time.perf_counter()
+        
+        runs = {
+            source['id']: {
+                'source': source['name'],
+                'success': False,
+                'not_modified': False,
+                'error': None,
+                'items_found': 0,
+                'items_processed': 0,
+                'knowledge_entries_created': 0,
+                'items_failed': 0,
+                # Validators are only replaced once every new item is stored -
+                # otherwise the next fetch would 304 past the items we lost
+                'etag': source.get('etag'),
+                'last_modified': source.get('last_modified'),
+                'fetched_validators': None
+            }
+            for source in sources
+        }
+        
+        self._host_semaphores = {}
+        self._seen_item_keys = set()
+        self._stage_queues = {stage: asyncio.Queue() for stage in PIPELINE_STAGES}
+        self._stage_in_flight = {stage: 0 for stage in PIPELINE_STAGES}
+        self._stage_peak_depth = {stage: 0 for stage in PIPELINE_STAGES}
+        self._run_counters = {'not_modified': 0, 'duplicates_skipped': 0, 'updated': 0, 'analyzed': 0, 'inserted': 0}
+        
+        for source in sources:
+            self._enqueue('fetch', source)
+        
+        workers = [asyncio.create_task(self._fetch_worker(runs))
+                   for _ in range(min(PIPELINE_CONFIG['fetch_workers'], len(sources)))]
+        workers += [asyncio.create_task(self._analysis_worker(runs))
+                    for _ in range(PIPELINE_CONFIG['analysis_workers'])]
+        workers.append(asyncio.create_task(self._insert_worker(runs)))
+        
+        try:
+            # Each stage only finishes feeding the next once its own queue has drained
+            for stage in PIPELINE_STAGES:
+                await self._stage_queues[stage].join()
+        finally:
+            for worker in workers:
+                worker.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+            self._stage_queues = {}
         
         results = {
             'processed': 0,
@@ -154,110 +228,208 @@ class RSSFeedProcessor:
             'details': []
         }
         
-        for source in sources:
+        for source_id, run in runs.items():
+            if run['success'] and run['fetched_validators'] and not run['items_failed']:
+                run['etag'], run['last_modified'] = run['fetched_validators']
+            
+            if run['success']:
+                await self.db.update_source_status(
+                    source_id, success=True,
+                    items_count=run['knowledge_entries_created'],
+                    etag=run['etag'],
+                    last_modified=run['last_modified']
+                )
+                results['success'] += 1
+                results['processed'] += run['items_processed']
+                results['knowledge_entries_created'] += run['knowledge_entries_created']
+            else:
+                await self.db.update_source_status(source_id, success=False, error=run['error'])
+                results['errors'] += 1
+            
+            results['details'].append({
+                key: value for key, value in run.items() if key not in ('etag', 'last_modified', 'fetched_validators')
+            })
+        
+        self.last_run_stats = {
+            **self._run_counters,
+            'sources': len(sources),
+            'elapsed_seconds': round(time.perf_counter() - start_time, 2),
+            'peak_queue_depth': dict(self._stage_peak_depth),
+            'finished_at': datetime.now().isoformat()
+        }
+        
+        logger.info(f"RSS processing complete: {results['success']}/{results['sources']} sources successful, "
+                    f"{self._run_counters['not_modified']} not modified, "
+                    f"{results['knowledge_entries_created']} knowledge entries created "
+                    f"in {self.last_run_stats['elapsed_seconds']}s")
+        return results
+    
+    # =========================================================================
+    # PIPELINE STAGES
+    # =========================================================================
+    
+    def _enqueue(self, stage: str, work: Any):
+        """Put work on a stage queue and track the stage's peak depth"""
+        queue = self._stage_queues[stage]
+        queue.put_nowait(work)
+        self._stage_peak_depth[stage] = max(self._stage_peak_depth[stage], queue.qsize())
+    
+    async def _fetch_worker(self, runs: Dict[int, Dict[str, Any]]):
+        """Stage 1: fetch, parse and dedupe one source at a time"""
+        queue = self._stage_queues['fetch']
+        while True:
+            source = await queue.get()
+            self._stage_in_flight['fetch'] += 1
             try:
-                result = await self._process_single_source(source)
-                results['details'].append(result)
-                
-                if result['success']:
-                    results['success'] += 1
-                    results['processed'] += result.get('items_processed', 0)
-                    results['knowledge_entries_created'] += result.get('knowledge_entries_created', 0)
-                else:
-                    results['errors'] += 1
-                    
-                # Small delay between sources
-                await asyncio.sleep(2)
-                
+                await self._fetch_source(source, runs[source['id']])
             except Exception as e:
                 logger.error(f"Failed to process source {source['name']}: {e}")
-                results['errors'] += 1
-                results['details'].append({
-                    'source': source['name'],
-                    'success': False,
-                    'error': str(e),
-                    'items_processed': 0
-                })
-        
-        logger.info(f"RSS processing complete: {results['success']}/{results['sources']} sources successful, {results['knowledge_entries_created']} knowledge entries created")
-        return results
+                runs[source['id']]['success'] = False
+                runs[source['id']]['error'] = str(e)
+            finally:
+                self._stage_in_flight['fetch'] -= 1
+                queue.task_done()
     
-    async def _process_single_source(self, source: Dict[str, Any]) -> Dict[str, Any]:
-        """Process a single RSS source"""
+    async def _fetch_source(self, source: Dict[str, Any], run: Dict[str, Any]):
+        """Fetch and parse one feed, refresh items we already have, queue the rest for analysis"""
         source_name = source['name']
-        source_url = source['feed_url']
-        source_id = source['id']
-        
         logger.info(f"Processing: {source_name}")
         
-        try:
-            # Fetch RSS feed
-            feed_data = await self._fetch_rss_feed(source_url)
-            
-            if not feed_data:
-                await self.db.update_source_status(source_id, success=False, error="Failed to fetch feed")
-                return {
-                    'source': source_name,
-                    'success': False,
-                    'error': 'Failed to fetch RSS feed',
-                    'items_processed': 0
-                }
-            
-            # Parse feed items
-            items = self._parse_feed_items(feed_data, source_name)
-            
-            if not items:
-                await self.db.update_source_status(source_id, success=False, error="No items found in feed")
-                return {
-                    'source': source_name,
-                    'success': False,
-                    'error': 'No valid items found',
-                    'items_processed': 0
-                }
-            
-            # Process and store items
-            processed_count = 0
-            for item in items:
-                try:
-                    # Get category from source
-                    category = source.get('category', 'marketing')
-                    
-                    # Process the item (this now includes knowledge base injection)
-                    success = await self._process_feed_item(item, source_id, category)
-                    if success:
-                        processed_count += 1
-                        
-                except Exception as e:
-                    logger.warning(f"Failed to process item from {source_name}: {e}")
-                    continue
-            
-            # Update source status
-            await self.db.update_source_status(source_id, success=True, items_count=processed_count)
-            
-            logger.info(f"Completed {source_name}: {processed_count}/{len(items)} items processed")
-            
-            return {
-                'source': source_name,
-                'success': True,
-                'items_processed': processed_count,
-                'items_found': len(items),
-                'knowledge_entries_created': processed_count  # Each item creates a knowledge entry
-            }
-            
-        except Exception as e:
-            logger.error(f"Error processing {source_name}: {e}")
-            await self.db.update_source_status(source_id, success=False, error=str(e))
-            return {
-                'source': source_name,
-                'success': False,
-                'error': str(e),
-                'items_processed': 0
-            }
+        # Conditional GET: at most a few concurrent requests per host
+        host = urlparse(source['feed_url']).netloc.lower()
+        if host not in self._host_semaphores:
+            self._host_semaphores[host] = asyncio.Semaphore(PIPELINE_CONFIG['per_host_limit'])
+        async with self._host_semaphores[host]:
+            fetched = await self._fetch_rss_feed(
+                source['feed_url'],
+                etag=source.get('etag'),
+                last_modified=source.get('last_modified')
+            )
+        
+        if not fetched:
+            run['error'] = 'Failed to fetch RSS feed'
+            return
+        
+        if fetched['not_modified']:
+            logger.info(f"Not modified since last fetch: {source_name}")
+            self._run_counters['not_modified'] += 1
+            run['success'] = True
+            run['not_modified'] = True
+            return
+        
+        # feedparser is synchronous - keep it off the event loop
+        items = await asyncio.to_thread(self._parse_feed_items, fetched['content'], source_name)
+        
+        if not items:
+            run['error'] = 'No valid items found'
+            return
+        
+        run['success'] = True
+        run['items_found'] = len(items)
+        run['fetched_validators'] = (fetched['etag'], fetched['last_modified'])
+        
+        # Dedupe before analysis: first within this refresh (syndicated articles)...
+        fresh_items = []
+        for item in items:
+            item_keys = self._item_keys(item)
+            if item_keys & self._seen_item_keys:
+                self._run_counters['duplicates_skipped'] += 1
+                continue
+            self._seen_item_keys |= item_keys
+            fresh_items.append(item)
+        
+        # ...then against the database, in one query for the whole feed
+        existing = await self.db.find_existing_items(fresh_items)
+        updates = [(existing[item['guid']], item) for item in fresh_items if item['guid'] in existing]
+        await self.db.update_existing_items(updates)
+        run['items_processed'] += len(updates)
+        self._run_counters['updated'] += len(updates)
+        
+        category = source.get('category', 'marketing')
+        for item in fresh_items:
+            if item['guid'] not in existing:
+                self._enqueue('analyze', (source['id'], category, item))
     
-    async def _fetch_rss_feed(self, feed_url: str) -> Optional[str]:
-        """Fetch RSS feed content with proper encoding handling"""
+    @staticmethod
+    def _item_keys(item: Dict[str, Any]) -> set:
+        """Hashes of an item's GUID and URL - either one identifies the article"""
+        return {
+            hashlib.sha1(value.strip().encode()).hexdigest()
+            for value in (item.get('guid'), item.get('link'))
+            if value
+        }
+    
+    async def _analysis_worker(self, runs: Dict[int, Dict[str, Any]]):
+        """Stage 2: analyze new items; the worker count bounds concurrent AI calls"""
+        queue = self._stage_queues['analyze']
+        while True:
+            source_id, category, item = await queue.get()
+            self._stage_in_flight['analyze'] += 1
+            try:
+                db_item = await self._analyze_feed_item(item, source_id, category)
+                self._run_counters['analyzed'] += 1
+                self._enqueue('insert', db_item)
+            except Exception as e:
+                logger.error(f"Failed to process feed item '{item.get('title', 'Unknown')}': {e}")
+                runs[source_id]['items_failed'] += 1
+            finally:
+                self._stage_in_flight['analyze'] -= 1
+                queue.task_done()
+    
+    async def _insert_worker(self, runs: Dict[int, Dict[str, Any]]):
+        """Stage 3: collect analyzed items into batches and bulk insert them"""
+        queue = self._stage_queues['insert']
+        while True:
+            batch = [await queue.get()]
+            try:
+                # Linger briefly so slow analyses still produce multi-row batches
+                while len(batch) < PIPELINE_CONFIG['insert_batch_size']:
+                    try:
+                        batch.append(await asyncio.wait_for(
+                            queue.get(), timeout=PIPELINE_CONFIG['insert_linger_seconds']
+                        ))
+                    except asyncio.TimeoutError:
+                        break
+                
+                self._stage_in_flight['insert'] += len(batch)
+                inserted_guids = await self.db.insert_feed_items(batch)
+                self._run_counters['inserted'] += len(inserted_guids)
+                
+                for db_item in batch:
+                    if db_item['guid'] in inserted_guids:
+                        run = runs[db_item['source_id']]
+                        run['items_processed'] += 1
+                        run['knowledge_entries_created'] += 1
+            except Exception as e:
+                logger.error(f"Failed to insert batch of {len(batch)} feed items: {e}")
+                for db_item in batch:
+                    run = runs[db_item['source_id']]
+                    run['items_failed'] += 1
+                    run['success'] = False
+                    run['error'] = f"Failed to insert feed items: {e}"
+            finally:
+                self._stage_in_flight['insert'] = 0
+                for _ in batch:
+                    queue.task_done()
+    
+    async def _fetch_rss_feed(self, feed_url: str, etag: Optional[str] = None,
+                              last_modified: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """
+        Fetch RSS feed content with proper encoding handling.
+        Sends the stored validators so unchanged feeds answer 304 with no body.
+        Returns {'not_modified', 'content', 'etag', 'last_modified'} or None on failure.
+        """
+        conditional_headers = {}
+        if etag:
+            conditional_headers['If-None-Match'] = etag
+        if last_modified:
+            conditional_headers['If-Modified-Since'] = last_modified
+        
         try:
-            async with self.session.get(feed_url) as response:
+            async with self.session.get(feed_url, headers=conditional_headers) as response:
+                if response.status == 304:
+                    return {'not_modified': True, 'content': None, 'etag': etag, 'last_modified': last_modified}
+                
                 if response.status == 200:
                     # Read as bytes first to handle encoding properly
                     content_bytes = await response.read()
@@ -278,7 +450,12 @@ class RSSFeedProcessor:
                     # Remove other control characters except newlines, tabs, and carriage returns
                     content = re.sub(r'[\x01-\x08\x0b\x0c\x0e-\x1f\x7f]', '', content)
                     
-                    return content
+                    return {
+                        'not_modified': False,
+                        'content': content,
+                        'etag': response.headers.get('ETag'),
+                        'last_modified': response.headers.get('Last-Modified')
+                    }
                 else:
                     logger.warning(f"HTTP {response.status} for {feed_url}")
                     return None
@@ -354,70 +531,51 @@ class RSSFeedProcessor:
             logger.error(f"Feed parsing failed for {source_name}: {e}")
             return []
     
-    async def _process_feed_item(self, item: Dict[str, Any], source_id: int, category: str) -> bool:
-        """Process and analyze a single feed item"""
-        try:
-            # Check if item already exists
-            existing = await self.db.find_existing_item(item['guid'], item['link'])
-            
-            if existing:
-                # Update existing item if needed
-                await self.db.update_existing_item(existing['id'], item)
-                return True
-            
-            # Analyze content with AI
-            analysis = await self.analyzer.analyze_content(
-                title=item['title'],
-                content=item['full_content'],
-                category=category
-            )
-            
-            # CRITICAL FIX: Extract raw scores from analysis first
-            raw_sentiment = analysis.get('sentiment_score', 0.0)
-            raw_trend = analysis.get('trend_score', 5.0)
-            raw_relevance = analysis.get('relevance_score', 5.0)
-            
-            # Clamp ALL scores to valid DECIMAL(3,2) database range (-9.99 to 9.99)
-            sentiment_score = max(-9.99, min(9.99, float(raw_sentiment)))
-            trend_score = max(1.0, min(9.99, float(raw_trend)))      # Min 1.0 for positive scores
-            relevance_score = max(1.0, min(9.99, float(raw_relevance))) # Min 1.0 for positive scores
-            
-            # Log any clamping that occurs (for debugging)
-            if sentiment_score != raw_sentiment:
-                logger.warning(f"CLAMPED sentiment_score from {raw_sentiment} to {sentiment_score}")
-            if trend_score != raw_trend:
-                logger.warning(f"CLAMPED trend_score from {raw_trend} to {trend_score}")
-            if relevance_score != raw_relevance:
-                logger.warning(f"CLAMPED relevance_score from {raw_relevance} to {relevance_score}")
-            
-            # Prepare item for database with clamped scores
-            db_item = {
-                **item,
-                'source_id': source_id,
-                'category': category,
-                'keywords': analysis.get('keywords', []),
-                'marketing_insights': analysis.get('insights', ''),
-                'actionable_tips': analysis.get('actionable_tips', []),
-                'content_type': analysis.get('content_type', 'article'),
-                'relevance_score': relevance_score,    # Use clamped value
-                'trend_score': trend_score,            # Use clamped value
-                'sentiment_score': sentiment_score,    # Use clamped value
-                'ai_processed': True,
-                'processed': True
-            }
-            
-            # Final verification before database insertion
-            logger.info(f"Inserting scores for '{item['title'][:30]}...': Sentiment={db_item['sentiment_score']:.2f}, Trend={db_item['trend_score']:.2f}, Relevance={db_item['relevance_score']:.2f}")
-            
-            # Store in database (this now also injects to knowledge base)
-            await self.db.insert_feed_item(db_item)
-            
-            logger.debug(f"Successfully processed: {item['title'][:50]}...")
-            return True
-            
-        except Exception as e:
-            logger.error(f"Failed to process feed item '{item.get('title', 'Unknown')}': {e}")
-            return False
+    async def _analyze_feed_item(self, item: Dict[str, Any], source_id: int, category: str) -> Dict[str, Any]:
+        """Analyze a single new feed item and build its database row"""
+        # Analyze content with AI
+        analysis = await self.analyzer.analyze_content(
+            title=item['title'],
+            content=item['full_content'],
+            category=category
+        )
+        
+        # CRITICAL FIX: Extract raw scores from analysis first
+        raw_sentiment = analysis.get('sentiment_score', 0.0)
+        raw_trend = analysis.get('trend_score', 5.0)
+        raw_relevance = analysis.get('relevance_score', 5.0)
+        
+        # Clamp ALL scores to valid DECIMAL(3,2) database range (-9.99 to 9.99)
+        sentiment_score = max(-9.99, min(9.99, float(raw_sentiment)))
+        trend_score = max(1.0, min(9.99, float(raw_trend)))      # Min 1.0 for positive scores
+        relevance_score = max(1.0, min(9.99, float(raw_relevance))) # Min 1.0 for positive scores
+        
+        # Log any clamping that occurs (for debugging)
+        if sentiment_score != raw_sentiment:
+            logger.warning(f"CLAMPED sentiment_score from {raw_sentiment} to {sentiment_score}")
+        if trend_score != raw_trend:
+            logger.warning(f"CLAMPED trend_score from {raw_trend} to {trend_score}")
+        if relevance_score != raw_relevance:
+            logger.warning(f"CLAMPED relevance_score from {raw_relevance} to {relevance_score}")
+        
+        # Prepare item for database with clamped scores
+        db_item = {
+            **item,
+            'source_id': source_id,
+            'category': category,
+            'keywords': analysis.get('keywords', []),
+            'marketing_insights': analysis.get('insights', ''),
+            'actionable_tips': analysis.get('actionable_tips', []),
+            'content_type': analysis.get('content_type', 'article'),
+            'relevance_score': relevance_score,    # Use clamped value
+            'trend_score': trend_score,            # Use clamped value
+            'sentiment_score': sentiment_score,    # Use clamped value
+            'ai_processed': True,
+            'processed': True
+        }
+        
+        logger.debug(f"Analyzed '{item['title'][:30]}...': Sentiment={db_item['sentiment_score']:.2f}, Trend={db_item['trend_score']:.2f}, Relevance={db_item['relevance_score']:.2f}")
+        return db_item
     
     async def cleanup_old_content(self, days_old: int = 120):
         """Clean up old content to prevent database bloat - REACTIVATED"""
@@ -441,5 +599,14 @@ class RSSFeedProcessor:
         return {
             'running': self.running,
             'has_session': self.session is not None,
-            'background_task_active': self.background_task is not None and not self.background_task.done()
+            'background_task_active': self.background_task is not None and not self.background_task.done(),
+            'pipeline': {
+                'active': bool(self._stage_queues),
+                'queue_depth': {
+                    stage: self._stage_queues[stage].qsize() if self._stage_queues else 0
+                    for stage in PIPELINE_STAGES
+                },
+                'in_flight': dict(self._stage_in_flight),
+                'last_run': self.last_run_stats
+            }
         }
@@ -10,6 +10,7 @@ from .bot_client import TelegramBotClient, get_bot_client
 from .database_manager import TelegramDatabaseManager, get_telegram_db_manager
 from .kill_switch import KillSwitch, get_kill_switch
 from .notification_manager import NotificationManager
+from .notification_pipeline import NotificationPipeline, get_notification_pipeline
 from .message_formatter import MessageFormatter
 from .callback_handler import CallbackHandler
 from .router import router
@@ -26,6 +27,7 @@ __all__ = [
     'TelegramDatabaseManager',
     'KillSwitch',
     'NotificationManager',
+    'NotificationPipeline',
     'MessageFormatter',
     'CallbackHandler',
     
@@ -33,6 +35,7 @@ __all__ = [
     'get_bot_client',
     'get_telegram_db_manager',
     'get_kill_switch',
+    'get_notification_pipeline',
     
     # Router
     'router',
@@ -3,6 +3,9 @@ Telegram Database Manager - All Database Operations
 Handles reading preferences, logging notifications, tracking responses
 FIXED: Uses correct db_manager methods (fetch_one, fetch_all, execute)
 FIXED: SQL injection protection via allowlist validation
+UPDATED 2026-10-16: Preferences served from a cached snapshot (NOTIFICATION_SETTINGS
+cache namespace, shared with the kill switch); call invalidate_notification_settings()
+after changing telegram_preferences or telegram_kill_switch.
 """
 
 import json
@@ -11,10 +14,15 @@ from typing import Dict, Optional, List, Any
 from datetime import datetime, time
 from uuid import UUID
 
+from ...core.cache import get_cache, invalidate, stable_key, NOTIFICATION_SETTINGS
 from ...core.database import db_manager
 
 logger = logging.getLogger(__name__)
 
+# Kill switch and preference snapshots. In-process invalidation is immediate;
+# other workers pick up a change within the TTL.
+NOTIFICATION_SETTINGS_TTL_SECONDS = 60
+
 
 # Valid notification types - must match columns in telegram_preferences table
 # Each type corresponds to a {type}_enabled column
@@ -33,6 +41,16 @@ VALID_NOTIFICATION_TYPES = frozenset({
 })
 
 
+def get_settings_cache():
+    """Cache for kill switch / preference snapshots (tagged by user_id)"""
+    return get_cache(NOTIFICATION_SETTINGS, max_size=100, ttl_seconds=NOTIFICATION_SETTINGS_TTL_SECONDS)
+
+
+async def invalidate_notification_settings(user_id: str) -> None:
+    """Drop cached kill switch and preference snapshots for a user"""
+    await invalidate(NOTIFICATION_SETTINGS, str(user_id))
+
+
 class TelegramDatabaseManager:
     """Manages all Telegram-related database operations"""
     
@@ -127,6 +145,26 @@ class TelegramDatabaseManager:
             logger.error(f"Failed to get preferences: {e}")
             return None
     
+    async def get_preferences_snapshot(self, user_id: str) -> Dict[str, Any]:
+        """
+        Cached preferences row ({} if the user has none)
+        
+        Raises on database errors so a failed lookup is never cached.
+        """
+        cache = get_settings_cache()
+        key = stable_key('preferences', str(user_id))
+        
+        snapshot = await cache.get(key)
+        if snapshot is None:
+            result = await self.db.fetch_one(
+                "SELECT * FROM telegram_preferences WHERE user_id = $1",
+                user_id
+            )
+            snapshot = dict(result) if result else {}
+            await cache.set(key, snapshot, tags=[str(user_id)])
+        
+        return snapshot
+    
     async def is_notification_type_enabled(
         self,
         user_id: str,
@@ -149,18 +187,12 @@ class TelegramDatabaseManager:
             logger.error(f"Invalid notification type: {e}")
             return False
         
-        # Safe to use in query since we validated against allowlist
         column_name = f"{notification_type}_enabled"
-        query = f"""
-            SELECT {column_name}, notifications_enabled
-            FROM telegram_preferences
-            WHERE user_id = $1;
-        """
         
         try:
-            result = await self.db.fetch_one(query, user_id)
-            if result:
-                return result['notifications_enabled'] and result[column_name]
+            preferences = await self.get_preferences_snapshot(user_id)
+            if preferences:
+                return bool(preferences.get('notifications_enabled') and preferences.get(column_name))
             return False
         except Exception as e:
             logger.error(f"Failed to check if {notification_type} enabled: {e}")
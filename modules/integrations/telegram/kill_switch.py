@@ -2,13 +2,19 @@
 """
 Kill Switch - Emergency control for Telegram notifications
 Provides instant system-wide notification disable capability
+
+UPDATED 2026-10-16: State is a cached snapshot in the NOTIFICATION_SETTINGS cache
+(shared with telegram preferences), dropped by enable()/disable(). The "no record"
+default is cached too, so a user without a row no longer costs a query per check.
 """
 
 import logging
 from datetime import datetime, timedelta
 from typing import Optional, Dict, Any
 
+from ...core.cache import stable_key
 from ...core.database import db_manager
+from .database_manager import get_settings_cache, invalidate_notification_settings
 
 logger = logging.getLogger(__name__)
 
@@ -26,9 +32,6 @@ class KillSwitch:
     
     def __init__(self):
         self.db = db_manager
-        self._cache: Optional[Dict[str, Any]] = None
-        self._cache_time: Optional[datetime] = None
-        self._cache_ttl = timedelta(minutes=1)  # Cache for 1 minute
     
     async def is_enabled(self, user_id: str) -> bool:
         """
@@ -41,11 +44,14 @@ class KillSwitch:
         Returns:
             True if notifications are enabled, False if disabled
         """
-        # Check cache first
-        if self._cache and self._cache_time:
-            if datetime.now() - self._cache_time < self._cache_ttl:
-                if self._cache.get('user_id') == user_id:
-                    return self._cache.get('enabled', False)
+        # Check cache first (a passed auto-enable time falls through to the database)
+        cache = get_settings_cache()
+        cache_key = stable_key('kill_switch', str(user_id))
+        cached = await cache.get(cache_key)
+        if cached is not None:
+            auto_enable_at = cached.get('auto_enable_at')
+            if cached['enabled'] or not auto_enable_at or datetime.now() < auto_enable_at:
+                return cached['enabled']
         
         # Query database
         query = """
@@ -60,6 +66,7 @@ class KillSwitch:
             if not result:
                 # No kill switch record = enabled by default
                 logger.info(f"No kill switch record for user {user_id}, defaulting to enabled")
+                await cache.set(cache_key, {'enabled': True, 'auto_enable_at': None}, tags=[str(user_id)])
                 return True
             
             enabled = result['enabled']
@@ -73,12 +80,11 @@ class KillSwitch:
                     return True
             
             # Update cache
-            self._cache = {
-                'user_id': user_id,
-                'enabled': enabled,
-                'auto_enable_at': auto_enable_at
-            }
-            self._cache_time = datetime.now()
+            await cache.set(
+                cache_key,
+                {'enabled': enabled, 'auto_enable_at': auto_enable_at},
+                tags=[str(user_id)]
+            )
             
             return enabled
             
@@ -119,9 +125,8 @@ class KillSwitch:
             
             await self.db.execute(query, user_id, reason, auto_enable_at)
             
-            # Clear cache
-            self._cache = None
-            self._cache_time = None
+            # Clear cached snapshot
+            await invalidate_notification_settings(user_id)
             
             duration_msg = f" for {duration_minutes} minutes" if duration_minutes else ""
             logger.warning(f"🛑 KILL SWITCH ACTIVATED for user {user_id}{duration_msg}: {reason}")
@@ -158,9 +163,8 @@ class KillSwitch:
             
             await self.db.execute(query, user_id, reason)
             
-            # Clear cache
-            self._cache = None
-            self._cache_time = None
+            # Clear cached snapshot
+            await invalidate_notification_settings(user_id)
             
             logger.info(f"✅ Kill switch disabled for user {user_id}: {reason}")
             
@@ -2,17 +2,22 @@
 Telegram Notification Manager - Central Routing and Rate Limiting
 All notifications flow through here for safety checks and logging
 UPDATED: Now also routes to iOS pending notifications
+UPDATED 2026-10-16: Hot path goes through the notification pipeline
+(notification_pipeline.py) - cached kill switch / preference snapshots, in-memory
+sliding-window rate limits, a per-chat rate-limited Telegram send queue, and
+batched (write-behind) notification logging and iOS queuing.
 """
 
 import logging
 import os
-import json
+import uuid
 from typing import Dict, Optional, Any
 from datetime import datetime, time as dt_time
 from zoneinfo import ZoneInfo
 
 from .bot_client import TelegramBotClient
 from .kill_switch import KillSwitch
+from .notification_pipeline import get_notification_pipeline
 
 logger = logging.getLogger(__name__)
 
@@ -32,6 +37,22 @@ RATE_LIMITS = {
     'engagement': 100  # Added - was causing "Invalid notification type" errors
 }
 
+# Map notification_type to iOS priority
+IOS_PRIORITY_MAP = {
+    'prayer': 'high',
+    'calendar': 'high',
+    'reminders': 'high',
+    'weather': 'medium',
+    'email': 'medium',
+    'intelligence': 'medium',
+    'bluesky': 'low',
+    'trends': 'low',
+    'engagement': 'low',
+    'analytics': 'low',
+    'fathom': 'medium',
+    'clickup': 'medium'
+}
+
 class NotificationManager:
     """Central manager for all Telegram notifications"""
     
@@ -39,6 +60,8 @@ class NotificationManager:
         self.bot_client = bot_client
         self.kill_switch = kill_switch
         self._db_manager = None  # Lazy initialization
+        self._http_client = None  # Shared client for thread creation
+        self.pipeline = get_notification_pipeline()
         
         # Cache chat_id from environment as fallback
         self._default_chat_id = os.getenv('TELEGRAM_CHAT_ID')
@@ -102,7 +125,7 @@ class NotificationManager:
         #         "blocked_by": "quiet_hours"
         #     }
         
-        # SAFETY CHECK 4: Rate limiting
+        # SAFETY CHECK 4: Rate limiting (reserves a slot; given back if the send fails)
         if not await self._check_rate_limit(user_id, notification_type):
             logger.warning(f"Rate limit exceeded for {notification_type}")
             return {
@@ -116,6 +139,7 @@ class NotificationManager:
         chat_id = self._default_chat_id
         if not chat_id:
             logger.error(f"No TELEGRAM_CHAT_ID configured in environment")
+            self.pipeline.rate_limiter.release(user_id, notification_type)
             return {
                 "success": False,
                 "error": "No chat_id configured",
@@ -158,16 +182,19 @@ class NotificationManager:
             if buttons:
                 reply_markup = self.bot_client.create_inline_keyboard(buttons)
             
-            # Send via Telegram
-            result = await self.bot_client.send_message(
-                chat_id=chat_id,
-                text=message_text,
-                reply_markup=reply_markup
+            # Send via Telegram (per-chat rate-limited queue)
+            result = await self.pipeline.send_queue.send(
+                self.bot_client,
+                chat_id,
+                message_text,
+                reply_markup
             )
             
             if result.get('message_id'):
-                # Log to database
-                notification_id = await self.db_manager.log_notification(
+                # Log to database (buffered - the id is assigned here)
+                notification_id = str(uuid.uuid4())
+                self.pipeline.writes.add_log(
+                    notification_id=notification_id,
                     user_id=user_id,
                     notification_type=notification_type,
                     notification_subtype=notification_subtype,
@@ -184,7 +211,7 @@ class NotificationManager:
                 # ============================================================
                 # iOS NOTIFICATION ROUTING - Queue for iOS devices
                 # ============================================================
-                await self._queue_ios_notification(
+                self._queue_ios_notification(
                     user_id=user_id,
                     notification_type=notification_type,
                     notification_subtype=notification_subtype,
@@ -202,6 +229,7 @@ class NotificationManager:
                 }
             else:
                 logger.error(f"Failed to send notification: No message_id returned")
+                self.pipeline.rate_limiter.release(user_id, notification_type)
                 return {
                     "success": False,
                     "error": "No message_id returned"
@@ -209,6 +237,7 @@ class NotificationManager:
         
         except Exception as e:
             logger.error(f"Exception sending notification: {e}", exc_info=True)
+            self.pipeline.rate_limiter.release(user_id, notification_type)
             return {
                 "success": False,
                 "error": str(e)
@@ -218,7 +247,7 @@ class NotificationManager:
     # iOS NOTIFICATION ROUTING
     # ========================================================================
     
-    async def _queue_ios_notification(
+    def _queue_ios_notification(
         self,
         user_id: str,
         notification_type: str,
@@ -230,22 +259,10 @@ class NotificationManager:
         """
         Queue notification for iOS devices
         
-        This inserts into ios_pending_notifications table which the iOS app
-        polls every 30 seconds. The app then schedules local notifications.
+        Buffers a row for ios_pending_notifications, which the iOS app polls every
+        30 seconds. The write buffer fans it out to every active device at flush.
         """
         try:
-            from modules.core.database import db_manager
-            
-            # Get all registered iOS devices for this user (need id for device_id FK)
-            devices = await db_manager.fetch_all(
-                "SELECT id, device_identifier FROM ios_devices WHERE user_id = $1 AND is_active = true",
-                user_id
-            )
-            
-            if not devices:
-                logger.debug(f"📱 No active iOS devices for user {user_id}")
-                return  # No iOS devices registered
-            
             # Extract title from message (first line, clean markdown)
             lines = message_text.strip().split('\n')
             title = lines[0].replace('*', '').replace('_', '').strip()[:100] if lines else notification_type.title()
@@ -263,41 +280,16 @@ class NotificationManager:
                 **(message_data or {})
             }
             
-            # Map notification_type to priority
-            priority_map = {
-                'prayer': 'high',
-                'calendar': 'high',
-                'reminders': 'high',
-                'weather': 'medium',
-                'email': 'medium',
-                'intelligence': 'medium',
-                'bluesky': 'low',
-                'trends': 'low',
-                'engagement': 'low',
-                'analytics': 'low',
-                'fathom': 'medium',
-                'clickup': 'medium'
-            }
-            priority = priority_map.get(notification_type, 'medium')
-            
-            # Insert for each device
-            for device in devices:
-                await db_manager.execute(
-                    """
-                    INSERT INTO ios_pending_notifications 
-                    (user_id, device_id, notification_type, title, body, payload, priority, status, scheduled_for, created_at)
-                    VALUES ($1, $2, $3, $4, $5, $6::jsonb, $7, 'pending', NOW(), NOW())
-                    """,
-                    user_id,
-                    device['id'],  # This is the UUID from ios_devices.id
-                    notification_type,
-                    title,
-                    body,
-                    json.dumps(payload),
-                    priority
-                )
+            priority = IOS_PRIORITY_MAP.get(notification_type, 'medium')
             
-            logger.info(f"📱 Queued iOS notification for {len(devices)} device(s): {notification_type}/{notification_subtype}")
+            self.pipeline.writes.add_ios(
+                user_id=user_id,
+                notification_type=notification_type,
+                title=title,
+                body=body,
+                payload=payload,
+                priority=priority
+            )
             
         except Exception as e:
             # Don't fail the main notification if iOS queueing fails
@@ -335,14 +327,9 @@ class NotificationManager:
         # Get daily limit for this type
         daily_limit = RATE_LIMITS.get(notification_type, 20)
         
-        # Get count from last 24 hours
-        count = await self.db_manager.get_notification_count(
-            user_id=user_id,
-            notification_type=notification_type,
-            hours=24
-        )
-        
-        return count < daily_limit
+        # In-memory 24h sliding window (seeded from the database once)
+        await self.pipeline.rate_limiter.ensure_seeded()
+        return self.pipeline.rate_limiter.try_acquire(user_id, notification_type, daily_limit)
     
     async def _create_chat_thread(
         self,
@@ -383,26 +370,28 @@ class NotificationManager:
             else:
                 thread_title = thread_titles.get(notification_type, f"{notification_type.title()} Notifications")
             
-            # Call the chat API endpoint
-            import httpx
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                response = await client.post(
-                    "http://localhost:8000/ai/thread/from-notification",
-                    json={
-                        "notification_type": notification_type,
-                        "thread_title": thread_title,
-                        "initial_message": message_text,
-                        "message_data": message_data
-                    }
-                )
-                
-                if response.status_code == 200:
-                    result = response.json()
-                    logger.info(f"📌 Thread {'created' if result['created'] else 'updated'}: {thread_title}")
-                    return result
-                else:
-                    logger.error(f"Failed to create thread: {response.status_code} - {response.text}")
-                    return {"success": False, "error": response.text}
+            # Call the chat API endpoint (one pooled client, not a new one per notification)
+            if self._http_client is None:
+                import httpx
+                self._http_client = httpx.AsyncClient(timeout=10.0)
+            
+            response = await self._http_client.post(
+                "http://localhost:8000/ai/thread/from-notification",
+                json={
+                    "notification_type": notification_type,
+                    "thread_title": thread_title,
+                    "initial_message": message_text,
+                    "message_data": message_data
+                }
+            )
+            
+            if response.status_code == 200:
+                result = response.json()
+                logger.info(f"📌 Thread {'created' if result['created'] else 'updated'}: {thread_title}")
+                return result
+            else:
+                logger.error(f"Failed to create thread: {response.status_code} - {response.text}")
+                return {"success": False, "error": response.text}
         
         except Exception as e:
             logger.error(f"Exception creating chat thread: {e}", exc_info=True)
@@ -440,12 +429,9 @@ class NotificationManager:
         """
         status = {}
         
+        await self.pipeline.rate_limiter.ensure_seeded()
         for notif_type, limit in RATE_LIMITS.items():
-            count = await self.db_manager.get_notification_count(
-                user_id=user_id,
-                notification_type=notif_type,
-                hours=24
-            )
+            count = self.pipeline.rate_limiter.count(user_id, notif_type)
             status[notif_type] = {
                 "count": count,
                 "limit": limit,
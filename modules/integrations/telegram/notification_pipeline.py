@@ -0,0 +1,424 @@
+"""
+Telegram Notification Pipeline - shared state behind NotificationManager
+Keeps the per-notification hot path free of database round-trips
+
+Created: 2026-10-16
+
+PIECES:
+1. SlidingWindowRateLimiter - per (user, type) send timestamps for the last 24h,
+   seeded from telegram_notifications at startup. Replaces a COUNT(*) per send.
+   Counters are per process; RATE_LIMITS are daily safety caps, so with several
+   workers each enforces its own share.
+2. TelegramSendQueue - one queue and worker per chat. Sends to a chat are spaced
+   TELEGRAM_PER_CHAT_INTERVAL apart and capped at TELEGRAM_GLOBAL_PER_SECOND across
+   all chats (Telegram's documented limits); a 429 waits out retry_after and retries.
+3. NotificationWriteBuffer - telegram_notifications log rows and iOS pending
+   notifications are buffered and written in one transaction every
+   WRITE_FLUSH_INTERVAL_SECONDS (or as soon as WRITE_FLUSH_BATCH_SIZE is reached).
+   sent_at / created_at are the flush time, at most a few seconds late. A batch
+   Postgres rejects is retried row by row; only the rows that still fail are dropped.
+
+Every NotificationManager instance shares the one pipeline (get_notification_pipeline()),
+so counters and queues are per process, not per manager.
+"""
+
+import asyncio
+import json
+import logging
+import time
+from collections import deque
+from datetime import timezone
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from ...core.database import db_manager, TRANSIENT_ERRORS
+from ...core.scheduler import get_scheduler
+
+logger = logging.getLogger(__name__)
+
+# Rate limit window (RATE_LIMITS in notification_manager.py are per day)
+RATE_WINDOW_SECONDS = 24 * 3600
+
+# Telegram Bot API limits: about 1 message/second to one chat, 30/second overall
+TELEGRAM_PER_CHAT_INTERVAL = 1.0
+TELEGRAM_GLOBAL_PER_SECOND = 30
+TELEGRAM_MAX_429_RETRIES = 2
+
+# Write-behind for notification logs and iOS queue rows
+WRITE_FLUSH_INTERVAL_SECONDS = 2
+WRITE_FLUSH_BATCH_SIZE = 50
+WRITE_BUFFER_MAX_ROWS = 5000  # rows kept for retry while the DB is unreachable
+
+SEED_RATE_WINDOW_QUERY = """
+    SELECT user_id, notification_type, sent_at
+    FROM telegram_notifications
+    WHERE sent_at > NOW() - INTERVAL '24 hours'
+"""
+
+LOG_NOTIFICATION_QUERY = """
+    INSERT INTO telegram_notifications (
+        id,
+        user_id,
+        notification_type,
+        notification_subtype,
+        message_data,
+        telegram_message_id,
+        sent_at
+    ) VALUES ($1::uuid, $2, $3, $4, $5, $6, NOW())
+"""
+
+# One row per active device, resolved at flush time
+QUEUE_IOS_NOTIFICATION_QUERY = """
+    INSERT INTO ios_pending_notifications
+    (user_id, device_id, notification_type, title, body, payload, priority, status, scheduled_for, created_at)
+    SELECT d.user_id, d.id, $2, $3, $4, $5::jsonb, $6, 'pending', NOW(), NOW()
+    FROM ios_devices d
+    WHERE d.user_id = $1::uuid AND d.is_active = true
+"""
+
+
+# ============================================================================
+# RATE LIMITING
+# ============================================================================
+
+class SlidingWindowRateLimiter:
+    """Per (user_id, notification_type) send timestamps within the window"""
+
+    def __init__(self, window_seconds: float = RATE_WINDOW_SECONDS):
+        self.window_seconds = window_seconds
+        self._events: Dict[Tuple[str, str], Deque[float]] = {}
+        self.seeded = False
+        self._seed_lock = asyncio.Lock()
+
+    def _window(self, user_id: str, notification_type: str) -> Deque[float]:
+        events = self._events.setdefault((str(user_id), notification_type), deque())
+        cutoff = time.time() - self.window_seconds
+        while events and events[0] <= cutoff:
+            events.popleft()
+        return events
+
+    async def ensure_seeded(self) -> None:
+        """Load the last 24h of sends from telegram_notifications (once)"""
+        if self.seeded:
+            return
+
+        async with self._seed_lock:
+            if self.seeded:
+                return
+            try:
+                rows = await db_manager.fetch_all(SEED_RATE_WINDOW_QUERY)
+                for row in sorted(rows, key=lambda r: r['sent_at']):
+                    sent_at = row['sent_at']
+                    if sent_at.tzinfo is None:
+                        sent_at = sent_at.replace(tzinfo=timezone.utc)
+                    self._events.setdefault(
+                        (str(row['user_id']), row['notification_type']), deque()
+                    ).append(sent_at.timestamp())
+                logger.info(f"📊 Notification rate counters seeded from {len(rows)} recent sends")
+            except Exception as e:
+                # Start from zero rather than block notifications
+                logger.error(f"Failed to seed notification rate counters: {e}")
+            self.seeded = True
+
+    def count(self, user_id: str, notification_type: str) -> int:
+        return len(self._window(user_id, notification_type))
+
+    def try_acquire(self, user_id: str, notification_type: str, limit: int) -> bool:
+        """Reserve one send if under the limit"""
+        events = self._window(user_id, notification_type)
+        if len(events) >= limit:
+            return False
+        events.append(time.time())
+        return True
+
+    def release(self, user_id: str, notification_type: str) -> None:
+        """Give back a reservation whose send failed"""
+        events = self._events.get((str(user_id), notification_type))
+        if events:
+            events.pop()
+
+
+# ============================================================================
+# TELEGRAM SEND QUEUE
+# ============================================================================
+
+def _retry_after_seconds(result: Dict[str, Any]) -> Optional[float]:
+    """retry_after from a 429 error body, if this was one"""
+    error = result.get('error')
+    if not error or '429' not in str(error):
+        return None
+    try:
+        return float(json.loads(error).get('parameters', {}).get('retry_after', 1))
+    except (ValueError, TypeError, AttributeError):
+        return 1.0
+
+
+class TelegramSendQueue:
+    """Per-chat FIFO queues drained at Telegram's rate limits"""
+
+    def __init__(self):
+        self._queues: Dict[str, asyncio.Queue] = {}
+        self._workers: Dict[str, asyncio.Task] = {}
+        self._global_lock = asyncio.Lock()
+        self._global_next = 0.0
+        self.stats = {'sent': 0, 'failed': 0, 'rate_limited': 0}
+
+    async def send(self, bot_client, chat_id, text: str, reply_markup: Optional[Dict] = None) -> Dict[str, Any]:
+        """Queue a message and wait for Telegram's response"""
+        chat_key = str(chat_id)
+        queue = self._queues.get(chat_key)
+        if queue is None:
+            queue = self._queues[chat_key] = asyncio.Queue()
+
+        worker = self._workers.get(chat_key)
+        if worker is None or worker.done():
+            self._workers[chat_key] = asyncio.create_task(self._chat_worker(queue))
+
+        future = asyncio.get_running_loop().create_future()
+        await queue.put((bot_client, chat_id, text, reply_markup, future))
+        return await future
+
+    def depth(self) -> int:
+        return sum(queue.qsize() for queue in self._queues.values())
+
+    async def stop(self) -> None:
+        for task in self._workers.values():
+            task.cancel()
+        for task in self._workers.values():
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        self._workers.clear()
+
+        # Fail anything still waiting so callers don't hang
+        for queue in self._queues.values():
+            while not queue.empty():
+                *_, future = queue.get_nowait()
+                if not future.done():
+                    future.set_result({'success': False, 'error': 'Send queue stopped'})
+
+    async def _global_slot(self) -> None:
+        """Wait for the next bot-wide send slot"""
+        async with self._global_lock:
+            now = time.monotonic()
+            wait = self._global_next - now
+            if wait > 0:
+                await asyncio.sleep(wait)
+            self._global_next = max(now, self._global_next) + 1.0 / TELEGRAM_GLOBAL_PER_SECOND
+
+    async def _chat_worker(self, queue: asyncio.Queue) -> None:
+        next_allowed = 0.0
+        while True:
+            bot_client, chat_id, text, reply_markup, future = await queue.get()
+            try:
+                wait = next_allowed - time.monotonic()
+                if wait > 0:
+                    await asyncio.sleep(wait)
+
+                result = None
+                for attempt in range(TELEGRAM_MAX_429_RETRIES + 1):
+                    await self._global_slot()
+                    result = await bot_client.send_message(
+                        chat_id=chat_id,
+                        text=text,
+                        reply_markup=reply_markup
+                    )
+                    retry_after = _retry_after_seconds(result)
+                    if retry_after is None or attempt == TELEGRAM_MAX_429_RETRIES:
+                        break
+                    self.stats['rate_limited'] += 1
+                    logger.warning(f"Telegram rate limited chat {chat_id}, retrying in {retry_after:g}s")
+                    await asyncio.sleep(retry_after)
+
+                next_allowed = time.monotonic() + TELEGRAM_PER_CHAT_INTERVAL
+                self.stats['sent' if result.get('message_id') else 'failed'] += 1
+                if not future.done():
+                    future.set_result(result)
+
+            except asyncio.CancelledError:
+                if not future.done():
+                    future.set_result({'success': False, 'error': 'Send queue stopped'})
+                raise
+            except Exception as e:
+                self.stats['failed'] += 1
+                if not future.done():
+                    future.set_result({'success': False, 'error': str(e)})
+            finally:
+                queue.task_done()
+
+
+# ============================================================================
+# WRITE-BEHIND BUFFER
+# ============================================================================
+
+class NotificationWriteBuffer:
+    """Buffers notification log rows and iOS queue rows for batched inserts"""
+
+    def __init__(self):
+        self._log_rows: List[tuple] = []
+        self._ios_rows: List[tuple] = []
+        self._flush_lock = asyncio.Lock()
+        self._flush_task: Optional[asyncio.Task] = None
+        self.stats = {'flushes': 0, 'rows_written': 0, 'flush_errors': 0, 'rows_dropped': 0}
+
+    def add_log(self, notification_id: str, user_id: str, notification_type: str,
+                notification_subtype: str, message_data: Dict[str, Any],
+                telegram_message_id: Optional[int]) -> None:
+        self._log_rows.append((
+            notification_id, user_id, notification_type, notification_subtype,
+            json.dumps(message_data or {}), telegram_message_id
+        ))
+        self._maybe_flush()
+
+    def add_ios(self, user_id: str, notification_type: str, title: str, body: str,
+                payload: Dict[str, Any], priority: str) -> None:
+        self._ios_rows.append((
+            str(user_id), notification_type, title, body,
+            json.dumps(payload, default=str), priority
+        ))
+        self._maybe_flush()
+
+    def pending(self) -> int:
+        return len(self._log_rows) + len(self._ios_rows)
+
+    def _maybe_flush(self) -> None:
+        if self.pending() >= WRITE_FLUSH_BATCH_SIZE and (self._flush_task is None or self._flush_task.done()):
+            self._flush_task = asyncio.create_task(self.flush())
+
+    async def flush(self) -> int:
+        """Write everything buffered in one transaction. Returns rows written."""
+        async with self._flush_lock:
+            if not self.pending():
+                return 0
+
+            log_rows, self._log_rows = self._log_rows, []
+            ios_rows, self._ios_rows = self._ios_rows, []
+
+            try:
+                async with db_manager.transaction() as conn:
+                    if log_rows:
+                        await conn.executemany(LOG_NOTIFICATION_QUERY, log_rows)
+                    if ios_rows:
+                        await conn.executemany(QUEUE_IOS_NOTIFICATION_QUERY, ios_rows)
+
+                written = len(log_rows) + len(ios_rows)
+                self.stats['flushes'] += 1
+                self.stats['rows_written'] += written
+                if ios_rows:
+                    logger.info(f"📱 Queued {len(ios_rows)} iOS notification(s)")
+                logger.debug(f"Flushed {len(log_rows)} notification logs, {len(ios_rows)} iOS rows")
+                return written
+
+            except TRANSIENT_ERRORS as e:
+                # Database unreachable - keep the rows for the next flush
+                self.stats['flush_errors'] += 1
+                self._requeue(log_rows, ios_rows)
+                logger.error(f"Failed to flush notification writes: {e}")
+                return 0
+
+            except Exception as e:
+                # One bad row fails the whole batch - write the rows one at a
+                # time so it can't block everything buffered behind it
+                self.stats['flush_errors'] += 1
+                logger.warning(f"Batched notification write rejected ({e}), "
+                               f"retrying {len(log_rows) + len(ios_rows)} rows one by one")
+                return await self._write_rows_individually(log_rows, ios_rows)
+
+    async def _write_rows_individually(self, log_rows: List[tuple], ios_rows: List[tuple]) -> int:
+        """Per-row fallback for flush(); rows Postgres rejects are logged and dropped"""
+        pending = [(LOG_NOTIFICATION_QUERY, row) for row in log_rows] + \
+                  [(QUEUE_IOS_NOTIFICATION_QUERY, row) for row in ios_rows]
+        written = 0
+
+        for position, (query, row) in enumerate(pending):
+            try:
+                await db_manager.execute(query, *row)
+                written += 1
+            except TRANSIENT_ERRORS as e:
+                # Database went away mid-retry - keep what is left for the next flush
+                rest = pending[position:]
+                self._requeue([r for q, r in rest if q is LOG_NOTIFICATION_QUERY],
+                              [r for q, r in rest if q is QUEUE_IOS_NOTIFICATION_QUERY])
+                logger.error(f"Failed to flush notification writes: {e}")
+                break
+            except Exception as e:
+                self.stats['rows_dropped'] += 1
+                kind = 'notification log' if query is LOG_NOTIFICATION_QUERY else 'iOS notification'
+                logger.error(f"Dropping {kind} row that cannot be written {row[:3]}: {e}")
+
+        if written:
+            self.stats['flushes'] += 1
+            self.stats['rows_written'] += written
+        return written
+
+    def _requeue(self, log_rows: List[tuple], ios_rows: List[tuple]) -> None:
+        """Put unwritten rows back ahead of newer ones (oldest dropped past the cap)"""
+        log_rows = log_rows + self._log_rows
+        ios_rows = ios_rows + self._ios_rows
+        self._log_rows = log_rows[-WRITE_BUFFER_MAX_ROWS:]
+        self._ios_rows = ios_rows[-WRITE_BUFFER_MAX_ROWS:]
+        dropped = len(log_rows) + len(ios_rows) - self.pending()
+        if dropped > 0:
+            self.stats['rows_dropped'] += dropped
+            logger.warning(f"Notification write buffer full, dropped {dropped} oldest rows")
+
+
+# ============================================================================
+# PIPELINE
+# ============================================================================
+
+class NotificationPipeline:
+    """Rate limiter, send queue and write buffer shared by all NotificationManagers"""
+
+    def __init__(self):
+        self.rate_limiter = SlidingWindowRateLimiter()
+        self.send_queue = TelegramSendQueue()
+        self.writes = NotificationWriteBuffer()
+        self._started = False
+
+    async def start(self) -> None:
+        """Seed rate counters and schedule the write flush (call once at startup)"""
+        if self._started:
+            return
+
+        await self.rate_limiter.ensure_seeded()
+
+        # Per-process buffer, so not leased
+        get_scheduler().add_job(
+            'notification_write_flush',
+            self.writes.flush,
+            interval=WRITE_FLUSH_INTERVAL_SECONDS,
+            jitter=0,
+            leased=False
+        )
+        self._started = True
+        logger.info("✅ Notification pipeline started")
+
+    async def stop(self) -> None:
+        """Drain the send queue workers and flush buffered writes"""
+        if self._started:
+            await get_scheduler().remove_job('notification_write_flush')
+            self._started = False
+        await self.send_queue.stop()
+        await self.writes.flush()
+
+    def get_status(self) -> Dict[str, Any]:
+        return {
+            'started': self._started,
+            'rate_counters_seeded': self.rate_limiter.seeded,
+            'send_queue_depth': self.send_queue.depth(),
+            'send_queue': dict(self.send_queue.stats),
+            'pending_writes': self.writes.pending(),
+            'writes': dict(self.writes.stats),
+        }
+
+
+_pipeline: Optional[NotificationPipeline] = None
+
+
+def get_notification_pipeline() -> NotificationPipeline:
+    """Get the process-wide notification pipeline"""
+    global _pipeline
+    if _pipeline is None:
+        _pipeline = NotificationPipeline()
+    return _pipeline
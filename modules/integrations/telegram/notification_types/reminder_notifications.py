@@ -208,6 +208,13 @@ class ReminderNotificationHandler:
                 logger.error(f"Error in reminder monitor: {e}")
                 await asyncio.sleep(60)
     
+    async def check_and_notify(self):
+        """
+        Send every reminder that is due - one pass
+        Called by the scheduler's reminder job in app.py
+        """
+        await self._check_and_send_due_reminders()
+    
     async def _check_and_send_due_reminders(self):
         """Check for reminders that are due and send notifications"""
         try:
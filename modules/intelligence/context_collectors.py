@@ -9,16 +9,25 @@ that feed into the situation detector.
 Created: 10/22/25
 Updated: 12/11/25 - Added singleton pattern, fixed EmailContextCollector bug,
                     standardized USER_ID handling
+Updated: 2026-10-16 - ContextCollector.run_with_budget(): per-run deadline, runtime stats and
+                      a "since last successful run" watermark; meeting and conversation
+                      collectors scan only new rows and carry earlier signals forward
+Updated: 2026-10-16 - Conversation topic extractions cached in Postgres by (thread, last message);
+                      stale threads analyzed together in one batched LLM request
 """
 
+import asyncio
 import logging
+import time
 from uuid import UUID, uuid4
 from datetime import datetime, timedelta, timezone
 from typing import Dict, List, Any, Optional
 from dataclasses import dataclass, asdict
 import json
+import re
 
 from modules.core.database import db_manager
+from modules.core.cache import stable_key
 
 logger = logging.getLogger(__name__)
 
@@ -29,6 +38,27 @@ logger = logging.getLogger(__name__)
 # Single user system - hardcode the user ID
 USER_ID = UUID("b7c60682-4815-4d9d-8ebe-66c6cd24eff9")
 
+# Incremental scans restart slightly before the watermark so rows committed late
+# (created_at stamped before the previous run finished) are not missed
+WATERMARK_OVERLAP_MINUTES = 5
+
+# Conversation topic extraction - cached per thread, keyed by its last message id.
+# Bump the version when the prompt or model changes so old extractions are redone.
+TOPIC_EXTRACTION_VERSION = 1
+TOPIC_EXTRACTION_MODEL = "anthropic/claude-3.5-sonnet"
+CONVERSATION_ANALYSIS_BATCH_SIZE = 8   # threads per LLM request
+CONVERSATION_TEXT_LIMIT = 2000         # characters of each thread sent to the model
+
+# Also in syntax_prime_schema.sql (MIGRATIONS); created by the collector on first use
+TOPIC_EXTRACTION_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS conversation_topic_extractions (
+        thread_id TEXT PRIMARY KEY,
+        content_key VARCHAR(40) NOT NULL,
+        analysis JSONB NOT NULL,
+        analyzed_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+    )
+"""
+
 
 def convert_utc_to_user_timezone(dt: datetime) -> datetime:
     """Convert UTC datetime to America/New_York timezone"""
@@ -79,12 +109,28 @@ class ContextCollector:
     Uses the centralized db_manager singleton for all database operations.
     """
     
+    # Incremental collection: signal types built from newly appended rows, mapped to the
+    # data field identifying their row. Collectors that set this accept collect_signals(since=...)
+    # and only scan rows newer than the watermark; earlier signals are carried forward.
+    incremental_signals: Dict[str, str] = {}
+    carry_forward_hours: int = 24
+    
     def __init__(self):
         """Initialize collector with centralized db_manager"""
         self.db = db_manager
         self.collector_name = self.__class__.__name__
         self.user_id = USER_ID
         
+        # Start of the last run that finished in time without a scan error
+        self.watermark: Optional[datetime] = None
+        self._carried_signals: List[ContextSignal] = []
+        self._scan_error: Optional[Exception] = None
+        self._runs = 0
+        self._timeouts = 0
+        self._errors = 0
+        self._total_duration_ms = 0.0
+        self._last_run: Dict[str, Any] = {}
+        
     async def collect_signals(self, lookback_hours: int = 24) -> List[ContextSignal]:
         """
         Collect all relevant signals from this data source.
@@ -106,6 +152,113 @@ class ContextCollector:
         """
         raise NotImplementedError("Subclasses must implement get_current_state()")
     
+    async def run_with_budget(self, timeout_seconds: float) -> List[ContextSignal]:
+        """
+        Run collect_signals() under a deadline and record runtime stats.
+        
+        The watermark only advances after a run that finished in time without a
+        scan error, so a slow or failed run is retried from the same point next
+        cycle. A timed-out run still returns the carried-forward signals.
+        
+        Args:
+            timeout_seconds: Deadline for this run
+            
+        Returns:
+            Fresh signals plus incremental signals carried from earlier runs
+        """
+        started = datetime.now(timezone.utc)
+        start_time = time.perf_counter()
+        self._scan_error = None
+        status = 'ok'
+        fresh: List[ContextSignal] = []
+        
+        try:
+            if self.incremental_signals:
+                collect = self.collect_signals(since=self._scan_since())
+            else:
+                collect = self.collect_signals()
+            fresh = await asyncio.wait_for(collect, timeout=timeout_seconds)
+        except asyncio.TimeoutError:
+            status = 'timeout'
+            self._timeouts += 1
+            logger.warning(f"⏱️ {self.collector_name} exceeded its {timeout_seconds:g}s budget")
+        except Exception as e:
+            status = 'error'
+            self._errors += 1
+            logger.error(f"{self.collector_name} failed: {e}", exc_info=True)
+        
+        if status == 'ok' and self._scan_error is not None:
+            status = 'error'
+            self._errors += 1
+        if status == 'ok':
+            self.watermark = started
+        
+        signals = self._merge_carried_signals(fresh or [], started)
+        
+        duration_ms = (time.perf_counter() - start_time) * 1000
+        self._runs += 1
+        self._total_duration_ms += duration_ms
+        self._last_run = {
+            'status': status,
+            'started_at': started.isoformat(),
+            'duration_ms': round(duration_ms, 1),
+            'fresh_signals': len(fresh or []),
+            'signals': len(signals)
+        }
+        
+        return signals
+    
+    def _scan_since(self) -> Optional[datetime]:
+        """Lower bound for incremental scans, or None for a full lookback window"""
+        if self.watermark is None:
+            return None
+        return self.watermark - timedelta(minutes=WATERMARK_OVERLAP_MINUTES)
+    
+    def _mark_scan_failed(self, error: Exception) -> None:
+        """Record an error swallowed inside collect_signals() so the watermark holds"""
+        self._scan_error = error
+    
+    def _merge_carried_signals(
+        self,
+        fresh: List[ContextSignal],
+        now: datetime
+    ) -> List[ContextSignal]:
+        """
+        Combine fresh signals with incremental signals from earlier runs.
+        
+        A carried signal is dropped once it expires, once it is older than
+        carry_forward_hours, or when a fresh signal covers the same row.
+        """
+        if not self.incremental_signals:
+            return fresh
+        
+        def row_key(signal: ContextSignal) -> Any:
+            return signal.data.get(self.incremental_signals[signal.signal_type])
+        
+        fresh_incremental = [s for s in fresh if s.signal_type in self.incremental_signals]
+        refreshed_rows = {row_key(s) for s in fresh_incremental}
+        cutoff = now - timedelta(hours=self.carry_forward_hours)
+        
+        carried = [
+            s for s in self._carried_signals
+            if s.expires_at > now and s.timestamp >= cutoff and row_key(s) not in refreshed_rows
+        ]
+        self._carried_signals = carried + fresh_incremental
+        
+        return fresh + carried
+    
+    def get_run_stats(self) -> Dict[str, Any]:
+        """Runtime stats for run_with_budget(), for monitoring"""
+        return {
+            'runs': self._runs,
+            'timeouts': self._timeouts,
+            'errors': self._errors,
+            'avg_duration_ms': round(self._total_duration_ms / self._runs, 1) if self._runs else 0,
+            'watermark': self.watermark.isoformat() if self.watermark else None,
+            'carried_signals': len(self._carried_signals),
+            'last_run': self._last_run
+        }
+    
     def _create_signal(
         self,
         signal_type: str,
@@ -164,14 +317,26 @@ class MeetingContextCollector(ContextCollector):
     - Upcoming related meetings
     """
     
-    async def collect_signals(self, lookback_hours: int = 168) -> List[ContextSignal]:
+    incremental_signals = {'meeting_processed': 'meeting_id'}
+    carry_forward_hours = 168
+    
+    async def collect_signals(
+        self,
+        lookback_hours: int = 168,
+        since: Optional[datetime] = None
+    ) -> List[ContextSignal]:
         """
         Collect meeting-related signals from last 7 days (168 hours default).
         
         Why 7 days? Meetings and action items typically have a weekly cadence.
+        
+        With since, only meetings processed after it produce meeting_processed
+        signals; pending action items and upcoming meetings are state, not new
+        rows, so they always use the full window.
         """
         signals = []
         lookback_time = datetime.now(timezone.utc) - timedelta(hours=lookback_hours)
+        meetings_since = max(lookback_time, since) if since else lookback_time
         
         try:
             # Query 1: Get recent meetings with their details
@@ -190,7 +355,7 @@ class MeetingContextCollector(ContextCollector):
                 ORDER BY meeting_date DESC
             """
             
-            meetings = await self.db.fetch_all(meetings_query, lookback_time)
+            meetings = await self.db.fetch_all(meetings_query, meetings_since)
             
             # Create signals for each processed meeting
             for meeting in meetings:
@@ -337,6 +502,7 @@ class MeetingContextCollector(ContextCollector):
             
         except Exception as e:
             logger.error(f"Error collecting meeting signals: {e}", exc_info=True)
+            self._mark_scan_failed(e)
         
         return signals
     
@@ -402,9 +568,17 @@ class ConversationContextCollector(ContextCollector):
     - Projects mentioned by the user
     """
     
+    incremental_signals = {
+        'topic_discussed': 'thread_id',
+        'question_asked': 'thread_id',
+        'project_mentioned': 'thread_id'
+    }
+    carry_forward_hours = 24
+    
     def __init__(self):
         super().__init__()
         self.openrouter_client = None
+        self._extraction_table_ready = False
         
     async def _get_openrouter_client(self):
         """Lazy load OpenRouter client"""
@@ -413,18 +587,35 @@ class ConversationContextCollector(ContextCollector):
             self.openrouter_client = await get_openrouter_client()
         return self.openrouter_client
     
-    async def collect_signals(self, lookback_hours: int = 24) -> List[ContextSignal]:
+    async def collect_signals(
+        self,
+        lookback_hours: int = 24,
+        since: Optional[datetime] = None
+    ) -> List[ContextSignal]:
         """
         Collect conversation signals from recent chat messages.
         
         Uses 24-hour lookback by default since conversations are more ephemeral.
+        With since, only threads with a user message after it are re-analyzed
+        (each still with its full lookback context), which skips the AI call
+        for every quiet thread.
         """
         signals = []
         lookback_time = datetime.now(timezone.utc) - timedelta(hours=lookback_hours)
         
         try:
             # Query: Get recent messages grouped by thread
-            messages_query = """
+            thread_filter = ""
+            query_args = [lookback_time]
+            if since:
+                thread_filter = """
+                AND cm.thread_id IN (
+                    SELECT thread_id FROM conversation_messages
+                    WHERE created_at >= $2 AND role = 'user'
+                )"""
+                query_args.append(since)
+            
+            messages_query = f"""
                 SELECT 
                     cm.id,
                     cm.thread_id,
@@ -437,12 +628,12 @@ class ConversationContextCollector(ContextCollector):
                 FROM conversation_messages cm
                 JOIN conversation_threads ct ON cm.thread_id = ct.id
                 WHERE cm.created_at >= $1
-                AND cm.role = 'user'
+                AND cm.role = 'user'{thread_filter}
                 ORDER BY cm.created_at DESC
                 LIMIT 100
             """
             
-            messages = await self.db.fetch_all(messages_query, lookback_time)
+            messages = await self.db.fetch_all(messages_query, *query_args)
             
             if not messages:
                 logger.info("ConversationContextCollector: No recent messages found")
@@ -456,123 +647,238 @@ class ConversationContextCollector(ContextCollector):
                     threads[thread_id] = []
                 threads[thread_id].append(msg)
             
-            logger.info(f"ConversationContextCollector: Analyzing {len(messages)} messages across {len(threads)} threads")
+            # Threads whose last message is unchanged reuse their cached extraction
+            # (messages are newest first, so thread_messages[0] is the last one)
+            content_keys = {
+                thread_id: stable_key(TOPIC_EXTRACTION_VERSION, thread_id, str(thread_messages[0]['id']))
+                for thread_id, thread_messages in threads.items()
+            }
+            analyses = await self._load_cached_analyses(content_keys)
+            stale = [thread_id for thread_id in threads if thread_id not in analyses]
+            
+            logger.info(
+                f"ConversationContextCollector: {len(messages)} messages across {len(threads)} threads "
+                f"({len(threads) - len(stale)} cached, {len(stale)} to analyze)"
+            )
             
-            # Get OpenRouter client for AI analysis
-            client = await self._get_openrouter_client()
+            # Analyze stale threads together - one LLM request per batch
+            for start in range(0, len(stale), CONVERSATION_ANALYSIS_BATCH_SIZE):
+                batch = {thread_id: threads[thread_id] for thread_id in stale[start:start + CONVERSATION_ANALYSIS_BATCH_SIZE]}
+                fresh = await self._analyze_threads(batch)
+                if fresh:
+                    analyses.update(fresh)
+                    await self._store_analyses({
+                        thread_id: (content_keys[thread_id], analysis)
+                        for thread_id, analysis in fresh.items()
+                    })
             
-            # Analyze each thread for topics/patterns
             for thread_id, thread_messages in threads.items():
-                # Combine messages into context for AI
-                conversation_text = "\n\n".join([
-                    f"[{msg['created_at'].strftime('%H:%M')}] User: {msg['content']}"
-                    for msg in sorted(thread_messages, key=lambda m: m['created_at'])
+                if thread_id not in analyses:
+                    continue
+                try:
+                    signals.extend(self._signals_from_analysis(thread_id, thread_messages, analyses[thread_id]))
+                except Exception as e:
+                    logger.error(f"Error building signals for thread {thread_id}: {e}")
+            
+            logger.info(f"ConversationContextCollector: Collected {len(signals)} signals")
+            
+        except Exception as e:
+            logger.error(f"Error collecting conversation signals: {e}", exc_info=True)
+            self._mark_scan_failed(e)
+        
+        return signals
+    
+    async def _ensure_extraction_table(self) -> None:
+        if self._extraction_table_ready:
+            return
+        await self.db.execute(TOPIC_EXTRACTION_SCHEMA)
+        self._extraction_table_ready = True
+    
+    async def _load_cached_analyses(self, content_keys: Dict[str, str]) -> Dict[str, Dict[str, Any]]:
+        """Cached extractions for threads whose content key still matches"""
+        try:
+            await self._ensure_extraction_table()
+            rows = await self.db.fetch_all("""
+                SELECT thread_id, content_key, analysis
+                FROM conversation_topic_extractions
+                WHERE thread_id = ANY($1::text[])
+            """, list(content_keys))
+        except Exception as e:
+            logger.warning(f"Topic extraction cache unavailable: {e}")
+            return {}
+        
+        analyses = {}
+        for row in rows:
+            if content_keys.get(row['thread_id']) == row['content_key']:
+                analysis = row['analysis']
+                analyses[row['thread_id']] = json.loads(analysis) if isinstance(analysis, str) else analysis
+        return analyses
+    
+    async def _store_analyses(self, entries: Dict[str, tuple]) -> None:
+        """Upsert extractions: thread_id -> (content_key, analysis)"""
+        try:
+            await self._ensure_extraction_table()
+            async with self.db.transaction() as conn:
+                await conn.executemany("""
+                    INSERT INTO conversation_topic_extractions (thread_id, content_key, analysis, analyzed_at)
+                    VALUES ($1, $2, $3, NOW())
+                    ON CONFLICT (thread_id) DO UPDATE SET
+                        content_key = EXCLUDED.content_key,
+                        analysis = EXCLUDED.analysis,
+                        analyzed_at = EXCLUDED.analyzed_at
+                """, [
+                    (thread_id, content_key, json.dumps(analysis))
+                    for thread_id, (content_key, analysis) in entries.items()
                 ])
-                
-                # AI analysis prompt
-                analysis_prompt = f"""Analyze this conversation and extract:
+        except Exception as e:
+            logger.warning(f"Could not cache topic extractions: {e}")
+    
+    async def _analyze_threads(self, threads: Dict[str, List]) -> Dict[str, Dict[str, Any]]:
+        """
+        Extract topics/questions/projects for several threads in one LLM request.
+        
+        Threads are labelled T1..Tn in the prompt and mapped back afterwards.
+        Threads missing from the response (or an unparseable response) are left
+        out and the scan is marked failed, so the watermark holds and they are
+        retried next run; threads that were analyzed come from the cache then.
+        """
+        labels = {f"T{n}": thread_id for n, thread_id in enumerate(threads, start=1)}
+        
+        sections = []
+        for label, thread_id in labels.items():
+            # Combine messages into context for AI
+            conversation_text = "\n\n".join([
+                f"[{msg['created_at'].strftime('%H:%M')}] User: {msg['content']}"
+                for msg in sorted(threads[thread_id], key=lambda m: m['created_at'])
+            ])
+            sections.append(f"=== {label} ===\n{conversation_text[:CONVERSATION_TEXT_LIMIT]}")
+        
+        # AI analysis prompt
+        analysis_prompt = f"""Analyze each of these conversations separately and extract:
 1. Main topics discussed (3-5 keywords each)
 2. Any questions the user asked that might need follow-up
 3. Any projects/initiatives mentioned by name
 
-Conversation:
-{conversation_text[:2000]}  
+{chr(10).join(sections)}
 
-Respond in JSON format:
+Respond in JSON format with one entry per conversation label ({", ".join(labels)}):
 {{
-    "topics": [
-        {{"keyword": "topic name", "relevance": 1-10, "category": "business/personal/technical/health"}},
-        ...
-    ],
-    "questions": [
-        {{"question": "text of question", "needs_followup": true/false}},
-        ...
-    ],
-    "projects": [
-        {{"project_name": "name", "context": "brief context"}},
-        ...
-    ]
+    "T1": {{
+        "topics": [
+            {{"keyword": "topic name", "relevance": 1-10, "category": "business/personal/technical/health"}},
+            ...
+        ],
+        "questions": [
+            {{"question": "text of question", "needs_followup": true/false}},
+            ...
+        ],
+        "projects": [
+            {{"project_name": "name", "context": "brief context"}},
+            ...
+        ]
+    }},
+    ...
 }}"""
-
-                try:
-                    response = await client.chat_completion(
-                        messages=[{"role": "user", "content": analysis_prompt}],
-                        model="anthropic/claude-3.5-sonnet",
-                        temperature=0.3,
-                        max_tokens=1000
-                    )
-                    
-                    ai_text = response['choices'][0]['message']['content']
-                    
-                    # Extract JSON from response
-                    import re
-                    json_match = re.search(r'\{.*\}', ai_text, re.DOTALL)
-                    if json_match:
-                        analysis = json.loads(json_match.group())
-                    else:
-                        logger.warning(f"Could not parse AI analysis for thread {thread_id}")
-                        continue
-                    
-                    # Create signals for topics discussed
-                    for topic in analysis.get('topics', []):
-                        if topic['relevance'] >= 6:
-                            signals.append(self._create_signal(
-                                signal_type='topic_discussed',
-                                data={
-                                    'thread_id': thread_id,
-                                    'keyword': topic['keyword'],
-                                    'relevance': topic['relevance'],
-                                    'category': topic.get('category', 'general'),
-                                    'message_count': len(thread_messages),
-                                    'latest_mention': thread_messages[0]['created_at'].isoformat()
-                                },
-                                priority=min(topic['relevance'], 7),
-                                expires_hours=48
-                            ))
-                            
-                            logger.debug(f"Topic signal: {topic['keyword']} (relevance: {topic['relevance']})")
-                    
-                    # Create signals for questions needing follow-up
-                    for question in analysis.get('questions', []):
-                        if question.get('needs_followup', False):
-                            signals.append(self._create_signal(
-                                signal_type='question_asked',
-                                data={
-                                    'thread_id': thread_id,
-                                    'question_text': question['question'],
-                                    'asked_at': thread_messages[0]['created_at'].isoformat()
-                                },
-                                priority=6,
-                                expires_hours=72
-                            ))
-                            
-                            logger.debug(f"Question signal: {question['question'][:50]}...")
-                    
-                    # Create signals for projects mentioned
-                    for project in analysis.get('projects', []):
-                        signals.append(self._create_signal(
-                            signal_type='project_mentioned',
-                            data={
-                                'thread_id': thread_id,
-                                'project_name': project['project_name'],
-                                'context': project.get('context', ''),
-                                'mentioned_at': thread_messages[0]['created_at'].isoformat()
-                            },
-                            priority=7,
-                            expires_hours=168
-                        ))
-                        
-                        logger.info(f"Project signal: {project['project_name']}")
-                
-                except json.JSONDecodeError as e:
-                    logger.error(f"Failed to parse AI analysis JSON for thread {thread_id}: {e}")
-                except Exception as e:
-                    logger.error(f"Error analyzing thread {thread_id}: {e}")
+        
+        try:
+            client = await self._get_openrouter_client()
+            response = await client.chat_completion(
+                messages=[{"role": "user", "content": analysis_prompt}],
+                model=TOPIC_EXTRACTION_MODEL,
+                temperature=0.3,
+                max_tokens=1000 * len(labels)
+            )
             
-            logger.info(f"ConversationContextCollector: Collected {len(signals)} signals")
+            ai_text = response['choices'][0]['message']['content']
             
+            # Extract JSON from response
+            json_match = re.search(r'\{.*\}', ai_text, re.DOTALL)
+            if not json_match:
+                raise ValueError("no JSON object in response")
+            parsed = json.loads(json_match.group())
+            if not isinstance(parsed, dict):
+                raise json.JSONDecodeError("expected an object keyed by thread label", json_match.group(), 0)
+            
+        except json.JSONDecodeError as e:
+            logger.error(f"Failed to parse AI analysis JSON for {len(labels)} threads: {e}")
+            self._mark_scan_failed(e)
+            return {}
         except Exception as e:
-            logger.error(f"Error collecting conversation signals: {e}", exc_info=True)
+            logger.error(f"Error analyzing {len(labels)} threads: {e}")
+            self._mark_scan_failed(e)
+            return {}
+        
+        analyses = {
+            thread_id: parsed[label]
+            for label, thread_id in labels.items()
+            if isinstance(parsed.get(label), dict)
+        }
+        if len(analyses) < len(labels):
+            logger.warning(f"AI analysis covered {len(analyses)} of {len(labels)} threads")
+            self._mark_scan_failed(ValueError(
+                f"{len(labels) - len(analyses)} threads missing from the topic extraction"
+            ))
+        return analyses
+    
+    def _signals_from_analysis(
+        self,
+        thread_id: str,
+        thread_messages: List,
+        analysis: Dict[str, Any]
+    ) -> List[ContextSignal]:
+        """Build topic/question/project signals from one thread's extraction"""
+        signals = []
+        
+        # Create signals for topics discussed
+        for topic in analysis.get('topics', []):
+            if topic.get('relevance', 0) >= 6:
+                signals.append(self._create_signal(
+                    signal_type='topic_discussed',
+                    data={
+                        'thread_id': thread_id,
+                        'keyword': topic['keyword'],
+                        'relevance': topic['relevance'],
+                        'category': topic.get('category', 'general'),
+                        'message_count': len(thread_messages),
+                        'latest_mention': thread_messages[0]['created_at'].isoformat()
+                    },
+                    priority=min(topic['relevance'], 7),
+                    expires_hours=48
+                ))
+                
+                logger.debug(f"Topic signal: {topic['keyword']} (relevance: {topic['relevance']})")
+        
+        # Create signals for questions needing follow-up
+        for question in analysis.get('questions', []):
+            if question.get('needs_followup', False):
+                signals.append(self._create_signal(
+                    signal_type='question_asked',
+                    data={
+                        'thread_id': thread_id,
+                        'question_text': question['question'],
+                        'asked_at': thread_messages[0]['created_at'].isoformat()
+                    },
+                    priority=6,
+                    expires_hours=72
+                ))
+                
+                logger.debug(f"Question signal: {question['question'][:50]}...")
+        
+        # Create signals for projects mentioned
+        for project in analysis.get('projects', []):
+            signals.append(self._create_signal(
+                signal_type='project_mentioned',
+                data={
+                    'thread_id': thread_id,
+                    'project_name': project['project_name'],
+                    'context': project.get('context', ''),
+                    'mentioned_at': thread_messages[0]['created_at'].isoformat()
+                },
+                priority=7,
+                expires_hours=168
+            ))
+            
+            logger.info(f"Project signal: {project['project_name']}")
         
         return signals
     
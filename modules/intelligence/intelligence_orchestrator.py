@@ -14,6 +14,11 @@ This is the main controller that:
 
 Created: 10/22/25
 Updated: 2025-01-XX - Added singleton pattern, auto-execution logic
+Updated: 2026-10-16 - Situation detection goes through SituationDetector.detect_all_situations
+                      (one SignalIndex per cycle, detectors run concurrently)
+Updated: 2026-10-16 - Situations are stored in one batch via SituationManager.create_situations
+Updated: 2026-10-16 - Collectors run under per-collector deadlines with bounded concurrency;
+                      per-collector runtime/signal stats in get_runtime_stats()
 """
 
 import asyncio
@@ -53,6 +58,18 @@ logger = logging.getLogger(__name__)
 
 USER_ID = UUID("b7c60682-4815-4d9d-8ebe-66c6cd24eff9")
 
+# Collector budgets - a collector that overruns its deadline is cancelled for this
+# cycle (its carried-forward signals are still used) instead of stalling the cycle
+DEFAULT_COLLECTOR_TIMEOUT_SECONDS = 30
+COLLECTOR_TIMEOUT_SECONDS = {
+    'conversation': 120,   # one OpenRouter call per active thread
+    'action_item': 60      # PerformanceContextCollector engagement aggregates
+}
+
+# Collectors running at once - each holds a pool connection (pool max is 10) while it
+# queries, so this leaves room for request handlers during a cycle
+MAX_CONCURRENT_COLLECTORS = 4
+
 #===============================================================================
 # SINGLETON INSTANCE
 #===============================================================================
@@ -150,6 +167,20 @@ class IntelligenceOrchestrator:
         self.action_item_collector = get_performance_collector()
         self.bluesky_collector = get_bluesky_collector()
         
+        # Slowest first so they start before the concurrency slots fill up
+        self.collectors = {
+            'conversation': self.conversation_collector,
+            'action_item': self.action_item_collector,
+            'calendar': self.calendar_collector,
+            'email': self.email_collector,
+            'meeting': self.meeting_collector,
+            'trend': self.trend_collector,
+            'weather': self.weather_collector,
+            'knowledge': self.knowledge_collector,
+            'bluesky': self.bluesky_collector
+        }
+        self._collector_semaphore = asyncio.Semaphore(MAX_CONCURRENT_COLLECTORS)
+        
         # Initialize intelligence modules using singleton getters
         self.situation_detector = get_situation_detector()
         self.situation_manager = get_situation_manager()
@@ -334,7 +365,8 @@ class IntelligenceOrchestrator:
         """
         Run all context collectors and gather signals.
         
-        Runs collectors in parallel for efficiency.
+        Runs collectors in parallel, at most MAX_CONCURRENT_COLLECTORS at a
+        time, each under its own deadline (see ContextCollector.run_with_budget).
         
         Args:
             user_id: User ID to collect signals for
@@ -342,48 +374,40 @@ class IntelligenceOrchestrator:
         Returns:
             Combined list of all signals from all collectors
         """
-        # Run all collectors in parallel
-        collector_tasks = [
-            self.calendar_collector.collect_signals(),
-            self.email_collector.collect_signals(),
-            self.meeting_collector.collect_signals(),
-            self.conversation_collector.collect_signals(),
-            self.trend_collector.collect_signals(),
-            self.weather_collector.collect_signals(),
-            self.knowledge_collector.collect_signals(),
-            self.action_item_collector.collect_signals(),
-            self.bluesky_collector.collect_signals()
-        ]
-        
-        results = await asyncio.gather(*collector_tasks, return_exceptions=True)
+        async def run_collector(name: str, collector) -> List:
+            timeout = COLLECTOR_TIMEOUT_SECONDS.get(name, DEFAULT_COLLECTOR_TIMEOUT_SECONDS)
+            async with self._collector_semaphore:
+                return await collector.run_with_budget(timeout)
+        
+        names = list(self.collectors)
+        results = await asyncio.gather(
+            *(run_collector(name, self.collectors[name]) for name in names),
+            return_exceptions=True
+        )
         
         # Combine all signals, filtering out errors
         # Use atomic logging to prevent interleaving when multiple collectors complete
         all_signals = []
-        collector_names = [
-            'calendar', 'email', 'meeting', 'conversation',
-            'trend', 'weather', 'knowledge', 'action_item', 'bluesky'
-        ]
         collector_stats = {}
         
-        for i, result in enumerate(results):
-            name = collector_names[i] if i < len(collector_names) else f"collector_{i}"
+        for name, result in zip(names, results):
             if isinstance(result, Exception):
                 logger.error(f"Collector {name} failed: {result}")
                 collector_stats[name] = "error"
                 continue
             
-            if isinstance(result, list):
-                all_signals.extend(result)
-                collector_stats[name] = len(result)
+            all_signals.extend(result)
+            status = self.collectors[name].get_run_stats()['last_run'].get('status')
+            collector_stats[name] = len(result) if status == 'ok' else status
         
         # Log all collector results in one atomic summary (prevents interleaving)
         log_summary(
             title="SIGNAL COLLECTION COMPLETE",
             stats={
                 "total_signals": len(all_signals),
-                "collectors_ok": sum(1 for v in collector_stats.values() if v != "error"),
+                "collectors_ok": sum(1 for v in collector_stats.values() if isinstance(v, int)),
                 "collectors_err": sum(1 for v in collector_stats.values() if v == "error"),
+                "collectors_timeout": sum(1 for v in collector_stats.values() if v == "timeout"),
             },
             logger_name=__name__
         )
@@ -409,34 +433,11 @@ class IntelligenceOrchestrator:
             logger.debug("No signals to detect situations from")
             return []
         
-        # Run all detectors
+        # Run all detectors against one shared SignalIndex (built once, detectors in parallel)
         all_situations = []
         
         try:
-            # Detector 1: Post-meeting actions
-            meeting_situations = await self.situation_detector.detect_post_meeting_situations(signals)
-            all_situations.extend(meeting_situations)
-            
-            # Detector 2: Deadline prep
-            deadline_situations = await self.situation_detector.detect_deadline_situations(signals)
-            all_situations.extend(deadline_situations)
-            
-            # Detector 3: Trend opportunities
-            trend_situations = await self.situation_detector.detect_trend_content_situations(signals)
-            all_situations.extend(trend_situations)
-            
-            # Detector 4: Email-meeting correlations
-            email_situations = await self.situation_detector.detect_email_meeting_correlation(signals)
-            all_situations.extend(email_situations)
-            
-            # Detector 5: Conversation-trend alignments
-            alignment_situations = await self.situation_detector.detect_conversation_trend_correlation(signals)
-            all_situations.extend(alignment_situations)
-            
-            # Detector 6: Weather impacts
-            weather_situations = await self.situation_detector.detect_weather_impact(signals)
-            all_situations.extend(weather_situations)
-            
+            all_situations = await self.situation_detector.detect_all_situations(signals)
             logger.info(f"Ran {6} detectors, found {len(all_situations)} total situations")
             
         except Exception as e:
@@ -457,10 +458,10 @@ class IntelligenceOrchestrator:
         """
         Generate actions for situations, store them, and auto-execute if qualified.
         
-        For each situation:
-        1. Generate suggested actions
-        2. Add actions to situation object
-        3. Store in database (with duplicate checking)
+        1. Drop situations already known to be duplicates (in-memory fingerprint LRU)
+        2. Generate suggested actions and add them to each situation object
+        3. Store all of them in one batch (duplicates return None)
+        For each stored situation:
         4. CHECK: Does this pattern qualify for auto-execution?
            - If YES: Execute primary action, record as 'auto_executed'
            - If NO: Add to notification queue for user approval
@@ -477,20 +478,23 @@ class IntelligenceOrchestrator:
         stored_situations = []  # Need user approval
         auto_executed_situations = []  # Already executed automatically
         
-        for situation in situations:
+        # Skip situations already known to duplicate a recent one before suggesting actions
+        candidates = await self.situation_manager.drop_known_duplicates(situations, user_id)
+        
+        prepared = []
+        for situation in candidates:
+            try:
+                # Generate actions for this situation and add them to the situation object
+                situation.suggested_actions = await self.action_suggester.suggest_actions(situation)
+                prepared.append(situation)
+            except Exception as e:
+                logger.error(f"Error generating actions for situation: {e}", exc_info=True)
+        
+        # Store in one batch (None for duplicates)
+        situation_ids = await self.situation_manager.create_situations(prepared, user_id)
+        
+        for situation, situation_id in zip(prepared, situation_ids):
             try:
-                # Generate actions for this situation
-                actions = await self.action_suggester.suggest_actions(situation)
-                
-                # Add actions to situation object
-                situation.suggested_actions = actions
-                
-                # Store in database (returns None if duplicate)
-                situation_id = await self.situation_manager.create_situation(
-                    situation=situation,
-                    user_id=user_id
-                )
-                
                 if not situation_id:
                     # Duplicate situation, skip
                     logger.debug(f"Skipped duplicate situation: {situation.situation_type}")
@@ -498,6 +502,7 @@ class IntelligenceOrchestrator:
                 
                 # Successfully stored - now check for auto-execution
                 situation.situation_id = situation_id
+                actions = situation.suggested_actions
                 
                 # Check if this pattern qualifies for auto-execution
                 # Method extracts pattern_key internally from context
@@ -965,7 +970,8 @@ class IntelligenceOrchestrator:
             'total_situations_detected': self.total_situations_detected,
             'total_auto_executed': self.total_auto_executed,
             'avg_signals_per_run': self.total_signals_collected / self.total_runs if self.total_runs > 0 else 0,
-            'avg_situations_per_run': self.total_situations_detected / self.total_runs if self.total_runs > 0 else 0
+            'avg_situations_per_run': self.total_situations_detected / self.total_runs if self.total_runs > 0 else 0,
+            'collectors': {name: collector.get_run_stats() for name, collector in self.collectors.items()}
         }
     
     
@@ -9,12 +9,19 @@ that warrant user notification and suggested actions.
 Created: 10/22/25
 Updated: 12/11/25 - Added singleton pattern
 Updated: 2025-12-15 - FIXED: Email classification too loose - added stop words, noreply filter
+Updated: 2026-10-16 - SignalIndex built once per cycle (by type, source, entity id, hour);
+                      correlation detectors are hash joins over token/address postings
+                      instead of pairwise scans; detectors run concurrently in worker threads
 """
 
+import asyncio
 import logging
+import re
+import threading
+from collections import Counter, defaultdict
 from uuid import UUID, uuid4
 from datetime import datetime, timedelta
-from typing import Dict, List, Any, Optional, Tuple
+from typing import Callable, Dict, Iterable, List, Any, Optional, Tuple
 from dataclasses import dataclass, asdict
 
 logger = logging.getLogger(__name__)
@@ -55,6 +62,18 @@ AUTOMATED_EMAIL_PATTERNS = [
     '@jobvite.com', '@taleo.net', '@icims.com', '@smartrecruiters.com',
 ]
 
+# Words ignored when matching calendar events to action items
+DEADLINE_COMMON_WORDS = {'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for'}
+
+# Event title/location words that suggest the event happens outdoors
+OUTDOOR_KEYWORDS = ['outdoor', 'outside', 'park', 'garden', 'lunch', 'walk', 'site visit', 'field']
+
+# signal.data keys indexed by SignalIndex.with_entity()
+ENTITY_KEYS = ('meeting_id', 'event_id', 'email_id', 'thread_id', 'entry_id', 'opportunity_id')
+
+EMAIL_ADDRESS_PATTERN = re.compile(r'[\w.+-]+@[\w-]+(?:\.[\w-]+)+')
+WORD_PATTERN = re.compile(r'\w+')
+
 #===============================================================================
 # BASE CLASSES - Situation data structure
 #===============================================================================
@@ -93,6 +112,105 @@ class Situation:
         return result
 
 
+#===============================================================================
+# SIGNAL INDEX - Built once per cycle, queried by every detector
+#===============================================================================
+
+def _meaningful_keywords(text: str) -> set:
+    """Lower-cased words of text minus stop words and very short words"""
+    return {kw for kw in text.split() if kw and kw not in STOP_WORDS and len(kw) > 2}
+
+
+def _postings(token_sets: Iterable[Iterable[str]]) -> Dict[str, List[int]]:
+    """Inverted index: token -> positions (in order) of the token sets containing it"""
+    postings: Dict[str, List[int]] = defaultdict(list)
+    for position, tokens in enumerate(token_sets):
+        for token in set(tokens):
+            postings[token].append(position)
+    return postings
+
+
+def _overlap_counts(postings: Dict[str, List[int]], tokens: Iterable[str]) -> Counter:
+    """How many of `tokens` each indexed position shares (hash join instead of pairwise set &)"""
+    counts: Counter = Counter()
+    for token in set(tokens):
+        counts.update(postings.get(token, ()))
+    return counts
+
+
+class SignalIndex:
+    """
+    One pass over a cycle's signals: positions by signal type, source, entity id
+    (meeting_id, event_id, ...) and hour bucket. Lookups return signals in their
+    original order, so detectors see exactly what filtering the raw list gave them.
+    
+    Detectors share derived structures (keyword postings etc.) through memo(),
+    which builds each one once per cycle even when detectors run in parallel.
+    """
+    
+    def __init__(self, signals: Iterable):
+        self.signals = list(signals)
+        self._by_type: Dict[str, List[int]] = defaultdict(list)
+        self._by_source: Dict[str, List[int]] = defaultdict(list)
+        self._by_entity: Dict[Tuple[str, str], List[int]] = defaultdict(list)
+        self._by_hour: Dict[datetime, List[int]] = defaultdict(list)
+        self._memo: Dict[str, Any] = {}
+        self._memo_lock = threading.Lock()
+        
+        for position, signal in enumerate(self.signals):
+            self._by_type[signal.signal_type].append(position)
+            self._by_source[signal.source].append(position)
+            if signal.timestamp is not None:
+                self._by_hour[signal.timestamp.replace(minute=0, second=0, microsecond=0)].append(position)
+            data = signal.data or {}
+            for key in ENTITY_KEYS:
+                value = data.get(key)
+                if value:
+                    self._by_entity[(key, str(value))].append(position)
+    
+    def __len__(self) -> int:
+        return len(self.signals)
+    
+    def _lookup(self, index: Dict, keys: Iterable) -> List:
+        keys = list(dict.fromkeys(keys))
+        positions = [position for key in keys for position in index.get(key, ())]
+        if len(keys) > 1:
+            positions.sort()
+        return [self.signals[position] for position in positions]
+    
+    def of_type(self, signal_types: List[str]) -> List:
+        """Signals of any of these types (memoized - detectors ask for the same groups)"""
+        return self.memo(('type',) + tuple(signal_types), lambda: self._lookup(self._by_type, signal_types))
+    
+    def from_source(self, sources: List[str]) -> List:
+        """Signals from any of these collectors"""
+        return self._lookup(self._by_source, sources)
+    
+    def with_entity(self, key: str, value: Any) -> List:
+        """Signals whose data[key] == value, for key in ENTITY_KEYS"""
+        return self._lookup(self._by_entity, [(key, str(value))])
+    
+    def in_window(self, start: datetime, end: datetime) -> List:
+        """Signals with start <= timestamp < end, read from hour buckets"""
+        hours = []
+        hour = start.replace(minute=0, second=0, microsecond=0)
+        while hour < end:
+            hours.append(hour)
+            hour += timedelta(hours=1)
+        return [s for s in self._lookup(self._by_hour, hours) if start <= s.timestamp < end]
+    
+    def memo(self, key: Any, build: Callable[[], Any]) -> Any:
+        """Build a derived structure once per cycle and share it between detectors"""
+        value = self._memo.get(key)
+        if value is None:
+            with self._memo_lock:
+                value = self._memo.get(key)
+                if value is None:
+                    value = build()
+                    self._memo[key] = value
+        return value
+
+
 #===============================================================================
 # SINGLETON INSTANCE
 #===============================================================================
@@ -131,8 +249,11 @@ class SituationDetector:
         """
         Main entry point: analyze all signals and detect all situation types.
         
+        Builds one SignalIndex for the cycle and runs every detector against it
+        concurrently in worker threads, so a large cycle never blocks the event loop.
+        
         Args:
-            signals: List of ContextSignal objects from all collectors
+            signals: List of ContextSignal objects from all collectors (or a SignalIndex)
             
         Returns:
             List of detected Situation objects
@@ -143,26 +264,54 @@ class SituationDetector:
             logger.info("SituationDetector: No signals to analyze")
             return situations
         
-        logger.info(f"SituationDetector: Analyzing {len(signals)} signals for patterns")
+        index = await asyncio.to_thread(self._as_index, signals)
+        logger.info(f"SituationDetector: Analyzing {len(index)} signals for patterns")
         
-        try:
-            # Run all situation detectors
-            # Each detector looks for a specific pattern across the signals
-            
-            situations.extend(await self.detect_post_meeting_situations(signals))
-            situations.extend(await self.detect_deadline_situations(signals))
-            situations.extend(await self.detect_trend_content_situations(signals))
-            situations.extend(await self.detect_email_meeting_correlation(signals))
-            situations.extend(await self.detect_conversation_trend_correlation(signals))
-            situations.extend(await self.detect_weather_impact(signals))
-            
-            logger.info(f"SituationDetector: Detected {len(situations)} situations")
-            
-        except Exception as e:
-            logger.error(f"Error detecting situations: {e}", exc_info=True)
+        detectors = [
+            self._detect_post_meeting_situations,
+            self._detect_deadline_situations,
+            self._detect_trend_content_situations,
+            self._detect_email_meeting_correlation,
+            self._detect_conversation_trend_correlation,
+            self._detect_weather_impact,
+        ]
+        
+        # Each detector looks for a specific pattern across the signals
+        results = await asyncio.gather(
+            *[asyncio.to_thread(detector, index) for detector in detectors],
+            return_exceptions=True
+        )
+        
+        for detector, result in zip(detectors, results):
+            if isinstance(result, BaseException):
+                logger.error(f"Error in {detector.__name__}: {result}", exc_info=result)
+            else:
+                situations.extend(result)
+        
+        logger.info(f"SituationDetector: Detected {len(situations)} situations")
         
         return situations
     
+    # Single-detector entry points (each accepts a signal list or a prebuilt SignalIndex)
+    
+    async def detect_post_meeting_situations(self, signals) -> List[Situation]:
+        return self._detect_post_meeting_situations(self._as_index(signals))
+    
+    async def detect_deadline_situations(self, signals) -> List[Situation]:
+        return self._detect_deadline_situations(self._as_index(signals))
+    
+    async def detect_trend_content_situations(self, signals) -> List[Situation]:
+        return self._detect_trend_content_situations(self._as_index(signals))
+    
+    async def detect_email_meeting_correlation(self, signals) -> List[Situation]:
+        return self._detect_email_meeting_correlation(self._as_index(signals))
+    
+    async def detect_conversation_trend_correlation(self, signals) -> List[Situation]:
+        return self._detect_conversation_trend_correlation(self._as_index(signals))
+    
+    async def detect_weather_impact(self, signals) -> List[Situation]:
+        return self._detect_weather_impact(self._as_index(signals))
+    
     def _create_situation(
         self,
         situation_type: str,
@@ -260,38 +409,17 @@ class SituationDetector:
         
         return priority
     
-    def _get_signals_by_type(self, signals: List, signal_types: List[str]) -> List:
-        """
-        Filter signals by type(s).
-        
-        Args:
-            signals: List of all ContextSignal objects
-            signal_types: List of signal types to filter for
-            
-        Returns:
-            List of signals matching the specified types
-        """
-        return [s for s in signals if s.signal_type in signal_types]
-    
-    def _get_signals_by_source(self, signals: List, sources: List[str]) -> List:
-        """
-        Filter signals by source(s).
-        
-        Args:
-            signals: List of all ContextSignal objects
-            sources: List of sources to filter for (e.g., ['meeting', 'calendar'])
-            
-        Returns:
-            List of signals matching the specified sources
-        """
-        return [s for s in signals if s.source in sources]
+    @staticmethod
+    def _as_index(signals) -> SignalIndex:
+        """Reuse a prebuilt index, or index a raw signal list"""
+        return signals if isinstance(signals, SignalIndex) else SignalIndex(signals or [])
     
     
     #===========================================================================
     # SITUATION DETECTOR 1: Post-Meeting Action Required
     #===========================================================================
     
-    async def detect_post_meeting_situations(self, signals: List) -> List[Situation]:
+    def _detect_post_meeting_situations(self, index: 'SignalIndex') -> List[Situation]:
         """
         Detect situations where a meeting happened and has action items.
         
@@ -304,7 +432,7 @@ class SituationDetector:
         
         try:
             # Get all meeting-related signals
-            meeting_signals = self._get_signals_by_type(signals, [
+            meeting_signals = index.of_type([
                 'meeting_processed',
                 'action_item_pending',
                 'action_item_overdue',
@@ -423,7 +551,7 @@ class SituationDetector:
     # SITUATION DETECTOR 2: Deadline Approaching - Prep Needed
     #===========================================================================
     
-    async def detect_deadline_situations(self, signals: List) -> List[Situation]:
+    def _detect_deadline_situations(self, index: 'SignalIndex') -> List[Situation]:
         """
         Detect situations where an upcoming event needs preparation.
         
@@ -436,13 +564,13 @@ class SituationDetector:
         
         try:
             # Get calendar and meeting signals
-            calendar_signals = self._get_signals_by_type(signals, [
+            calendar_signals = index.of_type([
                 'event_upcoming_24h',
                 'event_upcoming_48h',
                 'prep_time_needed'
             ])
             
-            action_signals = self._get_signals_by_type(signals, [
+            action_signals = index.of_type([
                 'action_item_pending',
                 'action_item_overdue'
             ])
@@ -473,30 +601,28 @@ class SituationDetector:
                 elif signal.signal_type == 'prep_time_needed':
                     events_needing_prep[event_id]['prep_signal'] = signal
             
+            # Inverted index of action item words (built once per cycle)
+            action_postings = index.memo('action_item_postings', lambda: _postings(
+                set(
+                    (s.data.get('action_text') or '').lower().split() +
+                    (s.data.get('meeting_title') or '').lower().split()
+                ) - DEADLINE_COMMON_WORDS
+                for s in action_signals
+            ))
+            
             # Try to find related action items by matching event titles/topics
             for event_id, data in events_needing_prep.items():
                 if not data['event']:
                     continue
                 
                 event_title = (data['event'].data.get('event_title') or '').lower()
+                event_keywords = set(event_title.split()) - DEADLINE_COMMON_WORDS
                 
-                # Simple keyword matching to find related action items
-                for action_signal in action_signals:
-                    action_text = (action_signal.data.get('action_text') or '').lower()
-                    meeting_title = (action_signal.data.get('meeting_title') or '').lower()
-                    
-                    # Check if action is related to this event
-                    event_keywords = set(event_title.split())
-                    action_keywords = set(action_text.split() + meeting_title.split())
-                    
-                    # If they share 2+ meaningful words (excluding common words)
-                    common_words = ['the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for']
-                    meaningful_overlap = len(
-                        (event_keywords - set(common_words)) & (action_keywords - set(common_words))
-                    )
-                    
-                    if meaningful_overlap >= 2:
-                        data['related_actions'].append(action_signal)
+                # Related if they share 2+ meaningful words (hash join on the action postings)
+                overlap = _overlap_counts(action_postings, event_keywords)
+                data['related_actions'] = [
+                    action_signals[position] for position in sorted(overlap) if overlap[position] >= 2
+                ]
             
             # Create situations for events that need prep OR have upcoming deadlines
             for event_id, data in events_needing_prep.items():
@@ -581,7 +707,7 @@ class SituationDetector:
     # SITUATION DETECTOR 3: Trend Content Opportunity
     #===========================================================================
     
-    async def detect_trend_content_situations(self, signals: List) -> List[Situation]:
+    def _detect_trend_content_situations(self, index: 'SignalIndex') -> List[Situation]:
         """
         Detect opportunities to create content based on trending topics.
         
@@ -594,7 +720,7 @@ class SituationDetector:
         
         try:
             # Get trend signals
-            trend_signals = self._get_signals_by_type(signals, [
+            trend_signals = index.of_type([
                 'trend_spike',
                 'trend_rising',
                 'trend_high',
@@ -602,12 +728,12 @@ class SituationDetector:
             ])
             
             # Get conversation and knowledge signals
-            conversation_signals = self._get_signals_by_type(signals, [
+            conversation_signals = index.of_type([
                 'topic_discussed',
                 'project_mentioned'
             ])
             
-            knowledge_signals = self._get_signals_by_type(signals, [
+            knowledge_signals = index.of_type([
                 'knowledge_frequently_accessed',
                 'knowledge_high_relevance',
                 'knowledge_topic_match'
@@ -617,9 +743,33 @@ class SituationDetector:
                 logger.debug("No trend signals found")
                 return situations
             
+            # Conversation topics and knowledge titles/topics, lower-cased once and indexed by word.
+            # A trend only needs checking against entries that share a word with it.
+            conversation_topics = [
+                (
+                    (s.data.get('keyword') or '').lower() if s.signal_type == 'topic_discussed' else '',
+                    (s.data.get('project_name') or '').lower() if s.signal_type == 'project_mentioned' else ''
+                )
+                for s in conversation_signals
+            ]
+            conversation_postings = _postings(
+                conv_keyword.split() + project_name.split() for conv_keyword, project_name in conversation_topics
+            )
+            knowledge_texts = [
+                (
+                    (s.data.get('title') or '').lower(),
+                    [str(t).lower() for t in (s.data.get('topics') or [])]
+                )
+                for s in knowledge_signals
+            ]
+            knowledge_postings = _postings(
+                title.split() + [word for topic in topics for word in topic.split()]
+                for title, topics in knowledge_texts
+            )
+            
             # Process each trend signal
             for trend_signal in trend_signals:
-                keyword = trend_signal.data.get('keyword', '').lower()
+                keyword = (trend_signal.data.get('keyword') or '').lower()
                 business_area = trend_signal.data.get('business_area')
                 
                 if not keyword:
@@ -627,28 +777,24 @@ class SituationDetector:
                 
                 # Try to find related conversation signals
                 related_conversations = []
-                for conv_signal in conversation_signals:
-                    conv_keyword = conv_signal.data.get('keyword', '').lower() if conv_signal.signal_type == 'topic_discussed' else ''
-                    project_name = conv_signal.data.get('project_name', '').lower() if conv_signal.signal_type == 'project_mentioned' else ''
+                for position in sorted(_overlap_counts(conversation_postings, keyword.split())):
+                    conv_keyword, project_name = conversation_topics[position]
                     
                     # Check if conversation is about this trend
                     if keyword in conv_keyword or keyword in project_name:
-                        related_conversations.append(conv_signal)
+                        related_conversations.append(conversation_signals[position])
                     # Also check reverse - if trend keyword contains conversation topic
                     elif conv_keyword and conv_keyword in keyword:
-                        related_conversations.append(conv_signal)
+                        related_conversations.append(conversation_signals[position])
                 
                 # Try to find related knowledge
                 related_knowledge = []
-                for knowledge_signal in knowledge_signals:
-                    knowledge_topics = knowledge_signal.data.get('topics', [])
-                    knowledge_title = (knowledge_signal.data.get('title') or '').lower()
+                for position in sorted(_overlap_counts(knowledge_postings, keyword.split())):
+                    knowledge_title, knowledge_topics = knowledge_texts[position]
                     
                     # Check if knowledge exists about this trend
-                    if keyword in knowledge_title:
-                        related_knowledge.append(knowledge_signal)
-                    elif any(keyword in str(t).lower() for t in knowledge_topics):
-                        related_knowledge.append(knowledge_signal)
+                    if keyword in knowledge_title or any(keyword in t for t in knowledge_topics):
+                        related_knowledge.append(knowledge_signals[position])
                 
                 # Build context for this situation
                 context = {
@@ -756,7 +902,7 @@ class SituationDetector:
     # SITUATION DETECTOR 4: Email-Meeting Correlation
     #===========================================================================
     
-    async def detect_email_meeting_correlation(self, signals: List) -> List[Situation]:
+    def _detect_email_meeting_correlation(self, index: 'SignalIndex') -> List[Situation]:
         """
         Detect when high-priority emails are related to upcoming meetings.
         
@@ -770,20 +916,20 @@ class SituationDetector:
         
         try:
             # Get email signals
-            email_signals = self._get_signals_by_type(signals, [
+            email_signals = index.of_type([
                 'email_priority_high',
                 'email_requires_response',
                 'email_follow_up'
             ])
             
             # Get calendar signals
-            calendar_signals = self._get_signals_by_type(signals, [
+            calendar_signals = index.of_type([
                 'event_upcoming_24h',
                 'event_upcoming_48h'
             ])
             
             # Get meeting signals
-            meeting_signals = self._get_signals_by_type(signals, [
+            meeting_signals = index.of_type([
                 'meeting_processed',
                 'meeting_upcoming'
             ])
@@ -792,6 +938,27 @@ class SituationDetector:
                 logger.debug("Insufficient email/meeting signals for correlation")
                 return situations
             
+            # Index both sides once: attendee addresses and title keywords per calendar event,
+            # plus attendee addresses/name words and title keywords per past meeting
+            calendar_keywords = [
+                _meaningful_keywords((s.data.get('event_title') or '').lower()) for s in calendar_signals
+            ]
+            calendar_keyword_postings = _postings(calendar_keywords)
+            calendar_address_postings = _postings(
+                EMAIL_ADDRESS_PATTERN.findall(' '.join(str(a).lower() for a in (s.data.get('attendees') or []) if a))
+                for s in calendar_signals
+            )
+            
+            meeting_attendee_info = [
+                ' '.join(str(a).lower() for a in (s.data.get('attendees') or [])) for s in meeting_signals
+            ]
+            meeting_keywords = [
+                _meaningful_keywords((s.data.get('meeting_title') or '').lower()) for s in meeting_signals
+            ]
+            meeting_keyword_postings = _postings(meeting_keywords)
+            meeting_address_postings = _postings(EMAIL_ADDRESS_PATTERN.findall(info) for info in meeting_attendee_info)
+            meeting_name_postings = _postings(WORD_PATTERN.findall(info) for info in meeting_attendee_info)
+            
             # Try to correlate emails with events/meetings
             for email_signal in email_signals:
                 sender_name = (email_signal.data.get('sender_name') or '').lower()
@@ -805,122 +972,119 @@ class SituationDetector:
                     continue
                 
                 # Extract keywords from email, filtering out stop words
-                raw_keywords = set(sender_name.split() + subject.split())
-                email_keywords = {kw for kw in raw_keywords if kw and kw not in STOP_WORDS and len(kw) > 2}
+                email_keywords = _meaningful_keywords(sender_name + ' ' + subject)
                 
                 # Need meaningful keywords to correlate
                 if len(email_keywords) < 2:
                     continue
                 
-                # Check calendar events
-                for calendar_signal in calendar_signals:
+                # Check calendar events - correlation found if sender is attending
+                # OR strong keyword overlap (3+ meaningful words)
+                attending_positions = set(calendar_address_postings.get(sender_email, ())) if sender_email else set()
+                calendar_overlap = _overlap_counts(calendar_keyword_postings, email_keywords)
+                candidates = attending_positions | {p for p, count in calendar_overlap.items() if count >= 3}
+                
+                for position in sorted(candidates):
+                    calendar_signal = calendar_signals[position]
                     event_title = (calendar_signal.data.get('event_title') or '').lower()
-                    attendees = calendar_signal.data.get('attendees') or []
+                    sender_attending = position in attending_positions
                     
-                    # Check if sender is attending the meeting
-                    attendee_emails = [str(a).lower() for a in attendees if a]
-                    sender_attending = sender_email in ' '.join(attendee_emails)
+                    hours_until_event = calendar_signal.data.get('hours_until', 48)
                     
-                    # Check if email keywords appear in event title (filter stop words)
-                    raw_event_keywords = set(event_title.split())
-                    event_keywords = {kw for kw in raw_event_keywords if kw and kw not in STOP_WORDS and len(kw) > 2}
-                    keyword_overlap = len(email_keywords & event_keywords)
+                    # Build context
+                    context = {
+                        'email_id': str(email_signal.data.get('email_id')),
+                        'sender_name': email_signal.data.get('sender_name'),
+                        'sender_email': email_signal.data.get('sender_email'),
+                        'subject': email_signal.data.get('subject'),
+                        'received_at': email_signal.data.get('received_at'),
+                        'priority_level': email_signal.data.get('priority_level'),
+                        'requires_response': email_signal.data.get('requires_response', False),
+                        'event_id': calendar_signal.data.get('event_id'),
+                        'event_title': calendar_signal.data.get('event_title'),
+                        'event_time': calendar_signal.data.get('start_time'),
+                        'hours_until_event': hours_until_event,
+                        'correlation_reason': 'sender_attending' if sender_attending else 'keyword_match',
+                        'correlation_strength': 'strong' if sender_attending else 'moderate'
+                    }
                     
-                    # Correlation found if sender is attending OR strong keyword overlap (3+ meaningful words)
-                    if sender_attending or keyword_overlap >= 3:
-                        hours_until_event = calendar_signal.data.get('hours_until', 48)
-                        
-                        # Build context
-                        context = {
-                            'email_id': str(email_signal.data.get('email_id')),
-                            'sender_name': email_signal.data.get('sender_name'),
-                            'sender_email': email_signal.data.get('sender_email'),
-                            'subject': email_signal.data.get('subject'),
-                            'received_at': email_signal.data.get('received_at'),
-                            'priority_level': email_signal.data.get('priority_level'),
-                            'requires_response': email_signal.data.get('requires_response', False),
-                            'event_id': calendar_signal.data.get('event_id'),
-                            'event_title': calendar_signal.data.get('event_title'),
-                            'event_time': calendar_signal.data.get('start_time'),
-                            'hours_until_event': hours_until_event,
-                            'correlation_reason': 'sender_attending' if sender_attending else 'keyword_match',
-                            'correlation_strength': 'strong' if sender_attending else 'moderate'
-                        }
-                        
-                        # Add action items if email has them
-                        action_items = email_signal.data.get('action_items')
-                        if action_items:
-                            context['email_action_items'] = action_items
-                        
-                        # Collect related signals
-                        related_signals = [email_signal, calendar_signal]
-                        
-                        # Determine expiry - before the meeting
-                        expires_hours = max(int(hours_until_event) - 2, 6)
-                        
-                        # Create the situation
-                        situation = self._create_situation(
-                            situation_type='email_priority_meeting_context',
-                            context=context,
-                            related_signals=related_signals,
-                            requires_action=True,
-                            expires_hours=expires_hours
-                        )
-                        
-                        situations.append(situation)
-                        
-                        logger.info(f"📧 Detected email-meeting correlation: {sender_name} → {event_title} in {hours_until_event:.1f}h")
+                    # Add action items if email has them
+                    action_items = email_signal.data.get('action_items')
+                    if action_items:
+                        context['email_action_items'] = action_items
+                    
+                    # Collect related signals
+                    related_signals = [email_signal, calendar_signal]
+                    
+                    # Determine expiry - before the meeting
+                    expires_hours = max(int(hours_until_event) - 2, 6)
+                    
+                    # Create the situation
+                    situation = self._create_situation(
+                        situation_type='email_priority_meeting_context',
+                        context=context,
+                        related_signals=related_signals,
+                        requires_action=True,
+                        expires_hours=expires_hours
+                    )
+                    
+                    situations.append(situation)
+                    
+                    logger.info(f"📧 Detected email-meeting correlation: {sender_name} → {event_title} in {hours_until_event:.1f}h")
                 
                 # Also check past meetings (if email is follow-up to a meeting)
-                for meeting_signal in meeting_signals:
+                # Sender was in the meeting: address match, or every word of their name appears
+                # among the attendees (confirmed with the full-name substring check)
+                attendee_positions = set(meeting_address_postings.get(sender_email, ())) if sender_email else set()
+                name_words = WORD_PATTERN.findall(sender_name)
+                if name_words:
+                    name_positions = set.intersection(*(set(meeting_name_postings.get(w, ())) for w in name_words))
+                    attendee_positions |= {p for p in name_positions if sender_name in meeting_attendee_info[p]}
+                
+                # Correlation if sender was attendee OR very strong keyword overlap (4+ meaningful words)
+                meeting_overlap = _overlap_counts(meeting_keyword_postings, email_keywords)
+                candidates = attendee_positions | {p for p, count in meeting_overlap.items() if count >= 4}
+                
+                for position in sorted(candidates):
+                    meeting_signal = meeting_signals[position]
                     meeting_title = (meeting_signal.data.get('meeting_title') or '').lower()
-                    attendees = meeting_signal.data.get('attendees') or []
                     
-                    if not attendees:
+                    if not meeting_signal.data.get('attendees'):
                         continue
                     
-                    # Check if sender was in the meeting
-                    attendee_info = ' '.join([str(a).lower() for a in attendees])
-                    sender_was_attendee = sender_email in attendee_info or sender_name in attendee_info
+                    sender_was_attendee = position in attendee_positions
+                    
+                    # Build context
+                    context = {
+                        'email_id': str(email_signal.data.get('email_id')),
+                        'sender_name': email_signal.data.get('sender_name'),
+                        'sender_email': email_signal.data.get('sender_email'),
+                        'subject': email_signal.data.get('subject'),
+                        'received_at': email_signal.data.get('received_at'),
+                        'priority_level': email_signal.data.get('priority_level'),
+                        'requires_response': email_signal.data.get('requires_response', False),
+                        'meeting_id': meeting_signal.data.get('meeting_id'),
+                        'meeting_title': meeting_signal.data.get('meeting_title'),
+                        'meeting_date': meeting_signal.data.get('meeting_date'),
+                        'correlation_type': 'post_meeting_followup',
+                        'correlation_reason': 'sender_was_attendee' if sender_was_attendee else 'keyword_match'
+                    }
                     
-                    # Check keyword overlap (filter stop words)
-                    raw_meeting_keywords = set(meeting_title.split())
-                    meeting_keywords = {kw for kw in raw_meeting_keywords if kw and kw not in STOP_WORDS and len(kw) > 2}
-                    keyword_overlap = len(email_keywords & meeting_keywords)
+                    # Collect related signals
+                    related_signals = [email_signal, meeting_signal]
                     
-                    # Correlation if sender was attendee OR very strong keyword overlap (4+ meaningful words)
-                    if sender_was_attendee or keyword_overlap >= 4:
-                        # Build context
-                        context = {
-                            'email_id': str(email_signal.data.get('email_id')),
-                            'sender_name': email_signal.data.get('sender_name'),
-                            'sender_email': email_signal.data.get('sender_email'),
-                            'subject': email_signal.data.get('subject'),
-                            'received_at': email_signal.data.get('received_at'),
-                            'priority_level': email_signal.data.get('priority_level'),
-                            'requires_response': email_signal.data.get('requires_response', False),
-                            'meeting_id': meeting_signal.data.get('meeting_id'),
-                            'meeting_title': meeting_signal.data.get('meeting_title'),
-                            'meeting_date': meeting_signal.data.get('meeting_date'),
-                            'correlation_type': 'post_meeting_followup',
-                            'correlation_reason': 'sender_was_attendee' if sender_was_attendee else 'keyword_match'
-                        }
-                        
-                        # Collect related signals
-                        related_signals = [email_signal, meeting_signal]
-                        
-                        # Create the situation
-                        situation = self._create_situation(
-                            situation_type='email_meeting_followup',
-                            context=context,
-                            related_signals=related_signals,
-                            requires_action=True,
-                            expires_hours=48
-                        )
-                        
-                        situations.append(situation)
-                        
-                        logger.info(f"📧 Detected email-meeting followup: {sender_name} following up on {meeting_title}")
+                    # Create the situation
+                    situation = self._create_situation(
+                        situation_type='email_meeting_followup',
+                        context=context,
+                        related_signals=related_signals,
+                        requires_action=True,
+                        expires_hours=48
+                    )
+                    
+                    situations.append(situation)
+                    
+                    logger.info(f"📧 Detected email-meeting followup: {sender_name} following up on {meeting_title}")
         
         except Exception as e:
             logger.error(f"Error detecting email-meeting correlations: {e}", exc_info=True)
@@ -932,7 +1096,7 @@ class SituationDetector:
     # SITUATION DETECTOR 5: Conversation-Trend Correlation
     #===========================================================================
     
-    async def detect_conversation_trend_correlation(self, signals: List) -> List[Situation]:
+    def _detect_conversation_trend_correlation(self, index: 'SignalIndex') -> List[Situation]:
         """
         Detect when topics you're discussing match trending topics.
         
@@ -946,20 +1110,20 @@ class SituationDetector:
         
         try:
             # Get conversation signals
-            conversation_signals = self._get_signals_by_type(signals, [
+            conversation_signals = index.of_type([
                 'topic_discussed',
                 'project_mentioned'
             ])
             
             # Get trend signals
-            trend_signals = self._get_signals_by_type(signals, [
+            trend_signals = index.of_type([
                 'trend_spike',
                 'trend_rising',
                 'trend_high'
             ])
             
             # Get knowledge signals
-            knowledge_signals = self._get_signals_by_type(signals, [
+            knowledge_signals = index.of_type([
                 'knowledge_frequently_accessed',
                 'knowledge_high_relevance',
                 'knowledge_topic_match'
@@ -969,14 +1133,21 @@ class SituationDetector:
                 logger.debug("Insufficient conversation/trend signals for correlation")
                 return situations
             
+            # Trend keywords and knowledge titles indexed by word - a conversation topic is
+            # only compared with the trends and knowledge entries it shares a word with
+            trend_keywords = [(s.data.get('keyword') or '').lower() for s in trend_signals]
+            trend_postings = _postings(keyword.split() for keyword in trend_keywords)
+            knowledge_titles = [(s.data.get('title') or '').lower() for s in knowledge_signals]
+            knowledge_postings = _postings(title.split() for title in knowledge_titles)
+            
             # Try to correlate conversations with trends
             for conversation_signal in conversation_signals:
                 # Get conversation topic
                 if conversation_signal.signal_type == 'topic_discussed':
-                    conversation_topic = conversation_signal.data.get('keyword', '').lower()
+                    conversation_topic = (conversation_signal.data.get('keyword') or '').lower()
                     conversation_relevance = conversation_signal.data.get('relevance', 5)
                 else:  # project_mentioned
-                    conversation_topic = conversation_signal.data.get('project_name', '').lower()
+                    conversation_topic = (conversation_signal.data.get('project_name') or '').lower()
                     conversation_relevance = 7  # Projects are inherently relevant
                 
                 if not conversation_topic:
@@ -985,92 +1156,86 @@ class SituationDetector:
                 # Split into keywords for better matching
                 conversation_keywords = set(conversation_topic.split())
                 
-                # Find matching trends
-                for trend_signal in trend_signals:
-                    trend_keyword = trend_signal.data.get('keyword', '').lower()
+                # Find matching trends - every candidate shares at least one keyword
+                trend_overlap = _overlap_counts(trend_postings, conversation_keywords)
+                for position in sorted(trend_overlap):
+                    trend_signal = trend_signals[position]
+                    trend_keyword = trend_keywords[position]
+                    keyword_overlap = trend_overlap[position]
+                    substring_match = conversation_topic in trend_keyword or trend_keyword in conversation_topic
                     
-                    if not trend_keyword:
-                        continue
+                    # Found a correlation! Try to find related knowledge (first entry whose
+                    # title contains the topic or the trend keyword)
+                    related_knowledge = None
+                    knowledge_candidates = _overlap_counts(
+                        knowledge_postings, conversation_keywords | set(trend_keyword.split())
+                    )
+                    for knowledge_position in sorted(knowledge_candidates):
+                        knowledge_title = knowledge_titles[knowledge_position]
+                        if conversation_topic in knowledge_title or trend_keyword in knowledge_title:
+                            related_knowledge = knowledge_signals[knowledge_position]
+                            break
                     
-                    trend_keywords = set(trend_keyword.split())
+                    # Build context
+                    context = {
+                        'conversation_topic': conversation_signal.data.get('keyword') or conversation_signal.data.get('project_name'),
+                        'conversation_relevance': conversation_relevance,
+                        'conversation_category': conversation_signal.data.get('category', 'general'),
+                        'thread_id': conversation_signal.data.get('thread_id'),
+                        'message_count': conversation_signal.data.get('message_count', 1),
+                        'trend_keyword': trend_signal.data.get('keyword'),
+                        'trend_score': trend_signal.data.get('trend_score'),
+                        'trend_type': trend_signal.signal_type,
+                        'trend_momentum': trend_signal.data.get('momentum') or trend_signal.data.get('trend_momentum'),
+                        'business_area': trend_signal.data.get('business_area'),
+                        'correlation_type': 'exact_match' if substring_match else 'keyword_overlap',
+                        'keyword_overlap_count': keyword_overlap
+                    }
                     
-                    # Check for keyword overlap
-                    keyword_overlap = len(conversation_keywords & trend_keywords)
-                    substring_match = conversation_topic in trend_keyword or trend_keyword in conversation_topic
+                    # Add spike details if available
+                    if trend_signal.signal_type == 'trend_spike':
+                        context['spike_change'] = trend_signal.data.get('score_change')
                     
-                    if keyword_overlap >= 1 or substring_match:
-                        # Found a correlation!
-                        
-                        # Try to find related knowledge
-                        related_knowledge = None
-                        for knowledge_signal in knowledge_signals:
-                            knowledge_title = (knowledge_signal.data.get('title') or '').lower()
-                            
-                            if (conversation_topic in knowledge_title or
-                                trend_keyword in knowledge_title):
-                                related_knowledge = knowledge_signal
-                                break
-                        
-                        # Build context
-                        context = {
-                            'conversation_topic': conversation_signal.data.get('keyword') or conversation_signal.data.get('project_name'),
-                            'conversation_relevance': conversation_relevance,
-                            'conversation_category': conversation_signal.data.get('category', 'general'),
-                            'thread_id': conversation_signal.data.get('thread_id'),
-                            'message_count': conversation_signal.data.get('message_count', 1),
-                            'trend_keyword': trend_signal.data.get('keyword'),
-                            'trend_score': trend_signal.data.get('trend_score'),
-                            'trend_type': trend_signal.signal_type,
-                            'trend_momentum': trend_signal.data.get('momentum') or trend_signal.data.get('trend_momentum'),
-                            'business_area': trend_signal.data.get('business_area'),
-                            'correlation_type': 'exact_match' if substring_match else 'keyword_overlap',
-                            'keyword_overlap_count': keyword_overlap
+                    # Add knowledge context if found
+                    if related_knowledge:
+                        context['knowledge_available'] = True
+                        context['knowledge_entry'] = {
+                            'entry_id': related_knowledge.data.get('entry_id'),
+                            'title': related_knowledge.data.get('title')
                         }
-                        
-                        # Add spike details if available
-                        if trend_signal.signal_type == 'trend_spike':
-                            context['spike_change'] = trend_signal.data.get('score_change')
-                        
-                        # Add knowledge context if found
-                        if related_knowledge:
-                            context['knowledge_available'] = True
-                            context['knowledge_entry'] = {
-                                'entry_id': related_knowledge.data.get('entry_id'),
-                                'title': related_knowledge.data.get('title')
-                            }
-                        else:
-                            context['knowledge_available'] = False
-                        
-                        # Create actionable insight
-                        if context['knowledge_available']:
-                            context['insight'] = f"You've discussed {conversation_topic}, it's trending (score: {context['trend_score']}), and you have relevant knowledge - perfect alignment for content creation!"
-                        else:
-                            context['insight'] = f"You've discussed {conversation_topic} and it's now trending (score: {context['trend_score']}) - consider creating content."
-                        
-                        # Collect related signals
-                        related_signals = [conversation_signal, trend_signal]
-                        if related_knowledge:
-                            related_signals.append(related_knowledge)
-                        
-                        # Determine expiry based on trend urgency
-                        if trend_signal.signal_type == 'trend_spike':
-                            expires_hours = 48
-                        else:
-                            expires_hours = 72
-                        
-                        # Create the situation
-                        situation = self._create_situation(
-                            situation_type='conversation_trend_alignment',
-                            context=context,
-                            related_signals=related_signals,
-                            requires_action=False,  # Opportunity, not requirement
-                            expires_hours=expires_hours
-                        )
-                        
-                        situations.append(situation)
-                        
-                        knowledge_note = "with knowledge" if context['knowledge_available'] else "no formal knowledge yet"
-                        logger.info(f"💡 Detected conversation-trend alignment: {conversation_topic} ↔ {trend_keyword} ({knowledge_note})")
+                    else:
+                        context['knowledge_available'] = False
+                    
+                    # Create actionable insight
+                    if context['knowledge_available']:
+                        context['insight'] = f"You've discussed {conversation_topic}, it's trending (score: {context['trend_score']}), and you have relevant knowledge - perfect alignment for content creation!"
+                    else:
+                        context['insight'] = f"You've discussed {conversation_topic} and it's now trending (score: {context['trend_score']}) - consider creating content."
+                    
+                    # Collect related signals
+                    related_signals = [conversation_signal, trend_signal]
+                    if related_knowledge:
+                        related_signals.append(related_knowledge)
+                    
+                    # Determine expiry based on trend urgency
+                    if trend_signal.signal_type == 'trend_spike':
+                        expires_hours = 48
+                    else:
+                        expires_hours = 72
+                    
+                    # Create the situation
+                    situation = self._create_situation(
+                        situation_type='conversation_trend_alignment',
+                        context=context,
+                        related_signals=related_signals,
+                        requires_action=False,  # Opportunity, not requirement
+                        expires_hours=expires_hours
+                    )
+                    
+                    situations.append(situation)
+                    
+                    knowledge_note = "with knowledge" if context['knowledge_available'] else "no formal knowledge yet"
+                    logger.info(f"💡 Detected conversation-trend alignment: {conversation_topic} ↔ {trend_keyword} ({knowledge_note})")
         
         except Exception as e:
             logger.error(f"Error detecting conversation-trend correlations: {e}", exc_info=True)
@@ -1082,7 +1247,7 @@ class SituationDetector:
     # SITUATION DETECTOR 6: Weather Impact on Schedule/Health
     #===========================================================================
     
-    async def detect_weather_impact(self, signals: List) -> List[Situation]:
+    def _detect_weather_impact(self, index: 'SignalIndex') -> List[Situation]:
         """
         Detect when weather conditions should affect your schedule or health.
         
@@ -1096,7 +1261,7 @@ class SituationDetector:
         
         try:
             # Get weather signals
-            weather_signals = self._get_signals_by_type(signals, [
+            weather_signals = index.of_type([
                 'uv_index_alert',
                 'uv_forecast_alert',
                 'headache_risk_high',
@@ -1105,7 +1270,7 @@ class SituationDetector:
             ])
             
             # Get calendar signals
-            calendar_signals = self._get_signals_by_type(signals, [
+            calendar_signals = index.of_type([
                 'event_upcoming_24h',
                 'event_upcoming_48h',
                 'meeting_cluster'
@@ -1115,6 +1280,14 @@ class SituationDetector:
                 logger.debug("No weather signals found")
                 return situations
             
+            # Check once per cycle which events are likely outdoor
+            def is_outdoor(calendar_signal) -> bool:
+                event_title = (calendar_signal.data.get('event_title') or '').lower()
+                location = (calendar_signal.data.get('location') or '').lower()
+                return any(kw in event_title or kw in location for kw in OUTDOOR_KEYWORDS)
+            
+            outdoor_signals = [s for s in calendar_signals if is_outdoor(s)]
+            
             # Process each weather signal
             for weather_signal in weather_signals:
                 signal_type = weather_signal.signal_type
@@ -1136,30 +1309,24 @@ class SituationDetector:
                     }
                     
                     # Find outdoor events
-                    outdoor_events = []
-                    for calendar_signal in calendar_signals:
-                        event_title = (calendar_signal.data.get('event_title') or '').lower()
-                        location = (calendar_signal.data.get('location') or '').lower()
-                        
-                        # Check if event is likely outdoor
-                        outdoor_keywords = ['outdoor', 'outside', 'park', 'garden', 'lunch', 'walk', 'site visit', 'field']
-                        is_outdoor = any(kw in event_title or kw in location for kw in outdoor_keywords)
-                        
-                        if is_outdoor:
-                            outdoor_events.append({
-                                'event_title': calendar_signal.data.get('event_title'),
-                                'event_time': calendar_signal.data.get('start_time'),
-                                'hours_until': calendar_signal.data.get('hours_until'),
-                                'location': calendar_signal.data.get('location')
-                            })
+                    outdoor_events = [
+                        {
+                            'event_title': calendar_signal.data.get('event_title'),
+                            'event_time': calendar_signal.data.get('start_time'),
+                            'hours_until': calendar_signal.data.get('hours_until'),
+                            'location': calendar_signal.data.get('location')
+                        }
+                        for calendar_signal in outdoor_signals
+                    ]
                     
                     if outdoor_events:
                         context['affected_events'] = outdoor_events
                         context['event_count'] = len(outdoor_events)
                         context['recommendation'] = f"Reschedule {len(outdoor_events)} outdoor events or prepare maximum sun protection"
-                        related_signals = [weather_signal] + [s for s in calendar_signals if any(
-                            e['event_title'] == s.data.get('event_title') for e in outdoor_events
-                        )]
+                        outdoor_titles = {e['event_title'] for e in outdoor_events}
+                        related_signals = [weather_signal] + [
+                            s for s in calendar_signals if s.data.get('event_title') in outdoor_titles
+                        ]
                     else:
                         # No outdoor events, but still important for general planning
                         context['affected_events'] = []
@@ -1288,6 +1455,7 @@ class SituationDetector:
 
 __all__ = [
     'Situation',
+    'SignalIndex',
     'SituationDetector',
     'get_situation_detector',
 ]
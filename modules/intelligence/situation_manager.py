@@ -13,15 +13,18 @@ Responsibilities:
 
 Created: 10/22/25
 Updated: 12/11/25 - Added singleton pattern, auto-execution support
+Updated: 2026-10-16 - Duplicate detection by persisted situation_fingerprint (unique partial
+                      index) with an in-process LRU in front; bulk INSERT ... ON CONFLICT DO NOTHING
 """
 
 import logging
 from uuid import UUID
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from typing import Dict, List, Any, Optional, Tuple
 import json
 
 from modules.core.database import db_manager
+from modules.core.cache import get_cache, stable_key
 
 logger = logging.getLogger(__name__)
 
@@ -34,6 +37,61 @@ AUTO_EXECUTE_MIN_APPROVALS = 5      # Minimum times user must have approved
 AUTO_EXECUTE_MIN_ACTION_RATE = 0.8  # 80% action rate required
 AUTO_EXECUTE_MIN_CONFIDENCE = 0.6   # Minimum average confidence score
 
+# Duplicate detection - a situation is a duplicate if one of the same type with the same
+# key fields was created in the last DUPLICATE_LOOKBACK_HOURS
+DUPLICATE_LOOKBACK_HOURS = 24
+SITUATION_FINGERPRINT_FIELDS = {
+    'post_meeting_action_required': ['meeting_id'],
+    'deadline_approaching_prep_needed': ['event_id'],
+    'trend_content_opportunity': ['keyword'],
+    'email_priority_meeting_context': ['email_id', 'event_id'],
+    'email_meeting_followup': ['email_id', 'meeting_id'],
+    'conversation_trend_alignment': ['conversation_topic', 'trend_keyword'],
+    'weather_impact_calendar': ['weather_condition'],
+    'weather_health_impact': ['weather_condition'],
+    'weather_emergency_alert': ['alert_description']
+}
+
+# Recent fingerprints kept in process so most duplicates never reach the database
+FINGERPRINT_CACHE = 'situation_fingerprints'
+FINGERPRINT_CACHE_MAX_SIZE = 5000
+
+# Rows per multi-row INSERT (15 params each, well under the 32767 bind limit)
+SITUATION_INSERT_BATCH_SIZE = 500
+
+SITUATION_COLUMNS = [
+    'id', 'user_id', 'situation_type', 'situation_context', 'confidence_score',
+    'priority_score', 'requires_action', 'suggested_actions', 'expires_at',
+    'related_signal_ids', 'detected_at', 'user_response', 'response_timestamp',
+    'created_at', 'situation_fingerprint'
+]
+
+# Also in syntax_prime_schema.sql (MIGRATIONS); run once per process before the first insert.
+# Fingerprints older than the lookback window are cleared, so the unique index only
+# ever covers the live dedupe window.
+SITUATION_FINGERPRINT_SCHEMA = """
+    ALTER TABLE contextual_situations ADD COLUMN IF NOT EXISTS situation_fingerprint VARCHAR(40);
+    CREATE UNIQUE INDEX IF NOT EXISTS idx_contextual_situations_fingerprint
+        ON contextual_situations(user_id, situation_fingerprint)
+        WHERE situation_fingerprint IS NOT NULL;
+"""
+
+
+def situation_fingerprint(situation_type: str, context: Dict[str, Any]) -> Optional[str]:
+    """
+    Hash of the type-specific key fields, or None when the situation cannot be
+    deduplicated (unknown type, or a key field is missing/empty).
+    """
+    fields = SITUATION_FINGERPRINT_FIELDS.get(situation_type)
+    if not fields:
+        return None
+    
+    values = [context.get(field) for field in fields]
+    if not all(values):
+        return None
+    
+    return stable_key(situation_type, *values)
+
 
 #===============================================================================
 # SINGLETON INSTANCE
@@ -66,6 +124,7 @@ class SituationManager:
         """Initialize with centralized db_manager"""
         self.db = db_manager
         self.manager_name = "SituationManager"
+        self._fingerprint_schema_ready = False
     
     #===========================================================================
     # AUTO-EXECUTION CHECK - New proactive feature
@@ -226,7 +285,7 @@ class SituationManager:
         """
         Store a new situation in the database.
         
-        Checks for duplicates first (same type + similar context within 24h)
+        Duplicates (same type + same key context fields within 24h) are skipped
         to avoid spamming the user with the same situation repeatedly.
         
         Args:
@@ -236,47 +295,111 @@ class SituationManager:
         Returns:
             UUID of created situation, or None if duplicate/error
         """
-        try:
-            # Check for duplicate situations
-            is_duplicate = await self._check_duplicate_situation(
-                user_id=user_id,
-                situation_type=situation.situation_type,
-                context=situation.situation_context,
-                lookback_hours=24
-            )
-            
-            if is_duplicate:
-                logger.debug(f"Skipping duplicate situation: {situation.situation_type}")
-                return None
-            
-            # Insert into database
-            query = """
-                INSERT INTO contextual_situations (
-                    id,
-                    user_id,
-                    situation_type,
-                    situation_context,
-                    confidence_score,
-                    priority_score,
-                    requires_action,
-                    suggested_actions,
-                    expires_at,
-                    related_signal_ids,
-                    detected_at,
-                    user_response,
-                    response_timestamp,
-                    created_at
-                ) VALUES (
-                    $1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11, $12, $13, $14
-                )
-                RETURNING id
-            """
+        return (await self.create_situations([situation], user_id))[0]
+    
+    async def create_situations(
+        self,
+        situations: List,
+        user_id: UUID
+    ) -> List[Optional[UUID]]:
+        """
+        Store a batch of situations, skipping duplicates.
+        
+        Duplicates are caught in three places, cheapest first:
+        1. in-process LRU of fingerprints created/seen in the last 24h (no query)
+        2. repeats within this batch
+        3. the unique (user_id, situation_fingerprint) index - the multi-row
+           INSERT uses ON CONFLICT DO NOTHING, so only new rows come back
+        
+        Args:
+            situations: Situation objects to store
+            user_id: User these situations belong to
             
-            # Convert related_signal_ids to string array
-            signal_ids = [str(sid) for sid in situation.related_signal_ids]
+        Returns:
+            One entry per situation: its UUID if stored, None if duplicate/error
+        """
+        results: List[Optional[UUID]] = [None] * len(situations)
+        if not situations:
+            return results
+        
+        try:
+            await self._ensure_fingerprint_schema()
+            
+            # Steps 1 and 2: drop duplicates we already know about
+            pending: List[Tuple[int, Any, Optional[str]]] = []
+            batch_fingerprints = set()
+            for position, situation in enumerate(situations):
+                fingerprint = situation_fingerprint(situation.situation_type, situation.situation_context)
+                if fingerprint is not None:
+                    if fingerprint in batch_fingerprints or await self._is_recent_fingerprint(user_id, fingerprint):
+                        logger.debug(f"Skipping duplicate situation: {situation.situation_type}")
+                        continue
+                    batch_fingerprints.add(fingerprint)
+                pending.append((position, situation, fingerprint))
+            
+            if not pending:
+                return results
+            
+            # Step 3: release fingerprints that left the window, then insert
+            now = datetime.utcnow()
+            inserted_ids = set()
+            async with self.db.transaction() as conn:
+                await conn.execute("""
+                    UPDATE contextual_situations
+                    SET situation_fingerprint = NULL
+                    WHERE user_id = $1
+                    AND situation_fingerprint IS NOT NULL
+                    AND created_at < $2
+                """, user_id, now - timedelta(hours=DUPLICATE_LOOKBACK_HOURS))
+                
+                for start in range(0, len(pending), SITUATION_INSERT_BATCH_SIZE):
+                    chunk = pending[start:start + SITUATION_INSERT_BATCH_SIZE]
+                    query, args = self._build_insert(chunk, user_id, now)
+                    rows = await conn.fetch(query, *args)
+                    inserted_ids.update(row['id'] for row in rows)
+            
+            # Remember every fingerprint in play; conflicts get the existing row's created_at
+            conflicts = []
+            for position, situation, fingerprint in pending:
+                if situation.situation_id in inserted_ids:
+                    results[position] = situation.situation_id
+                    if fingerprint is not None:
+                        await self._remember_fingerprint(user_id, fingerprint, now)
+                elif fingerprint is not None:
+                    conflicts.append(fingerprint)
+            
+            if conflicts:
+                existing = await self.db.fetch_all("""
+                    SELECT situation_fingerprint, created_at
+                    FROM contextual_situations
+                    WHERE user_id = $1 AND situation_fingerprint = ANY($2::varchar[])
+                """, user_id, conflicts)
+                for row in existing:
+                    await self._remember_fingerprint(user_id, row['situation_fingerprint'], row['created_at'])
+            
+            created = sum(1 for result in results if result)
+            logger.info(f"✅ Created {created} situation(s), skipped {len(situations) - created} duplicate(s)")
             
-            result = await self.db.fetch_one(
-                query,
+        except Exception as e:
+            logger.error(f"Error creating situations: {e}", exc_info=True)
+        
+        return results
+    
+    def _build_insert(
+        self,
+        chunk: List[Tuple[int, Any, Optional[str]]],
+        user_id: UUID,
+        now: datetime
+    ) -> Tuple[str, List[Any]]:
+        """Multi-row INSERT ... ON CONFLICT DO NOTHING RETURNING id for one chunk"""
+        width = len(SITUATION_COLUMNS)
+        placeholders = []
+        args: List[Any] = []
+        
+        for row_number, (_, situation, fingerprint) in enumerate(chunk):
+            base = row_number * width
+            placeholders.append('(' + ', '.join(f'${base + i + 1}' for i in range(width)) + ')')
+            args.extend([
                 situation.situation_id,
                 user_id,
                 situation.situation_type,
@@ -286,132 +409,60 @@ class SituationManager:
                 situation.requires_action,
                 json.dumps(situation.suggested_actions),
                 situation.expires_at,
-                signal_ids,
+                [str(sid) for sid in situation.related_signal_ids],
                 situation.detected_at,
                 None,  # user_response initially null
                 None,  # response_timestamp initially null
-                datetime.utcnow()
-            )
-            
-            logger.info(f"✅ Created situation: {situation.situation_type} (priority {situation.priority_score})")
-            
-            return result['id'] if result else None
-            
-        except Exception as e:
-            logger.error(f"Error creating situation: {e}", exc_info=True)
-            return None
-    
-    async def _check_duplicate_situation(
-        self,
-        user_id: UUID,
-        situation_type: str,
-        context: Dict[str, Any],
-        lookback_hours: int = 24
-    ) -> bool:
-        """
-        Check if a similar situation already exists recently.
+                now,
+                fingerprint
+            ])
         
-        Compares situation type and key context fields to detect duplicates.
-        
-        Args:
-            user_id: User ID
-            situation_type: Type of situation
-            context: Situation context dict
-            lookback_hours: How far back to check for duplicates
-            
-        Returns:
-            True if duplicate found, False otherwise
+        query = f"""
+            INSERT INTO contextual_situations ({', '.join(SITUATION_COLUMNS)})
+            VALUES {', '.join(placeholders)}
+            ON CONFLICT DO NOTHING
+            RETURNING id
         """
-        try:
-            lookback_time = datetime.utcnow() - timedelta(hours=lookback_hours)
-            
-            # Query for recent situations of same type
-            query = """
-                SELECT id, situation_context
-                FROM contextual_situations
-                WHERE user_id = $1
-                AND situation_type = $2
-                AND created_at >= $3
-                ORDER BY created_at DESC
-            """
-            
-            recent_situations = await self.db.fetch_all(
-                query,
-                user_id,
-                situation_type,
-                lookback_time
-            )
-            
-            if not recent_situations:
-                return False
-            
-            # Check if any of these are similar enough to be considered duplicates
-            for existing in recent_situations:
-                existing_context = json.loads(existing['situation_context']) if isinstance(existing['situation_context'], str) else existing['situation_context']
-                
-                # Compare key fields based on situation type
-                if self._contexts_are_similar(situation_type, context, existing_context):
-                    logger.debug(f"Found duplicate situation of type {situation_type}")
-                    return True
-            
+        return query, args
+    
+    async def _ensure_fingerprint_schema(self) -> None:
+        if self._fingerprint_schema_ready:
+            return
+        await self.db.execute(SITUATION_FINGERPRINT_SCHEMA)
+        self._fingerprint_schema_ready = True
+    
+    @staticmethod
+    def _fingerprint_cache():
+        return get_cache(
+            FINGERPRINT_CACHE,
+            max_size=FINGERPRINT_CACHE_MAX_SIZE,
+            ttl_seconds=DUPLICATE_LOOKBACK_HOURS * 3600
+        )
+    
+    async def _is_recent_fingerprint(self, user_id: UUID, fingerprint: str) -> bool:
+        """True if this fingerprint was created within the lookback window (in-process only)"""
+        created_at = await self._fingerprint_cache().get(f"{user_id}:{fingerprint}")
+        if created_at is None:
             return False
-            
-        except Exception as e:
-            logger.error(f"Error checking duplicate situation: {e}")
-            return False  # On error, don't block creation
+        return created_at >= datetime.utcnow() - timedelta(hours=DUPLICATE_LOOKBACK_HOURS)
     
-    def _contexts_are_similar(
-        self,
-        situation_type: str,
-        context1: Dict[str, Any],
-        context2: Dict[str, Any]
-    ) -> bool:
+    async def _remember_fingerprint(self, user_id: UUID, fingerprint: str, created_at: datetime) -> None:
+        if created_at.tzinfo is not None:
+            created_at = created_at.astimezone(timezone.utc).replace(tzinfo=None)
+        await self._fingerprint_cache().set(f"{user_id}:{fingerprint}", created_at)
+    
+    async def drop_known_duplicates(self, situations: List, user_id: UUID) -> List:
         """
-        Compare two situation contexts to determine if they're duplicates.
-        
-        Different situation types compare different fields.
-        
-        Args:
-            situation_type: Type of situation being compared
-            context1: First context
-            context2: Second context
-            
-        Returns:
-            True if contexts are similar enough to be duplicates
+        Situations not already known (in process) to duplicate a recent one.
+        Lets callers skip work such as action suggestion for obvious repeats;
+        create_situations still does the authoritative check.
         """
-        # Define key fields to compare for each situation type
-        comparison_fields = {
-            'post_meeting_action_required': ['meeting_id'],
-            'deadline_approaching_prep_needed': ['event_id'],
-            'trend_content_opportunity': ['keyword'],
-            'email_priority_meeting_context': ['email_id', 'event_id'],
-            'email_meeting_followup': ['email_id', 'meeting_id'],
-            'conversation_trend_alignment': ['conversation_topic', 'trend_keyword'],
-            'weather_impact_calendar': ['weather_condition'],
-            'weather_health_impact': ['weather_condition'],
-            'weather_emergency_alert': ['alert_description']
-        }
-        
-        fields = comparison_fields.get(situation_type, [])
-        
-        if not fields:
-            # If we don't know what to compare, be conservative and say they're different
-            return False
-        
-        # Check if all key fields match
-        for field in fields:
-            val1 = context1.get(field)
-            val2 = context2.get(field)
-            
-            # If either value is None/empty, NOT a duplicate
-            if not val1 or not val2:
-                return False
-            
-            # Compare actual values
-            if val1 != val2:
-                return False
-        
-        return True
+        fresh = []
+        for situation in situations:
+            fingerprint = situation_fingerprint(situation.situation_type, situation.situation_context)
+            if fingerprint is None or not await self._is_recent_fingerprint(user_id, fingerprint):
+                fresh.append(situation)
+        return fresh
     
     
     async def get_active_situations(
@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+Bluesky Keyword Matcher Benchmark
+Builds synthetic keyword sets for the 5 accounts (sized like the real keyword
+tables) and synthetic timelines, then compares one scan cycle through:
+
+- the old BlueskyEngagementDetector._match_keywords loop (substring test per keyword)
+- the old EngagementAnalyzer.calculate_keyword_match_score loop (phrase + word overlap)
+- KeywordMatcher: one Aho-Corasick pass per post for all accounts (cold and memoized)
+
+and checks the automaton's phrase matches against a per-keyword \\b...\\b regex
+reference. Substring hits inside longer words (e.g. "ai" in "said") are counted
+separately - the matcher drops those on purpose.
+
+Usage:
+    python scripts/benchmark_bluesky_keywords.py
+    python scripts/benchmark_bluesky_keywords.py --posts 200 --rounds 5
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import random
+import re
+import statistics
+import sys
+import time
+from typing import Callable, Dict, List, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules.integrations.bluesky.keyword_matcher import KeywordMatcher  # noqa: E402
+
+logging.basicConfig(
+    level=logging.WARNING,
+    format='%(asctime)s - %(levelname)s - %(message)s',
+    handlers=[logging.StreamHandler(stream=sys.stdout)]
+)
+logger = logging.getLogger(__name__)
+
+# Active keywords per account (see multi_account_client.py)
+ACCOUNT_KEYWORD_COUNTS = {
+    'personal': 884,
+    'rose_angel': 1451,
+    'binge_tv': 295,
+    'meals_feelz': 312,
+    'damn_it_carl': 402
+}
+
+
+def make_vocabulary(size: int, rng: random.Random) -> List[str]:
+    syllables = ['ka', 'lo', 'mi', 'ne', 'ru', 'sta', 'ber', 'gon', 'tri', 'vel', 'po', 'zen', 'ai', 'ex']
+    words = set()
+    while len(words) < size:
+        words.add(''.join(rng.choice(syllables) for _ in range(rng.randint(1, 4))))
+    return sorted(words)
+
+
+def make_keywords(vocabulary: List[str], rng: random.Random) -> Dict[str, List[str]]:
+    keywords = {}
+    for account_id, count in ACCOUNT_KEYWORD_COUNTS.items():
+        account = set()
+        while len(account) < count:
+            length = 1 if rng.random() < 0.6 else rng.randint(2, 3)
+            account.add(' '.join(rng.choice(vocabulary) for _ in range(length)))
+        keywords[account_id] = sorted(account)
+    return keywords
+
+
+def make_timelines(posts_per_timeline: int, vocabulary: List[str], keywords: Dict[str, List[str]],
+                   overlap: float, rng: random.Random) -> Dict[str, List[str]]:
+    """Timelines share roughly `overlap` of their posts (accounts follow the same people)"""
+    all_keywords = [k for account in keywords.values() for k in account]
+
+    def make_post() -> str:
+        words = [rng.choice(vocabulary) for _ in range(rng.randint(15, 50))]
+        for _ in range(rng.randint(0, 3)):
+            words.insert(rng.randrange(len(words) + 1), rng.choice(all_keywords))
+        text = ' '.join(words)
+        return text[0].upper() + text[1:] + rng.choice(['.', '?', '!', ' #bsky'])
+
+    shared = [make_post() for _ in range(int(posts_per_timeline * overlap))]
+    return {
+        account_id: rng.sample(shared, len(shared)) + [make_post() for _ in range(posts_per_timeline - len(shared))]
+        for account_id in keywords
+    }
+
+
+# ----------------------------------------------------------------------------
+# The matchers as they were before KeywordMatcher
+# ----------------------------------------------------------------------------
+
+def legacy_detector_match(post_text: str, keywords: List[str]) -> List[str]:
+    post_text_lower = post_text.lower()
+    return [keyword for keyword in keywords if keyword in post_text_lower]
+
+
+def legacy_analyzer_score(post_text: str, keywords: List[str]) -> Tuple[float, List[str]]:
+    post_lower = post_text.lower()
+    post_words = re.findall(r'\b\w+\b', post_lower)
+    matched_keywords = []
+    match_score = 0.0
+    for keyword in keywords:
+        keyword_lower = keyword.lower()
+        if keyword_lower in post_lower:
+            matched_keywords.append(keyword)
+            match_score += 2.0
+        elif any(word in keyword_lower.split() for word in post_words):
+            keyword_words = keyword_lower.split()
+            if any(word in post_words for word in keyword_words):
+                matched_keywords.append(keyword)
+                match_score += 1.0
+    if not matched_keywords:
+        return 0.0, []
+    keyword_coverage = len(set(matched_keywords)) / len(keywords)
+    density_bonus = min(match_score / len(post_words) * 100, 0.5)
+    return min((keyword_coverage * 0.8 + density_bonus * 0.2), 1.0), list(set(matched_keywords))
+
+
+def reference_whole_word(post_text: str, patterns: List[Tuple[str, 're.Pattern']]) -> List[str]:
+    post_lower = post_text.lower()
+    return [keyword for keyword, pattern in patterns if pattern.search(post_lower)]
+
+
+# ----------------------------------------------------------------------------
+
+def timed(func: Callable, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def median_time(func: Callable, rounds: int) -> float:
+    return statistics.median(timed(func)[1] for _ in range(rounds))
+
+
+async def main():
+    """Main execution function"""
+    parser = argparse.ArgumentParser(description='Benchmark Bluesky keyword matching on a synthetic scan cycle')
+    parser.add_argument('--posts', type=int, default=50, help='Posts per account timeline')
+    parser.add_argument('--overlap', type=float, default=0.3, help='Share of posts common to all timelines')
+    parser.add_argument('--vocabulary', type=int, default=4000, help='Distinct words')
+    parser.add_argument('--rounds', type=int, default=3, help='Timed cycles (median reported)')
+    parser.add_argument('--seed', type=int, default=11)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    vocabulary = make_vocabulary(args.vocabulary, rng)
+    keywords = make_keywords(vocabulary, rng)
+    timelines = make_timelines(args.posts, vocabulary, keywords, args.overlap, rng)
+    total_keywords = sum(len(k) for k in keywords.values())
+    total_posts = sum(len(t) for t in timelines.values())
+
+    print("=" * 78)
+    print(f"🔵 Bluesky keyword matching - {len(keywords)} accounts, {total_keywords} keywords, "
+          f"{total_posts} timeline posts, median of {args.rounds}")
+    print("=" * 78)
+
+    matcher = KeywordMatcher({})
+    matcher.load_keywords(keywords)
+    print(f"{'automaton build':<40} {matcher.last_rebuild_ms:>9.1f} ms   {matcher.get_stats()['states']} states")
+
+    def legacy_detector_cycle():
+        return {a: [legacy_detector_match(p, keywords[a]) for p in posts] for a, posts in timelines.items()}
+
+    def legacy_analyzer_cycle():
+        return {a: [legacy_analyzer_score(p, keywords[a]) for p in posts] for a, posts in timelines.items()}
+
+    def matcher_cycle(cold: bool = True):
+        if cold:
+            matcher._memo.clear()
+        return {a: [matcher.match(p).get(a) for p in posts] for a, posts in timelines.items()}
+
+    detector_s = median_time(legacy_detector_cycle, args.rounds)
+    analyzer_s = median_time(legacy_analyzer_cycle, args.rounds)
+    cold_s = median_time(lambda: matcher_cycle(cold=True), args.rounds)
+    matcher_cycle(cold=True)
+    warm_s = median_time(lambda: matcher_cycle(cold=False), args.rounds)
+
+    print(f"{'old detector (substring per keyword)':<40} {detector_s * 1000:>9.1f} ms")
+    print(f"{'old analyzer (phrase + word overlap)':<40} {analyzer_s * 1000:>9.1f} ms")
+    print(f"{'KeywordMatcher (one pass, all accounts)':<40} {cold_s * 1000:>9.1f} ms   "
+          f"{detector_s / cold_s:.0f}x / {analyzer_s / cold_s:.0f}x faster")
+    print(f"{'KeywordMatcher (memoized repeat scan)':<40} {warm_s * 1000:>9.1f} ms")
+
+    # Correctness: phrase matches vs a whole-word regex per keyword
+    print("-" * 78)
+    matcher_cycle(cold=True)
+    mismatched = 0
+    substring_only = 0
+    checked = 0
+    for account_id, posts in timelines.items():
+        patterns = [(k, re.compile(r'(?<!\w)' + re.escape(k) + r'(?!\w)')) for k in keywords[account_id]]
+        for post in posts:
+            expected = reference_whole_word(post, patterns)
+            match = matcher.match(post).get(account_id)
+            if sorted(match.phrase_matches if match else []) != sorted(expected):
+                mismatched += 1
+            substring_only += len(legacy_detector_match(post, keywords[account_id])) - len(expected)
+            checked += 1
+    status = '✅' if mismatched == 0 else f"❌ {mismatched} posts differ"
+    print(f"{'phrase matches vs whole-word regex':<40} {checked:>9} posts {status}")
+    print(f"{'substring-only hits dropped':<40} {substring_only:>9}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
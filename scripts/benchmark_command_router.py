@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Command Router Micro-Benchmark
+Compares the legacy /chat detect_* if/elif walk against the compiled
+single-pass CommandRouter, and checks both pick the same integration.
+
+Usage:
+    python scripts/benchmark_command_router.py                 # built-in sample corpus
+    python scripts/benchmark_command_router.py --from-db 5000  # last N real user messages
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+from typing import List, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules.ai import chat
+from modules.ai.command_router import CommandRouter, build_default_routes, HEALTH_CHECK_KEYWORDS, WRITING_CONTEXT_KEYWORDS
+
+# Representative chat traffic: plain conversation dominates, commands are the minority
+SAMPLE_MESSAGES = [
+    "hey, how's it going?",
+    "good morning! what's on my plate today?",
+    "can you help me think through the pricing page copy for the consulting site",
+    "what's the weather like outside",
+    "weather forecast for the week",
+    "bluesky scan",
+    "bluesky post bcdodge \"shipping the new release today\"",
+    "post it",
+    "give me some content ideas for the blog",
+    "scrape https://example.com",
+    "when is the next prayer",
+    "prayer notifications status",
+    "intelligence status",
+    "where am i right now",
+    "stop with the 2am jokes",
+    "trends scan",
+    "show me trending opportunities",
+    "voice synthesize hello world",
+    "image create a cat in a spacesuit",
+    "remind me to call mom at 5pm",
+    "list reminders",
+    "cancel all reminders",
+    "google analytics all sites",
+    "copy that to drive",
+    "summarize email 4",
+    "draft a reply to #2 saying thanks",
+    "save this as a draft",
+    "show recent meetings",
+    "what did we decide in the meeting yesterday",
+    "any action items from the call on oct 15?",
+    "system health check",
+    "write a linkedin post about the launch",
+    "explain the difference between a list and a tuple in python",
+    "I'm feeling pretty wiped today, long week",
+    "can you rewrite this paragraph so it sounds less formal",
+    "what should I name the new cat",
+    "that's hilarious, tell me more",
+    "ok what about the other option",
+    "let's plan the Q3 roadmap, start with the top three goals",
+    "remember when we talked about the podcast idea?",
+]
+
+
+def legacy_dispatch(message: str) -> Optional[str]:
+    """The detect_* calls /chat made before the command router, in order."""
+    winner = None
+    chat.detect_weather_request(message)
+
+    if chat.detect_bluesky_reply_approval(message):
+        winner = None
+    elif chat.detect_bluesky_command(message):
+        winner = 'bluesky'
+    elif chat.detect_rss_command(message):
+        winner = 'rss'
+    elif chat.detect_scraper_command(message):
+        winner = 'scraper'
+    elif chat.detect_prayer_command(message):
+        winner = 'prayer'
+    elif chat.detect_prayer_notification_command(message):
+        winner = 'prayer_notification'
+    elif chat.detect_intelligence_command(message):
+        winner = 'intelligence'
+    elif chat.detect_location_command(message):
+        winner = 'location'
+    elif chat.detect_pattern_complaint(message)[0]:
+        chat.detect_pattern_complaint(message)
+        winner = 'pattern_complaint'
+    elif chat.detect_trends_command(message)[0]:
+        winner = 'trends'
+    elif chat.detect_voice_command(message):
+        winner = 'voice'
+    elif chat.detect_image_command(message):
+        winner = 'image'
+    elif chat.detect_reminder_command(message):
+        chat.detect_reminder_command(message)
+        winner = 'reminder'
+    elif chat.detect_google_command(message)[0]:
+        winner = 'google'
+    elif chat.detect_email_detail_command(message)[0] or chat.detect_draft_creation_command(message)[0]:
+        is_email, _, _ = chat.detect_email_detail_command(message)
+        chat.detect_draft_creation_command(message)
+        winner = 'email_detail' if is_email else 'draft_creation'
+
+    chat.detect_show_meetings_command(message)
+    if not chat.detect_meeting_query(message)[0]:
+        any(term in message.lower() for term in HEALTH_CHECK_KEYWORDS)
+
+    # AI path: RSS context check
+    chat.detect_rss_command(message) or any(term in message.lower() for term in WRITING_CONTEXT_KEYWORDS)
+    return winner
+
+
+def compiled_dispatch(router: CommandRouter, message: str) -> Optional[str]:
+    command = router.classify(message)
+    if command.has('bluesky_reply_approval'):
+        return None
+    return command.winner.name if command.winner else None
+
+
+def time_per_message(fn, corpus: List[str], rounds: int) -> float:
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for message in corpus:
+            fn(message)
+    return (time.perf_counter() - start) / (rounds * len(corpus)) * 1e6
+
+
+async def load_messages_from_db(limit: int) -> List[str]:
+    import asyncpg
+    conn = await asyncpg.connect(os.environ['DATABASE_URL'])
+    try:
+        rows = await conn.fetch(
+            "SELECT content FROM conversation_messages WHERE role = 'user' ORDER BY created_at DESC LIMIT $1",
+            limit
+        )
+        return [row['content'] for row in rows if row['content']]
+    finally:
+        await conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the compiled command router')
+    parser.add_argument('--from-db', type=int, metavar='N', help='Use the last N user messages from DATABASE_URL')
+    parser.add_argument('--rounds', type=int, default=200, help='Passes over the corpus')
+    args = parser.parse_args()
+
+    corpus = asyncio.run(load_messages_from_db(args.from_db)) if args.from_db else SAMPLE_MESSAGES
+    rounds = max(1, args.rounds * len(SAMPLE_MESSAGES) // max(len(corpus), 1)) if args.from_db else args.rounds
+
+    compile_start = time.perf_counter()
+    router = CommandRouter(build_default_routes())
+    compile_ms = (time.perf_counter() - compile_start) * 1000
+
+    mismatches = [
+        (message, legacy_dispatch(message), compiled_dispatch(router, message))
+        for message in corpus
+        if legacy_dispatch(message) != compiled_dispatch(router, message)
+    ]
+
+    legacy_us = time_per_message(legacy_dispatch, corpus, rounds)
+    compiled_us = time_per_message(lambda m: compiled_dispatch(router, m), corpus, rounds)
+
+    print("=" * 70)
+    print(f"🧭 Command router benchmark - {len(corpus)} messages x {rounds} rounds")
+    print("=" * 70)
+    print(f"Compile time:        {compile_ms:8.2f} ms ({len(router.routes)} routes)")
+    print(f"Legacy if/elif walk: {legacy_us:8.2f} µs/message")
+    print(f"Compiled router:     {compiled_us:8.2f} µs/message")
+    print(f"Speedup:             {legacy_us / compiled_us:8.2f}x")
+    print(f"Winner mismatches:   {len(mismatches)}")
+    for message, legacy, compiled in mismatches[:10]:
+        print(f"   legacy={legacy!s:20} compiled={compiled!s:20} {message[:60]!r}")
+
+
+if __name__ == '__main__':
+    main()
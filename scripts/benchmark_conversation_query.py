@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+Cross-Thread Conversation Query Benchmark
+Builds a synthetic conversation_messages table (1M rows by default) in a scratch
+schema and compares the legacy DISTINCT ON (id) / title NOT LIKE query against
+the newest-first keyset scan used by query_conversations.
+
+Usage:
+    DATABASE_URL=postgres://... python scripts/benchmark_conversation_query.py
+    DATABASE_URL=postgres://... python scripts/benchmark_conversation_query.py --messages 200000 --keep
+"""
+
+import asyncio
+import asyncpg
+import argparse
+import logging
+import os
+import statistics
+import sys
+import time
+from typing import Any, List
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s',
+    handlers=[logging.StreamHandler(stream=sys.stdout)]
+)
+logger = logging.getLogger(__name__)
+
+SCHEMA = 'bench_conversations'
+
+# The title patterns the old query filtered with NOT LIKE
+LEGACY_PATTERNS = [
+    'Bluesky Draft:%', 'Trending Opportunities', 'Intelligence Briefings', 'Weather Alerts',
+    'Prayer Times', 'Meeting Summaries', 'Email Notifications', 'Calendar Alerts',
+    'Reminders', 'Engagement Opportunities', 'Analytics Reports',
+]
+
+SETUP_SQL = f"""
+    DROP SCHEMA IF EXISTS {SCHEMA} CASCADE;
+    CREATE SCHEMA {SCHEMA};
+
+    CREATE TABLE {SCHEMA}.conversation_threads (
+        id UUID PRIMARY KEY,
+        user_id UUID NOT NULL,
+        title VARCHAR(200),
+        platform VARCHAR(20) NOT NULL,
+        is_notification_thread BOOLEAN GENERATED ALWAYS AS (platform = 'system') STORED
+    );
+
+    CREATE TABLE {SCHEMA}.conversation_messages (
+        id UUID PRIMARY KEY,
+        thread_id UUID NOT NULL REFERENCES {SCHEMA}.conversation_threads(id),
+        user_id UUID NOT NULL,
+        role VARCHAR(20) NOT NULL,
+        content TEXT NOT NULL,
+        created_at TIMESTAMP WITH TIME ZONE NOT NULL
+    );
+"""
+
+# Threads: every 10th is a notification thread. Messages spread over 400 days,
+# spread across --users users, so the 10/20/50-day windows hold a realistic share.
+POPULATE_THREADS_SQL = f"""
+    INSERT INTO {SCHEMA}.conversation_threads (id, user_id, title, platform)
+    SELECT md5('thread' || t)::uuid,
+           md5('user' || (t % $2))::uuid,
+           CASE WHEN t % 10 = 0 THEN 'Weather Alerts' ELSE 'Conversation ' || t END,
+           CASE WHEN t % 10 = 0 THEN 'system' ELSE 'web' END
+    FROM generate_series(1, $1) AS t
+"""
+
+POPULATE_MESSAGES_SQL = f"""
+    INSERT INTO {SCHEMA}.conversation_messages (id, thread_id, user_id, role, content, created_at)
+    SELECT md5('message' || m)::uuid,
+           md5('thread' || (m % $1 + 1))::uuid,
+           md5('user' || ((m % $1 + 1) % $2))::uuid,
+           CASE WHEN m % 2 = 0 THEN 'user' ELSE 'assistant' END,
+           repeat('lorem ipsum dolor ', 10 + m % 20),
+           NOW() - (random() * INTERVAL '400 days')
+    FROM generate_series(1, $3) AS m
+"""
+
+INDEX_SQL = f"""
+    CREATE INDEX ON {SCHEMA}.conversation_messages(thread_id, created_at);
+    CREATE INDEX ON {SCHEMA}.conversation_messages(user_id, created_at DESC, id DESC);
+    ANALYZE {SCHEMA}.conversation_threads;
+    ANALYZE {SCHEMA}.conversation_messages;
+"""
+
+LEGACY_QUERY = f"""
+    SELECT DISTINCT ON (cm.id)
+        cm.id, cm.thread_id, cm.role, cm.content, cm.created_at, ct.title as thread_title
+    FROM {SCHEMA}.conversation_messages cm
+    LEFT JOIN {SCHEMA}.conversation_threads ct ON cm.thread_id = ct.id
+    WHERE cm.user_id = $1
+      AND cm.created_at >= NOW() - INTERVAL '1 day' * $2
+      AND ({' AND '.join(f'ct.title NOT LIKE ${i + 4}' for i in range(len(LEGACY_PATTERNS)))})
+    ORDER BY cm.id, cm.created_at DESC
+    LIMIT $3
+"""
+
+KEYSET_QUERY = f"""
+    SELECT
+        cm.id, cm.thread_id, cm.role, cm.content, cm.created_at, ct.title as thread_title
+    FROM {SCHEMA}.conversation_messages cm
+    LEFT JOIN {SCHEMA}.conversation_threads ct ON cm.thread_id = ct.id
+    WHERE cm.user_id = $1
+      AND cm.created_at >= NOW() - INTERVAL '1 day' * $2
+      AND ct.is_notification_thread IS NOT TRUE
+    ORDER BY cm.created_at DESC, cm.id DESC
+    LIMIT $3
+"""
+
+KEYSET_NEXT_PAGE_QUERY = KEYSET_QUERY.replace(
+    "AND ct.is_notification_thread",
+    "AND (cm.created_at, cm.id) < ($4, $5)\n      AND ct.is_notification_thread"
+)
+
+
+async def time_query(conn: asyncpg.Connection, query: str, args: List[Any], runs: int) -> float:
+    """Median wall time in ms (first run discarded as cache warm-up)"""
+    await conn.fetch(query, *args)
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        await conn.fetch(query, *args)
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+async def main():
+    """Main execution function"""
+    parser = argparse.ArgumentParser(description='Benchmark query_conversations on a synthetic table')
+    parser.add_argument('--messages', type=int, default=1_000_000, help='Synthetic message rows')
+    parser.add_argument('--threads', type=int, default=20_000, help='Synthetic threads')
+    parser.add_argument('--users', type=int, default=1, help='Users sharing the table')
+    parser.add_argument('--runs', type=int, default=10, help='Timed runs per query')
+    parser.add_argument('--keep', action='store_true', help=f'Keep the {SCHEMA} schema afterwards')
+    args = parser.parse_args()
+
+    database_url = os.getenv('DATABASE_URL')
+    if not database_url:
+        logger.error("❌ DATABASE_URL not set")
+        sys.exit(1)
+
+    conn = await asyncpg.connect(database_url)
+    try:
+        logger.info(f"🏗️  Building {args.messages:,} messages / {args.threads:,} threads in schema {SCHEMA}")
+        start = time.perf_counter()
+        await conn.execute(SETUP_SQL)
+        async with conn.transaction():
+            await conn.execute(POPULATE_THREADS_SQL, args.threads, args.users)
+            await conn.execute(POPULATE_MESSAGES_SQL, args.threads, args.users, args.messages)
+        await conn.execute(INDEX_SQL)
+        logger.info(f"✅ Synthetic data ready in {time.perf_counter() - start:.1f}s")
+
+        user_id = await conn.fetchval("SELECT md5('user' || (1 % $1))::uuid", args.users)
+
+        print("=" * 78)
+        print(f"💬 query_conversations - {args.messages:,} messages, median of {args.runs} runs")
+        print("=" * 78)
+        print(f"{'window':>8} {'limit':>6} {'legacy ms':>11} {'keyset ms':>11} {'page 2 ms':>11} {'speedup':>9}")
+
+        # The three windows build_memory_context actually requests
+        for days, limit in [(10, 100), (20, 300), (50, 500)]:
+            legacy_ms = await time_query(conn, LEGACY_QUERY, [user_id, days, limit, *LEGACY_PATTERNS], args.runs)
+            keyset_ms = await time_query(conn, KEYSET_QUERY, [user_id, days, limit], args.runs)
+
+            first_page = await conn.fetch(KEYSET_QUERY, user_id, days, limit)
+            cursor = (first_page[-1]['created_at'], first_page[-1]['id']) if first_page else (None, None)
+            page_ms = await time_query(conn, KEYSET_NEXT_PAGE_QUERY, [user_id, days, limit, *cursor], args.runs)
+
+            print(f"{days:>6}d {limit:>6} {legacy_ms:>11.2f} {keyset_ms:>11.2f} {page_ms:>11.2f} "
+                  f"{legacy_ms / keyset_ms:>8.1f}x")
+
+        plan = await conn.fetch(f"EXPLAIN ANALYZE {KEYSET_QUERY}", user_id, 20, 300)
+        print("\nKeyset plan (20d / 300):")
+        for row in plan:
+            print(f"   {row[0]}")
+
+    finally:
+        if not args.keep:
+            await conn.execute(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE")
+        await conn.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
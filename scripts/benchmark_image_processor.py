@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+Image Processor Benchmark
+Renders the social media pack plus the PNG/JPG/WebP format set from a 4K source
+two ways and compares wall time and how long the event loop is blocked:
+
+- legacy: one process_image-style pass per variant on the event loop
+          (base64 decode, PIL decode and copy each time)
+- batch:  ImageProcessor.process_batch (decode once per worker, process pool)
+
+Usage:
+    python scripts/benchmark_image_processor.py                      # synthetic 3840x2160 PNG
+    python scripts/benchmark_image_processor.py --image photo.jpg --rounds 5
+"""
+
+import argparse
+import asyncio
+import base64
+import io
+import logging
+import os
+import statistics
+import sys
+import time
+from typing import Any, Callable, Dict, List
+
+# image_processor.py only needs PIL, so load it directly rather than through the
+# image_generation package (which pulls in the FastAPI router and database layer).
+# Process-pool workers re-import it by the same top-level name.
+sys.path.insert(0, os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    'modules', 'integrations', 'image_generation'
+))
+
+from PIL import Image, ImageDraw, ImageFilter  # noqa: E402
+
+import image_processor  # noqa: E402
+from image_processor import ImageProcessor  # noqa: E402
+
+logging.basicConfig(
+    level=logging.WARNING,
+    format='%(asctime)s - %(levelname)s - %(message)s',
+    handlers=[logging.StreamHandler(stream=sys.stdout)]
+)
+logger = logging.getLogger(__name__)
+
+SOCIAL_SIZES = {
+    'instagram_post': (1080, 1080),
+    'instagram_story': (1080, 1920),
+    'facebook_post': (1200, 630),
+    'twitter_card': (1200, 675),
+    'linkedin_post': (1200, 627),
+}
+
+# What create_social_media_pack + create_multiple_formats ask for together
+VARIANTS: List[Dict[str, Any]] = [
+    {'name': name, 'target_format': 'jpg', 'quality_preset': 'social_media', 'custom_size': size}
+    for name, size in SOCIAL_SIZES.items()
+] + [
+    {'name': f'format_{fmt}', 'target_format': fmt, 'quality_preset': 'web_optimized'}
+    for fmt in ('png', 'jpg', 'webp')
+]
+
+
+def make_source_image(width: int, height: int) -> bytes:
+    """Photo-like synthetic image: smooth gradients, shapes and sensor-style noise"""
+    gradient = Image.linear_gradient('L').resize((width, height))
+    radial = Image.radial_gradient('L').resize((width, height))
+    noise = Image.effect_noise((width, height), 40)
+    image = Image.merge('RGB', (gradient, radial, Image.blend(gradient, noise, 0.35)))
+
+    draw = ImageDraw.Draw(image)
+    for i in range(24):
+        x, y = (i * 997) % width, (i * 613) % height
+        draw.ellipse((x, y, x + width // 6, y + height // 6), fill=((i * 37) % 256, (i * 91) % 256, (i * 53) % 256))
+    image = image.filter(ImageFilter.GaussianBlur(2))
+
+    buffer = io.BytesIO()
+    image.save(buffer, format='PNG')
+    return buffer.getvalue()
+
+
+def legacy_render(processor: ImageProcessor, image_base64: str, variant: Dict[str, Any]) -> str:
+    """One variant the way process_image used to do it, entirely on the calling thread"""
+    image_data = base64.b64decode(image_base64)
+    original = Image.open(io.BytesIO(image_data))
+    target_size = variant.get('custom_size') or processor.resolution_presets.get(
+        variant.get('resolution_preset', 'original'))
+    processed = processor._process_image_pipeline(
+        original.copy(), variant['target_format'], variant['quality_preset'], target_size)
+    buffer = io.BytesIO()
+    processed.save(buffer, **processor._get_save_parameters(variant['target_format'], variant['quality_preset']))
+    return base64.b64encode(buffer.getvalue()).decode('utf-8')
+
+
+async def measure(label: str, work: Callable, rounds: int) -> Dict[str, float]:
+    """Median wall time plus the longest event-loop stall seen while the work ran"""
+    wall_times, stalls = [], []
+    for _ in range(rounds):
+        longest_gap = 0.0
+        running = True
+
+        async def heartbeat():
+            nonlocal longest_gap
+            last = time.perf_counter()
+            while running:
+                await asyncio.sleep(0.005)
+                now = time.perf_counter()
+                longest_gap = max(longest_gap, now - last)
+                last = now
+
+        ticker = asyncio.create_task(heartbeat())
+        await asyncio.sleep(0)  # let the heartbeat take its first timestamp
+        start = time.perf_counter()
+        await work()
+        wall_times.append(time.perf_counter() - start)
+        await asyncio.sleep(0.01)  # one more beat, so a stall right at the end is seen
+        running = False
+        await ticker
+        stalls.append(longest_gap)
+
+    result = {'wall_s': statistics.median(wall_times), 'stall_ms': max(stalls) * 1000}
+    print(f"{label:<28} {result['wall_s']:>8.2f} s   max loop stall {result['stall_ms']:>8.1f} ms")
+    return result
+
+
+async def main():
+    """Main execution function"""
+    parser = argparse.ArgumentParser(description='Benchmark ImageProcessor batch rendering')
+    parser.add_argument('--image', help='Source image file (default: synthetic 4K PNG)')
+    parser.add_argument('--width', type=int, default=3840)
+    parser.add_argument('--height', type=int, default=2160)
+    parser.add_argument('--rounds', type=int, default=3, help='Timed rounds per approach')
+    args = parser.parse_args()
+
+    if args.image:
+        with open(args.image, 'rb') as f:
+            image_data = f.read()
+    else:
+        image_data = make_source_image(args.width, args.height)
+    image_base64 = base64.b64encode(image_data).decode('utf-8')
+
+    processor = ImageProcessor()
+    with Image.open(io.BytesIO(image_data)) as probe:
+        source_desc = f"{probe.size[0]}x{probe.size[1]} {probe.format}"
+
+    print("=" * 78)
+    print(f"🖼️  Image processor - {source_desc} ({len(image_data) / 1e6:.1f} MB), "
+          f"{len(VARIANTS)} variants, {image_processor.IMAGE_PROCESS_WORKERS} worker(s), "
+          f"median of {args.rounds}")
+    print("=" * 78)
+
+    # Start the pool outside the timings (workers are long-lived in the app)
+    pool_start = time.perf_counter()
+    await processor.process_batch(image_data, VARIANTS[:image_processor.IMAGE_PROCESS_WORKERS])
+    print(f"{'pool warm-up (one-off)':<28} {time.perf_counter() - pool_start:>8.2f} s")
+
+    async def legacy():
+        for variant in VARIANTS:
+            legacy_render(processor, image_base64, variant)
+
+    async def batch_bytes():
+        result = await processor.process_batch(image_data, VARIANTS)
+        assert all(v['success'] for v in result['variants'].values()), result
+
+    async def batch_base64():
+        result = await processor.process_batch(image_base64, VARIANTS)
+        for variant in result['variants'].values():
+            base64.b64encode(variant['image_bytes'])
+
+    legacy_result = await measure('legacy (per-variant, loop)', legacy, args.rounds)
+    batch_result = await measure('batch (bytes)', batch_bytes, args.rounds)
+    await measure('batch (+ base64 boundary)', batch_base64, args.rounds)
+
+    print("-" * 78)
+    print(f"Throughput: legacy {len(VARIANTS) / legacy_result['wall_s']:.1f} variants/s, "
+          f"batch {len(VARIANTS) / batch_result['wall_s']:.1f} variants/s "
+          f"({legacy_result['wall_s'] / batch_result['wall_s']:.2f}x)")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+"""
+iOS Calendar Sync Benchmark
+Builds an ios_calendar_events table in a scratch schema and syncs a synthetic
+payload (5k events by default) three ways:
+
+- legacy:   one INSERT ... ON CONFLICT round trip per event (the old loop)
+- bulk:     iOSDatabaseManager.sync_calendar_events - COPY into a temp stage,
+            one merge, one full-sync delete - for a first sync (all inserts),
+            a re-sync (all updates) and a full sync after 5% were deleted on the phone
+
+and checks that a full sync with one malformed event deletes nothing, that one
+row Postgres rejects (NUL byte) fails alone, and that a full sync with only
+window_start leaves events before the window alone.
+
+Usage:
+    DATABASE_URL=postgres://... python scripts/benchmark_ios_sync.py
+    DATABASE_URL=postgres://... python scripts/benchmark_ios_sync.py --events 20000 --runs 5
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import statistics
+import sys
+import time
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List
+from uuid import UUID
+
+import asyncpg
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules.integrations.ios.database_manager import iOSDatabaseManager, DEFAULT_USER_ID  # noqa: E402
+
+logging.basicConfig(
+    level=logging.WARNING,
+    format='%(asctime)s - %(levelname)s - %(message)s',
+    handlers=[logging.StreamHandler(stream=sys.stdout)]
+)
+logger = logging.getLogger(__name__)
+
+SCHEMA = 'bench_ios'
+DEVICE = 'benchmark-iphone'
+
+SETUP_SQL = f"""
+    DROP SCHEMA IF EXISTS {SCHEMA} CASCADE;
+    CREATE SCHEMA {SCHEMA};
+
+    CREATE TABLE {SCHEMA}.ios_calendar_events (
+        id SERIAL PRIMARY KEY,
+        user_id UUID NOT NULL,
+        device_identifier VARCHAR(255) NOT NULL,
+        event_id VARCHAR(255) NOT NULL,
+        title TEXT,
+        start_time TIMESTAMP WITH TIME ZONE,
+        end_time TIMESTAMP WITH TIME ZONE,
+        location TEXT,
+        notes TEXT,
+        is_all_day BOOLEAN DEFAULT FALSE,
+        calendar_name VARCHAR(255),
+        synced_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+        updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+        UNIQUE (user_id, event_id)
+    );
+"""
+
+LEGACY_QUERY = f"""
+    INSERT INTO {SCHEMA}.ios_calendar_events (
+        user_id, device_identifier, event_id,
+        title, start_time, end_time,
+        location, notes, is_all_day, calendar_name,
+        synced_at, updated_at
+    )
+    VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11, $11)
+    ON CONFLICT (user_id, event_id) DO UPDATE SET
+        title = EXCLUDED.title,
+        start_time = EXCLUDED.start_time,
+        end_time = EXCLUDED.end_time,
+        location = EXCLUDED.location,
+        notes = EXCLUDED.notes,
+        is_all_day = EXCLUDED.is_all_day,
+        calendar_name = EXCLUDED.calendar_name,
+        synced_at = EXCLUDED.synced_at,
+        updated_at = EXCLUDED.updated_at
+"""
+
+
+class ScratchDB:
+    """The slice of db_manager _bulk_sync uses, on a pool pinned to the scratch schema"""
+
+    def __init__(self, pool: asyncpg.Pool):
+        self.pool = pool
+
+    @asynccontextmanager
+    async def transaction(self):
+        async with self.pool.acquire() as conn:
+            async with conn.transaction():
+                yield conn
+
+
+def make_events(count: int, revision: int) -> List[Dict[str, Any]]:
+    """iOS-shaped payload (ISO strings with Z), one event every 3 hours"""
+    base = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    events = []
+    for n in range(count):
+        start = base + timedelta(hours=3 * n)
+        events.append({
+            'event_id': f"EV-{n:06d}",
+            'title': f"Meeting {n} (rev {revision})",
+            'start_time': start.isoformat().replace('+00:00', 'Z'),
+            'end_time': (start + timedelta(minutes=45)).isoformat().replace('+00:00', 'Z'),
+            'location': 'Conference Room B' if n % 3 else None,
+            'notes': 'Agenda: status, blockers, next steps' if n % 5 == 0 else None,
+            'is_all_day': n % 40 == 0,
+            'calendar_name': ['Work', 'Home', 'AMCF'][n % 3]
+        })
+    return events
+
+
+async def legacy_sync(pool: asyncpg.Pool, events: List[Dict[str, Any]]):
+    """The old loop: parse + one pooled round trip per event"""
+    now = datetime.now(timezone.utc)
+    for event in events:
+        start_time = datetime.fromisoformat(event['start_time'].replace('Z', '+00:00'))
+        end_time = datetime.fromisoformat(event['end_time'].replace('Z', '+00:00'))
+        await pool.execute(
+            LEGACY_QUERY, UUID(DEFAULT_USER_ID), DEVICE, event['event_id'], event['title'],
+            start_time, end_time, event.get('location'), event.get('notes'),
+            event.get('is_all_day', False), event.get('calendar_name'), now
+        )
+
+
+async def timed(func, runs: int, reset=None) -> float:
+    """Median wall time in ms; reset() runs untimed before each run"""
+    durations = []
+    for _ in range(runs):
+        if reset:
+            await reset()
+        start = time.perf_counter()
+        await func()
+        durations.append((time.perf_counter() - start) * 1000)
+    return statistics.median(durations)
+
+
+async def main():
+    """Main execution function"""
+    parser = argparse.ArgumentParser(description='Benchmark iOS calendar bulk sync')
+    parser.add_argument('--events', type=int, default=5000, help='Events in the payload')
+    parser.add_argument('--runs', type=int, default=3, help='Timed runs per case (median reported)')
+    parser.add_argument('--keep', action='store_true', help=f'Keep the {SCHEMA} schema afterwards')
+    args = parser.parse_args()
+
+    database_url = os.getenv('DATABASE_URL')
+    if not database_url:
+        logger.error("❌ DATABASE_URL not set")
+        sys.exit(1)
+
+    conn = await asyncpg.connect(database_url)
+    await conn.execute(SETUP_SQL)
+    pool = await asyncpg.create_pool(
+        database_url, min_size=2, max_size=10, server_settings={'search_path': SCHEMA}
+    )
+
+    ios_db = iOSDatabaseManager()
+    ios_db.db = ScratchDB(pool)
+
+    first = make_events(args.events, revision=1)
+    second = make_events(args.events, revision=2)
+    trimmed = [event for n, event in enumerate(second) if n % 20]  # 5% deleted on the phone
+    results = {}
+
+    async def truncate():
+        await conn.execute(f"TRUNCATE {SCHEMA}.ios_calendar_events")
+
+    async def load_first():
+        await truncate()
+        await ios_db.sync_calendar_events(DEVICE, first)
+
+    async def bulk(events, full_sync=False):
+        results['last'] = await ios_db.sync_calendar_events(DEVICE, events, full_sync=full_sync)
+
+    try:
+        rows = [
+            ('legacy: first sync (inserts)', await timed(lambda: legacy_sync(pool, first), args.runs, truncate)),
+            ('legacy: re-sync (updates)', await timed(lambda: legacy_sync(pool, second), args.runs, load_first)),
+            ('bulk:   first sync (inserts)', await timed(lambda: bulk(first), args.runs, truncate)),
+            ('bulk:   re-sync (updates)', await timed(lambda: bulk(second), args.runs, load_first)),
+            ('bulk:   full sync, 5% deleted', await timed(lambda: bulk(trimmed, True), args.runs, load_first)),
+        ]
+        full_sync_result = results['last']
+
+        # One malformed event in a full sync must not delete anything
+        await load_first()
+        malformed = trimmed + [{'event_id': 'EV-BAD', 'title': 'Broken', 'start_time': 'not a date'}]
+        guarded = await ios_db.sync_calendar_events(DEVICE, malformed, full_sync=True)
+        remaining = await conn.fetchval(f"SELECT COUNT(*) FROM {SCHEMA}.ios_calendar_events")
+
+        # One row the merge rejects must not fail the rest of the payload
+        await truncate()
+        poisoned = [dict(event) for event in first]
+        poisoned[7]['title'] = 'Broken\x00title'
+        isolated = await ios_db.sync_calendar_events(DEVICE, poisoned)
+
+        # A full sync with only window_start must only delete inside [window_start, ...)
+        await load_first()
+        midpoint = first[args.events // 2]['start_time']
+        half_window = await ios_db.sync_calendar_events(
+            DEVICE, first[args.events // 2 + 1:], full_sync=True, window_start=midpoint
+        )
+
+        print("=" * 78)
+        print(f"📱 iOS calendar sync - {args.events:,} events, median of {args.runs} runs")
+        print("=" * 78)
+        for label, ms in rows:
+            print(f"{label:<36} {ms:>10.1f} ms")
+        legacy_ms, bulk_ms = rows[1][1], rows[3][1]
+        print(f"{'re-sync speedup':<36} {legacy_ms / bulk_ms:>10.0f}x")
+        print("-" * 78)
+        print(f"{'last full sync phases (ms)':<36} {full_sync_result['timing_ms']}")
+        print(f"{'last full sync deleted':<36} {full_sync_result['deleted']:>10}")
+        status = '✅' if guarded['deleted'] == 0 and remaining == args.events else '❌'
+        print(f"{'malformed event -> delete skipped':<36} {guarded['failed']:>4} failed, "
+              f"{guarded['deleted']} deleted, {remaining} kept {status}")
+        status = '✅' if isolated['failed'] == 1 and isolated['synced'] == args.events - 1 else '❌'
+        print(f"{'one NUL-byte row -> isolated':<36} {isolated['failed']:>4} failed, "
+              f"{isolated['synced']} synced {status}")
+        status = '✅' if half_window['deleted'] == 1 else '❌'
+        print(f"{'window_start only -> scoped delete':<36} {half_window['deleted']:>4} deleted {status}")
+
+    finally:
+        await pool.close()
+        if not args.keep:
+            await conn.execute(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE")
+        await conn.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,298 @@
+#!/usr/bin/env python3
+"""
+Situation Detector Benchmark
+Feeds a synthetic intelligence cycle (10k ContextSignals by default: meetings,
+action items, calendar events, emails, conversation topics, trends, knowledge
+and weather) through SituationDetector.detect_all_situations and reports:
+
+- SignalIndex build time and the full cycle time (median of --rounds)
+- time per detector on the shared index
+- the longest event-loop stall while the cycle runs
+- the pairwise scans the correlation detectors used to do (deadline,
+  email-calendar, conversation-trend) timed against the index joins, with a
+  check that both find the same pairs
+
+Usage:
+    python scripts/benchmark_situation_detector.py
+    python scripts/benchmark_situation_detector.py --signals 50000 --rounds 5
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import random
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List
+from uuid import uuid4
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules.intelligence.context_collectors import ContextSignal  # noqa: E402
+from modules.intelligence.situation_detector import (  # noqa: E402
+    SituationDetector, SignalIndex, STOP_WORDS, DEADLINE_COMMON_WORDS
+)
+
+logging.basicConfig(
+    level=logging.ERROR,  # detectors log one line per situation
+    format='%(asctime)s - %(levelname)s - %(message)s',
+    handlers=[logging.StreamHandler(stream=sys.stdout)]
+)
+logger = logging.getLogger(__name__)
+
+# Share of the cycle per signal type (roughly what a busy day produces, scaled up)
+SIGNAL_MIX = {
+    'meeting_processed': 0.04,
+    'action_item_pending': 0.12,
+    'action_item_overdue': 0.04,
+    'meeting_upcoming': 0.03,
+    'event_upcoming_24h': 0.07,
+    'event_upcoming_48h': 0.07,
+    'prep_time_needed': 0.04,
+    'email_priority_high': 0.12,
+    'email_requires_response': 0.10,
+    'email_follow_up': 0.04,
+    'topic_discussed': 0.12,
+    'project_mentioned': 0.03,
+    'trend_spike': 0.03,
+    'trend_rising': 0.04,
+    'trend_high': 0.02,
+    'trend_opportunity': 0.02,
+    'knowledge_high_relevance': 0.03,
+    'knowledge_topic_match': 0.03,
+    'uv_index_alert': 0.0005,
+    'headache_risk_high': 0.0005,
+    'meeting_cluster': 0.001,
+}
+
+SOURCES = {
+    'meeting': ('meeting_processed', 'action_item_pending', 'action_item_overdue', 'meeting_upcoming'),
+    'calendar': ('event_upcoming_24h', 'event_upcoming_48h', 'prep_time_needed', 'meeting_cluster'),
+    'email': ('email_priority_high', 'email_requires_response', 'email_follow_up'),
+    'conversation': ('topic_discussed', 'project_mentioned'),
+    'trends': ('trend_spike', 'trend_rising', 'trend_high', 'trend_opportunity'),
+    'knowledge': ('knowledge_high_relevance', 'knowledge_topic_match'),
+    'weather': ('uv_index_alert', 'headache_risk_high'),
+}
+SOURCE_OF = {signal_type: source for source, types in SOURCES.items() for signal_type in types}
+
+
+def make_signals(count: int, vocabulary_size: int, contact_count: int, seed: int) -> List[ContextSignal]:
+    """Synthetic cycle with enough shared words and attendees that every detector has work"""
+    rng = random.Random(seed)
+    vocabulary = [f"topic{i}" for i in range(vocabulary_size)]
+    contacts = [(f"first{i} last{i}", f"first{i}.last{i}@client{i % 50}.com") for i in range(contact_count)]
+    now = datetime.utcnow()
+    meeting_ids = [str(uuid4()) for _ in range(max(1, int(count * SIGNAL_MIX['meeting_processed'])))]
+    event_ids = {
+        signal_type: [str(uuid4()) for _ in range(max(1, int(count * SIGNAL_MIX[signal_type])))]
+        for signal_type in ('event_upcoming_24h', 'event_upcoming_48h')
+    }
+    all_event_ids = event_ids['event_upcoming_24h'] + event_ids['event_upcoming_48h']
+
+    def words(n: int) -> str:
+        return ' '.join(rng.sample(vocabulary, n))
+
+    def attendees(n: int) -> List[str]:
+        return [email for _, email in rng.sample(contacts, n)]
+
+    signals = []
+    for signal_type, share in SIGNAL_MIX.items():
+        for i in range(max(1, int(count * share))):
+            if signal_type == 'meeting_processed':
+                data = {'meeting_id': meeting_ids[i % len(meeting_ids)], 'meeting_title': words(4),
+                        'meeting_date': now.isoformat(), 'attendees': attendees(3), 'summary': 'x'}
+            elif signal_type.startswith('action_item'):
+                data = {'meeting_id': rng.choice(meeting_ids), 'action_item_id': str(uuid4()),
+                        'action_text': words(5), 'meeting_title': words(3), 'days_until_due': rng.randint(0, 7)}
+            elif signal_type == 'meeting_upcoming':
+                data = {'meeting_id': rng.choice(meeting_ids), 'meeting_title': words(4),
+                        'attendees': attendees(3), 'hours_until': rng.uniform(1, 48)}
+            elif signal_type in ('event_upcoming_24h', 'event_upcoming_48h', 'prep_time_needed'):
+                ids = event_ids.get(signal_type, all_event_ids)
+                data = {'event_id': ids[i % len(ids)], 'event_title': words(4),
+                        'attendees': attendees(3), 'hours_until': rng.uniform(1, 48),
+                        'location': rng.choice(['office', 'park', 'zoom', 'client site']),
+                        'suggested_prep_hours': 1}
+            elif signal_type.startswith('email'):
+                name, email = rng.choice(contacts)
+                data = {'email_id': str(uuid4()), 'sender_name': name, 'sender_email': email,
+                        'subject': words(5), 'priority_level': 'high'}
+            elif signal_type == 'topic_discussed':
+                data = {'keyword': words(2), 'thread_id': str(uuid4()), 'relevance': 6}
+            elif signal_type == 'project_mentioned':
+                data = {'project_name': words(2), 'thread_id': str(uuid4())}
+            elif signal_type.startswith('trend'):
+                data = {'keyword': words(2), 'trend_score': rng.randint(20, 100),
+                        'business_area': rng.choice(['tech', 'amcf', 'bcdodge'])}
+            elif signal_type.startswith('knowledge'):
+                data = {'entry_id': str(uuid4()), 'title': words(5), 'topics': words(3).split()}
+            elif signal_type == 'uv_index_alert':
+                data = {'uv_index': 9, 'uv_level': 'very high'}
+            elif signal_type == 'headache_risk_high':
+                data = {'risk_level': 'high', 'risk_score': 70}
+            else:
+                data = {'date': now.date().isoformat(), 'meeting_count': 6}
+
+            signals.append(ContextSignal(
+                signal_id=uuid4(),
+                source=SOURCE_OF[signal_type],
+                signal_type=signal_type,
+                timestamp=now - timedelta(minutes=rng.randint(0, 24 * 60)),
+                data=data,
+                priority=rng.randint(3, 9),
+                expires_at=now + timedelta(hours=48)
+            ))
+
+    rng.shuffle(signals)
+    return signals
+
+
+# -----------------------------------------------------------------------------
+# The pre-index pairwise scans (pair counts only), for comparison
+# -----------------------------------------------------------------------------
+
+def legacy_filter(signals: List, types: List[str]) -> List:
+    return [s for s in signals if s.signal_type in types]
+
+
+def legacy_deadline_pairs(signals: List) -> int:
+    events = legacy_filter(signals, ['event_upcoming_24h', 'event_upcoming_48h'])
+    actions = legacy_filter(signals, ['action_item_pending', 'action_item_overdue'])
+    pairs = 0
+    for event in events:
+        event_keywords = set((event.data.get('event_title') or '').lower().split())
+        for action in actions:
+            action_keywords = set((action.data.get('action_text') or '').lower().split() +
+                                  (action.data.get('meeting_title') or '').lower().split())
+            if len((event_keywords - DEADLINE_COMMON_WORDS) & (action_keywords - DEADLINE_COMMON_WORDS)) >= 2:
+                pairs += 1
+    return pairs
+
+
+def legacy_email_calendar_pairs(signals: List) -> int:
+    emails = legacy_filter(signals, ['email_priority_high', 'email_requires_response', 'email_follow_up'])
+    events = legacy_filter(signals, ['event_upcoming_24h', 'event_upcoming_48h'])
+    pairs = 0
+    for email in emails:
+        sender_email = (email.data.get('sender_email') or '').lower()
+        raw = set((email.data.get('sender_name') or '').lower().split() + (email.data.get('subject') or '').lower().split())
+        email_keywords = {kw for kw in raw if kw and kw not in STOP_WORDS and len(kw) > 2}
+        if len(email_keywords) < 2:
+            continue
+        for event in events:
+            attending = sender_email in ' '.join(str(a).lower() for a in (event.data.get('attendees') or []) if a)
+            raw_event = set((event.data.get('event_title') or '').lower().split())
+            event_keywords = {kw for kw in raw_event if kw and kw not in STOP_WORDS and len(kw) > 2}
+            if attending or len(email_keywords & event_keywords) >= 3:
+                pairs += 1
+    return pairs
+
+
+def legacy_conversation_trend_pairs(signals: List) -> int:
+    conversations = legacy_filter(signals, ['topic_discussed', 'project_mentioned'])
+    trends = legacy_filter(signals, ['trend_spike', 'trend_rising', 'trend_high'])
+    pairs = 0
+    for conversation in conversations:
+        topic = (conversation.data.get('keyword') or conversation.data.get('project_name') or '').lower()
+        if not topic:
+            continue
+        for trend in trends:
+            keyword = (trend.data.get('keyword') or '').lower()
+            if keyword and (set(topic.split()) & set(keyword.split()) or topic in keyword or keyword in topic):
+                pairs += 1
+    return pairs
+
+
+def timed(func: Callable, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+async def measure_cycle(detector: SituationDetector, signals: List, rounds: int) -> Dict[str, float]:
+    """Median full-cycle time plus the longest event-loop stall seen while cycles ran"""
+    wall_times = []
+    longest_gap = 0.0
+    running = True
+
+    async def heartbeat():
+        nonlocal longest_gap
+        last = time.perf_counter()
+        while running:
+            await asyncio.sleep(0.005)
+            now = time.perf_counter()
+            longest_gap = max(longest_gap, now - last)
+            last = now
+
+    ticker = asyncio.create_task(heartbeat())
+    await asyncio.sleep(0)
+    situations = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        situations = await detector.detect_all_situations(signals)
+        wall_times.append(time.perf_counter() - start)
+    await asyncio.sleep(0.01)
+    running = False
+    await ticker
+    return {'wall_s': statistics.median(wall_times), 'stall_ms': longest_gap * 1000, 'situations': len(situations)}
+
+
+async def main():
+    """Main execution function"""
+    parser = argparse.ArgumentParser(description='Benchmark SituationDetector on a synthetic cycle')
+    parser.add_argument('--signals', type=int, default=10000, help='Signals per cycle')
+    parser.add_argument('--vocabulary', type=int, default=2000, help='Distinct topic words')
+    parser.add_argument('--contacts', type=int, default=3000, help='Distinct email senders / attendees')
+    parser.add_argument('--rounds', type=int, default=3, help='Timed cycles')
+    parser.add_argument('--seed', type=int, default=7)
+    parser.add_argument('--skip-legacy', action='store_true', help='Skip the pairwise comparison')
+    args = parser.parse_args()
+
+    signals = make_signals(args.signals, args.vocabulary, args.contacts, args.seed)
+    detector = SituationDetector()
+
+    print("=" * 78)
+    print(f"🧠 Situation detector - {len(signals)} signals, {args.vocabulary} words, "
+          f"{args.contacts} contacts, median of {args.rounds}")
+    print("=" * 78)
+
+    index, build_s = timed(SignalIndex, signals)
+    print(f"{'SignalIndex build':<36} {build_s * 1000:>9.1f} ms")
+
+    # Pairs each correlation detector joined, to check against the pairwise scans
+    joined_pairs: Dict[str, int] = {}
+    for name in ('post_meeting_situations', 'deadline_situations', 'trend_content_situations',
+                 'email_meeting_correlation', 'conversation_trend_correlation', 'weather_impact'):
+        found, seconds = timed(getattr(detector, f'_detect_{name}'), index)
+        joined_pairs[name] = sum(
+            situation.situation_context.get('action_item_count', 0) if name == 'deadline_situations' else 1
+            for situation in found
+            if situation.situation_type != 'email_meeting_followup'
+        )
+        print(f"  {name:<34} {seconds * 1000:>9.1f} ms   {len(found):>6} situations")
+
+    cycle = await measure_cycle(detector, signals, args.rounds)
+    print(f"{'full cycle (index + 6 detectors)':<36} {cycle['wall_s'] * 1000:>9.1f} ms   "
+          f"{cycle['situations']:>6} situations, max loop stall {cycle['stall_ms']:.1f} ms")
+
+    if args.skip_legacy:
+        return
+
+    print("-" * 78)
+    print("Pairwise scans the correlation detectors used to run:")
+    comparisons = [
+        ('deadline (event x action)', legacy_deadline_pairs, 'deadline_situations'),
+        ('email x calendar', legacy_email_calendar_pairs, 'email_meeting_correlation'),
+        ('conversation x trend', legacy_conversation_trend_pairs, 'conversation_trend_correlation'),
+    ]
+    for label, legacy, detector_name in comparisons:
+        pairs, seconds = timed(legacy, signals)
+        match = '✅' if pairs == joined_pairs[detector_name] else f"❌ index joined {joined_pairs[detector_name]}"
+        print(f"  {label:<34} {seconds * 1000:>9.1f} ms   {pairs:>6} pairs {match}")
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""
+Cross-Business Trend Correlation Benchmark
+Builds a synthetic trend_monitoring window (keywords tracked in several business
+areas, with missing days) and compares:
+
+- the old find_cross_business_correlations loop (nested dicts, pure-Python Pearson,
+  series aligned by position)
+- TrendAnalyzer.correlations_from_window on a pivoted, date-aligned NumPy matrix
+
+and checks the vectorized correlations against a per-pair reference computed on
+the days both areas have data. The old loop's results differ wherever a day is
+missing from one series; those pairs are counted separately.
+
+Usage:
+    python scripts/benchmark_trend_correlation.py
+    python scripts/benchmark_trend_correlation.py --keywords 10000 --days 14 --missing 0.2
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import random
+import statistics
+import sys
+import time
+from collections import defaultdict
+from datetime import date, timedelta
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules.integrations.google_trends.trend_analyzer import (  # noqa: E402
+    TrendAnalyzer, pivot_trend_window, correlate_business_areas
+)
+
+logging.basicConfig(
+    level=logging.WARNING,
+    format='%(asctime)s - %(levelname)s - %(message)s',
+    handlers=[logging.StreamHandler(stream=sys.stdout)]
+)
+logger = logging.getLogger(__name__)
+
+BUSINESS_AREAS = ['amcf', 'bcdodge', 'damnitcarl', 'mealsnfeelz', 'roseandangel', 'tvsignals']
+
+
+def make_rows(keywords: int, days: int, missing: float, rng: random.Random,
+              start_date: date) -> List[Dict[str, Any]]:
+    """
+    trend_monitoring-shaped rows, ordered like the old query (keyword, area, date).
+    Each keyword is tracked in 2-4 areas that follow a shared curve plus noise.
+    """
+    rows = []
+    for k in range(keywords):
+        keyword = f"keyword {k:05d}"
+        base = [rng.uniform(10, 90) for _ in range(days)]
+        for area in sorted(rng.sample(BUSINESS_AREAS, rng.randint(2, 4))):
+            noise = rng.uniform(0, 30)
+            for d in range(days):
+                if rng.random() < missing:
+                    continue
+                rows.append({
+                    'keyword': keyword,
+                    'business_area': area,
+                    'trend_date': start_date + timedelta(days=d),
+                    'trend_score': max(0, min(100, int(base[d] + rng.uniform(-noise, noise))))
+                })
+    return rows
+
+
+# ----------------------------------------------------------------------------
+# The correlation pass as it was before the NumPy engine
+# ----------------------------------------------------------------------------
+
+def legacy_correlation(scores1: List[int], scores2: List[int]) -> float:
+    try:
+        min_length = min(len(scores1), len(scores2))
+        s1 = scores1[-min_length:]
+        s2 = scores2[-min_length:]
+        if min_length < 2:
+            return 0.0
+        mean1 = statistics.mean(s1)
+        mean2 = statistics.mean(s2)
+        numerator = sum((s1[i] - mean1) * (s2[i] - mean2) for i in range(min_length))
+        sum_sq1 = sum((s1[i] - mean1) ** 2 for i in range(min_length))
+        sum_sq2 = sum((s2[i] - mean2) ** 2 for i in range(min_length))
+        denominator = (sum_sq1 * sum_sq2) ** 0.5
+        if denominator == 0:
+            return 0.0
+        return abs(numerator / denominator)
+    except Exception:
+        return 0.0
+
+
+def legacy_pairs(rows: List[Dict[str, Any]], min_correlation: float) -> Dict[Tuple[str, str, str], float]:
+    keyword_trends = defaultdict(lambda: defaultdict(list))
+    for row in rows:
+        keyword_trends[row['keyword']][row['business_area']].append(row['trend_score'])
+
+    pairs = {}
+    for keyword, business_data in keyword_trends.items():
+        if len(business_data) < 2:
+            continue
+        business_areas = list(business_data.keys())
+        for i, primary_business in enumerate(business_areas):
+            primary_scores = business_data[primary_business]
+            if len(primary_scores) < 3:
+                continue
+            for j, other_business in enumerate(business_areas):
+                if i >= j:
+                    continue
+                other_scores = business_data[other_business]
+                if len(other_scores) < 3:
+                    continue
+                correlation = legacy_correlation(primary_scores, other_scores)
+                if correlation >= min_correlation:
+                    pairs[(keyword, primary_business, other_business)] = correlation
+    return pairs
+
+
+def reference_pair(window, k: int, a: int, b: int) -> float:
+    """Date-aligned Pearson |r| for one pair with np.corrcoef (NaN under 3 shared days)"""
+    joint = window.observed[k, a] & window.observed[k, b]
+    if joint.sum() < 3:
+        return float('nan')
+    x, y = window.scores[k, a][joint], window.scores[k, b][joint]
+    if x.std() == 0 or y.std() == 0:
+        return 0.0
+    return abs(float(np.corrcoef(x, y)[0, 1]))
+
+
+# ----------------------------------------------------------------------------
+
+async def main():
+    """Main execution function"""
+    parser = argparse.ArgumentParser(description='Benchmark cross-business trend correlation')
+    parser.add_argument('--keywords', type=int, default=10000, help='Keywords in the window')
+    parser.add_argument('--days', type=int, default=14, help='Window length in days')
+    parser.add_argument('--missing', type=float, default=0.15, help='Share of (keyword, area, day) rows missing')
+    parser.add_argument('--min-correlation', type=float, default=0.6)
+    parser.add_argument('--rounds', type=int, default=3, help='Timed runs (median reported)')
+    parser.add_argument('--check', type=int, default=2000, help='Keyword/area pairs checked against the reference')
+    parser.add_argument('--seed', type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    start_date = date.today() - timedelta(days=args.days - 1)
+    rows = make_rows(args.keywords, args.days, args.missing, rng, start_date)
+
+    print("=" * 78)
+    print(f"📈 Cross-business trend correlation - {args.keywords} keywords, {len(rows)} rows, "
+          f"{args.days} days, {args.missing:.0%} missing, median of {args.rounds}")
+    print("=" * 78)
+
+    analyzer = TrendAnalyzer()
+
+    def timed(func, *func_args):
+        durations = []
+        for _ in range(args.rounds):
+            start = time.perf_counter()
+            result = func(*func_args)
+            durations.append(time.perf_counter() - start)
+        return result, statistics.median(durations)
+
+    legacy, legacy_s = timed(legacy_pairs, rows, args.min_correlation)
+    window, pivot_s = timed(pivot_trend_window, rows, start_date, args.days)
+    correlations, engine_s = timed(analyzer.correlations_from_window, window, args.min_correlation, 10)
+    (area_i, area_j, matrix), _ = timed(correlate_business_areas, window, analyzer.min_data_points)
+
+    print(f"{'old nested-dict loop':<40} {legacy_s * 1000:>9.1f} ms")
+    print(f"{'pivot to keyword x area x day':<40} {pivot_s * 1000:>9.1f} ms   {window.scores.shape}")
+    print(f"{'NumPy correlations + results':<40} {engine_s * 1000:>9.1f} ms")
+    print(f"{'pivot + NumPy total':<40} {(pivot_s + engine_s) * 1000:>9.1f} ms   "
+          f"{legacy_s / (pivot_s + engine_s):.0f}x faster")
+
+    # Correctness: vectorized r vs a per-pair date-aligned reference
+    print("-" * 78)
+    candidates = np.argwhere(~np.isnan(matrix))
+    sample = candidates[rng.sample(range(len(candidates)), min(args.check, len(candidates)))]
+    worst = max(
+        (abs(matrix[k, p] - reference_pair(window, k, area_i[p], area_j[p])) for k, p in sample),
+        default=0.0
+    )
+    status = '✅' if worst < 1e-9 else f"❌ max error {worst:.2e}"
+    print(f"{'pairs vs np.corrcoef on shared days':<40} {len(sample):>9} pairs {status}")
+
+    # Where position alignment changed the answer
+    vectorized = {
+        (window.keywords[k], window.business_areas[area_i[p]], window.business_areas[area_j[p]])
+        for k, p in np.argwhere(np.nan_to_num(matrix) >= args.min_correlation)
+    }
+    print(f"{'pairs over threshold (old / date-aligned)':<40} {len(legacy):>9} / {len(vectorized)}")
+    print(f"{'differ because of missing days':<40} {len(vectorized ^ set(legacy)):>9}")
+    if correlations:
+        top = correlations[0]
+        print(f"{'strongest':<40} {top.primary_keyword} ({top.primary_business}) "
+              f"r={top.correlation_strength:.3f} {top.shared_momentum}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+Google Trends Event-Loop Lag Benchmark
+Runs a full monitor_all_business_areas cycle against a mocked pytrends client
+(TrendReq calls sleep like slow HTTP and return real DataFrames) and a mocked
+db_manager, while a probe task samples event-loop lag every few milliseconds.
+
+Two modes are compared:
+
+- executor: GoogleTrendsClient as shipped (pytrends on the bounded thread pool)
+- inline:   the same cycle with the blocking pytrends work called directly on the
+            loop, as fetch_trend_data did before it moved to the executor
+
+Lag is how late each probe wakes up versus when it asked to; p99 is what a chat or
+SSE request landing mid-cycle would wait on top of its own work.
+
+Usage:
+    python scripts/benchmark_trends_loop_lag.py
+    python scripts/benchmark_trends_loop_lag.py --keywords 10 --http-ms 400 --probe-ms 5
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import statistics
+import sys
+import time
+from datetime import date
+from typing import List
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules.integrations.google_trends import trends_client  # noqa: E402
+from modules.integrations.google_trends.trends_client import GoogleTrendsClient  # noqa: E402
+
+logging.basicConfig(
+    level=logging.WARNING,
+    format='%(asctime)s - %(levelname)s - %(message)s',
+    handlers=[logging.StreamHandler(stream=sys.stdout)]
+)
+logger = logging.getLogger(__name__)
+
+
+class FakeTrendReq:
+    """Stands in for pytrends.TrendReq - blocking sleeps where the HTTP calls would be"""
+
+    http_seconds = 0.3
+
+    def __init__(self, *args, **kwargs):
+        time.sleep(self.http_seconds)  # TrendReq() fetches cookies
+        self.kw_list: List[str] = []
+
+    def build_payload(self, kw_list, **kwargs):
+        time.sleep(self.http_seconds)  # token request
+        self.kw_list = list(kw_list)
+
+    def interest_over_time(self) -> pd.DataFrame:
+        time.sleep(self.http_seconds)
+        index = pd.date_range(end=date.today(), periods=90, freq='D')
+        return pd.DataFrame(
+            {kw: [(i * 7 + n * 13) % 100 for i in range(90)] for n, kw in enumerate(self.kw_list)},
+            index=index
+        )
+
+    def interest_by_region(self, **kwargs) -> pd.DataFrame:
+        time.sleep(self.http_seconds)
+        return pd.DataFrame(
+            {kw: [40, 25, 10] for kw in self.kw_list},
+            index=pd.Index(['Virginia', 'Maryland', 'Ohio'])
+        )
+
+
+class FakeConnection:
+    def __init__(self, keywords: int):
+        self.keywords = keywords
+
+    async def fetch(self, query, business_area, limit):
+        await asyncio.sleep(0.002)
+        return [{'expanded_keyword': f"{business_area} keyword {n}"} for n in range(min(limit, self.keywords))]
+
+    async def execute(self, *args):
+        await asyncio.sleep(0.001)
+
+
+class FakeDBManager:
+    def __init__(self, keywords: int):
+        self.keywords = keywords
+
+    async def get_connection(self):
+        return FakeConnection(self.keywords)
+
+    async def release_connection(self, conn):
+        pass
+
+
+class InlineTrendsClient(GoogleTrendsClient):
+    """The pre-executor behaviour: pytrends work runs on the event loop"""
+
+    async def fetch_trend_data(self, keywords, timeframe='today 3-m'):
+        if not self.quota.try_consume():
+            return {}
+        await self.rate_limiter.acquire()
+        reached_google = trends_client.threading.Event()
+        return self._fetch_trend_data_blocking(keywords[:self.batch_size], timeframe, reached_google)
+
+
+async def probe_loop_lag(interval: float, samples: List[float], stop: asyncio.Event):
+    """Sleep for interval, record how late the wake-up was"""
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(interval)
+        samples.append(time.perf_counter() - start - interval)
+
+
+def percentile(values: List[float], pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+async def run_cycle(client: GoogleTrendsClient, keywords: int, probe_interval: float):
+    samples: List[float] = []
+    stop = asyncio.Event()
+    probe = asyncio.create_task(probe_loop_lag(probe_interval, samples, stop))
+
+    start = time.perf_counter()
+    await client.monitor_all_business_areas(keywords_per_area=keywords)
+    elapsed = time.perf_counter() - start
+
+    stop.set()
+    await probe
+    return elapsed, samples
+
+
+async def main():
+    """Main execution function"""
+    parser = argparse.ArgumentParser(description='Benchmark event-loop lag during a Google Trends cycle')
+    parser.add_argument('--keywords', type=int, default=10, help='Keywords per business area')
+    parser.add_argument('--http-ms', type=float, default=300, help='Simulated latency of each pytrends HTTP call')
+    parser.add_argument('--delay-ms', type=float, default=50, help='Spacing between requests (real client: 3000)')
+    parser.add_argument('--probe-ms', type=float, default=5, help='Loop-lag sampling interval')
+    args = parser.parse_args()
+
+    FakeTrendReq.http_seconds = args.http_ms / 1000
+    trends_client.TrendReq = FakeTrendReq
+    trends_client.db_manager = FakeDBManager(args.keywords)
+
+    results = {}
+    for mode, client_class in (('executor', GoogleTrendsClient), ('inline', InlineTrendsClient)):
+        client = client_class()
+        client.request_delay = args.delay_ms / 1000
+        client.rate_limiter = trends_client.RequestRateLimiter(client.request_delay)
+        if mode == 'inline':
+            # TrendReq() blocks too - build it on the loop like the old initialize_client
+            client._get_pytrends()
+            client._initialized = True
+
+        # Keep the cycle's own prints out of the report
+        real_stdout = sys.stdout
+        sys.stdout = open(os.devnull, 'w')
+        try:
+            results[mode] = await run_cycle(client, args.keywords, args.probe_ms / 1000)
+        finally:
+            sys.stdout.close()
+            sys.stdout = real_stdout
+        results[mode] += (client.requests_made_today,)
+
+    print("=" * 78)
+    print(f"⏱️  Google Trends loop lag - 6 areas x {args.keywords} keywords, "
+          f"{args.http_ms:.0f} ms per HTTP call, probe every {args.probe_ms:.0f} ms")
+    print("=" * 78)
+    print(f"{'mode':<10} {'cycle':>9} {'requests':>9} {'samples':>8} {'p50 lag':>10} {'p99 lag':>10} {'max lag':>10}")
+    for mode, (elapsed, samples, requests) in results.items():
+        print(f"{mode:<10} {elapsed:>8.2f}s {requests:>9} {len(samples):>8} "
+              f"{statistics.median(samples) * 1000:>8.1f}ms "
+              f"{percentile(samples, 99) * 1000:>8.1f}ms "
+              f"{max(samples) * 1000:>8.1f}ms")
+
+    executor_p99 = percentile(results['executor'][1], 99)
+    inline_p99 = percentile(results['inline'][1], 99)
+    print("-" * 78)
+    print(f"p99 loop lag: {executor_p99 * 1000:.1f} ms with the executor vs "
+          f"{inline_p99 * 1000:.1f} ms inline ({inline_p99 / max(executor_p99, 1e-6):.0f}x)")
+    trends_client._pytrends_executor.shutdown(wait=False)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -97,7 +97,10 @@ CREATE TABLE conversation_threads (
     
     -- Context
     primary_project_id INTEGER REFERENCES knowledge_projects(id),
-    platform VARCHAR(20) NOT NULL CHECK (platform IN ('web', 'ios', 'android', 'slack', 'email', 'api')),
+    platform VARCHAR(20) NOT NULL CHECK (platform IN ('web', 'ios', 'android', 'slack', 'email', 'api', 'system')),
+    
+    -- Notification threads (Weather Alerts, Bluesky Draft: ...) are created as platform 'system'
+    is_notification_thread BOOLEAN GENERATED ALWAYS AS (platform = 'system') STORED,
     
     -- State
     status VARCHAR(20) DEFAULT 'active' CHECK (status IN ('active', 'archived', 'completed', 'deleted')),
@@ -199,10 +202,14 @@ CREATE TABLE rss_feed_entries (
 CREATE INDEX idx_knowledge_entries_sha1 ON knowledge_entries(sha1);
 CREATE INDEX idx_knowledge_entries_project ON knowledge_entries(project_id);
 CREATE INDEX idx_knowledge_entries_search ON knowledge_entries USING gin(to_tsvector('english', title || ' ' || content));
+CREATE INDEX idx_knowledge_entries_search_vector ON knowledge_entries USING gin(search_vector);
+CREATE INDEX idx_knowledge_entries_title_trgm ON knowledge_entries USING gin(title gin_trgm_ops);
+CREATE INDEX idx_knowledge_entries_content_trgm ON knowledge_entries USING gin(content gin_trgm_ops);
 
 -- Conversations
 CREATE INDEX idx_conversation_threads_user ON conversation_threads(user_id, updated_at DESC);
 CREATE INDEX idx_conversation_messages_thread ON conversation_messages(thread_id, created_at);
+CREATE INDEX idx_conversation_messages_user_recent ON conversation_messages(user_id, created_at DESC, id DESC);
 
 -- Feedback
 CREATE INDEX idx_feedback_user_time ON user_feedback(user_id, created_at DESC);
@@ -271,3 +278,143 @@ CREATE TRIGGER trigger_knowledge_search_vector
 CREATE TRIGGER trigger_conversation_stats
     AFTER INSERT ON conversation_messages
     FOR EACH ROW EXECUTE FUNCTION update_conversation_stats();
+
+-- ============================================================================
+-- MIGRATIONS (idempotent - safe to re-run on an existing database)
+-- ============================================================================
+
+-- 2026-10-16: Newest-first keyset scan for cross-thread memory (query_conversations)
+-- Replaces the ORDER BY id sort over the whole time window and the title NOT LIKE filters
+ALTER TABLE conversation_threads
+    ADD COLUMN IF NOT EXISTS is_notification_thread BOOLEAN GENERATED ALWAYS AS (platform = 'system') STORED;
+
+CREATE INDEX IF NOT EXISTS idx_conversation_messages_user_recent
+    ON conversation_messages(user_id, created_at DESC, id DESC);
+
+-- 2026-10-16: Hybrid knowledge search (KnowledgeQueryEngine.search_knowledge)
+-- Full-text matches on the stored search_vector, literal ILIKE matches via trigrams
+CREATE INDEX IF NOT EXISTS idx_knowledge_entries_search_vector
+    ON knowledge_entries USING gin(search_vector);
+
+CREATE INDEX IF NOT EXISTS idx_knowledge_entries_title_trgm
+    ON knowledge_entries USING gin(title gin_trgm_ops);
+
+CREATE INDEX IF NOT EXISTS idx_knowledge_entries_content_trgm
+    ON knowledge_entries USING gin(content gin_trgm_ops);
+
+-- 2026-10-16: Shared cache second tier (modules/core/cache.py, CACHE_L2_BACKEND=postgres)
+-- UNLOGGED: no WAL writes; contents are dropped after a crash, which is fine for a cache.
+-- Also created by the app at startup.
+CREATE UNLOGGED TABLE IF NOT EXISTS cache_entries (
+    namespace TEXT NOT NULL,
+    cache_key TEXT NOT NULL,
+    value JSONB NOT NULL,
+    tags TEXT[] NOT NULL DEFAULT '{}',
+    expires_at TIMESTAMP WITH TIME ZONE NOT NULL,
+    PRIMARY KEY (namespace, cache_key)
+);
+
+CREATE INDEX IF NOT EXISTS idx_cache_entries_tags ON cache_entries USING gin(tags);
+
+-- 2026-10-16: Conditional GET for the RSS pipeline (RSSFeedProcessor.process_all_feeds)
+-- Validators from the last 200 response; sent back as If-None-Match / If-Modified-Since
+ALTER TABLE IF EXISTS rss_sources
+    ADD COLUMN IF NOT EXISTS etag TEXT,
+    ADD COLUMN IF NOT EXISTS last_modified TEXT;
+
+CREATE INDEX IF NOT EXISTS idx_rss_entries_link ON rss_feed_entries(link);
+
+-- 2026-10-16: Incremental Gmail sync (GmailClient.sync_incremental)
+-- Mailbox historyId per account; users.history.list resumes from it.
+-- Also created by the app on first sync.
+CREATE TABLE IF NOT EXISTS google_gmail_sync_state (
+    user_id TEXT NOT NULL,
+    email_account TEXT NOT NULL,
+    history_id TEXT NOT NULL,
+    last_synced_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    PRIMARY KEY (user_id, email_account)
+);
+
+-- 2026-10-16: Background job scheduler leases (modules/core/scheduler.py)
+-- One row per job; a replica claims a slot under pg_try_advisory_xact_lock and
+-- holds lease_until (renewed while running). Also created by the app at startup.
+CREATE TABLE IF NOT EXISTS scheduler_jobs (
+    job_name TEXT PRIMARY KEY,
+    next_run_at TIMESTAMP WITH TIME ZONE,
+    lease_owner TEXT,
+    lease_until TIMESTAMP WITH TIME ZONE,
+    last_started_at TIMESTAMP WITH TIME ZONE,
+    last_finished_at TIMESTAMP WITH TIME ZONE,
+    last_status TEXT,
+    last_error TEXT,
+    last_duration_ms INTEGER
+);
+
+-- 2026-10-16: Situation dedupe fingerprints (SituationManager.create_situations)
+-- Hash of the type-specific key fields; cleared once a row leaves the 24h window, so the
+-- partial unique index only covers live fingerprints. Also applied by the app on first insert.
+DO $$
+BEGIN
+    IF to_regclass('contextual_situations') IS NOT NULL THEN
+        ALTER TABLE contextual_situations ADD COLUMN IF NOT EXISTS situation_fingerprint VARCHAR(40);
+        CREATE UNIQUE INDEX IF NOT EXISTS idx_contextual_situations_fingerprint
+            ON contextual_situations(user_id, situation_fingerprint)
+            WHERE situation_fingerprint IS NOT NULL;
+    END IF;
+END $$;
+
+-- 2026-10-16: Conversation topic extraction cache (ConversationContextCollector)
+-- One row per thread; content_key hashes (prompt version, thread, last message id), so a
+-- thread is only re-sent to the model after a new message. Also created by the collector.
+CREATE TABLE IF NOT EXISTS conversation_topic_extractions (
+    thread_id TEXT PRIMARY KEY,
+    content_key VARCHAR(40) NOT NULL,
+    analysis JSONB NOT NULL,
+    analyzed_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+);
+
+-- 2026-10-16: Incremental Bluesky timeline scans (BlueskyMultiClient.get_new_timeline_posts)
+-- Newest post seen per account, plus the feed cursor and stop point of a gap that was too
+-- long to fill in one scan. Also created by the client on first use.
+CREATE TABLE IF NOT EXISTS bluesky_timeline_state (
+    account_id TEXT PRIMARY KEY,
+    newest_post_uri TEXT,
+    newest_indexed_at TIMESTAMP WITH TIME ZONE,
+    backfill_cursor TEXT,
+    backfill_stop_uri TEXT,
+    backfill_stop_at TIMESTAMP WITH TIME ZONE,
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+);
+
+-- 2026-10-16: Fathom meeting search (FathomDatabaseManager.search_meetings)
+-- Stored weighted search vector (title A, summary B, transcript C) instead of per-query
+-- to_tsvector over whole transcripts, plus timestamped transcript chunks with their own
+-- GIN index so results can point at the matching segment. Also applied at app startup by
+-- FathomDatabaseManager.ensure_search_schema() in a background task, which then chunks
+-- existing transcripts. Adding the column rewrites fathom_meetings once.
+DO $$
+BEGIN
+    IF to_regclass('public.fathom_meetings') IS NOT NULL THEN
+        ALTER TABLE fathom_meetings ADD COLUMN IF NOT EXISTS search_vector tsvector
+            GENERATED ALWAYS AS (
+                setweight(to_tsvector('english', COALESCE(title, '')), 'A') ||
+                setweight(to_tsvector('english', COALESCE(ai_summary, '')), 'B') ||
+                setweight(to_tsvector('english', COALESCE(transcript_text, '')), 'C')
+            ) STORED;
+        CREATE INDEX IF NOT EXISTS idx_fathom_meetings_search_vector
+            ON fathom_meetings USING GIN (search_vector);
+
+        CREATE TABLE IF NOT EXISTS fathom_transcript_chunks (
+            meeting_id UUID NOT NULL REFERENCES fathom_meetings(id) ON DELETE CASCADE,
+            chunk_index INTEGER NOT NULL,
+            start_seconds INTEGER,
+            end_seconds INTEGER,
+            speakers TEXT[],
+            chunk_text TEXT NOT NULL,
+            search_vector tsvector GENERATED ALWAYS AS (to_tsvector('english', chunk_text)) STORED,
+            PRIMARY KEY (meeting_id, chunk_index)
+        );
+        CREATE INDEX IF NOT EXISTS idx_fathom_transcript_chunks_search_vector
+            ON fathom_transcript_chunks USING GIN (search_vector);
+    END IF;
+END $$;